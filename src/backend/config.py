@@ -69,6 +69,84 @@ class Settings(BaseSettings):
     kimi_api_key: Optional[str] = Field(default=None, env="KIMI_API_KEY")
     minimax_api_key: Optional[str] = Field(default=None, env="MINIMAX_API_KEY")
     minimax_group_id: Optional[str] = Field(default=None, env="MINIMAX_GROUP_ID")
+    # Worker threads for blocking Gemini SDK calls (bounds concurrent Gemini requests)
+    gemini_executor_workers: int = Field(default=8, env="GEMINI_EXECUTOR_WORKERS")
+    # Max in-flight requests per provider, e.g. "gemini=4,openai=8,default=4" (empty = unlimited)
+    ai_provider_max_concurrency: str = Field(default="", env="AI_PROVIDER_MAX_CONCURRENCY")
+    # Per-provider/model RPM/TPM throttling (services/ai/rate_limiter.py);
+    # AI_RATE_LIMITS overrides budgets, e.g. "gemini=1000/1000000,gpt-4o=500/30000"
+    ai_rate_limit_enabled: bool = Field(default=True, env="AI_RATE_LIMIT_ENABLED")
+    ai_rate_limits: str = Field(default="", env="AI_RATE_LIMITS")
+    ai_rate_limit_max_wait_seconds: float = Field(default=120.0, env="AI_RATE_LIMIT_MAX_WAIT_SECONDS")
+    # Provider health / circuit breaker for the fallback chain (services/ai/health.py)
+    ai_health_window_size: int = Field(default=50, env="AI_HEALTH_WINDOW_SIZE")
+    ai_circuit_failure_threshold: int = Field(default=3, env="AI_CIRCUIT_FAILURE_THRESHOLD")
+    ai_circuit_min_success_rate: float = Field(default=0.5, env="AI_CIRCUIT_MIN_SUCCESS_RATE")
+    ai_circuit_open_seconds: float = Field(default=30.0, env="AI_CIRCUIT_OPEN_SECONDS")
+    # Hedged requests (opt-in per AIRequest): fire the next chain entry when the
+    # primary is slower than this percentile of its observed latency
+    ai_hedging_enabled: bool = Field(default=True, env="AI_HEDGING_ENABLED")
+    ai_hedge_latency_percentile: float = Field(default=95.0, env="AI_HEDGE_LATENCY_PERCENTILE")
+    ai_hedge_default_delay_ms: int = Field(default=8000, env="AI_HEDGE_DEFAULT_DELAY_MS")
+    ai_hedge_min_delay_ms: int = Field(default=500, env="AI_HEDGE_MIN_DELAY_MS")
+    # Prompt budget: CV tokens sent to the CV summary prompt (the rest is trimmed, keeping head and tail)
+    ai_summary_max_cv_tokens: int = Field(default=3000, env="AI_SUMMARY_MAX_CV_TOKENS")
+    # Batched CV summaries: CVs per request and prompt tokens per request
+    ai_summary_batch_size: int = Field(default=5, env="AI_SUMMARY_BATCH_SIZE")
+    ai_summary_batch_max_input_tokens: int = Field(default=20000, env="AI_SUMMARY_BATCH_MAX_INPUT_TOKENS")
+    # CVs analysed in parallel by the interviewer step 6 background job (1 = sequential)
+    analysis_max_concurrency: int = Field(default=4, env="ANALYSIS_MAX_CONCURRENCY")
+    # Analyse the first CV on its own so the others read the shared job posting prefix from the provider's prompt cache
+    analysis_prompt_cache_warmup: bool = Field(default=False, env="ANALYSIS_PROMPT_CACHE_WARMUP")
+    # Step 5 CV ingestion pipeline: text extraction threads and parallel uploads/summaries
+    upload_extract_workers: int = Field(default=2, env="UPLOAD_EXTRACT_WORKERS")
+    upload_max_concurrency: int = Field(default=4, env="UPLOAD_MAX_CONCURRENCY")
+    
+    # Worker threads for blocking Supabase queries (database/async_client.py)
+    db_executor_workers: int = Field(default=16, env="DB_EXECUTOR_WORKERS")
+    # Multi-CV uploads/analyses (interviewer steps 5 and 6) write candidates, CVs and
+    # analyses with multi-row inserts (services/database/bulk.py), up to BATCH_SIZE rows per request
+    db_bulk_writes_enabled: bool = Field(default=True, env="DB_BULK_WRITES_ENABLED")
+    db_bulk_insert_batch_size: int = Field(default=100, env="DB_BULK_INSERT_BATCH_SIZE")
+    # Request/job-scoped entity loader (database/loader.py): get_by_id lookups made in the same
+    # event-loop tick share one `in` query per table and are memoized for the request or job
+    db_entity_loader_enabled: bool = Field(default=True, env="DB_ENTITY_LOADER_ENABLED")
+    
+    # AI response cache (content-addressed, see services/ai/response_cache.py)
+    ai_cache_enabled: bool = Field(default=True, env="AI_CACHE_ENABLED")
+    ai_cache_memory_entries: int = Field(default=256, env="AI_CACHE_MEMORY_ENTRIES")
+    ai_cache_ttl_hours: int = Field(default=168, env="AI_CACHE_TTL_HOURS")
+    ai_cache_max_persistent_entries: int = Field(default=5000, env="AI_CACHE_MAX_PERSISTENT_ENTRIES")
+    
+    # AI usage logs (write-behind to ai_usage_logs, see services/ai/usage_recorder.py)
+    ai_usage_log_enabled: bool = Field(default=True, env="AI_USAGE_LOG_ENABLED")
+    ai_usage_log_batch_size: int = Field(default=50, env="AI_USAGE_LOG_BATCH_SIZE")
+    ai_usage_log_flush_seconds: float = Field(default=5.0, env="AI_USAGE_LOG_FLUSH_SECONDS")
+    ai_usage_log_max_buffer: int = Field(default=5000, env="AI_USAGE_LOG_MAX_BUFFER")
+    ai_usage_log_max_attempts: int = Field(default=5, env="AI_USAGE_LOG_MAX_ATTEMPTS")
+
+    # app_settings cache (see services/settings_cache.py): values are fresh for the TTL,
+    # then served stale for up to STALE_SECONDS while reloading; missing/failed reads
+    # are retried after NEGATIVE_TTL; other workers' changes are picked up by checking
+    # app_settings.updated_at every VERSION_CHECK_SECONDS (0 = TTL only)
+    settings_cache_ttl_seconds: float = Field(default=60.0, env="SETTINGS_CACHE_TTL_SECONDS")
+    settings_cache_stale_seconds: float = Field(default=300.0, env="SETTINGS_CACHE_STALE_SECONDS")
+    settings_cache_negative_ttl_seconds: float = Field(default=10.0, env="SETTINGS_CACHE_NEGATIVE_TTL_SECONDS")
+    settings_cache_version_check_seconds: float = Field(default=5.0, env="SETTINGS_CACHE_VERSION_CHECK_SECONDS")
+
+    # Prompt registry (see services/ai/prompt_registry.py): active default prompts are
+    # kept in memory, reloaded when ai_prompts.updated_at changes (checked every
+    # VERSION_CHECK_SECONDS) or after REFRESH_SECONDS; a failed load is retried after
+    # RETRY_SECONDS; usage counts are written every USAGE_FLUSH_SECONDS
+    prompt_cache_refresh_seconds: float = Field(default=300.0, env="PROMPT_CACHE_REFRESH_SECONDS")
+    prompt_cache_version_check_seconds: float = Field(default=5.0, env="PROMPT_CACHE_VERSION_CHECK_SECONDS")
+    prompt_cache_retry_seconds: float = Field(default=10.0, env="PROMPT_CACHE_RETRY_SECONDS")
+    prompt_usage_flush_seconds: float = Field(default=30.0, env="PROMPT_USAGE_FLUSH_SECONDS")
+
+    # Metrics exposed at /api/metrics in Prometheus text format (see services/metrics)
+    metrics_enabled: bool = Field(default=True, env="METRICS_ENABLED")
+    # Scrape token: /api/metrics is only served when set, and requires "Authorization: Bearer <token>"
+    metrics_token: Optional[str] = Field(default=None, env="METRICS_TOKEN")
     
     # Search API
     brave_search_api_key: Optional[str] = Field(default=None, env="BRAVE_SEARCH_API_KEY")
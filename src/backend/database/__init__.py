@@ -5,9 +5,24 @@ Provides database connection, models, and migrations.
 """
 
 from .connection import get_supabase_client, check_database_connection
+from .async_client import get_async_supabase_client, run_db
+from .loader import (
+    EntityLoader,
+    get_entity_loader,
+    forget_entity,
+    entity_loader_scope,
+    with_entity_loader,
+)
 
 __all__ = [
     "get_supabase_client",
+    "get_async_supabase_client",
+    "run_db",
+    "EntityLoader",
+    "get_entity_loader",
+    "forget_entity",
+    "entity_loader_scope",
+    "with_entity_loader",
     "check_database_connection",
 ]
 
@@ -0,0 +1,119 @@
+"""
+Non-blocking access to the Supabase client.
+
+supabase-py's client is synchronous: execute() blocks until PostgREST
+answers, which used to stall the event loop for every query made from an
+async service method. Services use get_async_supabase_client() instead:
+queries are built exactly as with the regular client, but execute() is
+awaited and runs on a dedicated, bounded thread pool (DB_EXECUTOR_WORKERS).
+The threads share the client's pooled HTTP connections, so concurrent
+requests overlap their database latency instead of serializing.
+
+Storage and auth calls pass straight through to the regular client.
+"""
+
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+from config import settings
+from .connection import get_supabase_client
+
+# Dedicated, bounded executor for blocking database calls.
+# Keeps queries off the event loop without exhausting the default pool.
+_db_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_db_executor() -> ThreadPoolExecutor:
+    """Get (or lazily create) the shared database executor."""
+    global _db_executor
+    if _db_executor is None:
+        _db_executor = ThreadPoolExecutor(
+            max_workers=settings.db_executor_workers,
+            thread_name_prefix="db",
+        )
+    return _db_executor
+
+
+async def run_db(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a blocking database call on the database executor.
+
+    Args:
+        func: Blocking callable (e.g. a query builder's execute)
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Whatever func returns (its exceptions are raised here)
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(_get_db_executor(), partial(context.run, func, *args, **kwargs))
+
+
+class _AsyncQuery:
+    """Proxy for a PostgREST request builder whose execute() is awaitable."""
+
+    __slots__ = ("_builder",)
+
+    def __init__(self, builder: Any):
+        self._builder = builder
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._builder, name)
+        if not callable(attr):
+            # e.g. the .not_ filter modifier returns a builder as a property
+            return self._wrap(attr)
+
+        def call(*args, **kwargs):
+            return self._wrap(attr(*args, **kwargs))
+        return call
+
+    @staticmethod
+    def _wrap(result: Any) -> Any:
+        if hasattr(result, "execute") and not isinstance(result, _AsyncQuery):
+            return _AsyncQuery(result)
+        return result
+
+    async def execute(self, *args, **kwargs):
+        return await run_db(self._builder.execute, *args, **kwargs)
+
+
+class AsyncSupabaseClient:
+    """Supabase client wrapper whose table()/from_()/rpc() queries are awaited."""
+
+    def __init__(self, client: Any):
+        self._client = client
+
+    def table(self, table_name: str) -> _AsyncQuery:
+        return _AsyncQuery(self._client.table(table_name))
+
+    def from_(self, table_name: str) -> _AsyncQuery:
+        return _AsyncQuery(self._client.from_(table_name))
+
+    def rpc(self, fn: str, *args, **kwargs) -> _AsyncQuery:
+        return _AsyncQuery(self._client.rpc(fn, *args, **kwargs))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+
+# Global async client instance
+_async_supabase_client: Optional[AsyncSupabaseClient] = None
+
+
+def get_async_supabase_client() -> AsyncSupabaseClient:
+    """
+    Get the async wrapper around the Supabase client.
+
+    Returns:
+        AsyncSupabaseClient for the current Supabase client
+    """
+    global _async_supabase_client
+    client = get_supabase_client()
+    if _async_supabase_client is None or _async_supabase_client._client is not client:
+        _async_supabase_client = AsyncSupabaseClient(client)
+    return _async_supabase_client
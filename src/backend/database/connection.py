@@ -73,6 +73,12 @@ def get_supabase_client() -> Client:
         key_preview = supabase_key[:8] + "..." if supabase_key else "(empty)"
         print(f"[Supabase] Connecting to {supabase_url} with key prefix: {key_preview} (length: {len(supabase_key)})")
         _supabase_client = create_client(supabase_url, supabase_key)
+        
+        from config import settings
+        if settings.metrics_enabled:
+            # Record query latency per service/table for /api/metrics
+            from .instrumentation import InstrumentedClient
+            _supabase_client = InstrumentedClient(_supabase_client)
     
     return _supabase_client
 
@@ -84,10 +90,12 @@ async def check_database_connection() -> bool:
     Returns:
         True if connection is healthy, False otherwise
     """
+    from .async_client import get_async_supabase_client
+    
     try:
-        client = get_supabase_client()
+        client = get_async_supabase_client()
         # Simple query to verify connection
-        result = client.table("candidates").select("id").limit(1).execute()
+        result = await client.table("candidates").select("id").limit(1).execute()
         return True
     except Exception as e:
         print(f"Database connection check failed: {e}")
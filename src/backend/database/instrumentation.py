@@ -0,0 +1,94 @@
+"""
+Query timing for the Supabase client.
+
+get_supabase_client() wraps the client so every PostgREST query built from
+client.table()/from_()/rpc() records its latency on execute(), labelled with
+the calling module (service), table (or RPC function) and operation. The
+wrappers only forward attribute access, so existing query code is
+unchanged; storage and auth calls pass straight through.
+"""
+
+import sys
+import time
+from typing import Any, Optional
+
+from services.metrics import record_db_query
+
+# Builder methods that determine a query's operation label
+_OPERATIONS = frozenset({"select", "insert", "update", "upsert", "delete"})
+
+# Client wrappers whose frames are skipped when labelling the calling service
+_WRAPPER_MODULES = frozenset({"database.async_client"})
+
+
+class _TimedQuery:
+    """Proxy for a PostgREST request builder that times execute()."""
+
+    __slots__ = ("_builder", "_service", "_table", "_operation")
+
+    def __init__(self, builder: Any, service: str, table: str, operation: Optional[str] = None):
+        self._builder = builder
+        self._service = service
+        self._table = table
+        self._operation = operation
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._builder, name)
+        if not callable(attr):
+            # e.g. the .not_ filter modifier returns a builder as a property
+            return self._wrap(attr, self._operation)
+        operation = self._operation or (name if name in _OPERATIONS else None)
+
+        def call(*args, **kwargs):
+            return self._wrap(attr(*args, **kwargs), operation)
+        return call
+
+    def _wrap(self, result: Any, operation: Optional[str]) -> Any:
+        if hasattr(result, "execute") and not isinstance(result, _TimedQuery):
+            return _TimedQuery(result, self._service, self._table, operation)
+        return result
+
+    def execute(self, *args, **kwargs):
+        started = time.perf_counter()
+        success = False
+        try:
+            result = self._builder.execute(*args, **kwargs)
+            success = True
+            return result
+        finally:
+            record_db_query(
+                self._service,
+                self._table,
+                self._operation or "select",
+                time.perf_counter() - started,
+                success,
+            )
+
+
+class InstrumentedClient:
+    """Supabase client wrapper recording query latency per service/table."""
+
+    def __init__(self, client: Any):
+        self._client = client
+
+    @staticmethod
+    def _caller_service() -> str:
+        # Two frames up: the code that called table()/rpc() on the client,
+        # or on the async wrapper around it (database/async_client.py)
+        frame = sys._getframe(2)
+        while frame.f_back is not None and frame.f_globals.get("__name__") in _WRAPPER_MODULES:
+            frame = frame.f_back
+        module = frame.f_globals.get("__name__", "")
+        return module.rsplit(".", 1)[-1] or "unknown"
+
+    def table(self, table_name: str) -> _TimedQuery:
+        return _TimedQuery(self._client.table(table_name), self._caller_service(), table_name)
+
+    def from_(self, table_name: str) -> _TimedQuery:
+        return _TimedQuery(self._client.from_(table_name), self._caller_service(), table_name)
+
+    def rpc(self, fn: str, *args, **kwargs) -> _TimedQuery:
+        return _TimedQuery(self._client.rpc(fn, *args, **kwargs), self._caller_service(), fn, "rpc")
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
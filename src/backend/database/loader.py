@@ -0,0 +1,210 @@
+"""
+Request- and job-scoped batching of get-by-id lookups (the DataLoader pattern).
+
+Handlers and background jobs often fetch the same candidate, CV or job
+posting several times, and fetch many of them one by one. Inside a scope
+(every HTTP request, see main.py, and every background job decorated with
+with_entity_loader) the services' get_by_id methods go through an
+EntityLoader instead:
+- lookups of one table made in the same event-loop tick are fetched with a
+  single `id in (...)` query;
+- fetched rows (and ids that don't exist) are memoized until the scope ends,
+  so repeated lookups don't query again. Services forget a row when they
+  update it (forget_entity).
+
+Outside a scope, or with DB_ENTITY_LOADER_ENABLED=false, get_by_id queries
+as before.
+"""
+
+import asyncio
+import contextvars
+import functools
+import logging
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Set
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Ids per `in (...)` query (keeps the request URL short); also used by the batch getters in services/database
+MAX_IDS_PER_QUERY = 100
+
+_current_loader: contextvars.ContextVar[Optional["EntityLoader"]] = contextvars.ContextVar(
+    "entity_loader", default=None
+)
+
+
+class EntityLoader:
+    """Coalesces and memoizes get-by-id lookups for one request or job."""
+
+    def __init__(self):
+        # table -> id -> row (None for ids that don't exist)
+        self._rows: Dict[str, Dict[str, Optional[Dict[str, Any]]]] = {}
+        # table -> id -> future of a lookup waiting for the next batch
+        self._pending: Dict[str, Dict[str, asyncio.Future]] = {}
+        self._queries: Dict[str, Callable[[], Any]] = {}
+        # Bumped by forget() so a batch that started before it doesn't memoize old rows
+        self._generations: Dict[str, int] = {}
+        self._dispatch_scheduled = False
+        self._tasks: Set[asyncio.Task] = set()
+        self._stats = {"loads": 0, "hits": 0, "queries": 0}
+
+    async def load(self, table: str, entity_id: Any, query: Callable[[], Any]) -> Optional[Dict[str, Any]]:
+        """
+        Get a row by id, batched with the other lookups of this tick.
+
+        Args:
+            table: Table name
+            entity_id: Row id
+            query: Returns a fresh query builder for the table, e.g.
+                lambda: self.client.table(self.table) (called from the
+                service module so query metrics keep the service's label)
+
+        Returns:
+            Copy of the row (callers may modify it) or None if there is no
+            row with that id
+
+        Raises:
+            Exception: If the batch query fails (nothing is memoized then)
+        """
+        key = str(entity_id)
+        self._stats["loads"] += 1
+        rows = self._rows.get(table)
+        if rows is not None and key in rows:
+            self._stats["hits"] += 1
+            return _copy(rows[key])
+
+        pending = self._pending.setdefault(table, {})
+        future = pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            pending[key] = future
+            self._queries.setdefault(table, query)
+            if not self._dispatch_scheduled:
+                self._dispatch_scheduled = True
+                loop.call_soon(self._dispatch)
+        else:
+            self._stats["hits"] += 1
+        # Shielded: a cancelled caller must not cancel the lookup for the others
+        return _copy(await asyncio.shield(future))
+
+    def forget(self, table: str, entity_id: Any = None):
+        """
+        Drop memoized rows (call after updating them).
+
+        Args:
+            table: Table name
+            entity_id: Row id, or None for every row of the table
+        """
+        self._generations[table] = self._generations.get(table, 0) + 1
+        if entity_id is None:
+            self._rows.pop(table, None)
+        else:
+            self._rows.get(table, {}).pop(str(entity_id), None)
+
+    def _dispatch(self):
+        """Start one batch query per table for the lookups collected this tick."""
+        self._dispatch_scheduled = False
+        batches, self._pending = self._pending, {}
+        for table, futures in batches.items():
+            task = asyncio.get_running_loop().create_task(
+                self._fetch(table, futures, self._queries.pop(table))
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _fetch(self, table: str, futures: Dict[str, asyncio.Future], query: Callable[[], Any]):
+        generation = self._generations.get(table, 0)
+        ids = list(futures)
+        found: Dict[str, Dict[str, Any]] = {}
+        try:
+            for start in range(0, len(ids), MAX_IDS_PER_QUERY):
+                chunk = ids[start:start + MAX_IDS_PER_QUERY]
+                self._stats["queries"] += 1
+                result = await query().select("*").in_("id", chunk).execute()
+                for row in result.data or []:
+                    found[str(row["id"])] = row
+        except Exception as e:
+            if len(ids) == 1:
+                future = futures[ids[0]]
+                if not future.done():
+                    future.set_exception(e)
+                return
+            # One malformed id fails the whole query: look the ids up one by one
+            logger.warning(f"Batched lookup of {len(ids)} {table} row(s) failed, retrying one by one: {e}")
+            await asyncio.gather(*(
+                self._fetch(table, {key: future}, query) for key, future in futures.items()
+            ))
+            return
+
+        if generation == self._generations.get(table, 0):
+            self._rows.setdefault(table, {}).update({key: found.get(key) for key in ids})
+        for key, future in futures.items():
+            if not future.done():
+                future.set_result(found.get(key))
+
+    def stats(self) -> Dict[str, int]:
+        """Return loader counters (loads, memoized/coalesced hits, queries)."""
+        return dict(self._stats)
+
+
+def _copy(row: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    return dict(row) if row is not None else None
+
+
+def get_entity_loader() -> Optional[EntityLoader]:
+    """
+    Get the loader of the current request or job.
+
+    Returns:
+        EntityLoader, or None outside a scope
+    """
+    return _current_loader.get()
+
+
+def forget_entity(table: str, entity_id: Any = None):
+    """
+    Drop a row from the current scope's loader, if any (call after updating it).
+
+    Args:
+        table: Table name
+        entity_id: Row id, or None for every row of the table
+    """
+    loader = _current_loader.get()
+    if loader is not None:
+        loader.forget(table, entity_id)
+
+
+@contextmanager
+def entity_loader_scope() -> Iterator[Optional[EntityLoader]]:
+    """
+    Run the enclosed code with a fresh loader.
+
+    Yields:
+        The scope's EntityLoader, or None if DB_ENTITY_LOADER_ENABLED is off
+    """
+    if not settings.db_entity_loader_enabled:
+        yield None
+        return
+    loader = EntityLoader()
+    token = _current_loader.set(loader)
+    try:
+        yield loader
+    finally:
+        _current_loader.reset(token)
+
+
+def with_entity_loader(func):
+    """
+    Decorator giving an async background job its own loader.
+
+    Jobs started with asyncio.create_task inherit the request's context; a
+    fresh scope keeps them from reusing rows memoized by the request.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        with entity_loader_scope():
+            return await func(*args, **kwargs)
+    return wrapper
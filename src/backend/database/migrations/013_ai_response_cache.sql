@@ -0,0 +1,33 @@
+-- Migration 013: AI Response Cache
+-- Created: 2026-10-16
+-- Purpose: Persistent tier of the content-addressed AI response cache.
+-- Rows are keyed by a SHA-256 of prompt_type, fully built prompt, provider/model
+-- and generation params, so identical CV/job posting analyses are not re-billed.
+
+CREATE TABLE IF NOT EXISTS ai_response_cache (
+    cache_key TEXT PRIMARY KEY,
+
+    -- What produced the cached response (for admin inspection and purging)
+    prompt_type TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    model TEXT,
+
+    -- Serialized AIResponse (data, raw_text, tokens, cost of the original call)
+    response JSONB NOT NULL,
+
+    -- Timestamps
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_ai_response_cache_expires_at ON ai_response_cache(expires_at);
+CREATE INDEX IF NOT EXISTS idx_ai_response_cache_created_at ON ai_response_cache(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_ai_response_cache_prompt_type ON ai_response_cache(prompt_type);
+
+-- Enable RLS (backend uses the service role)
+ALTER TABLE ai_response_cache ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Service role can manage AI response cache" ON ai_response_cache
+    FOR ALL USING (auth.role() = 'service_role');
+
+COMMENT ON TABLE ai_response_cache IS 'Content-addressed cache of AI responses (persistent tier, TTL and size bounded)';
@@ -0,0 +1,18 @@
+-- Migration 014: AI usage log cache/hedge columns
+-- Created: 2026-10-16
+-- Purpose: ai_usage_logs is now written (in batches) for every AI call made
+-- through the AI manager. Record whether the response came from the response
+-- cache, whether a hedge call was fired, and how many input tokens were read
+-- from the provider's prompt cache.
+
+ALTER TABLE ai_usage_logs
+ADD COLUMN IF NOT EXISTS cache_hit BOOLEAN NOT NULL DEFAULT FALSE;
+
+ALTER TABLE ai_usage_logs
+ADD COLUMN IF NOT EXISTS hedged BOOLEAN NOT NULL DEFAULT FALSE;
+
+ALTER TABLE ai_usage_logs
+ADD COLUMN IF NOT EXISTS cached_input_tokens INTEGER;
+
+-- Admin cost views group by model over a time range
+CREATE INDEX IF NOT EXISTS idx_ai_usage_logs_model_created_at ON ai_usage_logs(model_name, created_at DESC);
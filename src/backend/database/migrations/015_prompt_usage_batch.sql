@@ -0,0 +1,40 @@
+-- Migration 015: Batched prompt usage counters
+-- Created: 2026-10-17
+-- Purpose: Prompts are served from an in-process registry
+-- (services/ai/prompt_registry.py) that counts uses in memory and flushes
+-- them periodically. Add a function that applies many counts in one call,
+-- and stop usage updates from bumping updated_at, which the registry uses
+-- to detect prompt edits made by other workers.
+
+CREATE OR REPLACE FUNCTION increment_prompt_usage_batch(usage JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+    updated_rows INTEGER;
+BEGIN
+    -- usage: {"<prompt id>": <number of uses>, ...}
+    UPDATE ai_prompts AS p
+    SET usage_count = COALESCE(p.usage_count, 0) + u.value::INTEGER,
+        last_used_at = NOW()
+    FROM jsonb_each_text(usage) AS u
+    WHERE p.id = u.key::UUID;
+
+    GET DIAGNOSTICS updated_rows = ROW_COUNT;
+    RETURN updated_rows;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION update_ai_prompts_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- Usage counters are not edits
+    IF (to_jsonb(NEW) - 'usage_count' - 'last_used_at' - 'updated_at')
+        = (to_jsonb(OLD) - 'usage_count' - 'last_used_at' - 'updated_at') THEN
+        RETURN NEW;
+    END IF;
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- The registry reads the newest updated_at on every version check
+CREATE INDEX IF NOT EXISTS idx_ai_prompts_updated_at ON ai_prompts(updated_at DESC);
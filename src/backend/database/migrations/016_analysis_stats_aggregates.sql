@@ -0,0 +1,66 @@
+-- Migration 016: Server-side aggregates for admin dashboard statistics
+-- Created: 2026-10-17
+-- Purpose: The admin dashboard (GET /api/admin/dashboard/detailed-stats) and
+-- AnalysisService.count_by_provider / count_by_language used to read every
+-- row of analyses and count in Python. These functions group in the database
+-- and return one row per group.
+
+-- One row per (provider, model):
+--   calls          number of analyses
+--   persisted_cost sum of the stored cost of each analysis: total_cost, or
+--                  input_cost + output_cost when total_cost is missing or 0
+--   token_calls    analyses without a stored cost but with both token counts
+--                  (the backend prices these from the token sums)
+--   input_tokens / output_tokens  token sums of those token_calls analyses
+CREATE OR REPLACE FUNCTION analysis_provider_stats()
+RETURNS TABLE (
+    provider TEXT,
+    model TEXT,
+    calls BIGINT,
+    persisted_cost NUMERIC,
+    token_calls BIGINT,
+    input_tokens BIGINT,
+    output_tokens BIGINT
+) AS $$
+    WITH costed AS (
+        SELECT
+            a.provider,
+            a.model,
+            a.input_tokens,
+            a.output_tokens,
+            CASE
+                WHEN COALESCE(a.total_cost, 0) <> 0 THEN a.total_cost
+                WHEN a.input_cost IS NOT NULL AND a.output_cost IS NOT NULL
+                    THEN a.input_cost + a.output_cost
+                ELSE 0
+            END AS cost
+        FROM analyses AS a
+    )
+    SELECT
+        c.provider,
+        c.model,
+        COUNT(*) AS calls,
+        COALESCE(SUM(c.cost), 0) AS persisted_cost,
+        COUNT(*) FILTER (
+            WHERE c.cost = 0 AND c.input_tokens IS NOT NULL AND c.output_tokens IS NOT NULL
+        ) AS token_calls,
+        COALESCE(SUM(c.input_tokens) FILTER (
+            WHERE c.cost = 0 AND c.input_tokens IS NOT NULL AND c.output_tokens IS NOT NULL
+        ), 0) AS input_tokens,
+        COALESCE(SUM(c.output_tokens) FILTER (
+            WHERE c.cost = 0 AND c.input_tokens IS NOT NULL AND c.output_tokens IS NOT NULL
+        ), 0) AS output_tokens
+    FROM costed AS c
+    GROUP BY c.provider, c.model;
+$$ LANGUAGE sql STABLE;
+
+-- One row per language: number of analyses
+CREATE OR REPLACE FUNCTION analysis_language_counts()
+RETURNS TABLE (
+    language TEXT,
+    calls BIGINT
+) AS $$
+    SELECT a.language, COUNT(*) AS calls
+    FROM analyses AS a
+    GROUP BY a.language;
+$$ LANGUAGE sql STABLE;
@@ -5,6 +5,7 @@ This module initializes the FastAPI app with all necessary middleware,
 routers, and configuration for the CV analysis platform.
 """
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -28,6 +29,34 @@ for logger_name in ['services.ai_analysis', 'services.ai.gemini_provider', 'serv
 # Get logger for this module
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan: open and close shared resources.
+    
+    Pooled HTTP clients for upstream APIs live for the whole process; prompts
+    are loaded into memory at startup; buffered AI usage logs and prompt usage
+    counts are flushed before shutdown.
+    """
+    from services.http_client import get_http_client_registry
+    from services.ai.usage_recorder import get_ai_usage_recorder
+    from services.ai.prompt_registry import get_prompt_registry
+    
+    http_clients = get_http_client_registry()
+    http_clients.open()
+    usage_recorder = get_ai_usage_recorder()
+    usage_recorder.start()
+    prompt_registry = get_prompt_registry()
+    prompt_registry.start()
+    try:
+        yield
+    finally:
+        await prompt_registry.close()
+        await usage_recorder.close()
+        await http_clients.close()
+
+
 # Create FastAPI app instance
 app = FastAPI(
     title="CV Analysis Platform API",
@@ -35,6 +64,7 @@ app = FastAPI(
     version="0.1.0",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
+    lifespan=lifespan,
 )
 
 # CORS middleware configuration
@@ -77,6 +107,15 @@ async def rate_limit_middleware(request: Request, call_next):
     return response
 
 
+@app.middleware("http")
+async def entity_loader_middleware(request: Request, call_next):
+    """Give each request its own entity loader (batched, memoized get_by_id lookups)."""
+    from database import entity_loader_scope
+    
+    with entity_loader_scope():
+        return await call_next(request)
+
+
 @app.get("/")
 async def root():
     """
@@ -152,7 +191,7 @@ async def health_check():
 
 
 # Import routers
-from routers import interviewer, candidate, admin, enrichment, prompts, chatbot, profiles
+from routers import interviewer, candidate, admin, enrichment, prompts, chatbot, profiles, metrics
 
 # Register routers
 app.include_router(interviewer.router, prefix="/api")
@@ -162,6 +201,7 @@ app.include_router(profiles.router, prefix="/api")
 app.include_router(enrichment.router)
 app.include_router(admin.router, prefix="/api")
 app.include_router(prompts.router)  # Admin prompts management
+app.include_router(metrics.router, prefix="/api")  # Prometheus metrics
 
 # TODO: Add additional routers:
 # - Admin translation management
@@ -9,6 +9,8 @@ from typing import Dict, Optional
 from datetime import datetime, timedelta
 import logging
 
+from services.metrics.collectors import RATE_LIMIT_EVENTS
+
 logger = logging.getLogger(__name__)
 
 
@@ -82,6 +84,8 @@ class RateLimiter:
         # Check if limit exceeded
         if len(self.requests[client_ip]) >= self.requests_per_minute:
             logger.warning(f"Rate limit exceeded for IP: {client_ip}")
+            # Label by flow (e.g. /api/interviewer), not the full path with session ids
+            RATE_LIMIT_EVENTS.inc("http", "/".join(request.url.path.split("/")[:3]), "rejected")
             raise HTTPException(
                 status_code=429,
                 detail=f"Rate limit exceeded. Maximum {self.requests_per_minute} requests per minute."
@@ -5,12 +5,14 @@ Handles admin authentication and data management using Supabase native authentic
 Admin users are managed in Supabase Auth with role in user_metadata.
 """
 
-from fastapi import APIRouter, HTTPException, Depends, Header, Request, Body
+from fastapi import APIRouter, HTTPException, Depends, Header, Request, Body, Query
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, EmailStr
 from typing import Optional, Dict, Any
 import logging
 
+from database import run_db
+
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -99,7 +101,7 @@ async def get_current_admin(authorization: Optional[str] = Header(None)):
         
         for attempt in range(max_retries):
             try:
-                user_response = auth_client.auth.get_user(token)
+                user_response = await run_db(auth_client.auth.get_user, token)
                 break  # Success, exit retry loop
             except Exception as auth_error:
                 error_str = str(auth_error)
@@ -212,7 +214,7 @@ async def admin_login(credentials: AdminLogin, request: Request):
         
         for attempt in range(max_retries):
             try:
-                auth_response = auth_client.auth.sign_in_with_password({
+                auth_response = await run_db(auth_client.auth.sign_in_with_password, {
                     "email": credentials.email,
                     "password": credentials.password
                 })
@@ -367,74 +369,46 @@ async def get_detailed_stats(admin=Depends(get_current_admin)):
         
         # Get provider distribution with real costs
         logger.info("Getting provider distribution with costs...")
-        client = analysis_service.client
-        table = analysis_service.table
-        
-        # Get provider stats with costs from database
-        provider_stats_query = client.table(table)\
-            .select("provider, total_cost, input_cost, output_cost, model, input_tokens, output_tokens")\
-            .execute()
+        # Aggregated by (provider, model) in the database
+        provider_groups = await analysis_service.get_provider_stats()
         
         provider_stats = {}
-        total_rows = len(provider_stats_query.data or [])
-        rows_with_cost = 0
+        total_rows = sum(group["calls"] for group in provider_groups)
         rows_calculated = 0
         
         # Import cost calculator for dynamic calculation
         from utils.cost_calculator import calculate_cost_from_tokens
         
-        for row in (provider_stats_query.data or []):
-            provider = row.get("provider", "unknown")
+        for group in provider_groups:
+            provider = group["provider"]
             if provider not in ["unknown", "error", "timeout"]:
                 if provider not in provider_stats:
                     provider_stats[provider] = {"calls": 0, "cost": 0.0}
-                provider_stats[provider]["calls"] += 1
+                provider_stats[provider]["calls"] += group["calls"]
                 
-                cost_to_add = 0.0
+                # Stored costs (total_cost, else input_cost + output_cost)
+                cost_to_add = group["persisted_cost"]
                 
-                # Try total_cost first
-                total_cost = row.get("total_cost")
-                if total_cost is not None:
+                # Analyses without a stored cost: calculate from the token sums
+                # (pricing is linear in tokens, flat prices are charged per call)
+                token_calls = group["token_calls"]
+                if token_calls:
                     try:
-                        cost_to_add = float(total_cost)
-                        rows_with_cost += 1
-                    except (ValueError, TypeError):
-                        pass
-                
-                # Fallback 1: calculate from input_cost + output_cost if available
-                if cost_to_add == 0.0:
-                    input_cost = row.get("input_cost")
-                    output_cost = row.get("output_cost")
-                    if input_cost is not None and output_cost is not None:
-                        try:
-                            cost_to_add = float(input_cost) + float(output_cost)
-                            rows_with_cost += 1
-                        except (ValueError, TypeError):
-                            pass
-                
-                # Fallback 2: calculate from tokens if available
-                if cost_to_add == 0.0:
-                    input_tokens = row.get("input_tokens")
-                    output_tokens = row.get("output_tokens")
-                    model = row.get("model")
-                    if input_tokens is not None and output_tokens is not None:
-                        try:
-                            # Calculate cost dynamically from tokens
-                            cost_breakdown = await calculate_cost_from_tokens(
-                                provider=provider,
-                                model=model,
-                                input_tokens=input_tokens,
-                                output_tokens=output_tokens
-                            )
-                            cost_to_add = cost_breakdown["total_cost"]
-                            rows_calculated += 1
-                        except Exception as e:
-                            logger.warning(f"Error calculating cost for {provider}/{model}: {e}")
-                            pass
+                        cost_breakdown = await calculate_cost_from_tokens(
+                            provider=provider,
+                            model=group["model"],
+                            input_tokens=group["input_tokens"],
+                            output_tokens=group["output_tokens"],
+                            calls=token_calls
+                        )
+                        cost_to_add += cost_breakdown["total_cost"]
+                        rows_calculated += token_calls
+                    except Exception as e:
+                        logger.warning(f"Error calculating cost for {provider}/{group['model']}: {e}")
                 
                 provider_stats[provider]["cost"] += cost_to_add
         
-        logger.info(f"Provider stats calculation: {total_rows} total rows, {rows_with_cost} with persisted cost, {rows_calculated} calculated from tokens")
+        logger.info(f"Provider stats calculation: {total_rows} total rows in {len(provider_groups)} provider/model group(s), {rows_calculated} calculated from tokens")
         
         # Ensure all providers are present (even with 0) and round costs
         providers = {
@@ -614,7 +588,7 @@ async def download_cv(
                 raise HTTPException(status_code=400, detail=f"Invalid CV file URL format: {file_url}")
         
         # Generate signed URL
-        signed_url = storage_service.get_signed_url(bucket_name, file_path, expires_in=3600)
+        signed_url = await run_db(storage_service.get_signed_url, bucket_name, file_path, expires_in=3600)
         
         if not signed_url:
             raise HTTPException(status_code=500, detail="Failed to generate download URL")
@@ -762,14 +736,14 @@ async def get_ai_usage_logs(
         # Get total count with filters
         count_query = client.table(table).select("id", count="exact")
         count_query = apply_filters(count_query)
-        count_result = count_query.execute()
+        count_result = await count_query.execute()
         total = count_result.count or 0
         
         # Get paginated results with filters
         data_query = client.table(table).select("*")
         data_query = apply_filters(data_query)
         data_query = data_query.order("created_at", desc=True).range(offset, offset + limit - 1)
-        result = data_query.execute()
+        result = await data_query.execute()
         
         logs = result.data or []
         
@@ -918,12 +892,12 @@ async def list_companies(
 @router.get("/settings/default-ai-provider")
 async def get_default_ai_provider(admin=Depends(get_current_admin)):
     """Get the default AI provider fallback chain."""
-    from database import get_supabase_client
+    from database import get_async_supabase_client
     import json
     
     try:
-        client = get_supabase_client()
-        result = client.table("app_settings").select("*").eq("setting_key", "default_ai_provider").execute()
+        client = get_async_supabase_client()
+        result = await client.table("app_settings").select("*").eq("setting_key", "default_ai_provider").execute()
         
         if result.data and len(result.data) > 0:
             setting_value = result.data[0]["setting_value"]
@@ -970,7 +944,7 @@ async def update_default_ai_provider(
         ...
     ]
     """
-    from database import get_supabase_client
+    from database import get_async_supabase_client
     import json
     
     # Validate fallback chain
@@ -1003,10 +977,10 @@ async def update_default_ai_provider(
     fallback_chain = sorted(fallback_chain, key=lambda x: x.get("order", 999))
     
     try:
-        client = get_supabase_client()
+        client = get_async_supabase_client()
         
         # Check if setting exists
-        existing = client.table("app_settings").select("*").eq("setting_key", "default_ai_provider").execute()
+        existing = await client.table("app_settings").select("*").eq("setting_key", "default_ai_provider").execute()
         
         logger.info(f"Checking existing setting: found {len(existing.data) if existing.data else 0} record(s)")
         
@@ -1024,14 +998,19 @@ async def update_default_ai_provider(
                 "description": f"AI provider fallback chain with {len(fallback_chain)} provider(s)"
             }
             logger.info("Updating existing setting")
-            result = client.table("app_settings").update(update_data).eq("setting_key", "default_ai_provider").execute()
+            result = await client.table("app_settings").update(update_data).eq("setting_key", "default_ai_provider").execute()
         else:
             # Insert new
             logger.info("Inserting new setting")
-            result = client.table("app_settings").insert(setting_data).execute()
+            result = await client.table("app_settings").insert(setting_data).execute()
         
         logger.info(f"Default AI provider fallback chain updated by {admin['email']}: {json.dumps(fallback_chain)}")
-        
+
+        # Drop cached chain and pooled provider instances so the change applies immediately
+        # in this worker; other workers see the new updated_at via the settings cache
+        from services.ai import get_ai_manager
+        get_ai_manager().invalidate_fallback_chain()
+
         return JSONResponse({
             "success": True,
             "fallback_chain": fallback_chain,
@@ -1042,6 +1021,100 @@ async def update_default_ai_provider(
         raise HTTPException(status_code=500, detail=f"Error updating default AI provider: {str(e)}")
 
 
+@router.get("/settings/ai-cache")
+async def get_ai_cache_settings(admin=Depends(get_current_admin)):
+    """Get AI response cache status and hit/miss statistics."""
+    from services.ai.response_cache import get_ai_response_cache
+    from services.settings_cache import AI_CACHE_ENABLED_KEY, get_app_settings_cache
+
+    cache = get_ai_response_cache()
+    enabled = await get_app_settings_cache().get_bool(AI_CACHE_ENABLED_KEY, cache.enabled)
+    return JSONResponse({**cache.stats(), "enabled": enabled})
+
+
+@router.put("/settings/ai-cache")
+async def update_ai_cache_settings(
+    enabled: bool = Body(..., embed=True),
+    admin=Depends(get_current_admin)
+):
+    """Enable or bypass the AI response cache (stored in app_settings, applies to all workers)."""
+    from services.ai.response_cache import get_ai_response_cache
+    from services.database.app_settings_service import get_app_settings_service
+    from services.settings_cache import AI_CACHE_ENABLED_KEY, get_app_settings_cache
+
+    try:
+        await get_app_settings_service().set(
+            AI_CACHE_ENABLED_KEY,
+            "true" if enabled else "false",
+            "AI response cache enabled (false = bypass)"
+        )
+    except Exception as e:
+        logger.error(f"Error updating AI cache setting: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error updating AI cache setting: {str(e)}")
+    get_app_settings_cache().invalidate(AI_CACHE_ENABLED_KEY)
+
+    cache = get_ai_response_cache()
+    cache.enabled = enabled
+    logger.info(f"AI response cache {'enabled' if enabled else 'bypassed'} by {admin['email']}")
+
+    return JSONResponse({
+        "success": True,
+        **cache.stats()
+    })
+
+
+@router.delete("/settings/ai-cache")
+async def purge_ai_cache(admin=Depends(get_current_admin)):
+    """Purge all cached AI responses (memory and database tiers)."""
+    from services.ai.response_cache import get_ai_response_cache
+
+    try:
+        removed = await get_ai_response_cache().purge()
+        logger.info(f"AI response cache purged by {admin['email']}: {removed}")
+        return JSONResponse({
+            "success": True,
+            "removed": removed
+        })
+    except Exception as e:
+        logger.error(f"Error purging AI response cache: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Error purging AI response cache")
+
+
+@router.get("/settings/ai-health")
+async def get_ai_health(admin=Depends(get_current_admin)):
+    """
+    Get AI provider health for this worker.
+    
+    Per (provider, model): success rate, p50/p95 latency, recent 429/5xx
+    counts and circuit breaker state, plus rate limiter budgets.
+    """
+    from services.ai.health import get_provider_health_tracker
+    from services.ai.rate_limiter import get_rate_limit_scheduler
+
+    return JSONResponse({
+        "health": get_provider_health_tracker().stats(),
+        "rate_limits": get_rate_limit_scheduler().stats()
+    })
+
+
+@router.delete("/settings/ai-health")
+async def reset_ai_health(
+    provider: Optional[str] = Query(default=None),
+    model: Optional[str] = Query(default=None),
+    admin=Depends(get_current_admin)
+):
+    """Reset health stats and close circuits (all, one provider, or one provider/model)."""
+    from services.ai.health import get_provider_health_tracker
+
+    reset = get_provider_health_tracker().reset(provider, model if provider else None)
+    logger.info(f"AI provider health reset by {admin['email']}: provider={provider}, model={model}, entries={reset}")
+
+    return JSONResponse({
+        "success": True,
+        "reset": reset
+    })
+
+
 @router.get("/settings/available-providers")
 async def get_available_providers(admin=Depends(get_current_admin)):
     """Get list of available AI providers based on configured API keys."""
@@ -1074,7 +1147,7 @@ async def list_provider_models(
     """List available models for a specific provider with their token limits."""
     from services.ai.model_limits import get_max_output_tokens, get_context_window
     from config import settings
-    import httpx
+    from services.http_client import get_http_client_registry
     
     models = []
     
@@ -1114,13 +1187,15 @@ async def list_provider_models(
                     })
         
         elif provider_name == "kimi" and settings.kimi_api_key:
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            kimi_models_url = "https://kimi-k2.ai/api/v1/models"
+            async with get_http_client_registry().client(kimi_models_url) as client:
                 response = await client.get(
-                    "https://kimi-k2.ai/api/v1/models",
+                    kimi_models_url,
                     headers={
                         "Authorization": f"Bearer {settings.kimi_api_key}",
                         "Content-Type": "application/json"
-                    }
+                    },
+                    timeout=10.0
                 )
                 if response.status_code == 200:
                     data = response.json()
@@ -1266,7 +1341,7 @@ async def create_admin_user(
             )
         
         # Create user via Supabase Auth Admin API
-        response = client.auth.admin.create_user({
+        response = await run_db(client.auth.admin.create_user, {
             "email": user_data.email,
             "password": user_data.password,
             "email_confirm": user_data.email_confirm,
@@ -1311,7 +1386,7 @@ async def list_admin_users(
         client = get_supabase_client()
         
         # List all users from Supabase Auth
-        response = client.auth.admin.list_users()
+        response = await run_db(client.auth.admin.list_users)
         
         # Filter users with admin roles
         admin_users = []
@@ -1362,7 +1437,7 @@ async def delete_admin_user(
         client = get_supabase_client()
         
         # Delete user via Supabase Auth Admin API
-        client.auth.admin.delete_user(user_id)
+        await run_db(client.auth.admin.delete_user, user_id)
         
         logger.info(f"Admin user deleted: {user_id}")
         
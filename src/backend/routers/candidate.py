@@ -17,6 +17,9 @@ from pydantic import BaseModel, EmailStr, Field
 from uuid import UUID
 import logging
 
+from database import with_entity_loader
+from services.metrics import track_background_job
+
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/candidate", tags=["candidate"])
 
@@ -151,6 +154,8 @@ async def step1_identification(data: CandidateIdentification):
         )
 
 
+@track_background_job("candidate_job_posting_processing")
+@with_entity_loader
 async def _run_candidate_job_posting_processing_background(
     session_id: UUID,
     final_text: str,
@@ -583,6 +588,8 @@ async def step3_upload_cv(
         )
 
 
+@track_background_job("candidate_analysis")
+@with_entity_loader
 async def _run_candidate_analysis_background(
     session_id: UUID,
     session_service,
@@ -14,10 +14,11 @@ Handles conversational chatbot flow for CV preparation:
 """
 
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from typing import Optional, List, Dict, Any
 from uuid import UUID
 from datetime import datetime
+import json
 import logging
 
 from models.chatbot import (
@@ -39,6 +40,7 @@ from models.chatbot import (
 )
 
 from services.chatbot_service import get_chatbot_service
+from database import run_db
 from services.database.chatbot_service import get_chatbot_database_service
 from services.database.candidate_service import get_candidate_service
 from utils.file_processor import FileProcessor
@@ -631,7 +633,7 @@ async def send_message(request: ChatbotMessageRequest):
         
         # Get latest messages to construct response
         db_service = get_chatbot_database_service()
-        messages = db_service.get_messages(request.session_id, limit=1)
+        messages = await run_db(db_service.get_messages, request.session_id, limit=1)
         
         bot_message = None
         if messages and messages[-1]["role"] == "bot":
@@ -670,6 +672,64 @@ async def send_message(request: ChatbotMessageRequest):
         )
 
 
+@router.post("/message/stream")
+async def stream_message(request: ChatbotMessageRequest):
+    """
+    Send a message to the chatbot and stream the response (Server-Sent Events).
+    
+    Events:
+    - token: {"text": "..."} for each piece of the reply as it is generated
+    - done: {"message": ChatbotMessage} once the reply is complete and saved
+    - error: {"error": "..."} if the reply could not be generated or saved
+    """
+    db_service = get_chatbot_database_service()
+    if not await run_db(db_service.get_session, request.session_id):
+        raise HTTPException(
+            status_code=404,
+            detail="Session not found"
+        )
+    
+    chatbot_service = get_chatbot_service()
+    
+    def _sse(event: str, data: Dict[str, Any]) -> str:
+        return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+    
+    async def _events():
+        from models.chatbot import ChatbotMessage
+        
+        try:
+            async for event in chatbot_service.stream_message(
+                session_id=request.session_id,
+                user_message=request.message,
+                message_type=request.message_type
+            ):
+                if event["event"] == "token":
+                    yield _sse("token", {"text": event["text"]})
+                elif event["event"] == "done":
+                    bot_message = event["message"]
+                    message = ChatbotMessage(
+                        id=UUID(bot_message["id"]),
+                        role=bot_message["role"],
+                        content=bot_message["content"],
+                        message_type=bot_message.get("message_type", "text"),
+                        metadata=bot_message.get("metadata", {}),
+                        created_at=datetime.fromisoformat(bot_message["created_at"].replace("Z", "+00:00"))
+                    )
+                    yield _sse("done", {"message": message.model_dump(mode="json")})
+                else:
+                    yield _sse("error", {"error": event.get("error", "Failed to process message")})
+        except Exception as e:
+            logger.error(f"Error in chatbot message stream: {e}", exc_info=True)
+            yield _sse("error", {"error": "Internal server error processing message"})
+    
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        # Disable proxy buffering so tokens reach the client as they are produced
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.post("/profile")
 async def update_profile(request: ChatbotProfileDataRequest):
     """
@@ -682,7 +742,7 @@ async def update_profile(request: ChatbotProfileDataRequest):
         db_service = get_chatbot_database_service()
         
         # Get session
-        session = db_service.get_session(request.session_id)
+        session = await run_db(db_service.get_session, request.session_id)
         if not session:
             raise HTTPException(
                 status_code=404,
@@ -716,7 +776,7 @@ async def update_profile(request: ChatbotProfileDataRequest):
             candidate_id = UUID(candidate["id"])
         
         # Update session
-        db_service.update_session(request.session_id, {
+        await run_db(db_service.update_session, request.session_id, {
             "profile_data": current_profile,
             "candidate_id": str(candidate_id) if candidate_id else None,
             "current_step": "cv_upload"
@@ -754,7 +814,7 @@ async def upload_cv(
         db_service = get_chatbot_database_service()
         
         # Get session
-        session = db_service.get_session(session_uuid)
+        session = await run_db(db_service.get_session, session_uuid)
         if not session:
             raise HTTPException(
                 status_code=404,
@@ -862,7 +922,7 @@ async def upload_cv(
         profile_data = existing_profile
         
         # Update session with both CV data and profile data
-        db_service.update_session(session_uuid, {
+        await run_db(db_service.update_session, session_uuid, {
             "cv_data": cv_data,
             "profile_data": profile_data,
             "current_step": "cv_review"  # Changed to review step
@@ -878,7 +938,7 @@ async def upload_cv(
         )
         
         # Add bot message with extracted information summary
-        db_service.add_message(
+        await run_db(db_service.add_message,
             session_id=session_uuid,
             role="bot",
             content=summary_message,
@@ -919,7 +979,7 @@ async def get_messages(session_id: UUID, limit: Optional[int] = None):
         db_service = get_chatbot_database_service()
         
         # Get session
-        session = db_service.get_session(session_id)
+        session = await run_db(db_service.get_session, session_id)
         if not session:
             raise HTTPException(
                 status_code=404,
@@ -927,7 +987,7 @@ async def get_messages(session_id: UUID, limit: Optional[int] = None):
             )
         
         # Get messages
-        messages = db_service.get_messages(session_id, limit=limit)
+        messages = await run_db(db_service.get_messages, session_id, limit=limit)
         
         if not messages:
             return JSONResponse({
@@ -1000,7 +1060,7 @@ async def get_session(session_id: UUID):
     try:
         db_service = get_chatbot_database_service()
         
-        session = db_service.get_session(session_id)
+        session = await run_db(db_service.get_session, session_id)
         if not session:
             raise HTTPException(
                 status_code=404,
@@ -1008,7 +1068,7 @@ async def get_session(session_id: UUID):
             )
         
         # Get messages for this session
-        messages = db_service.get_messages(session_id)
+        messages = await run_db(db_service.get_messages, session_id)
         
         # Convert messages to response format
         message_list = []
@@ -13,14 +13,19 @@ Handles all steps of the interviewer flow:
 """
 
 import asyncio
+import random
 from datetime import datetime
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Query
 from fastapi.responses import JSONResponse
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from pydantic import BaseModel, EmailStr, Field
 from uuid import UUID
 import logging
 
+from config import settings
+from database import with_entity_loader
+from services.metrics import track_background_job
+
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/interviewer", tags=["interviewer"])
 
@@ -227,6 +232,8 @@ async def step1_identification(data: InterviewerIdentification):
         )
 
 
+@track_background_job("job_posting_processing")
+@with_entity_loader
 async def _run_job_posting_processing_background(
     session_id: UUID,
     final_text: str,
@@ -694,6 +701,8 @@ async def step3_key_points(data: KeyPointsInput):
         )
 
 
+@track_background_job("weighting_suggestions")
+@with_entity_loader
 async def _run_weighting_suggestions_background(
     session_id: UUID,
     job_posting_text: str,
@@ -1182,15 +1191,32 @@ async def step4_weighting(data: WeightingInput):
         )
 
 
+@track_background_job("cv_upload")
+@with_entity_loader
 async def _run_cv_upload_background(session_id: UUID, files_data: List[Dict[str, Any]], 
                                     session_service, cv_service, candidate_service,
                                     storage_service, ai_service):
     """
-    Background task to process CV uploads sequentially.
-    Updates progress in session as it goes.
+    Background task to process CV uploads as a bounded-concurrency pipeline.
+    
+    Each file goes through three stages, and different files overlap:
+    1. Validation and text extraction (in worker threads, upload_extract_workers at a time)
+    2. Candidate creation, storage upload and CV record (upload_max_concurrency at a time)
+    3. AI summary: stored CVs are queued and summarized in batches of
+       ai_summary_batch_size per AI request (upload_max_concurrency batches at a time)
+    
+    With several files and DB_BULK_WRITES_ENABLED, candidates are created up
+    front and CV records once all files are stored, each with multi-row inserts
+    instead of one request per file.
+    
+    Updates progress in session as each file finishes. Per-file errors and
+    the final upload_progress/upload_summary contract are unchanged, and
+    candidates_info keeps the order of the uploaded files.
     """
     from utils import FileProcessor
     from uuid import UUID
+    from functools import partial
+    from services.database import BulkRowResult
     
     try:
         # Get session data
@@ -1203,8 +1229,25 @@ async def _run_cv_upload_background(session_id: UUID, files_data: List[Dict[str,
         language = session_data.get("language", "en")
         total_files = len(files_data)
         
-        processed_cvs = []
-        errors = []
+        # Per-file outcomes keyed by position in files_data (files may finish in any order)
+        processed_by_idx: Dict[int, Dict[str, Any]] = {}
+        errors_by_idx: Dict[int, str] = {}
+        finished = 0
+        
+        extract_semaphore = asyncio.Semaphore(max(1, settings.upload_extract_workers))
+        io_semaphore = asyncio.Semaphore(max(1, settings.upload_max_concurrency))
+        summary_semaphore = asyncio.Semaphore(max(1, settings.upload_max_concurrency))
+        loop = asyncio.get_running_loop()
+        
+        # Stage 3 queue: CVs waiting for a summary batch, as (idx, extracted_text, filename)
+        pending_summaries: List[Tuple[int, str, str]] = []
+        summary_tasks: List[asyncio.Task] = []
+        summary_batch_size = max(1, settings.ai_summary_batch_size)
+        
+        # Batch mode: candidate results of valid files by idx, and CV records waiting to be written
+        bulk_writes = settings.db_bulk_writes_enabled and total_files > 1
+        candidates_by_idx: Dict[int, BulkRowResult] = {}
+        pending_cvs: Dict[int, Dict[str, Any]] = {}
         
         # Initialize progress
         session_service.update_session(
@@ -1220,71 +1263,112 @@ async def _run_cv_upload_background(session_id: UUID, files_data: List[Dict[str,
             }
         )
         
-        # Process each CV file SEQUENTIALLY
-        for idx, file_data in enumerate(files_data, 1):
+        def _publish_progress(status: str, filename: Optional[str]):
+            session_service.update_session(
+                session_id,
+                {
+                    "upload_progress": {
+                        "current": finished,
+                        "total": total_files,
+                        "status": status,
+                        "current_filename": filename
+                    }
+                }
+            )
+        
+        async def _summarize_batch(batch: List[Tuple[int, str, str]]):
+            """Summarize a batch of stored CVs and attach the summaries."""
+            async with summary_semaphore:
+                try:
+                    summaries = await ai_service.summarize_cvs(
+                        [(extracted_text, filename) for _, extracted_text, filename in batch],
+                        language
+                    )
+                except Exception as summary_error:
+                    logger.warning(f"Failed to generate summaries for {len(batch)} CV(s): {summary_error}")
+                    return
+            for (idx, _, filename), summary in zip(batch, summaries):
+                if idx not in processed_by_idx:
+                    # CV record failed (batch mode)
+                    continue
+                processed_by_idx[idx]["summary"] = summary
+                if summary:
+                    logger.info(f"Summary generated for {filename}")
+        
+        def _queue_summary(idx: int, extracted_text: str, filename: str):
+            """Queue a CV for summarization, starting a batch once enough are waiting."""
+            pending_summaries.append((idx, extracted_text, filename))
+            if len(pending_summaries) >= summary_batch_size:
+                summary_tasks.append(asyncio.create_task(_summarize_batch(list(pending_summaries))))
+                pending_summaries.clear()
+        
+        def _validation_error(filename: str, size: int) -> Optional[str]:
+            is_valid, error = FileProcessor.validate_file_type(filename)
+            if is_valid:
+                is_valid, error = FileProcessor.validate_file_size(size)
+            return None if is_valid else f"{filename}: {error}"
+        
+        def _candidate_fields(idx: int) -> Dict[str, Any]:
+            return {
+                # Generate unique email to avoid duplicates during batch upload
+                "email": f"interviewer_session_{session_id}_{idx}@shortlistai.test",
+                "name": f"Candidate {idx}",
+                "consent_given": False  # Consent from interviewer, not candidate
+            }
+        
+        async def _process_file(idx: int, file_data: Dict[str, Any]):
+            """Run one file through the pipeline, recording its result or error."""
             filename = file_data["filename"]
             file_content = file_data["content"]
             
-            try:
-                # Update progress
-                session_service.update_session(
-                    session_id,
-                    {
-                        "upload_progress": {
-                            "current": idx,
-                            "total": total_files,
-                            "status": f"Processing CV {idx} of {total_files}: {filename}",
-                            "current_filename": filename
-                        }
-                    }
-                )
-                
+            # Stage 1: validation and text extraction
+            async with extract_semaphore:
+                _publish_progress(f"Processing CV {idx} of {total_files}: {filename}", filename)
                 logger.info(f"🔄 Processing CV {idx}/{total_files}: {filename} ({len(file_content)} bytes)")
                 
-                # Validate file
-                is_valid, error = FileProcessor.validate_file_type(filename)
-                if not is_valid:
-                    errors.append(f"{filename}: {error}")
-                    continue
-                
-                # Validate size
-                is_valid, error = FileProcessor.validate_file_size(len(file_content))
-                if not is_valid:
-                    errors.append(f"{filename}: {error}")
-                    continue
+                # Validate file type and size
+                validation_error = _validation_error(filename, len(file_content))
+                if validation_error:
+                    errors_by_idx[idx] = validation_error
+                    return
                 
-                # Extract text
-                success, extracted_text, error = FileProcessor.extract_text(
-                    file_content,
-                    filename
+                # Extract text (CPU-bound / blocking, keep it off the event loop)
+                success, extracted_text, error = await loop.run_in_executor(
+                    None,
+                    partial(FileProcessor.extract_text, file_content, filename)
                 )
+            
+            if not success or not extracted_text:
+                extracted_text = ""
+                logger.warning(f"No text extracted from {filename}")
+            
+            # Stage 2: candidate, storage upload and CV record
+            async with io_semaphore:
+                if bulk_writes:
+                    # Created with the other candidates before the pipeline started
+                    created = candidates_by_idx[idx]
+                    if not created.ok:
+                        logger.error(f"Failed to create candidate for {filename}: {created.error}")
+                        errors_by_idx[idx] = f"{filename}: Failed to create candidate - {created.error}"
+                        return
+                    candidate = created.data
+                else:
+                    try:
+                        candidate = await candidate_service.create(**_candidate_fields(idx))
+                    except Exception as e:
+                        error_detail = str(e)
+                        logger.error(
+                            f"Failed to create candidate for {filename}: {error_detail}",
+                            exc_info=True
+                        )
+                        errors_by_idx[idx] = f"{filename}: Failed to create candidate - {error_detail}"
+                        return
                 
-                if not success or not extracted_text:
-                    extracted_text = ""
-                    logger.warning(f"No text extracted from {filename}")
-                
-                # Generate unique email to avoid duplicates during batch upload
-                generated_email = f"interviewer_session_{session_id}_{idx}@shortlistai.test"
-                try:
-                    candidate = await candidate_service.create(
-                        email=generated_email,
-                        name=f"Candidate {idx}",
-                        consent_given=False  # Consent from interviewer, not candidate
-                    )
-                except Exception as e:
-                    error_detail = str(e)
-                    logger.error(
-                        f"Failed to create candidate for {filename}: {error_detail}",
-                        exc_info=True
-                    )
-                    errors.append(f"{filename}: Failed to create candidate - {error_detail}")
-                    continue
-                
-                if not candidate:
-                    error_msg = f"candidate_service.create() returned None for {filename}"
-                    logger.error(error_msg)
-                    errors.append(f"{filename}: Failed to create candidate (service returned None)")
-                    continue
+                    if not candidate:
+                        error_msg = f"candidate_service.create() returned None for {filename}"
+                        logger.error(error_msg)
+                        errors_by_idx[idx] = f"{filename}: Failed to create candidate (service returned None)"
+                        return
                 
                 # Upload CV file FIRST (before AI processing to avoid memory issues)
                 success, file_url, error = await storage_service.upload_cv(
@@ -1294,53 +1378,94 @@ async def _run_cv_upload_background(session_id: UUID, files_data: List[Dict[str,
                 )
                 
                 if not success:
-                    errors.append(f"{filename}: {error}")
-                    continue
+                    errors_by_idx[idx] = f"{filename}: {error}"
+                    return
                 
                 # Create CV record
-                cv = await cv_service.create(
-                    candidate_id=UUID(candidate["id"]),
-                    file_url=file_url,
-                    uploaded_by_flow="interviewer",
-                    extracted_text=extracted_text
-                )
-                
-                if not cv:
-                    errors.append(f"{filename}: Failed to create CV record")
-                    continue
-                
-                # Summarize CV with AI AFTER upload (if we have extracted text)
-                summary = None
-                if extracted_text:
-                    try:
-                        # Limit text length for summary to avoid token issues
-                        summary_text = extracted_text[:5000] if len(extracted_text) > 5000 else extracted_text
-                        summary = await ai_service.summarize_cv(
-                            summary_text,
-                            filename,
-                            language
-                        )
-                        logger.info(f"Summary generated for {filename}")
-                    except Exception as summary_error:
-                        logger.warning(f"Failed to generate summary for {filename}: {summary_error}")
-                        summary = None
+                cv_fields = {
+                    "candidate_id": UUID(candidate["id"]),
+                    "file_url": file_url,
+                    "uploaded_by_flow": "interviewer",
+                    "extracted_text": extracted_text
+                }
+                if bulk_writes:
+                    # Written with the other CVs once all files are stored
+                    pending_cvs[idx] = cv_fields
+                    cv = None
                 else:
-                    logger.warning(f"No extracted text available for {filename}, skipping AI summary")
-                
-                processed_cvs.append({
-                    "cv_id": cv["id"],
-                    "candidate_id": candidate["id"],
-                    "filename": filename,
-                    "summary": summary
-                })
-                logger.info(f"✅ CV {idx}/{total_files} processed: {filename} -> {cv['id']}")
-                
-                # Clear file_content from memory after processing
-                del file_content
-                
+                    cv = await cv_service.create(**cv_fields)
+                    if not cv:
+                        errors_by_idx[idx] = f"{filename}: Failed to create CV record"
+                        return
+            
+            # Clear file_content from memory once it is stored
+            file_data["content"] = None
+            del file_content
+            
+            processed_by_idx[idx] = {
+                "cv_id": cv["id"] if cv else None,
+                "candidate_id": candidate["id"],
+                "filename": filename,
+                "summary": None
+            }
+            logger.info(f"✅ CV {idx}/{total_files} processed: {filename} -> {cv['id'] if cv else 'pending CV record'}")
+            
+            # Stage 3: summarize CV with AI AFTER upload (if we have extracted text)
+            if extracted_text:
+                _queue_summary(idx, extracted_text, filename)
+            else:
+                logger.warning(f"No extracted text available for {filename}, skipping AI summary")
+        
+        async def _run_file(idx: int, file_data: Dict[str, Any]):
+            nonlocal finished
+            filename = file_data["filename"]
+            try:
+                await _process_file(idx, file_data)
             except Exception as e:
-                errors.append(f"{filename}: {str(e)}")
+                errors_by_idx[idx] = f"{filename}: {str(e)}"
                 logger.error(f"Error processing CV {filename}: {e}", exc_info=True)
+            finally:
+                finished += 1
+                _publish_progress(f"Processed {finished} of {total_files} CV(s)", filename)
+        
+        if bulk_writes:
+            valid_indexes = [
+                idx for idx, file_data in enumerate(files_data, 1)
+                if not _validation_error(file_data["filename"], len(file_data["content"]))
+            ]
+            if valid_indexes:
+                created_candidates = await candidate_service.create_many(
+                    [_candidate_fields(idx) for idx in valid_indexes]
+                )
+                candidates_by_idx.update(zip(valid_indexes, created_candidates))
+        
+        await asyncio.gather(*(
+            _run_file(idx, file_data) for idx, file_data in enumerate(files_data, 1)
+        ))
+        
+        # Batch mode: write the CV records of all stored files (summaries may still be running)
+        if pending_cvs:
+            _publish_progress(f"Saving {len(pending_cvs)} CV record(s)...", None)
+            cv_indexes = sorted(pending_cvs)
+            created_cvs = await cv_service.create_many([pending_cvs[idx] for idx in cv_indexes])
+            for idx, created in zip(cv_indexes, created_cvs):
+                if created.ok:
+                    processed_by_idx[idx]["cv_id"] = created.data["id"]
+                else:
+                    filename = processed_by_idx.pop(idx)["filename"]
+                    errors_by_idx[idx] = f"{filename}: Failed to create CV record - {created.error}"
+        
+        # Summarize the last partial batch and wait for batches still running
+        if pending_summaries:
+            summary_tasks.append(asyncio.create_task(_summarize_batch(list(pending_summaries))))
+            pending_summaries.clear()
+        if summary_tasks:
+            _publish_progress(f"Summarizing {len(processed_by_idx)} CV(s)...", None)
+            await asyncio.gather(*summary_tasks)
+        
+        # Same order as the uploaded files, regardless of completion order
+        processed_cvs = [processed_by_idx[idx] for idx in sorted(processed_by_idx)]
+        errors = [errors_by_idx[idx] for idx in sorted(errors_by_idx)]
         
         # Update session with results
         if len(processed_cvs) > 0:
@@ -1458,7 +1583,7 @@ async def step5_upload_cvs(
             })
         
         # Read all files into memory (we need to pass them to background task)
-        # This is acceptable since we're processing sequentially in background
+        # (the background pipeline releases each file once it has been stored)
         files_data = []
         for file in files:
             try:
@@ -1513,11 +1638,43 @@ async def step5_upload_cvs(
         )
 
 
+def _analysis_retry_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """
+    Seconds to wait before retrying a CV analysis.
+    
+    Exponential backoff (1s, 2s, ...) with jitter, so CVs that failed together
+    don't retry together. If every provider was rate limited, waits at least
+    until the rate limit scheduler lets requests through again (capped at
+    AI_RATE_LIMIT_MAX_WAIT_SECONDS).
+    
+    Args:
+        attempt: Attempt that just failed (1-based)
+        retry_after: Seconds until a provider accepts requests again, if known
+        
+    Returns:
+        Delay in seconds
+    """
+    delay = float(2 ** (attempt - 1))
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, settings.ai_rate_limit_max_wait_seconds))
+    return delay + random.uniform(0, delay / 2)
+
+
+@track_background_job("analysis")
+@with_entity_loader
 async def _run_analysis_background(session_id: UUID, session_service, job_posting_service, cv_service, 
                                     analysis_service, ai_service, candidate_service, report_service):
     """
-    Background task to run AI analysis sequentially for all CVs.
-    Updates progress in session as it goes.
+    Background task to run AI analysis for all CVs.
+    
+    CVs are analysed concurrently (up to settings.analysis_max_concurrency at
+    a time). Each CV's result and the progress counter are written to the
+    session as soon as that CV finishes; the final results keep the cv_ids
+    order and the executive recommendation runs once all CVs are done.
+    
+    With several CVs and DB_BULK_WRITES_ENABLED, analysis records are written
+    with multi-row inserts once all CVs are analysed (results published before
+    that have analysis_id None).
     """
     try:
         # Get session data
@@ -1569,13 +1726,67 @@ async def _run_analysis_background(session_id: UUID, session_service, job_postin
                 return []
             return [value]
         
-        analyses = []
-        session_results = []
         candidate_lookup = {info["cv_id"]: info for info in candidates_info}
-        errors = []
+        
+        # Prompt stored on every analysis, resolved once per job (served from memory)
+        prompt_id_value = None
+        try:
+            from services.ai.prompt_registry import get_prompt_registry
+            prompt_data = await get_prompt_registry().get("interviewer_analysis", language)
+            if prompt_data and prompt_data.get("id"):
+                prompt_id_value = UUID(str(prompt_data["id"]))
+        except Exception as prompt_err:
+            logger.warning(f"Failed to get prompt_id: {prompt_err}")
+        
+        # Per-CV outcomes keyed by position in cv_ids (CVs may finish in any order)
+        results_by_idx: Dict[int, Dict[str, Any]] = {}
+        analyses_by_idx: Dict[int, Dict[str, Any]] = {}
+        errors_by_idx: Dict[int, List[str]] = {}
+        in_flight: set = set()
+        
+        def _ordered(values_by_idx: Dict[int, Any]) -> List[Any]:
+            return [values_by_idx[idx] for idx in sorted(values_by_idx)]
+        
+        def _publish_progress(status: str, cv_id: Optional[str] = None):
+            all_errors = [error for idx in sorted(errors_by_idx) for error in errors_by_idx[idx]]
+            progress = {
+                "current": len(results_by_idx),
+                "total": total_cvs,
+                "status": status,
+                "in_progress": len(in_flight),
+                "errors": all_errors if all_errors else None
+            }
+            if cv_id:
+                progress["current_cv_id"] = cv_id
+            session_service.update_session(session_id, {"analysis_progress": progress})
+        
+        def _record_error(idx: int, error_msg: str):
+            errors_by_idx.setdefault(idx, []).append(error_msg)
+        
+        # Batch mode: (analysis fields, failed) by idx, written once all CVs are analysed
+        bulk_writes = settings.db_bulk_writes_enabled and total_cvs > 1
+        pending_analyses: Dict[int, Tuple[Dict[str, Any], bool]] = {}
+        
+        async def _save_analysis(idx: int, failed: bool = False, **fields) -> Optional[Dict[str, Any]]:
+            """Create the analysis record, or queue it for the bulk insert (returns None then)."""
+            if bulk_writes:
+                pending_analyses[idx] = (fields, failed)
+                return None
+            return await analysis_service.create(**fields)
+        
+        def _record_result(idx: int, result: Dict[str, Any]):
+            """Store a CV's result and publish partial results as soon as it finishes."""
+            results_by_idx[idx] = result
+            session_service.update_session(
+                session_id,
+                {"analysis_results": _ordered(results_by_idx)}
+            )
+            _publish_progress(f"Analyzed {len(results_by_idx)} of {total_cvs} CVs...")
         
         # Maximum retry attempts for AI analysis (1 initial + 2 retries = 3 total)
         max_attempts = 3
+        # Seconds allowed per provider call (time queued for rate limits/slots not counted)
+        call_timeout = 300
         
         # Initialize progress
         session_service.update_session(
@@ -1590,28 +1801,19 @@ async def _run_analysis_background(session_id: UUID, session_service, job_postin
             }
         )
         
-        for idx, cv_id in enumerate(cv_ids, 1):
+        async def _analyze_cv(idx: int, cv_id: str):
+            """Analyse one CV and record its result entry (never raises)."""
             cv = None
             candidate_info = candidate_lookup.get(cv_id, {})
             try:
                 # Update progress
-                session_service.update_session(
-                    session_id,
-                    {
-                        "analysis_progress": {
-                            "current": idx,
-                            "total": total_cvs,
-                            "status": f"Analyzing CV {idx} of {total_cvs}...",
-                            "current_cv_id": cv_id
-                        }
-                    }
-                )
+                _publish_progress(f"Analyzing CV {idx} of {total_cvs}...", cv_id)
                 
                 cv = await cv_service.get_by_id(UUID(cv_id))
                 if not cv:
                     logger.warning(f"CV {cv_id} not found, adding to results with error")
                     error_msg = f"CV {idx}: CV record not found in database"
-                    errors.append(error_msg)
+                    _record_error(idx, error_msg)
                     # Still add to results so it appears in step7
                     summary = candidate_info.get("summary") or {}
                     candidate_label = (
@@ -1620,7 +1822,7 @@ async def _run_analysis_background(session_id: UUID, session_service, job_postin
                         or candidate_info.get("filename")
                         or f"Candidate {idx}"
                     )
-                    session_results.append({
+                    _record_result(idx, {
                         "analysis_id": None,
                         "candidate_id": str(cv_id),
                         "candidate_label": candidate_label,
@@ -1640,7 +1842,7 @@ async def _run_analysis_background(session_id: UUID, session_service, job_postin
                         "enrichment": None,
                         "error": error_msg
                     })
-                    continue
+                    return
                 extracted_text = cv.get("extracted_text") or ""
                 candidate_uuid: Optional[UUID] = None
                 candidate_name: Optional[str] = None
@@ -1667,7 +1869,7 @@ async def _run_analysis_background(session_id: UUID, session_service, job_postin
                 if not cv_markdown or not job_posting_markdown:
                     logger.error(f"Missing CV or job posting text for analysis. CV ID: {cv_id}")
                     error_msg = f"CV {idx}: Missing text content"
-                    errors.append(error_msg)
+                    _record_error(idx, error_msg)
                     # Still add to results so it appears in step7
                     summary = candidate_info.get("summary") or {}
                     candidate_label = (
@@ -1676,7 +1878,7 @@ async def _run_analysis_background(session_id: UUID, session_service, job_postin
                         or candidate_info.get("filename")
                         or f"Candidate {idx}"
                     )
-                    session_results.append({
+                    _record_result(idx, {
                         "analysis_id": None,
                         "candidate_id": str(cv.get("candidate_id")) if cv and cv.get("candidate_id") else str(cv_id),
                         "candidate_label": candidate_label,
@@ -1696,91 +1898,73 @@ async def _run_analysis_background(session_id: UUID, session_service, job_postin
                         "enrichment": None,
                         "error": error_msg
                     })
-                    continue
+                    return
 
                 # Run AI analysis with retry logic (up to 3 attempts total: 1 initial + 2 retries)
                 ai_result = None
                 last_error = None
                 
                 for attempt in range(1, max_attempts + 1):
+                    retry_after = None
                     try:
                         logger.info(f"🔄 Attempt {attempt}/{max_attempts} for CV {idx} (ID: {cv_id})")
                         
                         # Update progress to show retry attempt
                         if attempt > 1:
-                            session_service.update_session(
-                                session_id,
-                                {
-                                    "analysis_progress": {
-                                        "current": idx,
-                                        "total": total_cvs,
-                                        "status": f"Retrying analysis for CV {idx} (attempt {attempt}/{max_attempts})...",
-                                        "current_cv_id": cv_id
-                                    }
-                                }
+                            _publish_progress(
+                                f"Retrying analysis for CV {idx} (attempt {attempt}/{max_attempts})...",
+                                cv_id
                             )
                         
-                        ai_result = await asyncio.wait_for(
-                            ai_service.analyze_candidate_for_interviewer(
-                                job_posting_markdown,
-                                cv_markdown,
-                                key_points,
-                                weights,
-                                hard_blockers,
-                                nice_to_have,
-                                language,
-                                company_name=company_name,
-                                candidate_id=candidate_uuid,
-                                candidate_name=candidate_name,
-                            ),
-                            timeout=300  # 5 minutes per CV
+                        # The timeout applies to each provider call, not to the
+                        # time spent waiting for rate limit / concurrency slots
+                        ai_result = await ai_service.analyze_candidate_for_interviewer(
+                            job_posting_markdown,
+                            cv_markdown,
+                            key_points,
+                            weights,
+                            hard_blockers,
+                            nice_to_have,
+                            language,
+                            company_name=company_name,
+                            candidate_id=candidate_uuid,
+                            candidate_name=candidate_name,
+                            timeout=call_timeout,
                         )
                         
                         # Check if result is valid
                         if ai_result and ai_result.get("data"):
                             logger.info(f"✅ Analysis successful on attempt {attempt} for CV {idx}")
                             break  # Success, exit retry loop
+                        if ai_result and ai_result.get("error"):
+                            # Every provider was rate limited
+                            last_error = ai_result["error"]
+                            retry_after = ai_result.get("retry_after")
                         else:
                             last_error = f"AI returned empty or invalid result"
-                            logger.warning(f"⚠️ Attempt {attempt}/{max_attempts} failed for CV {idx}: {last_error}")
-                            if attempt < max_attempts:
-                                # Wait before retry (exponential backoff: 2s, 4s)
-                                wait_time = 2 ** (attempt - 1)
-                                logger.info(f"⏳ Waiting {wait_time}s before retry...")
-                                await asyncio.sleep(wait_time)
-                            else:
-                                logger.error(f"❌ All {max_attempts} attempts failed for CV {idx}")
-                    
-                    except asyncio.TimeoutError:
-                        last_error = f"Analysis timed out after 300s"
-                        logger.warning(f"⚠️ Attempt {attempt}/{max_attempts} timed out for CV {idx}")
-                        if attempt < max_attempts:
-                            wait_time = 2 ** (attempt - 1)
-                            logger.info(f"⏳ Waiting {wait_time}s before retry...")
-                            await asyncio.sleep(wait_time)
-                        else:
-                            logger.error(f"❌ All {max_attempts} attempts timed out for CV {idx}")
-                            # Handle timeout as final failure (will be caught by outer try-except)
-                            raise
+                        logger.warning(f"⚠️ Attempt {attempt}/{max_attempts} failed for CV {idx}: {last_error}")
+                        if attempt == max_attempts:
+                            logger.error(f"❌ All {max_attempts} attempts failed for CV {idx}")
                     
                     except Exception as attempt_err:
                         last_error = f"Exception during analysis: {str(attempt_err)}"
                         logger.warning(f"⚠️ Attempt {attempt}/{max_attempts} failed for CV {idx}: {last_error}")
-                        if attempt < max_attempts:
-                            wait_time = 2 ** (attempt - 1)
-                            logger.info(f"⏳ Waiting {wait_time}s before retry...")
-                            await asyncio.sleep(wait_time)
-                        else:
+                        if attempt == max_attempts:
                             logger.error(f"❌ All {max_attempts} attempts failed for CV {idx}: {last_error}")
                             # Re-raise to be handled by outer exception handler
                             raise
+                    
+                    if attempt < max_attempts:
+                        wait_time = _analysis_retry_delay(attempt, retry_after)
+                        logger.info(f"⏳ Waiting {wait_time:.1f}s before retry...")
+                        await asyncio.sleep(wait_time)
 
                 # If we get here and still no valid result, mark as failed
                 if not ai_result or not ai_result.get("data"):
                     error_msg = f"CV {idx}: AI failed to analyze after {max_attempts} attempts"
                     if last_error:
                         error_msg += f" (last error: {last_error})"
-                    errors.append(error_msg)
+                    _record_error(idx, error_msg)
                     # Still add to results so it appears in step7
                     summary = candidate_info.get("summary") or {}
                     candidate_label = (
@@ -1792,7 +1976,9 @@ async def _run_analysis_background(session_id: UUID, session_service, job_postin
                     candidate_id_str = str(cv.get("candidate_id")) if cv and cv.get("candidate_id") else str(cv_id)
                     # Create partial analysis record even when AI fails, so it appears in step7
                     try:
-                        partial_analysis = await analysis_service.create(
+                        partial_analysis = await _save_analysis(
+                            idx,
+                            failed=True,
                             mode="interviewer",
                             job_posting_id=UUID(job_posting_id),
                             cv_id=UUID(cv_id),
@@ -1819,7 +2005,7 @@ async def _run_analysis_background(session_id: UUID, session_service, job_postin
                         logger.error(f"Failed to create partial analysis for CV {cv_id}: {analysis_err}", exc_info=True)
                         analysis_id = None
                     
-                    session_results.append({
+                    _record_result(idx, {
                         "analysis_id": str(analysis_id) if analysis_id else None,
                         "candidate_id": str(cv.get("candidate_id")) if cv and cv.get("candidate_id") else str(cv_id),
                         "candidate_label": candidate_label,
@@ -1839,7 +2025,7 @@ async def _run_analysis_background(session_id: UUID, session_service, job_postin
                         "enrichment": None,
                         "error": error_msg
                     })
-                    continue
+                    return
 
                 data = ai_result.get("data", {})
                 categories = data.get("categories", {})
@@ -1892,7 +2078,7 @@ async def _run_analysis_background(session_id: UUID, session_service, job_postin
                     summary.get("full_name")
                     or summary.get("current_role")
                     or candidate_info.get("filename")
-                    or f"Candidate {len(session_results) + 1}"
+                    or f"Candidate {idx}"
                 )
 
                 # Fetch enrichment data
@@ -1952,17 +2138,8 @@ async def _run_analysis_background(session_id: UUID, session_service, job_postin
                     "score_breakdown": score_breakdown
                 }
                 
-                prompt_id_value = None
-                try:
-                    from services.database.prompt_service import get_prompt_service
-                    prompt_service = get_prompt_service()
-                    prompt_data = await prompt_service.get_prompt_by_key("interviewer_analysis", language)
-                    if prompt_data:
-                        prompt_id_value = UUID(prompt_data["id"])
-                except Exception as prompt_err:
-                    logger.warning(f"Failed to get prompt_id: {prompt_err}")
-                
-                analysis = await analysis_service.create(
+                analysis = await _save_analysis(
+                    idx,
                     mode="interviewer",
                     job_posting_id=UUID(job_posting_id),
                     cv_id=UUID(cv_id),
@@ -1986,7 +2163,7 @@ async def _run_analysis_background(session_id: UUID, session_service, job_postin
                     total_cost=cost_breakdown["total_cost"]
                 )
                 
-                session_results.append({
+                _record_result(idx, {
                     "analysis_id": analysis["id"] if analysis else None,
                     "candidate_id": str(cv["candidate_id"]),
                     "candidate_label": candidate_label,
@@ -2018,76 +2195,12 @@ async def _run_analysis_background(session_id: UUID, session_service, job_postin
                 })
 
                 if analysis:
-                    analyses.append(analysis)
+                    analyses_by_idx[idx] = analysis
                     
-            except asyncio.TimeoutError:
-                # This should only happen if all retry attempts timed out
-                error_msg = f"CV {idx}: Analysis timed out after {max_attempts} attempts"
-                logger.error(f"AI analysis timed out for CV {cv_id} after all retries")
-                errors.append(error_msg)
-                # Still add to results with error info so it appears in step7
-                summary = candidate_info.get("summary") or {}
-                candidate_label = (
-                    summary.get("full_name")
-                    or summary.get("current_role")
-                    or candidate_info.get("filename")
-                    or f"Candidate {idx}"
-                )
-                candidate_id_str = str(cv.get("candidate_id")) if cv and cv.get("candidate_id") else str(cv_id)
-                
-                # Create partial analysis record even when timeout, so it appears in step7
-                try:
-                    partial_analysis = await analysis_service.create(
-                        mode="interviewer",
-                        job_posting_id=UUID(job_posting_id),
-                        cv_id=UUID(cv_id),
-                        candidate_id=UUID(candidate_id_str),
-                        provider="timeout",
-                        model=None,
-                        categories={},
-                        global_score=0,
-                        strengths=[],
-                        risks=[error_msg],
-                        questions={"items": []},
-                        intro_pitch="",
-                        hard_blocker_flags=[],
-                        language=language,
-                        detailed_analysis={"error": error_msg, "status": "timeout", "attempts": max_attempts},
-                        input_tokens=None,
-                        output_tokens=None,
-                        input_cost=0.0,
-                        output_cost=0.0,
-                        total_cost=0.0
-                    )
-                    analysis_id = partial_analysis["id"] if partial_analysis else None
-                except Exception as analysis_err:
-                    logger.error(f"Failed to create partial analysis for CV {cv_id}: {analysis_err}", exc_info=True)
-                    analysis_id = None
-                
-                session_results.append({
-                    "analysis_id": str(analysis_id) if analysis_id else None,
-                    "candidate_id": candidate_id_str,
-                    "candidate_label": candidate_label,
-                    "file_name": candidate_info.get("filename"),
-                    "summary": summary,
-                    "global_score": 0,
-                    "categories": {},
-                    "strengths": [],
-                    "risks": [error_msg],
-                    "questions": [],
-                    "hard_blocker_flags": [],
-                    "recommendation": f"Analysis failed - timeout after {max_attempts} attempts",
-                    "intro_pitch": "",
-                    "gap_strategies": [],
-                    "preparation_tips": [],
-                    "provider": None,
-                    "enrichment": None,
-                    "error": error_msg
-                })
             except Exception as cv_err:
                 error_msg = f"CV {idx}: {str(cv_err)}"
                 logger.error(f"Error analyzing CV {cv_id}: {cv_err}", exc_info=True)
-                errors.append(error_msg)
+                _record_error(idx, error_msg)
                 # Still add to results with error info so it appears in step7
                 summary = candidate_info.get("summary") or {}
                 candidate_label = (
@@ -2100,7 +2213,9 @@ async def _run_analysis_background(session_id: UUID, session_service, job_postin
                 
                 # Create partial analysis record even when error, so it appears in step7
                 try:
-                    partial_analysis = await analysis_service.create(
+                    partial_analysis = await _save_analysis(
+                        idx,
+                        failed=True,
                         mode="interviewer",
                         job_posting_id=UUID(job_posting_id),
                         cv_id=UUID(cv_id),
@@ -2127,7 +2242,7 @@ async def _run_analysis_background(session_id: UUID, session_service, job_postin
                     logger.error(f"Failed to create partial analysis for CV {cv_id}: {analysis_err}", exc_info=True)
                     analysis_id = None
                 
-                session_results.append({
+                _record_result(idx, {
                     "analysis_id": str(analysis_id) if analysis_id else None,
                     "candidate_id": candidate_id_str,
                     "candidate_label": candidate_label,
@@ -2148,6 +2263,55 @@ async def _run_analysis_background(session_id: UUID, session_service, job_postin
                     "error": error_msg
                 })
         
+        # Analyse CVs concurrently, bounded by ANALYSIS_MAX_CONCURRENCY
+        # (per-provider limits are applied by the AI manager).
+        max_concurrency = max(1, settings.analysis_max_concurrency)
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def _analyze_cv_bounded(idx: int, cv_id: str):
+            async with semaphore:
+                in_flight.add(idx)
+                try:
+                    await _analyze_cv(idx, cv_id)
+                finally:
+                    in_flight.discard(idx)
+        
+        logger.info(f"Analyzing {total_cvs} CV(s) for session {session_id} with concurrency {max_concurrency}")
+        pending = list(enumerate(cv_ids, 1))
+        outcomes = []
+        if settings.analysis_prompt_cache_warmup and len(pending) > 1 and max_concurrency > 1:
+            # Concurrent requests can't read a prompt cache entry that is still being written:
+            # run one analysis first so the rest share its cached job posting prefix
+            outcomes += await asyncio.gather(_analyze_cv_bounded(*pending.pop(0)), return_exceptions=True)
+        outcomes += await asyncio.gather(
+            *(_analyze_cv_bounded(idx, cv_id) for idx, cv_id in pending),
+            return_exceptions=True
+        )
+        for outcome in outcomes:
+            if isinstance(outcome, Exception):
+                logger.error(f"Unexpected error in CV analysis worker: {outcome}", exc_info=outcome)
+        
+        # Batch mode: write all analysis records and fill in their ids
+        if pending_analyses:
+            _publish_progress(f"Saving {len(pending_analyses)} analyses...")
+            analysis_indexes = sorted(pending_analyses)
+            created_analyses = await analysis_service.create_many(
+                [pending_analyses[idx][0] for idx in analysis_indexes]
+            )
+            for idx, created in zip(analysis_indexes, created_analyses):
+                if not created.ok:
+                    logger.error(f"Failed to create analysis for CV {cv_ids[idx - 1]}: {created.error}")
+                    continue
+                if idx in results_by_idx:
+                    results_by_idx[idx]["analysis_id"] = str(created.data["id"])
+                if not pending_analyses[idx][1]:
+                    analyses_by_idx[idx] = created.data
+        
+        # Same order as cv_ids, regardless of completion order
+        session_results = _ordered(results_by_idx)
+        analyses = _ordered(analyses_by_idx)
+        errors = [error for idx in sorted(errors_by_idx) for error in errors_by_idx[idx]]
+        
         # Log summary
         logger.info(f"✅ Analysis completed: {len(session_results)}/{total_cvs} CVs analyzed successfully for session: {session_id}")
         if errors:
@@ -2470,19 +2634,15 @@ async def step7_results(
                     return []
                 return [value]
             
+            # One query for all candidates instead of one per analysis
+            candidates_by_id = await candidate_service.get_by_ids(
+                [analysis["candidate_id"] for analysis in analyses if analysis.get("candidate_id")]
+            )
+            
             fallback_results: List[Dict[str, Any]] = []
             for idx, analysis in enumerate(analyses, start=1):
-                candidate_label = None
-                try:
-                    candidate = await candidate_service.get_by_id(UUID(analysis["candidate_id"]))
-                    if candidate and candidate.get("name"):
-                        candidate_label = candidate["name"]
-                except Exception as candidate_err:  # pragma: no cover - logging only
-                    logger.warning(
-                        "Failed to load candidate %s for report fallback: %s",
-                        analysis.get("candidate_id"),
-                        candidate_err
-                    )
+                candidate = candidates_by_id.get(str(analysis.get("candidate_id")))
+                candidate_label = candidate["name"] if candidate and candidate.get("name") else None
                 
                 detailed_analysis = analysis.get("detailed_analysis") or {}
                 fallback_results.append({
@@ -2583,15 +2743,15 @@ async def step7_results(
                                 return []
                             return [value]
                         
+                        # One query for all candidates instead of one per analysis
+                        candidates_by_id = await candidate_service.get_by_ids(
+                            [analysis["candidate_id"] for analysis in analyses if analysis.get("candidate_id")]
+                        )
+                        
                         report_results: List[Dict[str, Any]] = []
                         for idx, analysis in enumerate(analyses, start=1):
-                            candidate_label = None
-                            try:
-                                candidate = await candidate_service.get_by_id(UUID(analysis["candidate_id"]))
-                                if candidate and candidate.get("name"):
-                                    candidate_label = candidate["name"]
-                            except Exception as candidate_err:
-                                logger.warning(f"Failed to load candidate {analysis.get('candidate_id')}: {candidate_err}")
+                            candidate = candidates_by_id.get(str(analysis.get("candidate_id")))
+                            candidate_label = candidate["name"] if candidate and candidate.get("name") else None
                             
                             detailed_analysis = analysis.get("detailed_analysis") or {}
                             report_results.append({
@@ -2680,6 +2840,19 @@ async def step7_results(
                         "ai_summary": company_enrichment.get("ai_summary")
                     }
             
+            # Candidate enrichments not already attached by step 6, fetched in one query
+            candidate_ids_to_enrich: List[UUID] = []
+            for result in sorted_results:
+                enrichment = result.get("enrichment")
+                if isinstance(enrichment, dict) and "candidate" in enrichment:
+                    continue
+                try:
+                    if result.get("candidate_id"):
+                        candidate_ids_to_enrich.append(UUID(result["candidate_id"]))
+                except (ValueError, TypeError) as id_err:
+                    logger.warning(f"Failed to fetch candidate enrichment: {id_err}")
+            candidate_enrichments = await candidate_enrichment_service.get_latest_many(candidate_ids_to_enrich)
+            
             # Ensure all required fields are present for each result
             for result in sorted_results:
                 # Ensure summary is a dict (not None)
@@ -2757,24 +2930,20 @@ async def step7_results(
                 
                 # Fetch candidate enrichment if not already present
                 if "candidate" not in enrichment_data:
-                    try:
-                        candidate_id = result.get("candidate_id")
-                        if candidate_id:
-                            candidate_enrichment = await candidate_enrichment_service.get_latest(UUID(candidate_id))
-                            if candidate_enrichment:
-                                logger.info(f"Found candidate enrichment in database for {candidate_id}")
-                                enrichment_data["candidate"] = {
-                                    "name": candidate_enrichment.get("candidate_name") or candidate_enrichment.get("name"),
-                                    "professional_summary": candidate_enrichment.get("professional_summary"),
-                                    "linkedin_profile": candidate_enrichment.get("linkedin_profile"),
-                                    "github_profile": candidate_enrichment.get("github_profile"),
-                                    "portfolio_url": candidate_enrichment.get("portfolio_url"),
-                                    "publications": candidate_enrichment.get("publications", []),
-                                    "awards": candidate_enrichment.get("awards", []),
-                                    "ai_summary": candidate_enrichment.get("ai_summary")
-                                }
-                    except Exception as enrichment_err:
-                        logger.warning(f"Failed to fetch candidate enrichment: {enrichment_err}")
+                    candidate_id = result.get("candidate_id")
+                    candidate_enrichment = candidate_enrichments.get(str(candidate_id)) if candidate_id else None
+                    if candidate_enrichment:
+                        logger.info(f"Found candidate enrichment in database for {candidate_id}")
+                        enrichment_data["candidate"] = {
+                            "name": candidate_enrichment.get("candidate_name") or candidate_enrichment.get("name"),
+                            "professional_summary": candidate_enrichment.get("professional_summary"),
+                            "linkedin_profile": candidate_enrichment.get("linkedin_profile"),
+                            "github_profile": candidate_enrichment.get("github_profile"),
+                            "portfolio_url": candidate_enrichment.get("portfolio_url"),
+                            "publications": candidate_enrichment.get("publications", []),
+                            "awards": candidate_enrichment.get("awards", []),
+                            "ai_summary": candidate_enrichment.get("ai_summary")
+                        }
                 
                 # Add company enrichment if available
                 if company_enrichment_data:
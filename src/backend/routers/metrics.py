@@ -0,0 +1,40 @@
+"""
+Metrics endpoint.
+
+Serves the in-process metrics registry (services/metrics) in Prometheus
+text format for scraping. The endpoint only exists when METRICS_TOKEN is set
+and every scrape must send "Authorization: Bearer <METRICS_TOKEN>": the
+metrics name providers and models and carry error rates and cost counters,
+so they are never public.
+"""
+
+import hmac
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+from typing import Optional
+
+from config import settings
+from services.metrics import get_metrics_registry
+
+router = APIRouter(tags=["metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4"  # charset added by the response
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics(authorization: Optional[str] = Header(default=None)) -> PlainTextResponse:
+    """
+    Expose application metrics.
+    
+    Returns:
+        Prometheus text exposition of AI, database, background job, queue,
+        session and rate limit metrics
+    """
+    # Fail closed: without a scrape token the endpoint is not served at all
+    if not settings.metrics_enabled or not settings.metrics_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    expected = f"Bearer {settings.metrics_token}"
+    if not authorization or not hmac.compare_digest(authorization, expected):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return PlainTextResponse(get_metrics_registry().render(), media_type=PROMETHEUS_CONTENT_TYPE)
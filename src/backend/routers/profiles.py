@@ -3,6 +3,7 @@ from fastapi.responses import JSONResponse
 from typing import Optional, List, Dict, Any
 import logging
 
+from database import run_db
 from services.database import (
     get_company_profile_service,
     get_candidate_profile_service,
@@ -33,16 +34,16 @@ async def list_company_profiles(
         results: List[Dict[str, Any]] = []
         if name:
             # naive contains: Supabase doesn't support ilike contains easily; fetch and filter client-side
-            res = svc.client.table(svc.table_profiles).select("*").limit(1000).execute()
+            res = await run_db(svc.client.table(svc.table_profiles).select("*").limit(1000).execute)
             base = res.data or []
             results = [r for r in base if name.lower() in (r.get("company_name") or "").lower()]
         elif industry:
             # Fetch all and filter by JSONB field client-side (simpler than RPC here)
-            res = svc.client.table(svc.table_profiles).select("*").limit(1000).execute()
+            res = await run_db(svc.client.table(svc.table_profiles).select("*").limit(1000).execute)
             base = res.data or []
             results = [r for r in base if (r.get("basic_info") or {}).get("industry") == industry]
         else:
-            res = svc.client.table(svc.table_profiles).select("*").limit(limit).execute()
+            res = await run_db(svc.client.table(svc.table_profiles).select("*").limit(limit).execute)
             results = res.data or []
 
         # Apply risk filter
@@ -69,7 +70,7 @@ async def list_company_profiles(
 async def get_company_profile(profile_id: str) -> JSONResponse:
     try:
         svc = get_company_profile_service()
-        res = svc.client.table(svc.table_profiles).select("*").eq("id", profile_id).limit(1).execute()
+        res = await run_db(svc.client.table(svc.table_profiles).select("*").eq("id", profile_id).limit(1).execute)
         if not res.data:
             raise HTTPException(status_code=404, detail="Company profile not found")
         return JSONResponse({"status": "success", "item": res.data[0]})
@@ -90,7 +91,7 @@ async def list_company_positions(
         query = svc.client.table(svc.table_positions).select("*").eq("company_profile_id", profile_id)
         if status:
             query = query.eq("status", status)
-        res = query.limit(limit).execute()
+        res = await run_db(query.limit(limit).execute)
         items = res.data or []
         return JSONResponse({"status": "success", "count": len(items), "items": items})
     except Exception as e:
@@ -108,7 +109,7 @@ async def list_candidate_profiles(
         svc = get_candidate_profile_service()
 
         # Base fetch
-        res = svc.client.table(svc.table_profiles).select("*").limit(1000).execute()
+        res = await run_db(svc.client.table(svc.table_profiles).select("*").limit(1000).execute)
         results = res.data or []
 
         # Name contains
@@ -137,7 +138,7 @@ async def list_candidate_profiles(
 async def get_candidate_profile(profile_id: str) -> JSONResponse:
     try:
         svc = get_candidate_profile_service()
-        res = svc.client.table(svc.table_profiles).select("*").eq("id", profile_id).limit(1).execute()
+        res = await run_db(svc.client.table(svc.table_profiles).select("*").eq("id", profile_id).limit(1).execute)
         if not res.data:
             raise HTTPException(status_code=404, detail="Candidate profile not found")
         return JSONResponse({"status": "success", "item": res.data[0]})
@@ -11,7 +11,9 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime
 import logging
 
+from database import run_db
 from services.database.prompt_service import get_prompt_service
+from services.ai.prompt_registry import get_prompt_registry
 
 logger = logging.getLogger(__name__)
 
@@ -42,7 +44,7 @@ async def get_current_admin(authorization: Optional[str] = Header(None)):
         client = get_supabase_client()
         
         # Verify token with Supabase Auth
-        user_response = client.auth.get_user(token)
+        user_response = await run_db(client.auth.get_user, token)
         
         if not user_response or not user_response.user:
             raise HTTPException(
@@ -287,6 +289,7 @@ async def create_prompt(
         if not created:
             raise HTTPException(status_code=500, detail="Failed to create prompt")
         
+        get_prompt_registry().invalidate()
         return created
         
     except HTTPException:
@@ -329,6 +332,7 @@ async def update_prompt(
         if not updated:
             raise HTTPException(status_code=404, detail="Prompt not found or update failed")
         
+        get_prompt_registry().invalidate()
         return updated
         
     except HTTPException:
@@ -355,6 +359,7 @@ async def delete_prompt(
         if not success:
             raise HTTPException(status_code=404, detail="Prompt not found or already deleted")
         
+        get_prompt_registry().invalidate()
         return {"message": "Prompt deactivated successfully"}
         
     except HTTPException:
@@ -414,6 +419,7 @@ async def rollback_prompt(
                 detail=f"Prompt or version {version} not found"
             )
         
+        get_prompt_registry().invalidate()
         return {
             "message": f"Rolled back to version {version}",
             "prompt": updated
@@ -0,0 +1,92 @@
+"""
+Micro-benchmark: compiled prompt templates vs. repeated str.replace.
+
+Renders the interviewer analysis prompt (the largest template, built once
+per CV in step 6) with a realistic job posting and CV, using both the
+previous build_prompt loop and services/ai/prompt_template.py, checks that
+the output matches and prints the time per render.
+
+Run with: python -m scripts.benchmark_prompt_templates [--iterations N]
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+from typing import Any, Dict
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from services.ai.prompt_template import CACHE_BREAKPOINT, CompiledTemplate, compile_template, register_templates
+from services.ai.prompts import INTERVIEWER_ANALYSIS_PROMPT
+
+
+def replace_build_prompt(template: str, variables: Dict[str, Any]) -> str:
+    """The previous AIProvider.build_prompt: one str.replace per variable."""
+    prompt = template.replace(CACHE_BREAKPOINT, "")
+    for key, value in variables.items():
+        placeholder = "{" + key + "}"
+        prompt = prompt.replace(placeholder, str(value))
+    return prompt
+
+
+def sample_variables() -> Dict[str, Any]:
+    """Variables sized like a typical step 6 request (~6 KB posting, ~12 KB CV)."""
+    job_posting = "\n".join(
+        f"- Requirement {i}: experience with distributed Python services and cloud tooling"
+        for i in range(75)
+    )
+    cv_text = "\n".join(
+        f"2015-2024 | Senior engineer at Company {i} | Built data pipelines, APIs and team processes"
+        for i in range(130)
+    )
+    return {
+        "job_posting": job_posting,
+        "cv_text": cv_text,
+        "key_points": "FastAPI, PostgreSQL, leadership, English C1",
+        "weights": str({"technical_skills": 40, "experience": 30, "soft_skills": 20, "languages": 10}),
+        "hard_blockers": str(["No work permit"]),
+        "nice_to_have": str(["Kubernetes", "Terraform"]),
+        "language": "English",
+        "company_context": "Company: Acme Corp\n" * 40,
+        "candidate_context": "Public profile: GitHub, conference talks\n" * 20,
+        "enrichment_context": "",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    template = INTERVIEWER_ANALYSIS_PROMPT
+    variables = sample_variables()
+    compiled = CompiledTemplate(template)
+    # As the prompt registry does for database prompts
+    register_templates({("interviewer_analysis", "en", 1): compiled})
+
+    expected = replace_build_prompt(template, variables)
+    assert compiled.render(variables) == expected, "compiled render differs from str.replace output"
+
+    results = {
+        "str.replace loop": timeit.timeit(lambda: replace_build_prompt(template, variables), number=args.iterations),
+        "compiled render (cached)": timeit.timeit(
+            lambda: compile_template(template).render(variables), number=args.iterations
+        ),
+        "compile + render (cold)": timeit.timeit(
+            lambda: CompiledTemplate(template).render(variables), number=args.iterations
+        ),
+    }
+
+    print(f"Template: {len(template):,} chars, prompt: {len(expected):,} chars, "
+          f"{len(variables)} variables, {args.iterations} iterations")
+    baseline = results["str.replace loop"]
+    for label, seconds in results.items():
+        per_call_us = seconds / args.iterations * 1_000_000
+        print(f"  {label:<26} {per_call_us:8.1f} us/render  ({baseline / seconds:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -21,6 +21,7 @@ from services.ai.prompts import (
     JOB_POSTING_NORMALIZATION_PROMPT,
     WEIGHTING_RECOMMENDATION_PROMPT,
     CV_SUMMARY_PROMPT,
+    CV_SUMMARY_BATCH_PROMPT,
     INTERVIEWER_ANALYSIS_PROMPT,
     CANDIDATE_ANALYSIS_PROMPT,
     TRANSLATION_PROMPT,
@@ -100,7 +101,7 @@ DEFAULT_PROMPTS = [
         "description": "Creates a concise summary of a CV including key identifiers, skills, and achievements.",
         "content": CV_SUMMARY_PROMPT,
         "category": "cv_extraction",
-        "variables": ["file_name", "language"],
+        "variables": ["cv_text", "file_name", "language"],
         "language": "en",
         "model_preferences": {
             "temperature": 0.4,
@@ -109,6 +110,21 @@ DEFAULT_PROMPTS = [
         },
         "admin_notes": "Used for quick candidate overviews. Should be concise and factual."
     },
+    {
+        "prompt_key": "cv_summary_batch",
+        "name": "CV Summary (Batch)",
+        "description": "Summarizes several CVs in one request, returning one summary per CV index.",
+        "content": CV_SUMMARY_BATCH_PROMPT,
+        "category": "cv_extraction",
+        "variables": ["cv_count", "cvs", "language"],
+        "language": "en",
+        "model_preferences": {
+            "temperature": 0.4,
+            "max_tokens": 3000,
+            "preferred_provider": "gemini"
+        },
+        "admin_notes": "Used by step 5 uploads. Must return {\"summaries\": [...]} with the CV index in each entry; entries that are missing or unparseable are re-summarized one by one with cv_summary."
+    },
     {
         "prompt_key": "interviewer_analysis",
         "name": "Interviewer Analysis",
@@ -122,6 +138,8 @@ DEFAULT_PROMPTS = [
             "weights",
             "hard_blockers",
             "nice_to_have",
+            "company_context",
+            "candidate_context",
             "enrichment_context",
             "language"
         ],
@@ -131,7 +149,7 @@ DEFAULT_PROMPTS = [
             "max_tokens": 3000,
             "preferred_provider": "gemini"
         },
-        "admin_notes": "Main evaluation prompt for interviewer flow. Questions should be sequenced and actionable."
+        "admin_notes": "Main evaluation prompt for interviewer flow. Questions should be sequenced and actionable. Everything above {cache_breakpoint} is identical for every CV of a session and is sent as a cached prompt prefix, so keep per-candidate variables (cv_text, candidate_context) below it. enrichment_context (company + candidate) is still filled for older templates."
     },
     {
         "prompt_key": "candidate_analysis",
@@ -4,7 +4,7 @@ AI services package.
 Provides abstraction layer for multiple AI providers.
 """
 
-from .base import AIProvider, AIRequest, AIResponse, PromptType
+from .base import AIProvider, AIRequest, AIResponse, AIStreamChunk, AIStreamError, PromptSection, PromptType
 from .gemini_provider import GeminiProvider
 from .openai_provider import OpenAIProvider
 from .claude_provider import ClaudeProvider
@@ -16,6 +16,9 @@ __all__ = [
     "AIProvider",
     "AIRequest",
     "AIResponse",
+    "AIStreamChunk",
+    "AIStreamError",
+    "PromptSection",
     "PromptType",
     "GeminiProvider",
     "OpenAIProvider",
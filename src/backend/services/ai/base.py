@@ -5,10 +5,12 @@ Defines the interface that all AI providers must implement.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
-from pydantic import BaseModel
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple
+from pydantic import BaseModel, computed_field
 from enum import Enum
 
+from .prompt_template import compile_template
+
 
 class PromptType(str, Enum):
     """Types of AI prompts supported by the platform."""
@@ -38,6 +40,18 @@ class PromptType(str, Enum):
     ANALYZE_CANDIDATE_SOCIAL_MEDIA_RISK = "analyze_candidate_social_media_risk"
 
 
+class PromptSection(BaseModel):
+    """
+    A prompt variable that may be trimmed to fit the model's context window.
+    
+    See services/ai/prompt_budget.py.
+    """
+    name: str  # Variable name in the template
+    priority: int = 0  # Lower is kept first; higher-priority sections are trimmed last
+    max_tokens: Optional[int] = None  # Cap for this section regardless of the model budget
+    keep_tail: bool = False  # Trim from the middle (keep start and end) instead of the end
+
+
 class AIRequest(BaseModel):
     """Base request for AI operations."""
     prompt_type: PromptType
@@ -46,6 +60,12 @@ class AIRequest(BaseModel):
     language: str = "en"
     max_tokens: Optional[int] = None
     temperature: Optional[float] = 0.7
+    use_cache: bool = True  # Allow serving/storing this request in the AI response cache
+    hedge: bool = False  # Opt in to hedged requests (latency-critical prompts only)
+    max_hedges: int = 1  # Max extra provider calls hedging may trigger for this request
+    budget_sections: List[PromptSection] = []  # Variables fitted to the model's context window
+    json_output: Optional[bool] = None  # Expect a JSON document (None: decided by prompt type)
+    timeout: Optional[float] = None  # Seconds allowed per provider call (time queued for rate limits/slots not counted)
 
 
 class AIResponse(BaseModel):
@@ -60,6 +80,40 @@ class AIResponse(BaseModel):
     output_tokens: Optional[int] = None
     latency_ms: Optional[int] = None
     cost_usd: Optional[float] = None
+    cache_hit: bool = False  # Served from the AI response cache (no tokens billed)
+    rate_limited: bool = False  # Provider answered 429 / quota exceeded
+    retry_after: Optional[float] = None  # Seconds to wait before retrying (Retry-After)
+    hedged: bool = False  # A hedge call was fired for this request (see ai_usage logs for both calls)
+    cached_input_tokens: Optional[int] = None  # Input tokens read from the provider's prompt cache
+    cache_write_tokens: Optional[int] = None  # Input tokens written to the provider's prompt cache
+    
+    @computed_field
+    @property
+    def prompt_cache_hit_rate(self) -> Optional[float]:
+        """Share of input tokens served from the provider's prompt cache."""
+        if self.cached_input_tokens is None or not self.input_tokens:
+            return None
+        return round(self.cached_input_tokens / self.input_tokens, 3)
+
+
+class AIStreamChunk(BaseModel):
+    """Incremental piece of a streamed completion."""
+    text: str = ""
+    done: bool = False  # Last chunk of the stream; carries the aggregated response
+    response: Optional[AIResponse] = None  # Full text, usage and cost (only on the done chunk)
+
+
+class AIStreamError(Exception):
+    """
+    Raised by AIProvider.stream when the provider call fails.
+    
+    Carries the error AIResponse (rate limit / Retry-After info included) so
+    callers can account for the failure the same way as a failed complete().
+    """
+    
+    def __init__(self, response: AIResponse):
+        super().__init__(response.error or "AI stream failed")
+        self.response = response
 
 
 class AIProvider(ABC):
@@ -99,6 +153,30 @@ class AIProvider(ABC):
         """
         pass
     
+    async def stream(self, request: AIRequest) -> AsyncIterator[AIStreamChunk]:
+        """
+        Execute an AI completion request, yielding text as it is generated.
+        
+        The last chunk has done=True and carries the aggregated AIResponse.
+        Providers without native streaming fall back to complete() and yield
+        the whole text as a single chunk.
+        
+        Args:
+            request: The AI request to process
+            
+        Yields:
+            AIStreamChunk with text deltas, then the done chunk
+            
+        Raises:
+            AIStreamError: If the provider call fails
+        """
+        response = await self.complete(request)
+        if not response.success:
+            raise AIStreamError(response)
+        if response.raw_text:
+            yield AIStreamChunk(text=response.raw_text)
+        yield AIStreamChunk(done=True, response=response)
+    
     @abstractmethod
     async def extract_structured_data(
         self,
@@ -123,6 +201,8 @@ class AIProvider(ABC):
         """
         Build a complete prompt from template and variables.
         
+        The template is parsed once and cached (see prompt_template.py).
+        
         Args:
             template: Prompt template with placeholders
             variables: Values to substitute into template
@@ -130,11 +210,23 @@ class AIProvider(ABC):
         Returns:
             Complete prompt string
         """
-        prompt = template
-        for key, value in variables.items():
-            placeholder = "{" + key + "}"
-            prompt = prompt.replace(placeholder, str(value))
-        return prompt
+        return compile_template(template).render(variables)
+    
+    def build_prompt_parts(self, template: str, variables: Dict[str, Any]) -> Tuple[str, str]:
+        """
+        Build a prompt split at the template's cache breakpoint.
+        
+        Providers with prompt caching send the prefix as a cacheable block;
+        prefix + suffix is always equal to build_prompt().
+        
+        Args:
+            template: Prompt template with placeholders
+            variables: Values to substitute into template
+            
+        Returns:
+            (prefix, suffix); prefix is empty if the template has no breakpoint
+        """
+        return compile_template(template).render_parts(variables)
     
     async def health_check(self) -> bool:
         """
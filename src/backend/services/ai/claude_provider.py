@@ -4,13 +4,18 @@ Anthropic Claude AI provider implementation.
 
 import json
 import time
-from typing import Dict, Any, Optional
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
 from anthropic import AsyncAnthropic
-from .base import AIProvider, AIRequest, AIResponse, PromptType
+from .base import AIProvider, AIRequest, AIResponse, AIStreamChunk, AIStreamError, PromptType
+from .rate_limiter import get_retry_after, is_rate_limit_error
+from .structured_output import expects_json, parse_structured_output
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Start of the assistant turn for JSON prompts (returned text continues it)
+JSON_PREFILL = "{"
+
 
 class ClaudeProvider(AIProvider):
     """
@@ -36,84 +41,56 @@ class ClaudeProvider(AIProvider):
         start_time = time.time()
         
         try:
-            # Build complete prompt
-            prompt = self.build_prompt(request.template, request.variables)
-            
             # Get maximum tokens for this model
             from .model_limits import get_max_output_tokens
             max_tokens = request.max_tokens or get_max_output_tokens(self.model_name)
             
+            # Claude has no JSON mode: prefill the reply with "{" so it starts
+            # with the JSON document instead of prose or a code fence
+            json_mode = expects_json(request)
+            messages = self._build_messages(request)
+            if json_mode:
+                messages.append({"role": "assistant", "content": JSON_PREFILL})
+            
             # Create message
             response = await self.client.messages.create(
                 model=self.model_name,
                 max_tokens=max_tokens,
                 temperature=request.temperature or 0.7,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
+                messages=messages
             )
             
             latency_ms = int((time.time() - start_time) * 1000)
             
             # Extract response
             raw_text = response.content[0].text if response.content else ""
+            if json_mode:
+                raw_text = JSON_PREFILL + raw_text
             
-            # Try to parse as JSON if expected
-            data = None
-            if request.prompt_type in [
-                PromptType.CV_EXTRACTION,
-                PromptType.JOB_POSTING_NORMALIZATION,
-                PromptType.INTERVIEWER_ANALYSIS,
-                PromptType.CANDIDATE_ANALYSIS,
-                PromptType.WEIGHTING_RECOMMENDATION,
-                PromptType.CV_SUMMARY,
-                PromptType.EXECUTIVE_RECOMMENDATION
-            ]:
-                try:
-                    # Try to find JSON in response
-                    json_text = raw_text
-                    if "```json" in raw_text:
-                        json_start = raw_text.find("```json") + 7
-                        json_end = raw_text.find("```", json_start)
-                        json_text = raw_text[json_start:json_end].strip()
-                    elif "```" in raw_text:
-                        json_start = raw_text.find("```") + 3
-                        json_end = raw_text.find("```", json_start)
-                        json_text = raw_text[json_start:json_end].strip()
-                    
-                    # Clean up common AI mistakes
-                    json_text = json_text.strip()
-                    # Fix double braces (AI sometimes copies {{ from examples)
-                    # Replace ALL occurrences, not just start/end
-                    json_text = json_text.replace("{{", "{").replace("}}", "}")
-                    
-                    data = json.loads(json_text)
-                except json.JSONDecodeError as e:
-                    logger.warning(f"Failed to parse Claude response as JSON: {e}")
-                    logger.warning(f"Raw text (first 500 chars): {raw_text[:500]}")
+            # Parse and validate JSON output
+            data, parse_error = parse_structured_output(request, raw_text)
+            if parse_error:
+                logger.warning(f"Claude {parse_error}; raw text (first 500 chars): {raw_text[:500]}")
             
             # Calculate cost (Claude pricing)
-            input_tokens = response.usage.input_tokens if response.usage else 0
+            input_tokens, cached_tokens, cache_write_tokens = self._input_usage(response.usage)
             output_tokens = response.usage.output_tokens if response.usage else 0
             
-            # Claude 3 pricing (approximate)
-            if "opus" in self.model_name:
-                cost_usd = (input_tokens * 0.000015) + (output_tokens * 0.000075)
-            elif "sonnet" in self.model_name:
-                cost_usd = (input_tokens * 0.000003) + (output_tokens * 0.000015)
-            else:  # Haiku
-                cost_usd = (input_tokens * 0.00000025) + (output_tokens * 0.00000125)
+            cost_usd = self._calculate_cost(input_tokens, output_tokens, cached_tokens, cache_write_tokens)
             
             return AIResponse(
-                success=True,
+                success=parse_error is None,
                 data=data,
+                error=parse_error,
                 raw_text=raw_text,
                 provider=self.provider_name,
                 model=self.model_name,
                 input_tokens=input_tokens,
                 output_tokens=output_tokens,
                 latency_ms=latency_ms,
-                cost_usd=cost_usd
+                cost_usd=cost_usd,
+                cached_input_tokens=cached_tokens,
+                cache_write_tokens=cache_write_tokens
             )
             
         except Exception as e:
@@ -125,9 +102,128 @@ class ClaudeProvider(AIProvider):
                 error=str(e),
                 provider=self.provider_name,
                 model=self.model_name,
-                latency_ms=latency_ms
+                latency_ms=latency_ms,
+                rate_limited=is_rate_limit_error(e),
+                retry_after=get_retry_after(e)
             )
     
+    async def stream(self, request: AIRequest) -> AsyncIterator[AIStreamChunk]:
+        """Stream a completion from Claude, yielding text deltas."""
+        start_time = time.time()
+        
+        from .model_limits import get_max_output_tokens
+        max_tokens = request.max_tokens or get_max_output_tokens(self.model_name)
+        
+        try:
+            stream = await self.client.messages.create(
+                model=self.model_name,
+                max_tokens=max_tokens,
+                temperature=request.temperature or 0.7,
+                messages=self._build_messages(request),
+                stream=True
+            )
+        except Exception as e:
+            logger.error(f"Claude API error: {e}")
+            raise AIStreamError(AIResponse(
+                success=False,
+                error=str(e),
+                provider=self.provider_name,
+                model=self.model_name,
+                latency_ms=int((time.time() - start_time) * 1000),
+                rate_limited=is_rate_limit_error(e),
+                retry_after=get_retry_after(e)
+            )) from e
+        
+        parts: List[str] = []
+        input_tokens = 0
+        cached_tokens = None
+        cache_write_tokens = None
+        output_tokens = 0
+        async for event in stream:
+            if event.type == "message_start":
+                input_tokens, cached_tokens, cache_write_tokens = self._input_usage(event.message.usage)
+            elif event.type == "content_block_delta":
+                text = getattr(event.delta, "text", "")
+                if text:
+                    parts.append(text)
+                    yield AIStreamChunk(text=text)
+            elif event.type == "message_delta":
+                output_tokens = event.usage.output_tokens
+        
+        yield AIStreamChunk(done=True, response=AIResponse(
+            success=True,
+            raw_text="".join(parts),
+            provider=self.provider_name,
+            model=self.model_name,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            latency_ms=int((time.time() - start_time) * 1000),
+            cost_usd=self._calculate_cost(input_tokens, output_tokens, cached_tokens, cache_write_tokens),
+            cached_input_tokens=cached_tokens,
+            cache_write_tokens=cache_write_tokens
+        ))
+    
+    def _build_messages(self, request: AIRequest) -> List[Dict[str, Any]]:
+        """
+        Build the messages for a request.
+        
+        When the template has a cache breakpoint, the prefix is sent as its
+        own content block marked with cache_control, so requests sharing it
+        (e.g. every CV of a step 6 analysis) read it from Claude's prompt cache.
+        """
+        prefix, suffix = self.build_prompt_parts(request.template, request.variables)
+        if not prefix:
+            return [{"role": "user", "content": suffix}]
+        content = [{"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}}]
+        if suffix:
+            content.append({"type": "text", "text": suffix})
+        return [{"role": "user", "content": content}]
+    
+    @staticmethod
+    def _input_usage(usage: Any) -> Tuple[int, Optional[int], Optional[int]]:
+        """
+        Read input usage, including prompt cache reads and writes.
+        
+        Claude reports cached tokens separately from input_tokens; the total
+        is returned as input tokens so it compares with other providers.
+        
+        Returns:
+            (total input tokens, cache read tokens, cache write tokens)
+        """
+        if usage is None:
+            return 0, None, None
+        cached_tokens = getattr(usage, "cache_read_input_tokens", None)
+        cache_write_tokens = getattr(usage, "cache_creation_input_tokens", None)
+        input_tokens = (usage.input_tokens or 0) + (cached_tokens or 0) + (cache_write_tokens or 0)
+        return input_tokens, cached_tokens, cache_write_tokens
+    
+    def _calculate_cost(
+        self,
+        input_tokens: int,
+        output_tokens: int,
+        cached_tokens: Optional[int] = None,
+        cache_write_tokens: Optional[int] = None,
+    ) -> float:
+        """
+        Approximate cost in USD for the current model (Claude 3 pricing).
+        
+        Cache reads are billed at 10% and cache writes at 125% of the input price.
+        """
+        if "opus" in self.model_name:
+            input_price, output_price = 0.000015, 0.000075
+        elif "sonnet" in self.model_name:
+            input_price, output_price = 0.000003, 0.000015
+        else:
+            # Haiku
+            input_price, output_price = 0.00000025, 0.00000125
+        cached_tokens = cached_tokens or 0
+        cache_write_tokens = cache_write_tokens or 0
+        uncached_tokens = max(0, input_tokens - cached_tokens - cache_write_tokens)
+        return (
+            (uncached_tokens + cached_tokens * 0.1 + cache_write_tokens * 1.25) * input_price
+            + output_tokens * output_price
+        )
+    
     async def extract_structured_data(
         self,
         text: str,
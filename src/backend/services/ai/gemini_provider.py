@@ -2,18 +2,40 @@
 Google Gemini AI provider implementation.
 """
 
+import asyncio
 import json
 import re
 import time
-from typing import Dict, Any, Optional, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import AsyncIterator, Dict, Any, Optional, List, Tuple
 import logging
 
 import google.generativeai as genai
 
-from .base import AIProvider, AIRequest, AIResponse, PromptType
+from config import settings
+
+from .base import AIProvider, AIRequest, AIResponse, AIStreamChunk, AIStreamError, PromptType
+from .rate_limiter import get_retry_after, is_rate_limit_error
+from .structured_output import expects_json, parse_structured_output
 
 logger = logging.getLogger(__name__)
 
+# Dedicated, bounded executor for blocking Gemini SDK calls.
+# Keeps generate_content off the event loop without exhausting the default pool.
+_gemini_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_gemini_executor() -> ThreadPoolExecutor:
+    """Get (or lazily create) the shared Gemini executor."""
+    global _gemini_executor
+    if _gemini_executor is None:
+        _gemini_executor = ThreadPoolExecutor(
+            max_workers=settings.gemini_executor_workers,
+            thread_name_prefix="gemini",
+        )
+    return _gemini_executor
+
 
 class GeminiProvider(AIProvider):
     """
@@ -28,7 +50,8 @@ class GeminiProvider(AIProvider):
         genai.configure(api_key=self.api_key)
 
         requested_model = self.config.get("model")
-        available_models = self._discover_available_models()
+        # Model discovery is a network call; skip it when the model is pinned
+        available_models = [] if requested_model else self._discover_available_models()
         
         # USER PREFERENCE: Gemini 2.5 Flash Lite first (most permissive safety filters)
         preferred_order = self.config.get(
@@ -115,9 +138,11 @@ class GeminiProvider(AIProvider):
             max_output_tokens = request.max_tokens or get_max_output_tokens(self.model_name)
             
             # Configure generation parameters
-            generation_config = genai.types.GenerationConfig(
+            json_mode = expects_json(request)
+            generation_config = self._generation_config(
                 temperature=request.temperature or 0.7,
                 max_output_tokens=max_output_tokens,
+                json_mode=json_mode,
             )
             
             # EXPERIMENTAL: Try WITHOUT safety_settings
@@ -126,7 +151,7 @@ class GeminiProvider(AIProvider):
             
             while True:
                 try:
-                    response = self.model.generate_content(
+                    response = await self._generate_content(
                         prompt_to_use,
                         generation_config=generation_config
                         # NO safety_settings parameter at all
@@ -156,7 +181,7 @@ class GeminiProvider(AIProvider):
                     ]
                     
                     try:
-                        response = self.model.generate_content(
+                        response = await self._generate_content(
                             prompt_to_use,
                             generation_config=generation_config,
                             safety_settings=safety_settings
@@ -241,39 +266,10 @@ class GeminiProvider(AIProvider):
                     latency_ms=latency_ms
                 )
             
-            # Try to parse as JSON if expected
-            data = None
-            if request.prompt_type in [
-                PromptType.CV_EXTRACTION,
-                PromptType.JOB_POSTING_NORMALIZATION,
-                PromptType.INTERVIEWER_ANALYSIS,
-                PromptType.CANDIDATE_ANALYSIS,
-                PromptType.WEIGHTING_RECOMMENDATION,
-                PromptType.CV_SUMMARY,
-                PromptType.EXECUTIVE_RECOMMENDATION
-            ]:
-                try:
-                    # Try to find JSON in response
-                    json_text = raw_text
-                    if "```json" in raw_text:
-                        json_start = raw_text.find("```json") + 7
-                        json_end = raw_text.find("```", json_start)
-                        json_text = raw_text[json_start:json_end].strip()
-                    elif "```" in raw_text:
-                        json_start = raw_text.find("```") + 3
-                        json_end = raw_text.find("```", json_start)
-                        json_text = raw_text[json_start:json_end].strip()
-                    
-                    # Clean up common AI mistakes
-                    json_text = json_text.strip()
-                    # Fix double braces (AI sometimes copies {{ from examples)
-                    # Replace ALL occurrences, not just start/end
-                    json_text = json_text.replace("{{", "{").replace("}}", "}")
-                    
-                    data = json.loads(json_text)
-                except json.JSONDecodeError as e:
-                    logger.warning(f"Failed to parse Gemini response as JSON: {e}")
-                    logger.warning(f"Raw text (first 500 chars): {raw_text[:500]}")
+            # Parse and validate JSON output
+            data, parse_error = parse_structured_output(request, raw_text)
+            if parse_error:
+                logger.warning(f"Gemini {parse_error}; raw text (first 500 chars): {raw_text[:500]}")
             
             # Estimate cost (rough approximation)
             # Gemini pricing varies; this is a placeholder
@@ -281,16 +277,23 @@ class GeminiProvider(AIProvider):
             output_chars = len(raw_text)
             cost_usd = (input_chars * 0.000001) + (output_chars * 0.000002)
             
+            # Newer Gemini models cache shared prompt prefixes implicitly and
+            # report it in usage_metadata (not exposed by older SDK versions)
+            usage = getattr(response, "usage_metadata", None)
+            cached_tokens = getattr(usage, "cached_content_token_count", None) if usage else None
+            
             return AIResponse(
-                success=True,
+                success=parse_error is None,
                 data=data,
+                error=parse_error,
                 raw_text=raw_text,
                 provider=self.provider_name,
                 model=self.model_name,
                 input_tokens=input_chars // 4,  # Rough estimate
                 output_tokens=output_chars // 4,
                 latency_ms=latency_ms,
-                cost_usd=cost_usd
+                cost_usd=cost_usd,
+                cached_input_tokens=cached_tokens
             )
             
         except Exception as e:
@@ -311,9 +314,47 @@ class GeminiProvider(AIProvider):
                 error=str(e),
                 provider=self.provider_name,
                 model=self.model_name,
-                latency_ms=latency_ms
+                latency_ms=latency_ms,
+                rate_limited=is_rate_limit_error(e),
+                retry_after=get_retry_after(e)
             )
     
+    @staticmethod
+    def _generation_config(temperature: float, max_output_tokens: int, json_mode: bool = False) -> Any:
+        """
+        Build the generation config, asking for a JSON response when supported.
+        
+        response_mime_type is only accepted by newer google-generativeai
+        releases; older ones fall back to a plain config (the JSON is then
+        recovered by the structured output parser).
+        """
+        if json_mode:
+            try:
+                return genai.types.GenerationConfig(
+                    temperature=temperature,
+                    max_output_tokens=max_output_tokens,
+                    response_mime_type="application/json",
+                )
+            except TypeError:
+                pass
+        return genai.types.GenerationConfig(
+            temperature=temperature,
+            max_output_tokens=max_output_tokens,
+        )
+    
+    async def _generate_content(self, prompt: str, **kwargs) -> Any:
+        """
+        Run the blocking generate_content call on the Gemini executor.
+        
+        The model is captured at call time so a concurrent model switch
+        does not affect a request that is already in flight.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _get_gemini_executor(),
+            partial(self.model.generate_content, prompt, **kwargs)
+        )
+    
     def _handle_generation_exception(
         self,
         exception: Exception,
@@ -390,6 +431,70 @@ class GeminiProvider(AIProvider):
         
         return sanitized_prompt
     
+    async def stream(self, request: AIRequest) -> AsyncIterator[AIStreamChunk]:
+        """
+        Stream a completion from Gemini, yielding text as chunks arrive.
+        
+        The blocking SDK iterator is advanced on the Gemini executor. Unlike
+        complete(), there is no in-provider model switching or prompt
+        sanitization: a failure raises AIStreamError and AIManager moves on
+        to the next fallback entry.
+        """
+        start_time = time.time()
+        prompt = self.build_prompt(request.template, request.variables)
+        
+        from .model_limits import get_max_output_tokens
+        generation_config = genai.types.GenerationConfig(
+            temperature=request.temperature or 0.7,
+            max_output_tokens=request.max_tokens or get_max_output_tokens(self.model_name),
+        )
+        
+        def _error(exc: Exception) -> AIStreamError:
+            logger.error(f"Gemini API error: {exc}")
+            return AIStreamError(AIResponse(
+                success=False,
+                error=str(exc),
+                provider=self.provider_name,
+                model=self.model_name,
+                latency_ms=int((time.time() - start_time) * 1000),
+                rate_limited=is_rate_limit_error(exc),
+                retry_after=get_retry_after(exc)
+            ))
+        
+        loop = asyncio.get_running_loop()
+        executor = _get_gemini_executor()
+        try:
+            response = await self._generate_content(prompt, generation_config=generation_config, stream=True)
+            chunks = iter(response)
+        except Exception as e:
+            raise _error(e) from e
+        
+        parts: List[str] = []
+        while True:
+            try:
+                chunk = await loop.run_in_executor(executor, next, chunks, None)
+                if chunk is None:
+                    break
+                # .text raises ValueError when the chunk was blocked by safety filters
+                text = chunk.text
+            except Exception as e:
+                raise _error(e) from e
+            if text:
+                parts.append(text)
+                yield AIStreamChunk(text=text)
+        
+        raw_text = "".join(parts)
+        yield AIStreamChunk(done=True, response=AIResponse(
+            success=True,
+            raw_text=raw_text,
+            provider=self.provider_name,
+            model=self.model_name,
+            input_tokens=len(prompt) // 4,  # Rough estimate, as in complete()
+            output_tokens=len(raw_text) // 4,
+            latency_ms=int((time.time() - start_time) * 1000),
+            cost_usd=(len(prompt) * 0.000001) + (len(raw_text) * 0.000002)
+        ))
+    
     async def extract_structured_data(
         self,
         text: str,
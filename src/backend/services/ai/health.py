@@ -0,0 +1,361 @@
+"""
+Provider health tracking and circuit breaking.
+
+Keeps rolling stats per (provider, model) — success rate, p50/p95 latency and
+recent 429/5xx counts — and a circuit breaker per entry:
+
+- closed: requests flow normally
+- open: the entry is skipped by the fallback chain for a cool-down period
+- half-open: after the cool-down a single probe request is let through;
+  success closes the circuit, failure opens it again
+
+AIManager uses this to reorder and filter the fallback chain so a degraded
+provider doesn't cost a full timeout on every call.
+"""
+
+import logging
+import re
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from config import settings
+
+from .base import AIResponse
+
+logger = logging.getLogger(__name__)
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+# Minimum samples before the success rate can trip the breaker / mark degraded
+MIN_SAMPLES = 10
+
+# Success rate below which a closed entry is tried after healthy ones
+DEGRADED_SUCCESS_RATE = 0.8
+
+# 429/5xx counts are reported for this trailing window
+RECENT_ERRORS_SECONDS = 300
+
+_SERVER_ERROR_PATTERN = re.compile(
+    r"\b5\d\d\b|internal server error|service unavailable|bad gateway|overloaded|timed out|timeout",
+    re.IGNORECASE,
+)
+
+
+def _percentile(values: List[float], percentile: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(percentile / 100.0 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+class _EntryHealth:
+    """Rolling window and breaker state for one (provider, model)."""
+
+    def __init__(self, window_size: int):
+        # (timestamp, success, latency_ms, error_kind)
+        self.samples: Deque[Tuple[float, bool, Optional[int], Optional[str]]] = deque(maxlen=window_size)
+        self.state = CIRCUIT_CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probe_started_at: Optional[float] = None
+        self.times_opened = 0
+
+    def success_rate(self) -> Optional[float]:
+        if not self.samples:
+            return None
+        return sum(1 for sample in self.samples if sample[1]) / len(self.samples)
+
+    def latencies(self) -> List[float]:
+        return [sample[2] for sample in self.samples if sample[1] and sample[2] is not None]
+
+    def recent_errors(self, kind: str, now: float) -> int:
+        return sum(
+            1 for timestamp, _, _, error_kind in self.samples
+            if error_kind == kind and now - timestamp <= RECENT_ERRORS_SECONDS
+        )
+
+
+class ProviderHealthTracker:
+    """
+    Rolling health stats and circuit breakers for AI provider/model entries.
+    """
+
+    def __init__(
+        self,
+        window_size: int = 50,
+        failure_threshold: int = 3,
+        min_success_rate: float = 0.5,
+        open_seconds: float = 30.0,
+    ):
+        self.window_size = window_size
+        self.failure_threshold = failure_threshold
+        self.min_success_rate = min_success_rate
+        self.open_seconds = open_seconds
+        self._entries: Dict[Tuple[str, str], _EntryHealth] = {}
+
+    def _entry(self, provider_name: str, model_name: Optional[str]) -> _EntryHealth:
+        key = (provider_name, model_name or "")
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = _EntryHealth(self.window_size)
+            self._entries[key] = entry
+        return entry
+
+    @staticmethod
+    def classify_error(response: AIResponse) -> Optional[str]:
+        """
+        Classify a failed response as "rate_limited" (429), "server_error" (5xx/timeout) or "error".
+
+        Args:
+            response: Provider response
+
+        Returns:
+            Error kind, or None for a successful response
+        """
+        if response.success:
+            return None
+        if response.rate_limited:
+            return "rate_limited"
+        if response.error and _SERVER_ERROR_PATTERN.search(response.error):
+            return "server_error"
+        return "error"
+
+    def record(
+        self,
+        provider_name: str,
+        model_name: Optional[str],
+        success: bool,
+        latency_ms: Optional[int] = None,
+        error_kind: Optional[str] = None,
+    ):
+        """
+        Record the outcome of a provider call and update the breaker.
+
+        Args:
+            provider_name: Provider name
+            model_name: Model identifier
+            success: Whether the call succeeded
+            latency_ms: Call latency
+            error_kind: Error classification for failures (see classify_error)
+        """
+        now = time.monotonic()
+        entry = self._entry(provider_name, model_name)
+        entry.samples.append((now, success, latency_ms, None if success else (error_kind or "error")))
+
+        if success:
+            entry.consecutive_failures = 0
+            if entry.state == CIRCUIT_HALF_OPEN:
+                logger.info(f"Circuit closed for {provider_name}/{model_name} (probe succeeded)")
+                entry.state = CIRCUIT_CLOSED
+                entry.probe_started_at = None
+                # Start from a clean window so old failures don't re-trip it
+                entry.samples.clear()
+                entry.samples.append((now, success, latency_ms, None))
+            return
+
+        entry.consecutive_failures += 1
+        if entry.state == CIRCUIT_HALF_OPEN:
+            self._open(provider_name, model_name, entry, now, "probe failed")
+            return
+
+        success_rate = entry.success_rate()
+        if entry.state == CIRCUIT_CLOSED and (
+            entry.consecutive_failures >= self.failure_threshold
+            or (len(entry.samples) >= MIN_SAMPLES and success_rate is not None
+                and success_rate < self.min_success_rate)
+        ):
+            self._open(
+                provider_name, model_name, entry, now,
+                f"{entry.consecutive_failures} consecutive failures, success rate {success_rate:.0%}"
+            )
+
+    def _open(self, provider_name: str, model_name: Optional[str], entry: _EntryHealth, now: float, reason: str):
+        entry.state = CIRCUIT_OPEN
+        entry.opened_at = now
+        entry.probe_started_at = None
+        entry.times_opened += 1
+        logger.warning(
+            f"Circuit opened for {provider_name}/{model_name} ({reason}); "
+            f"skipping it for {self.open_seconds:.0f}s"
+        )
+
+    def allow_request(self, provider_name: str, model_name: Optional[str]) -> bool:
+        """
+        Check whether the fallback chain may use this entry now.
+
+        An open circuit past its cool-down moves to half-open and admits one
+        probe request; further requests are refused until the probe reports.
+
+        Args:
+            provider_name: Provider name
+            model_name: Model identifier
+
+        Returns:
+            True if a request may be sent
+        """
+        entry = self._entries.get((provider_name, model_name or ""))
+        if entry is None or entry.state == CIRCUIT_CLOSED:
+            return True
+
+        now = time.monotonic()
+        if entry.state == CIRCUIT_OPEN:
+            if now - entry.opened_at < self.open_seconds:
+                return False
+            entry.state = CIRCUIT_HALF_OPEN
+            logger.info(f"Circuit half-open for {provider_name}/{model_name}; sending probe")
+
+        # Half-open: one probe at a time (a stuck probe is replaced after the cool-down)
+        if entry.probe_started_at is not None and now - entry.probe_started_at < self.open_seconds:
+            return False
+        entry.probe_started_at = now
+        return True
+
+    def latency_percentile(
+        self,
+        provider_name: str,
+        model_name: Optional[str],
+        percentile: float,
+        min_samples: int = 5,
+    ) -> Optional[float]:
+        """
+        Get an observed latency percentile for successful calls.
+
+        Args:
+            provider_name: Provider name
+            model_name: Model identifier
+            percentile: Percentile (0-100)
+            min_samples: Minimum successful samples required
+
+        Returns:
+            Latency in ms, or None if there isn't enough data
+        """
+        entry = self._entries.get((provider_name, model_name or ""))
+        if entry is None:
+            return None
+        latencies = entry.latencies()
+        if len(latencies) < min_samples:
+            return None
+        return _percentile(latencies, percentile)
+
+    def is_degraded(self, provider_name: str, model_name: Optional[str]) -> bool:
+        """Whether a closed entry has a poor recent success rate."""
+        entry = self._entries.get((provider_name, model_name or ""))
+        if entry is None or len(entry.samples) < MIN_SAMPLES:
+            return False
+        success_rate = entry.success_rate()
+        return success_rate is not None and success_rate < DEGRADED_SUCCESS_RATE
+
+    def order_chain(self, chain: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Reorder a fallback chain by health.
+
+        Healthy entries keep their configured order, degraded ones move after
+        them and entries with an open circuit are dropped. If every entry is
+        open, the chain is returned unchanged rather than failing outright.
+
+        Args:
+            chain: Fallback chain items with "provider" and "model"
+
+        Returns:
+            Chain to try, in order
+        """
+        healthy: List[Dict[str, Any]] = []
+        degraded: List[Dict[str, Any]] = []
+        for item in chain:
+            provider_name = item.get("provider")
+            model_name = self.normalize_model(provider_name, item.get("model"))
+            if not self.allow_request(provider_name, model_name):
+                logger.info(f"Skipping {provider_name}/{model_name}: circuit open")
+                continue
+            if self.is_degraded(provider_name, model_name):
+                degraded.append(item)
+            else:
+                healthy.append(item)
+
+        ordered = healthy + degraded
+        return ordered if ordered else list(chain)
+
+    @staticmethod
+    def normalize_model(provider_name: Optional[str], model_name: Optional[str]) -> Optional[str]:
+        """Normalize model names the same way pooled providers are keyed."""
+        if provider_name == "gemini" and model_name and not model_name.startswith("models/"):
+            return f"models/{model_name}"
+        return model_name
+
+    def reset(self, provider_name: Optional[str] = None, model_name: Optional[str] = None) -> int:
+        """
+        Clear stats and close circuits.
+
+        Args:
+            provider_name: Only reset this provider (all if None)
+            model_name: Only reset this model (requires provider_name)
+
+        Returns:
+            Number of entries reset
+        """
+        keys = [
+            key for key in self._entries
+            if (provider_name is None or key[0] == provider_name)
+            and (model_name is None or key[1] == self.normalize_model(provider_name, model_name))
+        ]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return rolling stats and breaker state per (provider, model)."""
+        now = time.monotonic()
+        entries = {}
+        for (provider_name, model_name), entry in self._entries.items():
+            latencies = entry.latencies()
+            success_rate = entry.success_rate()
+            retry_in = None
+            if entry.state == CIRCUIT_OPEN:
+                retry_in = round(max(0.0, self.open_seconds - (now - entry.opened_at)), 1)
+            entries[f"{provider_name}/{model_name}"] = {
+                "provider": provider_name,
+                "model": model_name or None,
+                "state": entry.state,
+                "samples": len(entry.samples),
+                "success_rate": round(success_rate, 3) if success_rate is not None else None,
+                "p50_latency_ms": _percentile(latencies, 50),
+                "p95_latency_ms": _percentile(latencies, 95),
+                "recent_429": entry.recent_errors("rate_limited", now),
+                "recent_5xx": entry.recent_errors("server_error", now),
+                "consecutive_failures": entry.consecutive_failures,
+                "times_opened": entry.times_opened,
+                "probe_in_seconds": retry_in,
+            }
+        return {
+            "window_size": self.window_size,
+            "failure_threshold": self.failure_threshold,
+            "min_success_rate": self.min_success_rate,
+            "open_seconds": self.open_seconds,
+            "entries": entries,
+        }
+
+
+# Global tracker instance
+_provider_health_tracker: Optional[ProviderHealthTracker] = None
+
+
+def get_provider_health_tracker() -> ProviderHealthTracker:
+    """
+    Get global provider health tracker.
+
+    Returns:
+        ProviderHealthTracker singleton
+    """
+    global _provider_health_tracker
+    if _provider_health_tracker is None:
+        _provider_health_tracker = ProviderHealthTracker(
+            window_size=settings.ai_health_window_size,
+            failure_threshold=settings.ai_circuit_failure_threshold,
+            min_success_rate=settings.ai_circuit_min_success_rate,
+            open_seconds=settings.ai_circuit_open_seconds,
+        )
+    return _provider_health_tracker
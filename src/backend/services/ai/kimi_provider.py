@@ -7,9 +7,12 @@ https://kimi-k2.ai/api-docs
 
 import json
 import time
-from typing import Dict, Any, Optional, List
+from typing import AsyncIterator, Dict, Any, Optional, List
 import httpx
-from .base import AIProvider, AIRequest, AIResponse, PromptType
+from services.http_client import get_http_client_registry
+from .base import AIProvider, AIRequest, AIResponse, AIStreamChunk, AIStreamError, PromptType
+from .rate_limiter import get_retry_after, is_rate_limit_error
+from .structured_output import expects_json, parse_structured_output
 import logging
 
 logger = logging.getLogger(__name__)
@@ -85,14 +88,19 @@ class KimiProvider(AIProvider):
                 "temperature": request.temperature or 0.7,
                 "max_tokens": max_tokens
             }
+            # Native JSON mode for prompts that return a JSON document
+            json_mode = expects_json(request)
+            if json_mode:
+                payload["response_format"] = {"type": "json_object"}
             
             # Make async HTTP request
             # Increased timeout for large CV analysis requests (can take 3-5 minutes)
-            async with httpx.AsyncClient(timeout=300.0) as client:
+            async with get_http_client_registry().client(self.api_base) as client:
                 response = await client.post(
                     f"{self.api_base}/chat/completions",
                     headers=self.headers,
-                    json=payload
+                    json=payload,
+                    timeout=300.0
                 )
                 response.raise_for_status()
                 result = response.json()
@@ -164,107 +172,17 @@ class KimiProvider(AIProvider):
                 logger.error(f"Response structure: {json.dumps(result, indent=2)[:1000]}")
                 raw_text = ""
             
-            # Try to parse as JSON if expected
-            data = None
-            if request.prompt_type in [
-                PromptType.CV_EXTRACTION,
-                PromptType.JOB_POSTING_NORMALIZATION,
-                PromptType.INTERVIEWER_ANALYSIS,
-                PromptType.CANDIDATE_ANALYSIS,
-                PromptType.WEIGHTING_RECOMMENDATION,
-                PromptType.CV_SUMMARY,
-                PromptType.EXECUTIVE_RECOMMENDATION
-            ]:
-                if not raw_text:
-                    logger.error("Kimi returned empty response, cannot parse JSON")
-                else:
-                    json_text = raw_text  # Initialize before try block
-                    try:
-                        # Try to find JSON in response
-                        json_text = raw_text
-                        
-                        # First, try to extract from code blocks
-                        if "```json" in raw_text:
-                            json_start = raw_text.find("```json") + 7
-                            # Find the closing ``` (could be ```json or just ```)
-                            json_end = raw_text.find("```", json_start)
-                            if json_end == -1:
-                                # No closing found, might be truncated - use everything after opening
-                                json_end = len(raw_text)
-                            if json_end > json_start:
-                                json_text = raw_text[json_start:json_end].strip()
-                                logger.info("Extracted JSON from ```json code block")
-                        elif "```" in raw_text:
-                            # Try to find code block
-                            json_start = raw_text.find("```") + 3
-                            # Skip language identifier if present (e.g., ```json or ```python)
-                            # Check if next char is newline or {
-                            if json_start < len(raw_text):
-                                # Skip until we find { or [
-                                while json_start < len(raw_text) and raw_text[json_start] not in "{[":
-                                    if raw_text[json_start] == '\n':
-                                        json_start += 1
-                                        break
-                                    json_start += 1
-                            
-                            json_end = raw_text.find("```", json_start)
-                            if json_end == -1:
-                                # No closing found, might be truncated - use everything after opening
-                                json_end = len(raw_text)
-                            if json_end > json_start:
-                                json_text = raw_text[json_start:json_end].strip()
-                                logger.info("Extracted JSON from ``` code block")
-                        
-                        # Clean up common AI mistakes
-                        json_text = json_text.strip()
-                        # Remove leading/trailing whitespace and newlines
-                        json_text = json_text.strip('\n\r\t ')
-                        
-                        # Fix double braces (AI sometimes copies {{ from examples)
-                        # Replace ALL occurrences, not just start/end
-                        json_text = json_text.replace("{{", "{").replace("}}", "}")
-                        
-                        # Try to find JSON object/array boundaries if not already found
-                        if not json_text.startswith(("{", "[")):
-                            # Try to find first { or [
-                            start_idx = min(
-                                json_text.find("{") if json_text.find("{") >= 0 else len(json_text),
-                                json_text.find("[") if json_text.find("[") >= 0 else len(json_text)
-                            )
-                            if start_idx < len(json_text):
-                                # Find matching closing brace/bracket
-                                brace_count = 0
-                                bracket_count = 0
-                                end_idx = start_idx
-                                for i in range(start_idx, len(json_text)):
-                                    if json_text[i] == "{":
-                                        brace_count += 1
-                                    elif json_text[i] == "}":
-                                        brace_count -= 1
-                                    elif json_text[i] == "[":
-                                        bracket_count += 1
-                                    elif json_text[i] == "]":
-                                        bracket_count -= 1
-                                    
-                                    if brace_count == 0 and bracket_count == 0:
-                                        end_idx = i + 1
-                                        break
-                                json_text = json_text[start_idx:end_idx]
-                        
-                        data = json.loads(json_text)
-                        logger.info(f"Successfully parsed Kimi JSON response")
-                    except json.JSONDecodeError as e:
-                        logger.warning(f"Failed to parse Kimi response as JSON: {e}")
-                        logger.warning(f"Raw text (first 1000 chars): {raw_text[:1000]}")
-                        logger.warning(f"Attempted JSON text (first 500 chars): {json_text[:500] if 'json_text' in locals() else 'N/A'}")
-                    except Exception as e:
-                        logger.error(f"Unexpected error parsing Kimi JSON: {e}")
-                        logger.error(f"Raw text (first 1000 chars): {raw_text[:1000]}")
+            # Parse and validate JSON output
+            data, parse_error = parse_structured_output(request, raw_text)
+            if parse_error:
+                logger.warning(f"Kimi {parse_error}; raw text (first 1000 chars): {raw_text[:1000]}")
             
             # Extract usage statistics
             usage = result.get("usage", {})
             input_tokens = usage.get("prompt_tokens", 0)
             output_tokens = usage.get("completion_tokens", 0)
+            # Moonshot caches repeated prompt prefixes automatically
+            cached_tokens = usage.get("cached_tokens")
             
             # Estimate cost (Kimi K2 pricing - approximate, based on credit system)
             # 1 credit = 1 request, pricing varies by package
@@ -272,15 +190,17 @@ class KimiProvider(AIProvider):
             cost_usd = 0.005  # Average estimate
             
             return AIResponse(
-                success=True,
+                success=parse_error is None,
                 data=data,
+                error=parse_error,
                 raw_text=raw_text,
                 provider=self.provider_name,
                 model=self.model_name,
                 input_tokens=input_tokens,
                 output_tokens=output_tokens,
                 latency_ms=latency_ms,
-                cost_usd=cost_usd
+                cost_usd=cost_usd,
+                cached_input_tokens=cached_tokens
             )
             
         except httpx.ConnectError as e:
@@ -326,7 +246,9 @@ class KimiProvider(AIProvider):
                 error=error_msg,
                 provider=self.provider_name,
                 model=self.model_name,
-                latency_ms=latency_ms
+                latency_ms=latency_ms,
+                rate_limited=is_rate_limit_error(e),
+                retry_after=get_retry_after(e)
             )
         except httpx.RequestError as e:
             latency_ms = int((time.time() - start_time) * 1000)
@@ -355,6 +277,73 @@ class KimiProvider(AIProvider):
                 latency_ms=latency_ms
             )
     
+    async def stream(self, request: AIRequest) -> AsyncIterator[AIStreamChunk]:
+        """Stream a completion from Kimi (OpenAI-compatible SSE)."""
+        start_time = time.time()
+        prompt = self.build_prompt(request.template, request.variables)
+        
+        from .model_limits import get_max_output_tokens
+        payload = {
+            "model": self.model_name,
+            "messages": [
+                {"role": "system", "content": "You are a helpful AI assistant for CV analysis."},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": request.temperature or 0.7,
+            "max_tokens": request.max_tokens or get_max_output_tokens(self.model_name),
+            "stream": True
+        }
+        
+        parts: List[str] = []
+        usage: Dict[str, Any] = {}
+        async with get_http_client_registry().client(self.api_base) as client:
+            try:
+                async with client.stream(
+                    "POST",
+                    f"{self.api_base}/chat/completions",
+                    headers=self.headers,
+                    json=payload,
+                    timeout=300.0
+                ) as response:
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        data = line[len("data:"):].strip()
+                        if data == "[DONE]":
+                            break
+                        event = json.loads(data)
+                        usage = event.get("usage") or usage
+                        for choice in event.get("choices") or []:
+                            text = (choice.get("delta") or {}).get("content")
+                            if text:
+                                parts.append(text)
+                                yield AIStreamChunk(text=text)
+            except (httpx.HTTPError, json.JSONDecodeError) as e:
+                if parts:
+                    raise
+                logger.error(f"Kimi API error: {e}")
+                raise AIStreamError(AIResponse(
+                    success=False,
+                    error=f"Kimi API error: {str(e)}",
+                    provider=self.provider_name,
+                    model=self.model_name,
+                    latency_ms=int((time.time() - start_time) * 1000),
+                    rate_limited=is_rate_limit_error(e),
+                    retry_after=get_retry_after(e)
+                )) from e
+        
+        yield AIStreamChunk(done=True, response=AIResponse(
+            success=True,
+            raw_text="".join(parts),
+            provider=self.provider_name,
+            model=self.model_name,
+            input_tokens=usage.get("prompt_tokens", 0),
+            output_tokens=usage.get("completion_tokens", 0),
+            latency_ms=int((time.time() - start_time) * 1000),
+            cost_usd=0.005  # Per-request estimate, as in complete()
+        ))
+    
     def _initialize_model(self) -> bool:
         """Initialize Kimi model selection."""
         for idx in range(self._current_index + 1, len(self._candidate_models)):
@@ -375,10 +364,11 @@ class KimiProvider(AIProvider):
     async def health_check(self) -> bool:
         """Check if Kimi provider is healthy."""
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
+            async with get_http_client_registry().client(self.api_base) as client:
                 response = await client.get(
                     f"{self.api_base}/models",
-                    headers=self.headers
+                    headers=self.headers,
+                    timeout=5.0
                 )
                 return response.status_code == 200
         except Exception:
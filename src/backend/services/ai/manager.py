@@ -4,21 +4,74 @@ AI Manager - Central service for managing AI providers and requests.
 Handles provider selection, routing, fallback, and logging.
 """
 
+import asyncio
 import logging
 import os
-from typing import Dict, Optional, Any
+import time
+from contextlib import aclosing
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple
 
 from config import settings
+from services.metrics.collectors import AI_QUEUE_DEPTH, record_ai_response
+from services.settings_cache import AI_CACHE_ENABLED_KEY, DEFAULT_AI_PROVIDER_KEY, get_app_settings_cache
 
-from .base import AIProvider, AIRequest, AIResponse
+from .base import AIProvider, AIRequest, AIResponse, AIStreamChunk, AIStreamError, PromptType
 from .claude_provider import ClaudeProvider
 from .gemini_provider import GeminiProvider
 from .kimi_provider import KimiProvider
 from .openai_provider import OpenAIProvider
+from .health import get_provider_health_tracker
+from .prompt_budget import fit_request
+from .rate_limiter import DEFAULT_RETRY_AFTER_SECONDS, get_rate_limit_scheduler, get_retry_after, is_rate_limit_error
+from .response_cache import get_ai_response_cache
+from .usage_recorder import get_ai_usage_recorder
 # Minimax provider imported dynamically when needed
 
 logger = logging.getLogger(__name__)
 
+# Expensive prompt types never hedged, even if the request opts in
+NON_HEDGEABLE_PROMPT_TYPES = {
+    PromptType.INTERVIEWER_ANALYSIS,
+    PromptType.CANDIDATE_ANALYSIS,
+    PromptType.EXECUTIVE_RECOMMENDATION,
+    PromptType.CHATBOT_CV_GENERATION,
+    PromptType.CHATBOT_DIGITAL_FOOTPRINT_ANALYSIS,
+    PromptType.CHATBOT_INTERVIEW_PREP,
+}
+
+# Cancellation message for the losing call of a hedged request
+HEDGE_CANCEL_MESSAGE = "hedged request superseded"
+
+
+def parse_concurrency_limits(value: Optional[str]) -> Dict[str, int]:
+    """
+    Parse a per-provider concurrency setting.
+    
+    Format: "gemini=4,openai=8,default=2" (a "default" entry applies to
+    providers without their own entry). Invalid entries are ignored.
+    
+    Args:
+        value: Raw setting value
+        
+    Returns:
+        Dict of provider name -> max concurrent requests
+    """
+    limits: Dict[str, int] = {}
+    for item in (value or "").split(","):
+        name, _, limit = item.partition("=")
+        name = name.strip().lower()
+        if not name:
+            continue
+        try:
+            parsed = int(limit.strip())
+        except ValueError:
+            logger.warning(f"Ignoring invalid provider concurrency entry: {item!r}")
+            continue
+        if parsed > 0:
+            limits[name] = parsed
+    return limits
+
 
 class AIManager:
     """
@@ -39,8 +92,19 @@ class AIManager:
         # Initialize available providers based on environment variables
         self._initialize_providers()
         
-        # Load fallback chain from database (async, but we'll set it on first use)
+        # Fallback chain parsed from the default_ai_provider setting, and the
+        # setting value it was parsed from (re-parsed when the value changes)
         self._db_fallback_chain: Optional[List[Dict[str, Any]]] = None
+        self._fallback_chain_source: Any = None
+        
+        # Provider instances bound to a specific model, keyed by (provider, model).
+        # Built once and reused so SDK clients, connections and Gemini model
+        # discovery are not recreated on every request.
+        self._provider_pool: Dict[Tuple[str, str], AIProvider] = {}
+        
+        # Per-provider cap on in-flight completions (AI_PROVIDER_MAX_CONCURRENCY)
+        self._provider_concurrency = parse_concurrency_limits(settings.ai_provider_max_concurrency)
+        self._provider_semaphores: Dict[str, asyncio.Semaphore] = {}
     
     def _initialize_providers(self):
         """
@@ -98,50 +162,267 @@ class AIManager:
             logger.warning("No AI providers configured. Check API keys in environment.")
     
     async def _load_fallback_chain_from_db(self):
-        """Load fallback chain from database."""
-        if hasattr(self, '_db_fallback_chain') and self._db_fallback_chain is not None:
+        """
+        Get the fallback chain from the default_ai_provider setting.
+        
+        The setting is read through the app settings cache (TTL, background
+        refresh, cross-worker invalidation; see services/settings_cache.py).
+        The parsed chain is kept until the setting value changes; a change
+        also drops pooled provider instances built for the previous chain.
+        """
+        setting_value = await get_app_settings_cache().get(DEFAULT_AI_PROVIDER_KEY)
+        if self._db_fallback_chain is not None and setting_value == self._fallback_chain_source:
             return self._db_fallback_chain
         
-        try:
-            import json
-            from database import get_supabase_client
-            client = get_supabase_client()
-            result = client.table("app_settings").select("*").eq("setting_key", "default_ai_provider").execute()
+        if self._db_fallback_chain is not None and self._provider_pool:
+            logger.info("Fallback chain setting changed; dropping pooled providers")
+            self._provider_pool.clear()
+        self._fallback_chain_source = setting_value
+        self._db_fallback_chain = self._parse_fallback_chain(setting_value)
+        return self._db_fallback_chain
+    
+    def _parse_fallback_chain(self, setting_value: Any) -> List[Dict[str, Any]]:
+        """
+        Parse the default_ai_provider setting into the chain of available providers.
+        
+        Args:
+            setting_value: JSON list of {provider, model, order} (or a single
+                provider name, the old format); None if not configured
             
-            if result.data and len(result.data) > 0:
-                setting_value = result.data[0]["setting_value"]
-                # Try to parse as JSON (new format)
-                try:
-                    fallback_chain = json.loads(setting_value) if isinstance(setting_value, str) else setting_value
-                    if isinstance(fallback_chain, list) and len(fallback_chain) > 0:
-                        # Filter to only include available providers
-                        filtered_chain = [
-                            item for item in fallback_chain
-                            if item.get("provider") in self.providers
-                        ]
-                        if filtered_chain:
-                            self._db_fallback_chain = filtered_chain
-                            logger.info(f"Loaded fallback chain from database: {len(filtered_chain)} provider(s): {[item.get('provider') for item in filtered_chain]}")
-                            return filtered_chain
-                        else:
-                            logger.warning(f"Fallback chain from database has no available providers. Configured: {fallback_chain}, Available: {list(self.providers.keys())}")
-                    elif isinstance(fallback_chain, list) and len(fallback_chain) == 0:
-                        logger.warning("Fallback chain from database is empty list")
-                except (json.JSONDecodeError, TypeError):
-                    # Old format (single provider string)
-                    if setting_value in self.providers:
-                        self._db_fallback_chain = [{"provider": setting_value, "model": None, "order": 1}]
-                        logger.info(f"Loaded single provider from database (old format): {setting_value}")
-                        return self._db_fallback_chain
-                    else:
-                        logger.warning(f"Provider from database not available: {setting_value}. Available: {list(self.providers.keys())}")
-        except Exception as e:
-            logger.warning(f"Could not load fallback chain from database: {e}")
-        
-        # No valid fallback chain found - return empty to trigger error
-        self._db_fallback_chain = []
+        Returns:
+            Chain entries for configured providers (empty if none)
+        """
+        if setting_value is None:
+            logger.warning("No AI provider fallback chain setting available")
+            return []
+        
+        import json
+        try:
+            fallback_chain = json.loads(setting_value) if isinstance(setting_value, str) else setting_value
+        except (json.JSONDecodeError, TypeError):
+            # Old format (single provider string)
+            if setting_value in self.providers:
+                logger.info(f"Loaded single provider from database (old format): {setting_value}")
+                return [{"provider": setting_value, "model": None, "order": 1}]
+            logger.warning(f"Provider from database not available: {setting_value}. Available: {list(self.providers.keys())}")
+            return []
+        
+        if isinstance(fallback_chain, list) and len(fallback_chain) > 0:
+            # Filter to only include available providers
+            filtered_chain = [
+                item for item in fallback_chain
+                if item.get("provider") in self.providers
+            ]
+            if filtered_chain:
+                logger.info(f"Loaded fallback chain from database: {len(filtered_chain)} provider(s): {[item.get('provider') for item in filtered_chain]}")
+                return filtered_chain
+            logger.warning(f"Fallback chain from database has no available providers. Configured: {fallback_chain}, Available: {list(self.providers.keys())}")
+        elif isinstance(fallback_chain, list):
+            logger.warning("Fallback chain from database is empty list")
+        elif isinstance(fallback_chain, str) and fallback_chain in self.providers:
+            return [{"provider": fallback_chain, "model": None, "order": 1}]
         return []
     
+    def invalidate_fallback_chain(self):
+        """
+        Drop the cached fallback chain and pooled provider instances.
+        
+        Called when the admin changes the fallback chain so the next request
+        in this worker reloads it from the database and builds fresh provider
+        instances (other workers pick the change up via the settings cache).
+        """
+        self._db_fallback_chain = None
+        self._fallback_chain_source = None
+        self._provider_pool.clear()
+        get_app_settings_cache().invalidate(DEFAULT_AI_PROVIDER_KEY)
+        logger.info("AI fallback chain cache and provider pool invalidated")
+    
+    def _create_provider(self, provider_name: str, model_name: str) -> Optional[AIProvider]:
+        """
+        Create a provider instance bound to a specific model.
+        
+        Args:
+            provider_name: Name of provider (gemini, openai, claude, kimi, minimax)
+            model_name: Normalized model identifier
+            
+        Returns:
+            New AIProvider instance, or None if the provider has no API key
+        """
+        provider_config = {"model": model_name}
+        
+        if provider_name == "gemini" and settings.gemini_api_key:
+            return GeminiProvider(settings.gemini_api_key, provider_config)
+        if provider_name == "openai" and settings.openai_api_key:
+            return OpenAIProvider(settings.openai_api_key, provider_config)
+        if provider_name == "kimi" and settings.kimi_api_key:
+            return KimiProvider(settings.kimi_api_key, provider_config)
+        if provider_name == "claude" and settings.anthropic_api_key:
+            return ClaudeProvider(settings.anthropic_api_key, provider_config)
+        if provider_name == "minimax" and settings.minimax_api_key:
+            from .minimax_provider import MinimaxProvider
+            minimax_config = {
+                "group_id": os.getenv("MINIMAX_GROUP_ID", ""),
+                "model": model_name
+            }
+            return MinimaxProvider(settings.minimax_api_key, minimax_config)
+        return None
+    
+    def _get_pooled_provider(self, provider_name: str, model_name: str) -> Optional[AIProvider]:
+        """
+        Get the pooled provider instance for a (provider, model) pair.
+        
+        The instance is created on first use and kept until the pool is
+        invalidated. Creation errors are propagated to the caller.
+        
+        Args:
+            provider_name: Name of provider
+            model_name: Model name as configured in the fallback chain
+            
+        Returns:
+            AIProvider instance, or None if the provider is not configured
+        """
+        # Normalize model name for Gemini (needs "models/" prefix)
+        normalized_model = model_name
+        if provider_name == "gemini" and not normalized_model.startswith("models/"):
+            normalized_model = f"models/{normalized_model}"
+        
+        key = (provider_name, normalized_model)
+        provider = self._provider_pool.get(key)
+        if provider is None:
+            provider = self._create_provider(provider_name, normalized_model)
+            if provider is not None:
+                self._provider_pool[key] = provider
+                logger.info(f"Created pooled provider {provider_name}/{normalized_model}")
+        return provider
+    
+    def _get_provider_semaphore(self, provider_name: str) -> Optional[asyncio.Semaphore]:
+        """
+        Get the concurrency limiter for a provider.
+        
+        Args:
+            provider_name: Name of provider
+            
+        Returns:
+            Semaphore sized from AI_PROVIDER_MAX_CONCURRENCY, or None if unlimited
+        """
+        limit = self._provider_concurrency.get(provider_name, self._provider_concurrency.get("default"))
+        if not limit:
+            return None
+        semaphore = self._provider_semaphores.get(provider_name)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(limit)
+            self._provider_semaphores[provider_name] = semaphore
+        return semaphore
+    
+    async def _call_provider(self, provider: AIProvider, request: AIRequest) -> AIResponse:
+        """
+        Call the provider, waiting for a free slot if the provider is capped.
+        
+        Args:
+            provider: Provider instance
+            request: The AI request
+            
+        Returns:
+            AIResponse from the provider
+        """
+        semaphore = self._get_provider_semaphore(provider.provider_name)
+        if semaphore is None:
+            return await self._call_provider_throttled(provider, request)
+        await self._acquire_provider_slot(semaphore, provider)
+        try:
+            return await self._call_provider_throttled(provider, request)
+        finally:
+            semaphore.release()
+    
+    @staticmethod
+    async def _acquire_provider_slot(semaphore: asyncio.Semaphore, provider: AIProvider):
+        """
+        Wait for a provider concurrency slot, counting waiters in ai_queue_depth.
+        
+        Args:
+            semaphore: Provider semaphore from _get_provider_semaphore
+            provider: Provider instance
+        """
+        if not semaphore.locked():
+            await semaphore.acquire()
+            return
+        labels = (provider.provider_name, getattr(provider, "model_name", None) or "", "concurrency")
+        AI_QUEUE_DEPTH.inc(*labels)
+        try:
+            await semaphore.acquire()
+        finally:
+            AI_QUEUE_DEPTH.dec(*labels)
+    
+    async def _call_provider_throttled(self, provider: AIProvider, request: AIRequest) -> AIResponse:
+        """
+        Call provider.complete within the provider/model RPM and TPM budget.
+        
+        The request's tokens are estimated and reserved before the call
+        (queueing if the budget is exhausted), then reconciled with the actual
+        usage. A 429 pauses the model for its Retry-After interval. The outcome
+        and latency feed the provider health tracker (circuit breaker).
+        request.timeout limits the provider call only, not the time queued
+        before it; a call that runs over becomes a failed response.
+        
+        Args:
+            provider: Provider instance
+            request: The AI request
+            
+        Returns:
+            AIResponse from the provider
+        """
+        scheduler = get_rate_limit_scheduler()
+        model_name = getattr(provider, "model_name", None)
+        reserved = scheduler.estimate_tokens(
+            request,
+            provider.build_prompt(request.template, request.variables)
+        )
+        await scheduler.acquire(provider.provider_name, model_name, reserved)
+        
+        health = get_provider_health_tracker()
+        started = time.monotonic()
+        response = None
+        try:
+            if request.timeout:
+                response = await asyncio.wait_for(provider.complete(request), request.timeout)
+            else:
+                response = await provider.complete(request)
+        except asyncio.TimeoutError:
+            response = AIResponse(
+                success=False,
+                error=f"Provider call timed out after {request.timeout}s",
+                provider=provider.provider_name,
+                model=model_name,
+                latency_ms=int((time.monotonic() - started) * 1000)
+            )
+        except asyncio.CancelledError:
+            # Lost a hedge race or the caller gave up (e.g. its own wait_for):
+            # says nothing about the provider, so health is not touched.
+            # Slow providers are caught by request.timeout above instead.
+            raise
+        except Exception:
+            health.record(
+                provider.provider_name,
+                model_name,
+                success=False,
+                latency_ms=int((time.monotonic() - started) * 1000),
+                error_kind="error"
+            )
+            raise
+        finally:
+            if response is None:
+                # Cancelled or raised: no response to reconcile, refund the reservation
+                scheduler.release(provider.provider_name, model_name, reserved)
+        health.record(
+            provider.provider_name,
+            model_name,
+            success=response.success,
+            latency_ms=response.latency_ms if response.latency_ms is not None else int((time.monotonic() - started) * 1000),
+            error_kind=health.classify_error(response)
+        )
+        scheduler.record_response(provider.provider_name, model_name, reserved, response)
+        return response
+    
     def get_provider(self, provider_name: Optional[str] = None) -> Optional[AIProvider]:
         """
         Get AI provider by name.
@@ -186,32 +467,11 @@ class AIManager:
         if provider_name:
             provider = self.get_provider(provider_name)
             if provider:
-                # Create a temporary provider instance with specific model if needed
+                # Reuse a pooled provider instance bound to the specific model if needed
                 if model_name:
-                    # Create provider with specific model config
-                    from config import settings
-                    
-                    # Normalize model name for Gemini (needs "models/" prefix)
-                    normalized_model = model_name
-                    if provider_name == "gemini" and not normalized_model.startswith("models/"):
-                        normalized_model = f"models/{normalized_model}"
-                    
-                    provider_config = {"model": normalized_model}
-                    
-                    if provider_name == "gemini" and settings.gemini_api_key:
-                        from .gemini_provider import GeminiProvider
-                        provider = GeminiProvider(settings.gemini_api_key, provider_config)
-                    elif provider_name == "openai" and settings.openai_api_key:
-                        from .openai_provider import OpenAIProvider
-                        provider = OpenAIProvider(settings.openai_api_key, provider_config)
-                    elif provider_name == "kimi" and settings.kimi_api_key:
-                        from .kimi_provider import KimiProvider
-                        provider = KimiProvider(settings.kimi_api_key, provider_config)
-                    elif provider_name == "claude" and settings.anthropic_api_key:
-                        from .claude_provider import ClaudeProvider
-                        provider = ClaudeProvider(settings.anthropic_api_key, provider_config)
+                    provider = self._get_pooled_provider(provider_name, model_name) or provider
                 
-                response = await provider.complete(request)
+                response = await self._complete(provider, request)
                 await self._log_usage(request, response)
                 if response.success or not enable_fallback:
                     return response
@@ -229,8 +489,18 @@ class AIManager:
                 provider="none"
             )
         
+        # Skip entries with an open circuit and try degraded ones last
+        fallback_chain = get_provider_health_tracker().order_chain(fallback_chain)
+        
+        if self._should_hedge(request):
+            candidates = self._resolve_chain_providers(fallback_chain)
+            if len(candidates) > 1:
+                return await self._execute_hedged(request, candidates)
+        
         # Try each item in fallback chain (ONLY providers configured in database)
         last_error = None
+        attempts = 0
+        rate_limited: List[AIResponse] = []
         for item in fallback_chain:
             provider_name_item = item.get("provider")
             model_name_item = item.get("model")
@@ -240,38 +510,10 @@ class AIManager:
                 logger.warning(f"Provider {provider_name_item} not available, skipping")
                 continue
             
-            # Create provider instance with specific model if specified
+            # Reuse pooled provider instance with specific model if specified
             if model_name_item:
-                from config import settings
-                
-                # Normalize model name for Gemini (needs "models/" prefix)
-                normalized_model = model_name_item
-                if provider_name_item == "gemini" and not normalized_model.startswith("models/"):
-                    normalized_model = f"models/{normalized_model}"
-                
-                provider_config = {"model": normalized_model}
-                
                 try:
-                    if provider_name_item == "gemini" and settings.gemini_api_key:
-                        from .gemini_provider import GeminiProvider
-                        provider = GeminiProvider(settings.gemini_api_key, provider_config)
-                    elif provider_name_item == "openai" and settings.openai_api_key:
-                        from .openai_provider import OpenAIProvider
-                        provider = OpenAIProvider(settings.openai_api_key, provider_config)
-                    elif provider_name_item == "kimi" and settings.kimi_api_key:
-                        from .kimi_provider import KimiProvider
-                        provider = KimiProvider(settings.kimi_api_key, provider_config)
-                    elif provider_name_item == "claude" and settings.anthropic_api_key:
-                        from .claude_provider import ClaudeProvider
-                        provider = ClaudeProvider(settings.anthropic_api_key, provider_config)
-                    elif provider_name_item == "minimax" and settings.minimax_api_key:
-                        from .minimax_provider import MinimaxProvider
-                        import os
-                        minimax_config = {
-                            "group_id": os.getenv("MINIMAX_GROUP_ID", ""),
-                            "model": normalized_model
-                        }
-                        provider = MinimaxProvider(settings.minimax_api_key, minimax_config)
+                    provider = self._get_pooled_provider(provider_name_item, model_name_item) or provider
                 except Exception as e:
                     logger.warning(f"Failed to create {provider_name_item} provider with model {model_name_item}: {e}")
                     last_error = str(e)
@@ -279,22 +521,408 @@ class AIManager:
             
             try:
                 logger.info(f"Trying {provider_name_item}/{model_name_item or 'default'}")
-                response = await provider.complete(request)
+                attempts += 1
+                response = await self._complete(provider, request)
                 await self._log_usage(request, response)
                 if response.success:
                     return response
                 last_error = response.error
+                if response.rate_limited:
+                    rate_limited.append(response)
             except Exception as e:
                 logger.warning(f"Error with {provider_name_item}/{model_name_item or 'default'}: {e}")
                 last_error = str(e)
         
-        # All fallback attempts failed
+        # All fallback attempts failed. If every provider was rate limited,
+        # tell the caller when the first of them accepts requests again.
+        retry_after = None
+        if rate_limited and len(rate_limited) == attempts:
+            retry_after = min(self._retry_after(response) for response in rate_limited)
         return AIResponse(
+            success=False,
+            error=f"All providers in fallback chain failed. Last error: {last_error}",
+            provider="none",
+            rate_limited=retry_after is not None,
+            retry_after=retry_after
+        )
+    
+    @staticmethod
+    def _retry_after(response: AIResponse) -> float:
+        """Seconds until a rate limited provider/model may be retried (the scheduler's pause, else the 429 hint)."""
+        paused = get_rate_limit_scheduler().retry_after(response.provider, response.model)
+        if paused is not None:
+            return paused
+        return response.retry_after if response.retry_after is not None else DEFAULT_RETRY_AFTER_SECONDS
+    
+    def _resolve_chain_providers(self, fallback_chain: List[Dict[str, Any]]) -> List[AIProvider]:
+        """
+        Resolve fallback chain items to (pooled) provider instances.
+        
+        Unavailable providers and models that fail to initialize are skipped.
+        
+        Args:
+            fallback_chain: Chain items with "provider" and "model"
+            
+        Returns:
+            Provider instances in chain order
+        """
+        candidates = []
+        for item in fallback_chain:
+            candidate = self.get_provider(item.get("provider"))
+            if candidate and item.get("model"):
+                try:
+                    candidate = self._get_pooled_provider(item.get("provider"), item.get("model")) or candidate
+                except Exception as e:
+                    logger.warning(f"Failed to create {item.get('provider')} provider with model {item.get('model')}: {e}")
+                    candidate = None
+            if candidate:
+                candidates.append(candidate)
+        return candidates
+    
+    async def stream(
+        self,
+        request: AIRequest,
+        provider_name: Optional[str] = None,
+        model_name: Optional[str] = None
+    ) -> AsyncIterator[AIStreamChunk]:
+        """
+        Stream an AI request across the fallback chain.
+        
+        Entries are tried in (health-ordered) chain order, with the specific
+        provider/model first if given. A provider that fails before producing
+        any text falls through to the next entry; once text has been yielded
+        the caller has already shown it, so a later failure is raised instead.
+        
+        Args:
+            request: The AI request to execute
+            provider_name: Specific provider to try first, or None for the chain
+            model_name: Specific model (only if provider_name is specified)
+            
+        Yields:
+            AIStreamChunk text deltas, then a done chunk with the full response
+            
+        Raises:
+            AIStreamError: If every provider failed before producing text
+        """
+        candidates: List[AIProvider] = []
+        if provider_name:
+            provider = self.get_provider(provider_name)
+            if provider and model_name:
+                provider = self._get_pooled_provider(provider_name, model_name) or provider
+            if provider:
+                candidates.append(provider)
+        
+        fallback_chain = await self._load_fallback_chain_from_db()
+        if fallback_chain:
+            candidates.extend(self._resolve_chain_providers(
+                get_provider_health_tracker().order_chain(fallback_chain)
+            ))
+        
+        if not candidates:
+            raise AIStreamError(AIResponse(
+                success=False,
+                error="No AI provider fallback chain configured. Please configure providers in admin settings.",
+                provider="none"
+            ))
+        
+        last_error = None
+        for provider in candidates:
+            started_output = False
+            try:
+                logger.info(f"Streaming from {provider.provider_name}/{getattr(provider, 'model_name', None) or 'default'}")
+                async for chunk in self._stream_provider(provider, request):
+                    started_output = started_output or bool(chunk.text)
+                    yield chunk
+                return
+            except Exception as e:
+                if started_output:
+                    raise
+                logger.warning(f"Error streaming from {provider.provider_name}/{getattr(provider, 'model_name', None)}: {e}")
+                last_error = e.response.error if isinstance(e, AIStreamError) else str(e)
+        
+        raise AIStreamError(AIResponse(
             success=False,
             error=f"All providers in fallback chain failed. Last error: {last_error}",
             provider="none"
+        ))
+    
+    async def _stream_provider(self, provider: AIProvider, request: AIRequest) -> AsyncIterator[AIStreamChunk]:
+        """
+        Stream from one provider with the same bookkeeping as _complete.
+        
+        Fits budget sections to the provider's model, serves cache hits as a
+        single chunk, holds the provider concurrency slot and rate limit
+        reservation for the duration of the stream, and records health, rate
+        limit usage, the usage log and the cache entry once the stream
+        finishes or fails.
+        
+        Args:
+            provider: Provider instance
+            request: The AI request
+            
+        Yields:
+            AIStreamChunk from the provider (or the cache)
+        """
+        model_name = getattr(provider, "model_name", None)
+        request = fit_request(request, model_name)
+        prompt = provider.build_prompt(request.template, request.variables)
+        
+        cache = get_ai_response_cache()
+        cache_key = None
+        if await self._cache_enabled_for(request):
+            cache_key = cache.make_key(request, prompt, provider.provider_name, model_name)
+            cached = await cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"AI response cache hit for {request.prompt_type} ({cached.provider}/{cached.model})")
+                await self._log_usage(request, cached)
+                if cached.raw_text:
+                    yield AIStreamChunk(text=cached.raw_text)
+                yield AIStreamChunk(done=True, response=cached)
+                return
+        
+        scheduler = get_rate_limit_scheduler()
+        health = get_provider_health_tracker()
+        reserved = scheduler.estimate_tokens(request, prompt)
+        semaphore = self._get_provider_semaphore(provider.provider_name)
+        if semaphore is not None:
+            await self._acquire_provider_slot(semaphore, provider)
+        try:
+            await scheduler.acquire(provider.provider_name, model_name, reserved)
+            started = time.monotonic()
+            try:
+                # aclosing: a client disconnect closes the provider's HTTP stream right away
+                async with aclosing(provider.stream(request)) as chunks:
+                    async for chunk in chunks:
+                        if chunk.done and chunk.response is not None:
+                            response = chunk.response
+                            health.record(
+                                provider.provider_name,
+                                model_name,
+                                success=True,
+                                latency_ms=response.latency_ms
+                            )
+                            scheduler.record_response(provider.provider_name, model_name, reserved, response)
+                            await self._log_usage(request, response)
+                            if cache_key is not None:
+                                await cache.set(cache_key, request, response)
+                        yield chunk
+            except Exception as e:
+                if isinstance(e, AIStreamError):
+                    response = e.response
+                else:
+                    response = AIResponse(
+                        success=False,
+                        error=str(e),
+                        provider=provider.provider_name,
+                        model=model_name,
+                        rate_limited=is_rate_limit_error(e),
+                        retry_after=get_retry_after(e)
+                    )
+                health.record(
+                    provider.provider_name,
+                    model_name,
+                    success=False,
+                    latency_ms=int((time.monotonic() - started) * 1000),
+                    error_kind=health.classify_error(response)
+                )
+                scheduler.record_response(provider.provider_name, model_name, reserved, response)
+                await self._log_usage(request, response)
+                raise
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+    
+    def _should_hedge(self, request: AIRequest) -> bool:
+        """Whether a request may be hedged across fallback entries."""
+        return (
+            settings.ai_hedging_enabled
+            and request.hedge
+            and request.max_hedges > 0
+            and request.prompt_type not in NON_HEDGEABLE_PROMPT_TYPES
+        )
+    
+    def _hedge_delay(self, provider: AIProvider) -> float:
+        """
+        Seconds to wait for a provider before firing a hedge.
+        
+        Uses the configured percentile of the provider/model's observed
+        latency, or a default until enough samples exist.
+        """
+        observed = get_provider_health_tracker().latency_percentile(
+            provider.provider_name,
+            getattr(provider, "model_name", None),
+            settings.ai_hedge_latency_percentile
+        )
+        delay_ms = observed if observed is not None else settings.ai_hedge_default_delay_ms
+        return max(delay_ms, settings.ai_hedge_min_delay_ms) / 1000.0
+    
+    async def _execute_hedged(self, request: AIRequest, candidates: List[AIProvider]) -> AIResponse:
+        """
+        Execute a request with hedging across fallback entries.
+        
+        Starts the first candidate; if it hasn't answered within its hedge
+        delay, the same request is also sent to the next candidate (at most
+        request.max_hedges extra calls) and the first success wins. The other
+        call is cancelled. Failures fall through to the next candidate as in
+        the normal chain. Every call, including cancelled ones, is logged for
+        cost accounting.
+        
+        Args:
+            request: The AI request
+            candidates: Providers from the (health-ordered) fallback chain
+            
+        Returns:
+            AIResponse from the first successful call (hedged=True if a hedge was fired)
+        """
+        tasks: Dict[asyncio.Task, Tuple[AIProvider, float]] = {}
+        next_index = 0
+        hedges_left = request.max_hedges
+        hedged = False
+        last_error = None
+        
+        def _launch() -> AIProvider:
+            nonlocal next_index
+            provider = candidates[next_index]
+            next_index += 1
+            task = asyncio.create_task(self._complete(provider, request))
+            tasks[task] = (provider, time.monotonic())
+            return provider
+        
+        delay = self._hedge_delay(_launch())
+        try:
+            while tasks:
+                can_hedge = hedges_left > 0 and next_index < len(candidates)
+                done, _ = await asyncio.wait(
+                    tasks.keys(),
+                    timeout=delay if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                
+                if not done:
+                    hedges_left -= 1
+                    hedged = True
+                    provider = _launch()
+                    logger.info(
+                        f"Hedging {request.prompt_type}: no answer after {delay:.2f}s, "
+                        f"also trying {provider.provider_name}/{getattr(provider, 'model_name', None)}"
+                    )
+                    delay = self._hedge_delay(provider)
+                    continue
+                
+                winner = None
+                for task in done:
+                    provider, _ = tasks.pop(task)
+                    try:
+                        response = task.result()
+                    except Exception as e:
+                        logger.warning(f"Error with {provider.provider_name}/{getattr(provider, 'model_name', None)}: {e}")
+                        response = AIResponse(
+                            success=False,
+                            error=str(e),
+                            provider=provider.provider_name,
+                            model=getattr(provider, "model_name", None)
+                        )
+                    response = response.model_copy(update={"hedged": hedged})
+                    await self._log_usage(request, response)
+                    if response.success and winner is None:
+                        winner = response
+                    elif not response.success:
+                        last_error = response.error
+                
+                if winner is not None:
+                    return winner
+                
+                # All in-flight calls failed: continue down the chain
+                if not tasks and next_index < len(candidates):
+                    delay = self._hedge_delay(_launch())
+        finally:
+            await self._cancel_hedged_calls(request, tasks)
+        
+        return AIResponse(
+            success=False,
+            error=f"All providers in fallback chain failed. Last error: {last_error}",
+            provider="none",
+            hedged=hedged
         )
     
+    async def _cancel_hedged_calls(self, request: AIRequest, tasks: Dict[asyncio.Task, Tuple[AIProvider, float]]):
+        """
+        Cancel losing calls of a hedged request and log them.
+        
+        The provider may already have processed (and billed) the prompt, so
+        the cancelled call is logged with its estimated input tokens.
+        """
+        for task, (provider, started) in list(tasks.items()):
+            task.cancel(msg=HEDGE_CANCEL_MESSAGE)
+            prompt = provider.build_prompt(request.template, request.variables)
+            await self._log_usage(request, AIResponse(
+                success=False,
+                error="Cancelled: hedged request answered by another provider",
+                provider=provider.provider_name,
+                model=getattr(provider, "model_name", None),
+                input_tokens=get_rate_limit_scheduler().estimate_prompt_tokens(prompt),
+                output_tokens=0,
+                latency_ms=int((time.monotonic() - started) * 1000),
+                hedged=True
+            ))
+        tasks.clear()
+    
+    async def _cache_enabled_for(self, request: AIRequest) -> bool:
+        """
+        Whether a request may be read from and written to the AI response cache.
+        
+        The ai_cache_enabled app setting (PUT /settings/ai-cache) overrides
+        AI_CACHE_ENABLED, so admins can bypass the cache without a restart.
+        
+        Args:
+            request: The AI request
+            
+        Returns:
+            True if the cache is on and the request allows it
+        """
+        if not request.use_cache:
+            return False
+        default = get_ai_response_cache().enabled
+        return await get_app_settings_cache().get_bool(AI_CACHE_ENABLED_KEY, default)
+    
+    async def _complete(self, provider: AIProvider, request: AIRequest) -> AIResponse:
+        """
+        Run a completion through the AI response cache.
+        
+        Budget sections are first fitted to the provider's model. The request
+        is then looked up by content hash (prompt type, built prompt,
+        provider/model, generation params) and only sent to the provider on a miss.
+        
+        Args:
+            provider: Provider instance to use on a cache miss
+            request: The AI request
+            
+        Returns:
+            AIResponse (cache_hit=True when served from cache)
+        """
+        request = fit_request(request, getattr(provider, "model_name", None))
+        cache = get_ai_response_cache()
+        if not await self._cache_enabled_for(request):
+            return await self._call_provider(provider, request)
+        
+        prompt = provider.build_prompt(request.template, request.variables)
+        cache_key = cache.make_key(
+            request,
+            prompt,
+            provider.provider_name,
+            getattr(provider, "model_name", None)
+        )
+        
+        cached = await cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"AI response cache hit for {request.prompt_type} ({cached.provider}/{cached.model})")
+            return cached
+        
+        response = await self._call_provider(provider, request)
+        if response.success:
+            await cache.set(cache_key, request, response)
+        return response
+    
     async def extract_structured_data(
         self,
         text: str,
@@ -330,31 +958,33 @@ class AIManager:
     
     async def _log_usage(self, request: Optional[AIRequest], response: AIResponse):
         """
-        Log AI usage to database for monitoring and cost tracking.
+        Log AI usage to database and metrics for monitoring and cost tracking.
         
         Args:
             request: The original request (if available)
             response: The response from AI provider
         """
-        # TODO: Store in ai_usage_logs table
         log_data = {
             "provider": response.provider,
-            "prompt_type": request.prompt_type if request else "unknown",
+            "prompt_type": str(getattr(request.prompt_type, "value", request.prompt_type)) if request else "unknown",
             "model_name": response.model,
             "input_tokens": response.input_tokens,
             "output_tokens": response.output_tokens,
             "cost_usd": response.cost_usd,
             "latency_ms": response.latency_ms,
             "status": "success" if response.success else "error",
-            "error_message": response.error
+            "error_message": response.error,
+            "cache_hit": response.cache_hit,
+            "hedged": response.hedged,
+            "cached_input_tokens": response.cached_input_tokens,
+            "created_at": datetime.now(timezone.utc).isoformat()
         }
         
-        logger.info(f"AI usage: {log_data}")
+        logger.info(f"AI usage: {log_data} prompt_cache_hit_rate={response.prompt_cache_hit_rate}")
+        record_ai_response(log_data["prompt_type"] if request else None, response)
         
-        # In production, insert into database:
-        # from database import get_supabase_client
-        # client = get_supabase_client()
-        # client.table("ai_usage_logs").insert(log_data).execute()
+        # Buffered and bulk-inserted into ai_usage_logs in the background
+        get_ai_usage_recorder().record(log_data)
     
     async def health_check(self) -> Dict[str, bool]:
         """
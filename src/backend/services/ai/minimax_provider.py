@@ -8,8 +8,10 @@ https://platform.minimax.io/docs/guides/models-intro
 import json
 import time
 from typing import Dict, Any, Optional
-import httpx
+from services.http_client import get_http_client_registry
 from .base import AIProvider, AIRequest, AIResponse, PromptType
+from .rate_limiter import get_retry_after, is_rate_limit_error
+from .structured_output import parse_structured_output
 import logging
 
 logger = logging.getLogger(__name__)
@@ -75,11 +77,12 @@ class MinimaxProvider(AIProvider):
             
             # Make async HTTP request
             # Increased timeout for large CV analysis requests
-            async with httpx.AsyncClient(timeout=300.0) as client:
+            async with get_http_client_registry().client(self.api_base) as client:
                 response = await client.post(
                     f"{self.api_base}/text/chatcompletion_v2",
                     headers=self.headers,
-                    json=payload
+                    json=payload,
+                    timeout=300.0
                 )
                 response.raise_for_status()
                 result = response.json()
@@ -89,39 +92,10 @@ class MinimaxProvider(AIProvider):
             # Extract response (Minimax format)
             raw_text = result["choices"][0]["message"]["content"]
             
-            # Try to parse as JSON if expected
-            data = None
-            if request.prompt_type in [
-                PromptType.CV_EXTRACTION,
-                PromptType.JOB_POSTING_NORMALIZATION,
-                PromptType.INTERVIEWER_ANALYSIS,
-                PromptType.CANDIDATE_ANALYSIS,
-                PromptType.WEIGHTING_RECOMMENDATION,
-                PromptType.CV_SUMMARY,
-                PromptType.EXECUTIVE_RECOMMENDATION
-            ]:
-                try:
-                    # Try to find JSON in response
-                    json_text = raw_text
-                    if "```json" in raw_text:
-                        json_start = raw_text.find("```json") + 7
-                        json_end = raw_text.find("```", json_start)
-                        json_text = raw_text[json_start:json_end].strip()
-                    elif "```" in raw_text:
-                        json_start = raw_text.find("```") + 3
-                        json_end = raw_text.find("```", json_start)
-                        json_text = raw_text[json_start:json_end].strip()
-                    
-                    # Clean up common AI mistakes
-                    json_text = json_text.strip()
-                    # Fix double braces (AI sometimes copies {{ from examples)
-                    # Replace ALL occurrences, not just start/end
-                    json_text = json_text.replace("{{", "{").replace("}}", "}")
-                    
-                    data = json.loads(json_text)
-                except json.JSONDecodeError as e:
-                    logger.warning(f"Failed to parse Minimax response as JSON: {e}")
-                    logger.warning(f"Raw text (first 500 chars): {raw_text[:500]}")
+            # Parse and validate JSON output (no native JSON mode on this endpoint)
+            data, parse_error = parse_structured_output(request, raw_text)
+            if parse_error:
+                logger.warning(f"Minimax {parse_error}; raw text (first 500 chars): {raw_text[:500]}")
             
             # Extract usage statistics
             usage = result.get("usage", {})
@@ -132,8 +106,9 @@ class MinimaxProvider(AIProvider):
             cost_usd = (input_tokens * 0.000001) + (output_tokens * 0.000002)
             
             return AIResponse(
-                success=True,
+                success=parse_error is None,
                 data=data,
+                error=parse_error,
                 raw_text=raw_text,
                 provider=self.provider_name,
                 model=self.model_name,
@@ -152,7 +127,9 @@ class MinimaxProvider(AIProvider):
                 error=str(e),
                 provider=self.provider_name,
                 model=self.model_name,
-                latency_ms=latency_ms
+                latency_ms=latency_ms,
+                rate_limited=is_rate_limit_error(e),
+                retry_after=get_retry_after(e)
             )
     
     async def extract_structured_data(
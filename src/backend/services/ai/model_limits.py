@@ -1,10 +1,11 @@
 """
 Model token limits and capabilities.
 
-Defines maximum tokens (output) and context window (input) for each AI model.
+Defines maximum tokens (output), context window (input) and per-minute
+rate limits for each AI model.
 """
 
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 # Maximum output tokens per model
 # These are the limits for max_tokens/max_output_tokens parameter
@@ -148,3 +149,66 @@ def get_context_window(model_name: str) -> int:
     # Default: return high limit for modern models
     return 128000
 
+
+
+# Request-per-minute / token-per-minute budgets per model: (rpm, tpm)
+# Conservative defaults for entry-level paid tiers; override per deployment
+# with AI_RATE_LIMITS (see services/ai/rate_limiter.py).
+MODEL_RATE_LIMITS: Dict[str, Tuple[int, int]] = {
+    # Gemini models
+    "models/gemini-2.5-pro": (150, 2000000),
+    "models/gemini-2.5-flash": (1000, 1000000),
+    "models/gemini-2.5-flash-lite": (4000, 4000000),
+    "models/gemini-2.0-flash": (2000, 4000000),
+    "models/gemini-1.5-pro": (1000, 4000000),
+    "models/gemini-1.5-flash": (2000, 4000000),
+    
+    # OpenAI models
+    "gpt-4o": (500, 30000),
+    "gpt-4o-mini": (500, 200000),
+    "gpt-4.1-mini": (500, 200000),
+    "gpt-4-turbo": (500, 30000),
+    "gpt-4": (500, 10000),
+    "gpt-3.5-turbo": (3500, 200000),
+    
+    # Claude models
+    "claude-3-5-sonnet-20241022": (50, 40000),
+    "claude-3-opus-20240229": (50, 20000),
+    "claude-3-sonnet-20240229": (50, 40000),
+    "claude-3-haiku-20240307": (50, 50000),
+}
+
+# Fallback budgets per provider for models not listed above: (rpm, tpm)
+PROVIDER_RATE_LIMITS: Dict[str, Tuple[int, int]] = {
+    "gemini": (150, 1000000),
+    "openai": (500, 30000),
+    "claude": (50, 40000),
+    "kimi": (60, 128000),
+    "minimax": (60, 100000),
+}
+
+
+def get_rate_limits(provider_name: str, model_name: Optional[str] = None) -> Optional[Tuple[int, int]]:
+    """
+    Get request/token per-minute budgets for a provider model.
+    
+    Args:
+        provider_name: Provider name (e.g., "gemini", "openai")
+        model_name: Optional model identifier
+        
+    Returns:
+        (rpm, tpm) tuple, or None if the provider has no known budget
+    """
+    if model_name:
+        if model_name in MODEL_RATE_LIMITS:
+            return MODEL_RATE_LIMITS[model_name]
+        
+        # Try with/without "models/" prefix for Gemini
+        if model_name.startswith("models/"):
+            alternative = model_name.replace("models/", "")
+        else:
+            alternative = f"models/{model_name}"
+        if alternative in MODEL_RATE_LIMITS:
+            return MODEL_RATE_LIMITS[alternative]
+    
+    return PROVIDER_RATE_LIMITS.get(provider_name)
@@ -4,12 +4,14 @@ OpenAI AI provider implementation.
 
 import json
 import time
-from typing import Dict, Any, Optional, List
+from typing import AsyncIterator, Dict, Any, Optional, List
 import logging
 
 from openai import AsyncOpenAI
 
-from .base import AIProvider, AIRequest, AIResponse, PromptType
+from .base import AIProvider, AIRequest, AIResponse, AIStreamChunk, AIStreamError, PromptType
+from .rate_limiter import RateLimitScheduler, get_retry_after, is_rate_limit_error
+from .structured_output import expects_json, parse_structured_output
 
 logger = logging.getLogger(__name__)
 
@@ -60,6 +62,10 @@ class OpenAIProvider(AIProvider):
             from .model_limits import get_max_output_tokens
             max_tokens = request.max_tokens or get_max_output_tokens(self.model_name)
             
+            # Native JSON mode for prompts that return a JSON document
+            json_mode = expects_json(request)
+            extra_args = {"response_format": {"type": "json_object"}} if json_mode else {}
+            
             # Create chat completion
             response = await self.client.chat.completions.create(
                 model=self.model_name,
@@ -68,7 +74,8 @@ class OpenAIProvider(AIProvider):
                     {"role": "user", "content": prompt}
                 ],
                 temperature=request.temperature or 0.7,
-                max_tokens=max_tokens
+                max_tokens=max_tokens,
+                **extra_args
             )
             
             latency_ms = int((time.time() - start_time) * 1000)
@@ -76,60 +83,30 @@ class OpenAIProvider(AIProvider):
             # Extract response
             raw_text = response.choices[0].message.content
             
-            # Try to parse as JSON if expected
-            data = None
-            if request.prompt_type in [
-                PromptType.CV_EXTRACTION,
-                PromptType.JOB_POSTING_NORMALIZATION,
-                PromptType.INTERVIEWER_ANALYSIS,
-                PromptType.CANDIDATE_ANALYSIS,
-                PromptType.WEIGHTING_RECOMMENDATION,
-                PromptType.CV_SUMMARY,
-                PromptType.EXECUTIVE_RECOMMENDATION
-            ]:
-                try:
-                    # Try to find JSON in response
-                    json_text = raw_text
-                    if "```json" in raw_text:
-                        json_start = raw_text.find("```json") + 7
-                        json_end = raw_text.find("```", json_start)
-                        json_text = raw_text[json_start:json_end].strip()
-                    elif "```" in raw_text:
-                        json_start = raw_text.find("```") + 3
-                        json_end = raw_text.find("```", json_start)
-                        json_text = raw_text[json_start:json_end].strip()
-                    
-                    # Clean up common AI mistakes
-                    json_text = json_text.strip()
-                    # Fix double braces (AI sometimes copies {{ from examples)
-                    # Replace ALL occurrences, not just start/end
-                    json_text = json_text.replace("{{", "{").replace("}}", "}")
-                    
-                    data = json.loads(json_text)
-                except json.JSONDecodeError as e:
-                    logger.warning(f"Failed to parse OpenAI response as JSON: {e}")
-                    logger.warning(f"Raw text (first 500 chars): {raw_text[:500]}")
+            # Parse and validate JSON output
+            data, parse_error = parse_structured_output(request, raw_text)
+            if parse_error:
+                logger.warning(f"OpenAI {parse_error}; raw text (first 500 chars): {(raw_text or '')[:500]}")
             
             # Calculate cost (rough estimate based on OpenAI pricing)
             input_tokens = response.usage.prompt_tokens if response.usage else 0
             output_tokens = response.usage.completion_tokens if response.usage else 0
+            cached_tokens = self._cached_tokens(response.usage)
             
-            # GPT-4 pricing (approximate)
-            if "gpt-4" in self.model_name:
-                cost_usd = (input_tokens * 0.00003) + (output_tokens * 0.00006)
-            else:  # GPT-3.5
-                cost_usd = (input_tokens * 0.0000015) + (output_tokens * 0.000002)
+            cost_usd = self._calculate_cost(input_tokens, output_tokens, cached_tokens)
             
             return AIResponse(
-                success=True,
+                success=parse_error is None,
                 data=data,
+                error=parse_error,
                 raw_text=raw_text,
                 provider=self.provider_name,
                 model=self.model_name,
                 input_tokens=input_tokens,
                 output_tokens=output_tokens,
                 latency_ms=latency_ms,
-                cost_usd=cost_usd
+                cost_usd=cost_usd,
+                cached_input_tokens=cached_tokens
             )
             
         except Exception as e:
@@ -149,9 +126,91 @@ class OpenAIProvider(AIProvider):
                 error=str(e),
                 provider=self.provider_name,
                 model=self.model_name,
-                latency_ms=latency_ms
+                latency_ms=latency_ms,
+                rate_limited=is_rate_limit_error(e),
+                retry_after=get_retry_after(e)
             )
     
+    async def stream(self, request: AIRequest) -> AsyncIterator[AIStreamChunk]:
+        """Stream a completion from OpenAI, yielding content deltas."""
+        start_time = time.time()
+        prompt = self.build_prompt(request.template, request.variables)
+        
+        from .model_limits import get_max_output_tokens
+        max_tokens = request.max_tokens or get_max_output_tokens(self.model_name)
+        
+        try:
+            stream = await self.client.chat.completions.create(
+                model=self.model_name,
+                messages=[
+                    {"role": "system", "content": "You are a helpful AI assistant for CV analysis."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=request.temperature or 0.7,
+                max_tokens=max_tokens,
+                stream=True
+            )
+        except Exception as e:
+            logger.error(f"OpenAI API error: {e}")
+            raise AIStreamError(AIResponse(
+                success=False,
+                error=str(e),
+                provider=self.provider_name,
+                model=self.model_name,
+                latency_ms=int((time.time() - start_time) * 1000),
+                rate_limited=is_rate_limit_error(e),
+                retry_after=get_retry_after(e)
+            )) from e
+        
+        parts: List[str] = []
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                yield AIStreamChunk(text=delta)
+        
+        raw_text = "".join(parts)
+        # Streamed responses carry no usage block in this SDK version: estimate it
+        input_tokens = RateLimitScheduler.estimate_prompt_tokens(prompt)
+        output_tokens = RateLimitScheduler.estimate_prompt_tokens(raw_text)
+        yield AIStreamChunk(done=True, response=AIResponse(
+            success=True,
+            raw_text=raw_text,
+            provider=self.provider_name,
+            model=self.model_name,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            latency_ms=int((time.time() - start_time) * 1000),
+            cost_usd=self._calculate_cost(input_tokens, output_tokens)
+        ))
+    
+    @staticmethod
+    def _cached_tokens(usage: Any) -> Optional[int]:
+        """
+        Read prompt tokens served from OpenAI's automatic prefix cache.
+        
+        Prompts are assembled with the shared part first (see the cache
+        breakpoint in AIProvider.build_prompt_parts), which is what the
+        automatic cache matches on; no request flag is needed.
+        """
+        details = getattr(usage, "prompt_tokens_details", None) if usage else None
+        if details is None:
+            return None
+        if isinstance(details, dict):
+            return details.get("cached_tokens")
+        return getattr(details, "cached_tokens", None)
+    
+    def _calculate_cost(self, input_tokens: int, output_tokens: int, cached_tokens: Optional[int] = None) -> float:
+        """Approximate cost in USD for the current model (cached input billed at 50%)."""
+        billed_input = input_tokens - (cached_tokens or 0) * 0.5
+        # GPT-4 pricing (approximate)
+        if "gpt-4" in self.model_name:
+            return (billed_input * 0.00003) + (output_tokens * 0.00006)
+        # GPT-3.5
+        return (billed_input * 0.0000015) + (output_tokens * 0.000002)
+    
     async def extract_structured_data(
         self,
         text: str,
@@ -0,0 +1,167 @@
+"""
+Context-window-aware prompt budgeting.
+
+Fits the large variables of a prompt (CV text, job posting, enrichment
+context) into the input budget of the model that will run it, using
+MODEL_CONTEXT_WINDOW / MODEL_MAX_OUTPUT_TOKENS from model_limits.py.
+
+Sections are declared on the request (AIRequest.budget_sections) with a
+priority: the fixed part of the prompt is counted first, then sections are
+given room in priority order, so low-priority context (enrichment) is
+trimmed before the CV or the job posting. Trimming cuts at line/word
+boundaries and can keep both the start and the end of a text, so the last
+part of a long CV (skills, education) is not silently lost.
+
+AIManager applies this per provider/model, so each fallback entry gets a
+prompt sized for its own context window.
+"""
+
+import logging
+import math
+from typing import Dict, Optional
+
+from .base import AIRequest
+from .model_limits import get_context_window, get_max_output_tokens
+from .prompt_template import compile_template
+
+logger = logging.getLogger(__name__)
+
+# Rough characters-per-token ratio used to estimate prompt size
+CHARS_PER_TOKEN = 4
+
+# Share of the remaining input budget actually used (estimates are approximate)
+BUDGET_SAFETY_FACTOR = 0.9
+
+# Share of a keep_tail section's budget given to the start of the text
+HEAD_SHARE = 0.75
+
+# Inserted where text was removed
+TRIM_MARKER = "\n[...]\n"
+
+# Below this many tokens a trimmed section is dropped rather than kept as a fragment
+MIN_TRIMMED_TOKENS = 16
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text.
+
+    Args:
+        text: Text to estimate
+
+    Returns:
+        Estimated token count
+    """
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def get_input_budget(model_name: Optional[str], max_output_tokens: Optional[int] = None) -> int:
+    """
+    Get the prompt token budget of a model.
+
+    Args:
+        model_name: Model identifier (None uses the default context window)
+        max_output_tokens: Output tokens requested (model maximum if None)
+
+    Returns:
+        Tokens available for the prompt
+    """
+    model_name = model_name or ""
+    output_tokens = max_output_tokens or get_max_output_tokens(model_name)
+    return max(0, int((get_context_window(model_name) - output_tokens) * BUDGET_SAFETY_FACTOR))
+
+
+def _cut_head(text: str, max_chars: int) -> str:
+    """Keep the start of the text, ending at a line (or word) boundary."""
+    if max_chars <= 0:
+        return ""
+    head = text[:max_chars]
+    boundary = head.rfind("\n")
+    if boundary < max_chars // 2:
+        boundary = head.rfind(" ")
+    return head[:boundary] if boundary >= max_chars // 2 else head
+
+
+def _cut_tail(text: str, max_chars: int) -> str:
+    """Keep the end of the text, starting at a line (or word) boundary."""
+    if max_chars <= 0:
+        return ""
+    tail = text[-max_chars:]
+    boundary = tail.find("\n")
+    if boundary < 0 or boundary > max_chars // 2:
+        boundary = tail.find(" ")
+    return tail[boundary + 1:] if 0 <= boundary <= max_chars // 2 else tail
+
+
+def trim_to_tokens(text: str, max_tokens: int, keep_tail: bool = False) -> str:
+    """
+    Trim a text to an estimated token count.
+
+    Args:
+        text: Text to trim
+        max_tokens: Token budget for the text
+        keep_tail: Keep the end as well as the start (cut from the middle)
+
+    Returns:
+        The text unchanged if it fits, otherwise the trimmed text with a
+        marker (empty if the budget is too small for a useful excerpt)
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    if max_tokens < MIN_TRIMMED_TOKENS:
+        return ""
+    max_chars = max_tokens * CHARS_PER_TOKEN - len(TRIM_MARKER)
+    if not keep_tail:
+        return _cut_head(text, max_chars).rstrip() + TRIM_MARKER
+    head_chars = int(max_chars * HEAD_SHARE)
+    head = _cut_head(text, head_chars).rstrip()
+    tail = _cut_tail(text, max_chars - head_chars).lstrip()
+    return head + TRIM_MARKER + tail
+
+
+def fit_request(request: AIRequest, model_name: Optional[str]) -> AIRequest:
+    """
+    Fit a request's budget sections into a model's input budget.
+
+    The prompt without the sections is counted first; the remaining budget
+    is handed to sections in priority order (lowest number first), each
+    also limited by its own max_tokens.
+
+    Args:
+        request: The AI request
+        model_name: Model that will run the request
+
+    Returns:
+        The same request if nothing had to be trimmed, otherwise a copy with
+        trimmed variables
+    """
+    if not request.budget_sections:
+        return request
+
+    template = compile_template(request.template)
+    fixed_prompt = template.render({
+        **request.variables,
+        **{section.name: "" for section in request.budget_sections},
+    })
+    remaining = get_input_budget(model_name, request.max_tokens) - estimate_tokens(fixed_prompt)
+
+    variables = dict(request.variables)
+    trimmed: Dict[str, str] = {}
+    for section in sorted(request.budget_sections, key=lambda item: item.priority):
+        occurrences = template.count(section.name)
+        if section.name not in variables or not occurrences:
+            continue
+        value = str(variables[section.name])
+        allowed = max(0, remaining) // occurrences
+        if section.max_tokens is not None:
+            allowed = min(allowed, section.max_tokens)
+        fitted = trim_to_tokens(value, allowed, section.keep_tail)
+        if fitted != value:
+            variables[section.name] = fitted
+            trimmed[section.name] = f"{estimate_tokens(value)}->{estimate_tokens(fitted)}"
+        remaining -= estimate_tokens(fitted) * occurrences
+
+    if not trimmed:
+        return request
+    logger.info(f"Prompt budget for {request.prompt_type} on {model_name}: trimmed {trimmed} (tokens)")
+    return request.model_copy(update={"variables": variables})
@@ -0,0 +1,275 @@
+"""
+In-process registry of the prompts used for AI calls.
+
+get_prompt used to query ai_prompts and bump the usage counter on every AI
+call. The registry instead keeps the active default prompt of every key and
+language in memory:
+- All prompts are loaded in one query at startup (and compiled, see
+  prompt_template.py), then served without touching the database.
+- Edits made through routers/prompts.py call invalidate(), so this worker
+  reloads before the next read. Other workers notice the edit by checking the
+  newest ai_prompts.updated_at every PROMPT_CACHE_VERSION_CHECK_SECONDS (in the
+  background) and reload when it changes; everything is reloaded at least every
+  PROMPT_CACHE_REFRESH_SECONDS.
+- If a load fails the previous prompts are kept (or the built-in defaults are
+  used) and the load is retried after PROMPT_CACHE_RETRY_SECONDS.
+- Uses are counted in memory and added to ai_prompts.usage_count in one call
+  every PROMPT_USAGE_FLUSH_SECONDS and on shutdown.
+"""
+
+import asyncio
+import logging
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from config import settings
+from services.ai.prompt_template import (
+    CompiledTemplate,
+    TemplateKey,
+    compile_template,
+    get_registered_template,
+    register_templates,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class PromptRegistry:
+    """
+    Active default prompts by (prompt_key, language), with batched usage counters.
+    """
+
+    def __init__(
+        self,
+        refresh_seconds: float = 300.0,
+        version_check_seconds: float = 5.0,
+        retry_seconds: float = 10.0,
+        usage_flush_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.refresh_seconds = refresh_seconds
+        self.version_check_seconds = version_check_seconds
+        self.retry_seconds = retry_seconds
+        self.usage_flush_seconds = usage_flush_seconds
+        self._clock = clock
+
+        self._prompts: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._version: Optional[str] = None
+        self._loaded_at: Optional[float] = None
+        self._checked_at: Optional[float] = None
+        self._retry_at: Optional[float] = None
+        self._invalidated = False
+        # Bumped by invalidate() so a load that started before it doesn't count as fresh
+        self._generation = 0
+        self._refresh_task: Optional[asyncio.Task] = None
+
+        self._usage: Counter = Counter()
+        self._usage_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._service = None
+        self._stats = {
+            "hits": 0, "misses": 0, "loads": 0, "failed_loads": 0,
+            "usage_flushes": 0, "failed_usage_flushes": 0,
+        }
+
+    def _get_service(self):
+        if self._service is None:
+            from services.database.prompt_service import get_prompt_service
+            self._service = get_prompt_service()
+        return self._service
+
+    async def get(self, prompt_key: str, language: str = "en") -> Optional[Dict[str, Any]]:
+        """
+        Get the active default prompt for a key and language.
+
+        Args:
+            prompt_key: Prompt key (e.g. "interviewer_analysis")
+            language: Language code
+
+        Returns:
+            Prompt row or None if there is none (callers use the built-in default)
+        """
+        now = self._clock()
+        can_retry = self._retry_at is None or now >= self._retry_at
+        if (self._loaded_at is None or self._invalidated) and can_retry:
+            await asyncio.shield(self._start_refresh())
+        elif self._loaded_at is not None and can_retry and (
+            now - self._checked_at >= self.version_check_seconds
+            or now - self._loaded_at >= self.refresh_seconds
+        ):
+            self._start_refresh()
+
+        prompt = self._prompts.get((prompt_key, language))
+        self._stats["hits" if prompt is not None else "misses"] += 1
+        return prompt
+
+    def record_usage(self, prompt_id: Optional[str]):
+        """
+        Count one use of a prompt (written by the next usage flush).
+
+        Args:
+            prompt_id: Prompt ID
+        """
+        if prompt_id:
+            self._usage[prompt_id] += 1
+
+    def invalidate(self):
+        """Reload prompts before the next read (call after editing ai_prompts)."""
+        self._generation += 1
+        self._invalidated = True
+        self._retry_at = None
+
+    def _start_refresh(self) -> asyncio.Task:
+        """Start a version check / reload unless one is already running (single flight)."""
+        loop = asyncio.get_running_loop()
+        task = self._refresh_task
+        if task is None or task.done() or task.get_loop() is not loop:
+            task = loop.create_task(self._refresh())
+            self._refresh_task = task
+        return task
+
+    async def _refresh(self):
+        generation = self._generation
+        self._checked_at = self._clock()
+        must_load = (
+            self._invalidated
+            or self._loaded_at is None
+            or self._clock() - self._loaded_at >= self.refresh_seconds
+        )
+        try:
+            service = self._get_service()
+            version = await service.get_prompts_version()
+            if not (must_load or self._invalidated) and version == self._version:
+                return
+            rows = await service.get_active_default_prompts()
+        except Exception as e:
+            self._stats["failed_loads"] += 1
+            self._retry_at = self._clock() + self.retry_seconds
+            logger.warning(
+                f"Failed to load prompts ({'keeping loaded prompts' if self._loaded_at else 'using defaults'}): {e}"
+            )
+            return
+
+        self._install(rows)
+        self._version = version
+        self._loaded_at = self._clock()
+        self._retry_at = None
+        if generation == self._generation:
+            self._invalidated = False
+
+    def _install(self, rows: List[Dict[str, Any]]):
+        """Replace the loaded prompts, compiling each template once."""
+        prompts: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for row in rows:
+            key = (row.get("prompt_key"), row.get("language") or "en")
+            current = prompts.get(key)
+            if current is None or (row.get("version") or 0) > (current.get("version") or 0):
+                prompts[key] = row
+
+        templates: Dict[TemplateKey, CompiledTemplate] = {}
+        for (prompt_key, language), row in prompts.items():
+            previous = self._prompts.get((prompt_key, language))
+            if previous is not None and previous.get("version") != row.get("version"):
+                logger.info(f"Prompt '{prompt_key}' ({language}) changed: v{previous.get('version')} -> v{row.get('version')}")
+            content = row.get("content", "")
+            template_key = (prompt_key, language, row.get("version"))
+            compiled = get_registered_template(template_key)
+            if compiled is None or compiled.template != content:
+                # Placeholders that don't match the declared variables are reported here
+                declared_variables = row.get("variables")
+                compiled = compile_template(
+                    content,
+                    name=f"{prompt_key}/{language} v{row.get('version')}",
+                    declared_variables=declared_variables if isinstance(declared_variables, list) else None,
+                )
+            templates[template_key] = compiled
+
+        self._prompts = prompts
+        register_templates(templates)
+        self._stats["loads"] += 1
+        logger.info(f"Loaded {len(prompts)} prompt(s) from database")
+
+    async def flush_usage(self) -> int:
+        """
+        Write counted uses to ai_prompts.usage_count.
+
+        Counts that cannot be written (or whose flush is cancelled) are kept
+        for the next flush.
+
+        Returns:
+            Number of uses written
+        """
+        if not self._usage:
+            return 0
+        async with self._usage_lock:
+            usage = dict(self._usage)
+            self._usage.clear()
+            try:
+                await self._get_service().increment_usage_batch(usage)
+            except asyncio.CancelledError:
+                self._usage.update(usage)
+                raise
+            except Exception as e:
+                self._usage.update(usage)
+                self._stats["failed_usage_flushes"] += 1
+                logger.warning(f"Failed to write prompt usage counts, will retry: {e}")
+                return 0
+            self._stats["usage_flushes"] += 1
+        return sum(usage.values())
+
+    def start(self):
+        """Load prompts and start periodic usage flushes (application startup, inside the event loop)."""
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        await self._start_refresh()
+        while True:
+            await asyncio.sleep(self.usage_flush_seconds)
+            await self.flush_usage()
+
+    async def close(self):
+        """Stop the background task and write remaining usage counts (application shutdown)."""
+        if self._task is not None:
+            # Wait for a running flush instead of cancelling it mid-write
+            async with self._usage_lock:
+                self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush_usage()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return registry counters."""
+        return {
+            "prompts": len(self._prompts),
+            "version": self._version,
+            "pending_usage": sum(self._usage.values()),
+            **self._stats,
+        }
+
+
+# Global registry instance
+_prompt_registry: Optional[PromptRegistry] = None
+
+
+def get_prompt_registry() -> PromptRegistry:
+    """
+    Get global prompt registry.
+
+    Returns:
+        PromptRegistry singleton
+    """
+    global _prompt_registry
+    if _prompt_registry is None:
+        _prompt_registry = PromptRegistry(
+            refresh_seconds=settings.prompt_cache_refresh_seconds,
+            version_check_seconds=settings.prompt_cache_version_check_seconds,
+            retry_seconds=settings.prompt_cache_retry_seconds,
+            usage_flush_seconds=settings.prompt_usage_flush_seconds,
+        )
+    return _prompt_registry
@@ -0,0 +1,177 @@
+"""
+Compiled prompt templates.
+
+A template is parsed once into its literal segments and placeholder names,
+then rendered by filling the placeholder slots and joining — a single pass
+over the output instead of one full-string str.replace per variable.
+Only the prompts loaded by the prompt registry are cached, by (prompt_key,
+language, version), so each version is parsed (and checked against its
+declared variables) once. Ad-hoc templates built per call (e.g. f-strings in
+the chatbot) are compiled on every use and not kept in memory.
+
+Rendering keeps the str.replace semantics the prompts were written for:
+"{{" / "}}" in JSON examples stay literal and placeholders without a value
+are left as-is. Variable values are inserted verbatim and never scanned for
+placeholders themselves.
+"""
+
+import logging
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Template marker separating the stable prompt prefix from the per-request part.
+# Everything before it is sent as a cacheable prefix (see AIProvider.build_prompt_parts).
+CACHE_BREAKPOINT_NAME = "cache_breakpoint"
+CACHE_BREAKPOINT = "{" + CACHE_BREAKPOINT_NAME + "}"
+
+# (prompt_key, language, version) of a registry prompt
+TemplateKey = Tuple[str, str, Any]
+
+_PLACEHOLDER_PATTERN = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
+
+class CompiledTemplate:
+    """A prompt template parsed into literal segments and placeholder slots."""
+
+    __slots__ = ("template", "placeholders", "_parts", "_breakpoint")
+
+    def __init__(self, template: str):
+        self.template = template
+        # re.split with a group alternates literal text (even indices) and placeholder names (odd indices)
+        self._parts: List[str] = _PLACEHOLDER_PATTERN.split(template)
+        names = self._parts[1::2]
+        self.placeholders: Set[str] = set(names) - {CACHE_BREAKPOINT_NAME}
+        self._breakpoint: Optional[int] = None
+        for index in range(1, len(self._parts), 2):
+            if self._parts[index] == CACHE_BREAKPOINT_NAME:
+                self._breakpoint = index
+                break
+
+    @property
+    def has_breakpoint(self) -> bool:
+        """Whether the template marks a cacheable prefix."""
+        return self._breakpoint is not None
+
+    def count(self, name: str) -> int:
+        """Number of occurrences of a placeholder."""
+        return self._parts[1::2].count(name)
+
+    def _render_range(self, start: int, end: int, variables: Dict[str, Any]) -> str:
+        parts = self._parts[start:end]
+        # Slots sit at odd indices of the full list; shift for slices starting at an odd index
+        for index in range(1 - start % 2, len(parts), 2):
+            name = parts[index]
+            if name == CACHE_BREAKPOINT_NAME:
+                parts[index] = ""
+            elif name in variables:
+                parts[index] = str(variables[name])
+            else:
+                parts[index] = "{" + name + "}"
+        return "".join(parts)
+
+    def render(self, variables: Dict[str, Any]) -> str:
+        """
+        Render the template.
+
+        Args:
+            variables: Values for the placeholders
+
+        Returns:
+            The complete prompt (cache breakpoint removed)
+        """
+        return self._render_range(0, len(self._parts), variables)
+
+    def render_parts(self, variables: Dict[str, Any]) -> Tuple[str, str]:
+        """
+        Render the template split at its cache breakpoint.
+
+        Args:
+            variables: Values for the placeholders
+
+        Returns:
+            (prefix, suffix); prefix is empty if the template has no breakpoint
+        """
+        if self._breakpoint is None:
+            return "", self.render(variables)
+        return (
+            self._render_range(0, self._breakpoint, variables),
+            self._render_range(self._breakpoint + 1, len(self._parts), variables),
+        )
+
+    def check(self, declared_variables: Iterable[str]) -> Tuple[Set[str], Set[str]]:
+        """
+        Compare the template's placeholders with the variables it is declared to use.
+
+        Args:
+            declared_variables: Variable names declared for the prompt
+
+        Returns:
+            (unknown placeholders not declared, declared variables never used)
+        """
+        declared = set(declared_variables)
+        return self.placeholders - declared, declared - self.placeholders
+
+
+# Registry prompts by key, and the same objects by text for build_prompt, which only sees the text
+_registered_templates: Dict[TemplateKey, CompiledTemplate] = {}
+_registered_by_text: Dict[str, CompiledTemplate] = {}
+
+
+def get_registered_template(key: TemplateKey) -> Optional[CompiledTemplate]:
+    """Compiled registry prompt for (prompt_key, language, version), if registered."""
+    return _registered_templates.get(key)
+
+
+def register_templates(templates: Dict[TemplateKey, CompiledTemplate]):
+    """
+    Replace the cached registry prompts.
+
+    Called by the prompt registry after each load with the active version of
+    every prompt, so replaced versions and deleted prompts are dropped.
+
+    Args:
+        templates: Compiled prompts by (prompt_key, language, version)
+    """
+    global _registered_templates, _registered_by_text
+    _registered_templates = dict(templates)
+    _registered_by_text = {compiled.template: compiled for compiled in templates.values()}
+
+
+def compile_template(
+    template: str,
+    name: Optional[str] = None,
+    declared_variables: Optional[Iterable[str]] = None,
+) -> CompiledTemplate:
+    """
+    Get the compiled form of a template.
+
+    Templates registered by the prompt registry are returned from the cache;
+    any other template is parsed on every call and not cached.
+
+    When declared_variables is given for a template that is not cached,
+    placeholders that are not declared (usually a typo that would be sent to
+    the model verbatim) and declared variables the template never uses are
+    logged.
+
+    Args:
+        template: Prompt template with {placeholders}
+        name: Prompt key/version, for the compile report
+        declared_variables: Variables the prompt is declared to use
+
+    Returns:
+        CompiledTemplate (may be shared, do not mutate)
+    """
+    compiled = _registered_by_text.get(template)
+    if compiled is not None:
+        return compiled
+
+    compiled = CompiledTemplate(template)
+    if declared_variables is not None:
+        unknown, missing = compiled.check(declared_variables)
+        if unknown:
+            logger.warning(f"Prompt {name or '<template>'}: undeclared placeholders {sorted(unknown)}")
+        if missing:
+            logger.warning(f"Prompt {name or '<template>'}: declared variables not in template {sorted(missing)}")
+    return compiled
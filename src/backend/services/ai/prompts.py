@@ -141,6 +141,9 @@ IMPORTANT: You must respond in {language}. All summaries, descriptions, and cont
 
 CV File Name: {file_name}
 
+CV Content:
+{cv_text}
+
 Extract and return ONLY valid JSON:
 {{
   "full_name": "Full candidate name if present",
@@ -172,6 +175,52 @@ Rules:
 
 Return ONLY the JSON in {language}."""
 
+# Batched CV Summary Prompt (several CVs per request, see AIAnalysisService.summarize_cvs)
+CV_SUMMARY_BATCH_PROMPT = """You are an expert resume analyst. Summarize each of the {cv_count} CVs below and extract key identifiers.
+
+IMPORTANT: You must respond in {language}. All summaries, descriptions, and content must be in {language}.
+
+Each CV starts with a header line "=== CV <index> | File: <file name> ===".
+
+{cvs}
+
+Return ONLY valid JSON with one entry per CV, using the index from its header:
+{{
+  "summaries": [
+    {{
+      "index": 1,
+      "full_name": "Full candidate name if present",
+      "current_role": "Most recent job title or a short headline describing the candidate",
+      "experience_years": "Approximate years of relevant experience as integer",
+      "primary_skills": ["Top hard skills", "Technologies", "Frameworks"],
+      "soft_skills": ["Key soft or leadership skills"],
+      "languages": ["Language - Level"],
+      "education": [
+        {{
+          "degree": "Degree or certification",
+          "institution": "Institution name",
+          "year": "Graduation year or range if available"
+        }}
+      ],
+      "notable_achievements": [
+        "Impactful achievement or metric",
+        "Award or recognition",
+        "Open-source or community leadership"
+      ],
+      "summary": "2-3 sentence narrative summarizing the candidate’s profile"
+    }}
+  ]
+}}
+
+Rules:
+- Summarize every CV, each one independently: never mix information between CVs.
+- If a field is missing, use null (for single values) or an empty array.
+- Be concise, factual, and base everything on the CV content.
+- Use the CV file name only as a hint when necessary (e.g., to infer candidate name).
+- Do not invent details not present in the CV.
+
+Return ONLY the JSON in {language}."""
+
 # Interviewer Analysis Prompt
 INTERVIEWER_ANALYSIS_PROMPT = """You are a professional recruiter analyzing candidates for a job opening. You must perform a meticulous, comprehensive analysis following the detailed structure below.
 
@@ -183,9 +232,6 @@ Job Posting:
 Key Requirements (from interviewer):
 {key_points}
 
-Candidate CV:
-{cv_text}
-
 Weights for evaluation:
 {weights}
 
@@ -195,7 +241,7 @@ Hard Blockers:
 Nice To Have (preferred but optional differentiators):
 {nice_to_have}
 
-{enrichment_context}
+{company_context}
 
 INSTRUCTIONS:
 1. Compare meticulously the candidate's competencies and experiences with the job posting requirements.
@@ -358,6 +404,13 @@ REQUIREMENTS:
 - Questions must cover technical skills, soft skills, and address gaps not evident in CV.
 - All text, analysis, and content must be in {language}.
 
+The candidate to analyze follows.
+{cache_breakpoint}
+Candidate CV:
+{cv_text}
+
+{candidate_context}
+
 Return ONLY the JSON in {language}, no additional text."""
 
 # Candidate Analysis Prompt  
@@ -1231,7 +1284,8 @@ async def get_prompt(prompt_type: str, language: str = "en") -> str:
     """
     Get prompt template by type from database.
     
-    Falls back to default prompts if database is not available.
+    Database prompts come from the in-process prompt registry; falls back
+    to default prompts if there is none or the database is not available.
     
     Args:
         prompt_type: Type of prompt (cv_extraction, job_posting_normalization, etc.)
@@ -1240,18 +1294,16 @@ async def get_prompt(prompt_type: str, language: str = "en") -> str:
     Returns:
         Prompt template string
     """
-    # Try to get from database first
+    # Active prompts from the database, served from memory (see prompt_registry.py)
     try:
-        from services.database.prompt_service import get_prompt_service
+        from services.ai.prompt_registry import get_prompt_registry
         
-        service = get_prompt_service()
-        prompt_data = await service.get_prompt_by_key(
-            prompt_key=prompt_type,
-            language=language
-        )
+        registry = get_prompt_registry()
+        prompt_data = await registry.get(prompt_type, language)
         
         if prompt_data:
-            logger.info(f"Loaded prompt '{prompt_type}' from database (v{prompt_data.get('version')})")
+            registry.record_usage(prompt_data.get("id"))
+            logger.debug(f"Using prompt '{prompt_type}' from database (v{prompt_data.get('version')})")
             return prompt_data.get("content", "")
     
     except Exception as e:
@@ -1263,6 +1315,7 @@ async def get_prompt(prompt_type: str, language: str = "en") -> str:
         "job_posting_normalization": JOB_POSTING_NORMALIZATION_PROMPT,
         "weighting_recommendation": WEIGHTING_RECOMMENDATION_PROMPT,
         "cv_summary": CV_SUMMARY_PROMPT,
+        "cv_summary_batch": CV_SUMMARY_BATCH_PROMPT,
         "interviewer_analysis": INTERVIEWER_ANALYSIS_PROMPT,
         "candidate_analysis": CANDIDATE_ANALYSIS_PROMPT,
         "translation": TRANSLATION_PROMPT,
@@ -1308,6 +1361,7 @@ def get_prompt_sync(prompt_type: str) -> str:
         "job_posting_normalization": JOB_POSTING_NORMALIZATION_PROMPT,
         "weighting_recommendation": WEIGHTING_RECOMMENDATION_PROMPT,
         "cv_summary": CV_SUMMARY_PROMPT,
+        "cv_summary_batch": CV_SUMMARY_BATCH_PROMPT,
         "interviewer_analysis": INTERVIEWER_ANALYSIS_PROMPT,
         "candidate_analysis": CANDIDATE_ANALYSIS_PROMPT,
         "translation": TRANSLATION_PROMPT,
@@ -0,0 +1,404 @@
+"""
+Per-provider/model rate limit scheduler.
+
+Keeps a token bucket pair (requests per minute and tokens per minute) for
+each provider/model, using the budgets in model_limits.py. Requests are
+admitted when both buckets have room and otherwise queue (FIFO) until they
+do. When a provider answers 429, the model is paused for the Retry-After
+interval so queued requests don't keep tripping the limit.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional, Tuple
+
+from config import settings
+from services.metrics.collectors import AI_QUEUE_DEPTH, RATE_LIMIT_EVENTS
+
+from .base import AIRequest, AIResponse
+from .model_limits import get_rate_limits
+from .prompt_budget import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Output tokens reserved for requests without an explicit max_tokens
+DEFAULT_OUTPUT_TOKEN_ESTIMATE = 1024
+
+# Pause applied after a 429 without a usable Retry-After
+DEFAULT_RETRY_AFTER_SECONDS = 10.0
+
+_RETRY_IN_PATTERN = re.compile(r"retry in ([\d.]+)\s*s", re.IGNORECASE)
+_RETRY_DELAY_PATTERN = re.compile(r"retry_delay\s*\{\s*seconds:\s*(\d+)", re.IGNORECASE)
+
+
+def parse_rate_limit_overrides(value: Optional[str]) -> Dict[str, Tuple[int, int]]:
+    """
+    Parse the AI_RATE_LIMITS setting.
+
+    Format: "gemini=1000/1000000,gpt-4o=500/30000" where each key is a
+    provider or model name and the value is rpm/tpm. Invalid entries are ignored.
+
+    Args:
+        value: Raw setting value
+
+    Returns:
+        Dict of provider/model name -> (rpm, tpm)
+    """
+    overrides: Dict[str, Tuple[int, int]] = {}
+    for item in (value or "").split(","):
+        name, _, limits = item.partition("=")
+        name = name.strip()
+        if not name:
+            continue
+        rpm, _, tpm = limits.partition("/")
+        try:
+            overrides[name] = (int(rpm.strip()), int(tpm.strip()))
+        except ValueError:
+            logger.warning(f"Ignoring invalid rate limit entry: {item!r}")
+    return overrides
+
+
+def is_rate_limit_error(exc: Exception) -> bool:
+    """
+    Check whether a provider exception is a rate limit (429 / quota) error.
+
+    Args:
+        exc: Exception raised by a provider SDK or httpx
+
+    Returns:
+        True if the error indicates the provider is throttling us
+    """
+    status_code = getattr(exc, "status_code", None)
+    response = getattr(exc, "response", None)
+    if status_code is None and response is not None:
+        status_code = getattr(response, "status_code", None)
+    if status_code == 429:
+        return True
+
+    message = str(exc).lower()
+    return (
+        "429" in message
+        or "rate limit" in message
+        or "rate_limit" in message
+        or "resource exhausted" in message
+        or "resource_exhausted" in message
+    )
+
+
+def get_retry_after(exc: Exception) -> Optional[float]:
+    """
+    Extract the Retry-After delay (seconds) from a provider exception.
+
+    Reads Retry-After / retry-after-ms headers when the exception carries an
+    HTTP response (OpenAI, Anthropic, httpx), otherwise looks for the retry
+    hint in the error message (Gemini).
+
+    Args:
+        exc: Exception raised by a provider SDK or httpx
+
+    Returns:
+        Delay in seconds, or None if not provided
+    """
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers:
+        retry_after_ms = headers.get("retry-after-ms")
+        if retry_after_ms:
+            try:
+                return max(0.0, float(retry_after_ms) / 1000.0)
+            except ValueError:
+                pass
+        retry_after = headers.get("retry-after")
+        if retry_after:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                try:
+                    retry_at = parsedate_to_datetime(retry_after)
+                    return max(0.0, retry_at.timestamp() - time.time())
+                except (TypeError, ValueError):
+                    pass
+
+    message = str(exc)
+    for pattern in (_RETRY_IN_PATTERN, _RETRY_DELAY_PATTERN):
+        match = pattern.search(message)
+        if match:
+            return float(match.group(1))
+    return None
+
+
+class _ModelBudget:
+    """Token bucket pair (RPM + TPM) for one provider/model."""
+
+    def __init__(self, rpm: int, tpm: int):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.available_requests = float(rpm)
+        self.available_tokens = float(tpm)
+        self.blocked_until = 0.0
+        self.updated_at = time.monotonic()
+        # Held while a request waits for capacity, so waiters are admitted in order
+        self.lock = asyncio.Lock()
+        self.admitted = 0
+        self.throttled = 0
+        self.rate_limited = 0
+
+    def refill(self, now: float):
+        elapsed = max(0.0, now - self.updated_at)
+        self.updated_at = now
+        self.available_requests = min(self.rpm, self.available_requests + elapsed * self.rpm / 60.0)
+        self.available_tokens = min(self.tpm, self.available_tokens + elapsed * self.tpm / 60.0)
+
+    def wait_time(self, tokens: int, now: float) -> float:
+        """Seconds until a request of this size can be admitted (0 if now)."""
+        wait = max(0.0, self.blocked_until - now)
+        if self.available_requests < 1:
+            wait = max(wait, (1 - self.available_requests) * 60.0 / self.rpm)
+        if self.available_tokens < tokens:
+            wait = max(wait, (tokens - self.available_tokens) * 60.0 / self.tpm)
+        return wait
+
+
+class RateLimitScheduler:
+    """
+    Admits AI requests according to per-provider/model RPM and TPM budgets.
+
+    Usage (done by AIManager around every provider call):
+        reserved = scheduler.estimate_tokens(request, prompt)
+        await scheduler.acquire(provider, model, reserved)
+        response = await provider.complete(request)
+        scheduler.record_response(provider, model, reserved, response)
+        # (scheduler.release(provider, model, reserved) if complete raises or is cancelled)
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        overrides: Optional[Dict[str, Tuple[int, int]]] = None,
+        max_wait_seconds: float = 120.0,
+    ):
+        self.enabled = enabled
+        self.overrides = overrides or {}
+        self.max_wait_seconds = max_wait_seconds
+        self._budgets: Dict[Tuple[str, str], Optional[_ModelBudget]] = {}
+
+    @staticmethod
+    def estimate_tokens(request: AIRequest, prompt: Optional[str] = None) -> int:
+        """
+        Estimate the tokens a request will consume (prompt + reserved output).
+
+        Args:
+            request: The AI request
+            prompt: Fully built prompt, if already available
+
+        Returns:
+            Estimated total tokens
+        """
+        if prompt is None:
+            prompt = request.template + "".join(str(v) for v in request.variables.values())
+        return RateLimitScheduler.estimate_prompt_tokens(prompt) + (request.max_tokens or DEFAULT_OUTPUT_TOKEN_ESTIMATE)
+
+    @staticmethod
+    def estimate_prompt_tokens(prompt: str) -> int:
+        """Estimate the input tokens of a prompt."""
+        return estimate_tokens(prompt)
+
+    def _get_budget(self, provider_name: str, model_name: Optional[str]) -> Optional[_ModelBudget]:
+        key = (provider_name, model_name or "")
+        if key not in self._budgets:
+            limits = None
+            if model_name:
+                limits = self.overrides.get(model_name) or self.overrides.get(model_name.replace("models/", ""))
+            limits = limits or self.overrides.get(provider_name) or get_rate_limits(provider_name, model_name)
+            self._budgets[key] = _ModelBudget(*limits) if limits else None
+        return self._budgets[key]
+
+    async def acquire(self, provider_name: str, model_name: Optional[str], tokens: int) -> float:
+        """
+        Wait until the request fits the provider/model budget, then reserve it.
+
+        Requests larger than the whole TPM budget are admitted once the
+        bucket is full. After max_wait_seconds the request is admitted anyway
+        so nothing queues forever behind a misconfigured budget.
+
+        Args:
+            provider_name: Provider name
+            model_name: Model identifier
+            tokens: Estimated tokens (from estimate_tokens)
+
+        Returns:
+            Seconds spent waiting
+        """
+        if not self.enabled:
+            return 0.0
+        budget = self._get_budget(provider_name, model_name)
+        if budget is None:
+            return 0.0
+
+        tokens = min(tokens, budget.tpm)
+        started = time.monotonic()
+        queue_labels = (provider_name, model_name or "", "rate_limit")
+        AI_QUEUE_DEPTH.inc(*queue_labels)
+        try:
+            async with budget.lock:
+                while True:
+                    now = time.monotonic()
+                    budget.refill(now)
+                    wait = budget.wait_time(tokens, now)
+                    waited = now - started
+                    if wait <= 0 or waited >= self.max_wait_seconds:
+                        if wait > 0:
+                            logger.warning(
+                                f"Rate limit wait for {provider_name}/{model_name} exceeded "
+                                f"{self.max_wait_seconds}s; sending request anyway"
+                            )
+                        budget.available_requests -= 1
+                        budget.available_tokens -= tokens
+                        budget.admitted += 1
+                        if waited > 0.001:
+                            budget.throttled += 1
+                            RATE_LIMIT_EVENTS.inc("ai", f"{provider_name}/{model_name}", "throttled")
+                            logger.info(f"Rate limiter held {provider_name}/{model_name} request for {waited:.2f}s")
+                        return waited
+                    await asyncio.sleep(min(wait, self.max_wait_seconds - waited))
+        finally:
+            AI_QUEUE_DEPTH.dec(*queue_labels)
+
+    def record_response(
+        self,
+        provider_name: str,
+        model_name: Optional[str],
+        reserved_tokens: int,
+        response: AIResponse,
+    ):
+        """
+        Reconcile the reservation with the actual response.
+
+        Refunds (or charges) the difference between reserved and actual
+        tokens. A 429 consumed no tokens: the reservation is given back and
+        the model paused for Retry-After.
+
+        Args:
+            provider_name: Provider name
+            model_name: Model identifier used for acquire
+            reserved_tokens: Tokens reserved by acquire
+            response: Provider response
+        """
+        if not self.enabled:
+            return
+        budget = self._get_budget(provider_name, model_name)
+        if budget is None:
+            return
+
+        if response.rate_limited:
+            self.release(provider_name, model_name, reserved_tokens)
+            self.penalize(provider_name, model_name, response.retry_after)
+            return
+
+        if response.input_tokens is not None or response.output_tokens is not None:
+            actual = (response.input_tokens or 0) + (response.output_tokens or 0)
+        elif not response.success:
+            # Failed before generating anything: give the reservation back
+            actual = 0
+        else:
+            return
+        reserved = min(reserved_tokens, budget.tpm)
+        budget.available_tokens = min(budget.tpm, budget.available_tokens + reserved - actual)
+
+    def release(self, provider_name: str, model_name: Optional[str], reserved_tokens: int):
+        """
+        Give back the tokens reserved for a request that produced no response
+        (cancelled, or the provider raised). The request still counts for RPM.
+
+        Args:
+            provider_name: Provider name
+            model_name: Model identifier used for acquire
+            reserved_tokens: Tokens reserved by acquire
+        """
+        if not self.enabled:
+            return
+        budget = self._get_budget(provider_name, model_name)
+        if budget is None:
+            return
+        reserved = min(reserved_tokens, budget.tpm)
+        budget.available_tokens = min(budget.tpm, budget.available_tokens + reserved)
+
+    def penalize(self, provider_name: str, model_name: Optional[str], retry_after: Optional[float] = None):
+        """
+        Pause a provider/model after a rate limit response.
+
+        Args:
+            provider_name: Provider name
+            model_name: Model identifier
+            retry_after: Seconds from the Retry-After header, if any
+        """
+        budget = self._get_budget(provider_name, model_name)
+        if budget is None:
+            return
+        delay = retry_after if retry_after is not None else DEFAULT_RETRY_AFTER_SECONDS
+        budget.blocked_until = max(budget.blocked_until, time.monotonic() + delay)
+        budget.available_requests = min(budget.available_requests, 0.0)
+        budget.rate_limited += 1
+        RATE_LIMIT_EVENTS.inc("ai", f"{provider_name}/{model_name}", "rate_limited")
+        logger.warning(f"{provider_name}/{model_name} rate limited; pausing requests for {delay:.1f}s")
+
+    def retry_after(self, provider_name: str, model_name: Optional[str]) -> Optional[float]:
+        """
+        Seconds until a provider/model paused by a 429 accepts requests again.
+
+        Args:
+            provider_name: Provider name
+            model_name: Model identifier
+
+        Returns:
+            Remaining pause (0 if not paused), or None if the model has no budget
+        """
+        if not self.enabled:
+            return None
+        budget = self._budgets.get((provider_name, model_name or ""))
+        if budget is None:
+            return None
+        return max(0.0, budget.blocked_until - time.monotonic())
+
+    def stats(self) -> Dict[str, Any]:
+        """Return current budgets and counters per provider/model."""
+        now = time.monotonic()
+        models = {}
+        for (provider_name, model_name), budget in self._budgets.items():
+            if budget is None:
+                continue
+            models[f"{provider_name}/{model_name}"] = {
+                "rpm": budget.rpm,
+                "tpm": budget.tpm,
+                "available_requests": round(budget.available_requests, 2),
+                "available_tokens": int(budget.available_tokens),
+                "blocked_for_seconds": round(max(0.0, budget.blocked_until - now), 2),
+                "admitted": budget.admitted,
+                "throttled": budget.throttled,
+                "rate_limited": budget.rate_limited,
+            }
+        return {"enabled": self.enabled, "models": models}
+
+
+# Global scheduler instance
+_rate_limit_scheduler: Optional[RateLimitScheduler] = None
+
+
+def get_rate_limit_scheduler() -> RateLimitScheduler:
+    """
+    Get global rate limit scheduler.
+
+    Returns:
+        RateLimitScheduler singleton
+    """
+    global _rate_limit_scheduler
+    if _rate_limit_scheduler is None:
+        _rate_limit_scheduler = RateLimitScheduler(
+            enabled=settings.ai_rate_limit_enabled,
+            overrides=parse_rate_limit_overrides(settings.ai_rate_limits),
+            max_wait_seconds=settings.ai_rate_limit_max_wait_seconds,
+        )
+    return _rate_limit_scheduler
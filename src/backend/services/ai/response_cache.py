@@ -0,0 +1,240 @@
+"""
+Content-addressed AI response cache.
+
+Caches successful AI responses keyed by a hash of the prompt type, the fully
+built prompt, the provider/model and the generation parameters, so the same
+CV analysed against the same job posting is not billed again.
+
+Two tiers:
+- In-memory LRU (per process, bounded by entry count)
+- Persistent table ai_response_cache (shared, TTL and size bounded)
+"""
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from config import settings
+
+from .base import AIRequest, AIResponse
+
+logger = logging.getLogger(__name__)
+
+# Prune the persistent tier every N writes
+_PRUNE_EVERY_WRITES = 50
+
+
+class AIResponseCache:
+    """
+    Two-tier (memory LRU + database) cache of AI responses.
+
+    Cache hits are returned with cache_hit=True and zero tokens/cost, since
+    no provider call was made.
+    """
+
+    def __init__(
+        self,
+        max_memory_entries: int = 256,
+        ttl_seconds: int = 7 * 24 * 3600,
+        max_persistent_entries: int = 5000,
+        enabled: bool = True,
+        persistent: bool = True,
+    ):
+        self.max_memory_entries = max_memory_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_persistent_entries = max_persistent_entries
+        self.enabled = enabled
+        self.persistent = persistent
+
+        # cache_key -> (expires_at, serialized response)
+        self._memory: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._persistent_service = None
+        self._writes_since_prune = 0
+        self._stats = {"memory_hits": 0, "persistent_hits": 0, "misses": 0, "writes": 0}
+
+    @staticmethod
+    def make_key(request: AIRequest, prompt: str, provider: str, model: Optional[str]) -> str:
+        """
+        Build the content hash for a request.
+
+        Args:
+            request: The AI request (prompt type and generation params)
+            prompt: Fully built prompt text
+            provider: Provider name
+            model: Model identifier
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        payload = json.dumps(
+            {
+                "prompt_type": str(getattr(request.prompt_type, "value", request.prompt_type)),
+                "prompt": prompt,
+                "provider": provider,
+                "model": model,
+                "temperature": request.temperature,
+                "max_tokens": request.max_tokens,
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _get_persistent_service(self):
+        """Get the database service for the persistent tier, or None if unavailable."""
+        if not self.persistent:
+            return None
+        if self._persistent_service is None:
+            try:
+                from services.database.ai_response_cache_service import get_ai_response_cache_service
+                self._persistent_service = get_ai_response_cache_service()
+            except Exception as e:
+                logger.warning(f"AI response cache persistent tier unavailable: {e}")
+                self.persistent = False
+                return None
+        return self._persistent_service
+
+    def _memory_get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        expires_at, payload = entry
+        if expires_at <= time.time():
+            del self._memory[key]
+            return None
+        self._memory.move_to_end(key)
+        return payload
+
+    def _memory_set(self, key: str, payload: Dict[str, Any]):
+        self._memory[key] = (time.time() + self.ttl_seconds, payload)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    @staticmethod
+    def _as_hit(payload: Dict[str, Any]) -> AIResponse:
+        """Build the AIResponse returned for a cache hit."""
+        response = AIResponse(**payload)
+        return response.model_copy(update={
+            "cache_hit": True,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "cached_input_tokens": None,
+            "cache_write_tokens": None,
+            "cost_usd": 0.0,
+            "latency_ms": 0,
+        })
+
+    async def get(self, key: str) -> Optional[AIResponse]:
+        """
+        Look up a cached response (memory first, then database).
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            AIResponse marked as cache hit, or None
+        """
+        payload = self._memory_get(key)
+        if payload is not None:
+            self._stats["memory_hits"] += 1
+            return self._as_hit(payload)
+
+        service = self._get_persistent_service()
+        if service is not None:
+            payload = await service.get(key)
+            if payload is not None:
+                self._stats["persistent_hits"] += 1
+                self._memory_set(key, payload)
+                return self._as_hit(payload)
+
+        self._stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, request: AIRequest, response: AIResponse):
+        """
+        Store a successful response in both tiers.
+
+        Args:
+            key: Cache key from make_key
+            request: The original request
+            response: Successful response from the provider
+        """
+        if not response.success:
+            return
+
+        payload = response.model_dump(exclude={"cache_hit", "prompt_cache_hit_rate"})
+        self._memory_set(key, payload)
+        self._stats["writes"] += 1
+
+        service = self._get_persistent_service()
+        if service is None:
+            return
+
+        await service.set(
+            cache_key=key,
+            prompt_type=str(getattr(request.prompt_type, "value", request.prompt_type)),
+            provider=response.provider,
+            model=response.model,
+            response=payload,
+            ttl_seconds=self.ttl_seconds,
+        )
+        self._writes_since_prune += 1
+        if self._writes_since_prune >= _PRUNE_EVERY_WRITES:
+            self._writes_since_prune = 0
+            await service.prune(self.max_persistent_entries)
+
+    async def purge(self) -> Dict[str, int]:
+        """
+        Remove all cached responses from both tiers.
+
+        Returns:
+            Dict with number of entries removed per tier
+        """
+        memory_removed = len(self._memory)
+        self._memory.clear()
+
+        persistent_removed = 0
+        service = self._get_persistent_service()
+        if service is not None:
+            persistent_removed = await service.purge()
+
+        logger.info(f"AI response cache purged: memory={memory_removed}, persistent={persistent_removed}")
+        return {"memory": memory_removed, "persistent": persistent_removed}
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache configuration and hit/miss counters."""
+        return {
+            "enabled": self.enabled,
+            "persistent": self.persistent,
+            "memory_entries": len(self._memory),
+            "max_memory_entries": self.max_memory_entries,
+            "max_persistent_entries": self.max_persistent_entries,
+            "ttl_seconds": self.ttl_seconds,
+            **self._stats,
+        }
+
+
+# Global cache instance
+_ai_response_cache: Optional[AIResponseCache] = None
+
+
+def get_ai_response_cache() -> AIResponseCache:
+    """
+    Get global AI response cache.
+
+    Returns:
+        AIResponseCache singleton
+    """
+    global _ai_response_cache
+    if _ai_response_cache is None:
+        _ai_response_cache = AIResponseCache(
+            max_memory_entries=settings.ai_cache_memory_entries,
+            ttl_seconds=settings.ai_cache_ttl_hours * 3600,
+            max_persistent_entries=settings.ai_cache_max_persistent_entries,
+            enabled=settings.ai_cache_enabled,
+        )
+    return _ai_response_cache
@@ -0,0 +1,267 @@
+"""
+Structured (JSON) output for AI prompts.
+
+Shared by all providers:
+- expects_json() decides whether a request must return JSON (by prompt
+  type, overridable with AIRequest.json_output), so providers can switch on
+  their native JSON mode (OpenAI/Kimi response_format, Gemini
+  response_mime_type, Claude response prefill). Other requests (chatbot
+  prompts, which are often free text or built ad hoc) are parsed on a best
+  effort basis: a reply that isn't JSON is still a successful response.
+- parse_json_response() is a single tolerant parser for the text that
+  comes back: it strips code fences and surrounding prose, removes trailing
+  commas, undoes {{ }} copied from the prompt examples and closes JSON that
+  was cut off by the output token limit.
+- validate_structured_output() checks the result against a small
+  per-prompt-type schema (top-level object + required keys), so a reply
+  that is JSON but not the expected document fails over to the next
+  provider instead of surfacing as an empty analysis.
+"""
+
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from .base import AIRequest, PromptType
+
+logger = logging.getLogger(__name__)
+
+# Prompt types whose templates require a JSON document and whose callers
+# cannot do without it. A reply that isn't valid JSON fails the response.
+JSON_PROMPT_TYPES = frozenset({
+    PromptType.CV_EXTRACTION,
+    PromptType.JOB_POSTING_NORMALIZATION,
+    PromptType.WEIGHTING_RECOMMENDATION,
+    PromptType.CV_SUMMARY,
+    PromptType.INTERVIEWER_ANALYSIS,
+    PromptType.CANDIDATE_ANALYSIS,
+    PromptType.EXECUTIVE_RECOMMENDATION,
+    PromptType.STRUCTURE_COMPANY_ENRICHMENT,
+    PromptType.STRUCTURE_CANDIDATE_ENRICHMENT,
+    PromptType.ANALYZE_COMPANY_SOCIAL_MEDIA_RISK,
+    PromptType.ANALYZE_CANDIDATE_SOCIAL_MEDIA_RISK,
+})
+
+# Required top-level keys (and accepted types) per prompt type. Kept to what
+# downstream code cannot do without; other prompt types (including
+# CV_EXTRACTION, which extract_structured_data uses with caller schemas)
+# only need an object.
+RESPONSE_SCHEMAS: Dict[PromptType, Dict[str, Tuple[type, ...]]] = {
+    PromptType.WEIGHTING_RECOMMENDATION: {"weights": (dict,)},
+    PromptType.INTERVIEWER_ANALYSIS: {"categories": (dict,)},
+    PromptType.CANDIDATE_ANALYSIS: {"categories": (dict,)},
+    PromptType.EXECUTIVE_RECOMMENDATION: {"executive_summary": (str, dict, list)},
+}
+
+# Truncated output: how many earlier cut points to try when closing the JSON
+MAX_TRUNCATION_REPAIRS = 20
+
+
+def expects_json(request: AIRequest) -> bool:
+    """
+    Whether a request must return a JSON document.
+
+    Args:
+        request: The AI request
+
+    Returns:
+        AIRequest.json_output if set, otherwise True for JSON prompt types
+    """
+    if request.json_output is not None:
+        return request.json_output
+    return request.prompt_type in JSON_PROMPT_TYPES
+
+
+def _strip_code_fence(text: str) -> str:
+    """Return the content of the first ``` block (or everything after an unclosed one)."""
+    start = text.find("```")
+    if start < 0:
+        return text
+    content_start = text.find("\n", start)
+    if content_start < 0:
+        return text[start + 3:]
+    end = text.find("```", content_start)
+    return text[content_start + 1:end if end >= 0 else len(text)]
+
+
+def _scan(text: str, start: int) -> Tuple[int, List[str], bool, List[Tuple[int, Tuple[str, ...]]]]:
+    """
+    Scan a JSON value from start, tracking nesting outside of strings.
+
+    Returns:
+        (end index, open closers, inside a string, cut points) where end is
+        just past the value if it was closed (else len(text)) and cut points
+        are (index of a top-level-of-container comma, closers open there)
+    """
+    stack: List[str] = []
+    in_string = False
+    escaped = False
+    cut_points: List[Tuple[int, Tuple[str, ...]]] = []
+    for index in range(start, len(text)):
+        char = text[index]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+        if char == '"':
+            in_string = True
+        elif char == "{":
+            stack.append("}")
+        elif char == "[":
+            stack.append("]")
+        elif char in "}]":
+            if stack and stack[-1] == char:
+                stack.pop()
+            if not stack:
+                return index + 1, [], False, cut_points
+        elif char == ",":
+            cut_points.append((index, tuple(stack)))
+    return len(text), stack, in_string, cut_points
+
+
+def _remove_trailing_commas(text: str) -> str:
+    """Drop commas directly before a closing bracket (outside strings)."""
+    result: List[str] = []
+    in_string = False
+    escaped = False
+    for char in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "}]":
+            while result and result[-1].isspace():
+                result.pop()
+            if result and result[-1] == ",":
+                result.pop()
+        result.append(char)
+    return "".join(result)
+
+
+def _loads(text: str) -> Optional[Any]:
+    try:
+        return json.loads(text)
+    except (json.JSONDecodeError, ValueError):
+        try:
+            return json.loads(_remove_trailing_commas(text))
+        except (json.JSONDecodeError, ValueError):
+            return None
+
+
+def _close(fragment: str, closers) -> str:
+    return fragment.rstrip().rstrip(",").rstrip() + "".join(reversed(closers))
+
+
+def _parse_value(text: str) -> Optional[Any]:
+    """Parse the first JSON object/array in text, repairing truncation."""
+    starts = [index for index in (text.find("{"), text.find("[")) if index >= 0]
+    if not starts:
+        return None
+    start = min(starts)
+    end, stack, in_string, cut_points = _scan(text, start)
+    if not stack:
+        return _loads(text[start:end])
+
+    # Cut off by the token limit: close what is open, or drop the last
+    # incomplete member and close from an earlier comma
+    fragment = text[start:end]
+    value = _loads(_close(fragment + ('"' if in_string else ""), stack))
+    if value is not None:
+        return value
+    for index, closers in reversed(cut_points[-MAX_TRUNCATION_REPAIRS:]):
+        value = _loads(_close(text[start:index], closers))
+        if value is not None:
+            return value
+    return None
+
+
+def parse_json_response(text: Optional[str]) -> Optional[Any]:
+    """
+    Parse a JSON document from model output, repairing common defects.
+
+    Handles code fences, prose around the JSON, trailing commas, {{ }}
+    copied from prompt examples and output truncated mid-document.
+
+    Args:
+        text: Raw model output
+
+    Returns:
+        Parsed value, or None if no JSON could be recovered
+    """
+    if not text:
+        return None
+    text = text.strip()
+    value = _loads(text)
+    if value is not None:
+        return value
+
+    candidate = _strip_code_fence(text).strip()
+    value = _parse_value(candidate)
+    if value is not None:
+        return value
+
+    if "{{" in candidate or "}}" in candidate:
+        return _parse_value(candidate.replace("{{", "{").replace("}}", "}"))
+    return None
+
+
+def validate_structured_output(prompt_type: PromptType, data: Any) -> List[str]:
+    """
+    Validate parsed output against the prompt type's schema.
+
+    Args:
+        prompt_type: Prompt type of the request
+        data: Parsed JSON
+
+    Returns:
+        List of problems (empty if valid)
+    """
+    if not isinstance(data, dict):
+        return [f"expected a JSON object, got {type(data).__name__}"]
+    errors = []
+    for key, types in RESPONSE_SCHEMAS.get(prompt_type, {}).items():
+        if key not in data:
+            errors.append(f"missing '{key}'")
+        elif not isinstance(data[key], types):
+            errors.append(f"'{key}' should be {' or '.join(t.__name__ for t in types)}")
+    return errors
+
+
+def parse_structured_output(request: AIRequest, raw_text: Optional[str]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Parse and validate the output of a request.
+
+    Requests that expect JSON (expects_json) fail on output that isn't a
+    valid document. Other prompt types keep whatever JSON object the reply
+    contains, or no data, without an error; json_output=False skips parsing.
+
+    Args:
+        request: The AI request
+        raw_text: Raw model output
+
+    Returns:
+        (data, error): data for valid output, otherwise None and a reason
+        (the reason is only set for requests that expect JSON)
+    """
+    if request.json_output is False:
+        return None, None
+    if not expects_json(request):
+        data = parse_json_response(raw_text)
+        return (data if isinstance(data, dict) else None), None
+
+    data = parse_json_response(raw_text)
+    if data is None:
+        return None, "Invalid structured output: no parseable JSON in response"
+    errors = validate_structured_output(request.prompt_type, data)
+    if errors:
+        return None, f"Invalid structured output for {request.prompt_type.value}: {'; '.join(errors)}"
+    return data, None
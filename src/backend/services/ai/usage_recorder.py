@@ -0,0 +1,211 @@
+"""
+Write-behind recorder for AI usage logs.
+
+AIManager hands every usage record (all prompt types, including chatbot and
+enrichment calls, cache hits and failed attempts) to the recorder, which
+only appends it to an in-memory buffer. A background task flushes the
+buffer to ai_usage_logs in bulk inserts when it reaches AI_USAGE_LOG_BATCH_SIZE
+records or every AI_USAGE_LOG_FLUSH_SECONDS, off the request path. The
+application lifespan starts the task and flushes what is left on shutdown.
+
+Recording never waits on the database: if inserts keep failing, records are
+retried with the next flush and the oldest are dropped beyond
+AI_USAGE_LOG_MAX_BUFFER. A batch that fails AI_USAGE_LOG_MAX_ATTEMPTS times in
+a row (e.g. a row the table rejects) is dropped so it can't block the records
+queued behind it.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class AIUsageRecorder:
+    """
+    Buffers AI usage records and writes them to the database in batches.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 50,
+        flush_interval_seconds: float = 5.0,
+        max_buffer: int = 5000,
+        max_attempts: int = 5,
+        enabled: bool = True,
+    ):
+        self.batch_size = max(1, batch_size)
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_buffer = max(self.batch_size, max_buffer)
+        self.max_attempts = max(1, max_attempts)
+        self.enabled = enabled
+
+        self._buffer: Deque[Dict[str, Any]] = deque()
+        self._service = None
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        # Consecutive failed inserts of the batch at the front of the buffer
+        self._head_failures = 0
+        self._stats = {"recorded": 0, "written": 0, "dropped": 0, "flushes": 0, "failed_flushes": 0}
+
+    def _get_service(self):
+        """Get the database service, or None if unavailable."""
+        if self._service is None:
+            try:
+                from services.database.ai_usage_log_service import get_ai_usage_log_service
+                self._service = get_ai_usage_log_service()
+            except Exception as e:
+                logger.warning(f"AI usage log table unavailable, disabling usage recorder: {e}")
+                self.enabled = False
+                return None
+        return self._service
+
+    def record(self, record: Dict[str, Any]):
+        """
+        Queue a usage record (never blocks).
+
+        Args:
+            record: Row for ai_usage_logs
+        """
+        if not self.enabled:
+            return
+        self._buffer.append(record)
+        self._stats["recorded"] += 1
+        self._trim()
+        if len(self._buffer) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    def _trim(self):
+        overflow = len(self._buffer) - self.max_buffer
+        if overflow > 0:
+            for _ in range(overflow):
+                self._buffer.popleft()
+            self._stats["dropped"] += overflow
+            logger.warning(f"AI usage recorder buffer full; dropped {overflow} oldest record(s)")
+
+    def start(self):
+        """Start the background flush task (application startup, inside the event loop)."""
+        if not self.enabled or (self._task is not None and not self._task.done()):
+            return
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            failed_flushes = self._stats["failed_flushes"]
+            await self.flush()
+            if self._stats["failed_flushes"] > failed_flushes:
+                # Database unavailable: don't retry on every new record, wait a full interval
+                await asyncio.sleep(self.flush_interval_seconds)
+
+    async def flush(self) -> int:
+        """
+        Write buffered records to the database.
+
+        Records are sent in chunks of batch_size; a failed chunk (and
+        everything after it) goes back to the front of the buffer, unless it
+        has now failed max_attempts times, in which case it is dropped.
+        Unsent records also go back if the flush is cancelled.
+
+        Returns:
+            Number of records written
+        """
+        if not self._buffer:
+            return 0
+        service = self._get_service()
+        if service is None:
+            self._buffer.clear()
+            return 0
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+
+        written = 0
+        async with self._flush_lock:
+            pending: List[Dict[str, Any]] = list(self._buffer)
+            self._buffer.clear()
+            try:
+                while pending:
+                    batch = pending[:self.batch_size]
+                    try:
+                        written += await service.insert_many(batch)
+                    except Exception as e:
+                        self._stats["failed_flushes"] += 1
+                        self._head_failures += 1
+                        if self._head_failures < self.max_attempts:
+                            logger.warning(f"Failed to write {len(pending)} AI usage record(s), will retry: {e}")
+                            break
+                        logger.error(
+                            f"Dropping {len(batch)} AI usage record(s) after "
+                            f"{self._head_failures} failed attempts: {e}"
+                        )
+                        self._stats["dropped"] += len(batch)
+                        self._head_failures = 0
+                        pending = pending[self.batch_size:]
+                        break
+                    self._head_failures = 0
+                    pending = pending[self.batch_size:]
+            finally:
+                if pending:
+                    self._buffer.extendleft(reversed(pending))
+                    self._trim()
+            self._stats["flushes"] += 1
+            self._stats["written"] += written
+        return written
+
+    async def close(self):
+        """Stop the background task and flush remaining records (application shutdown)."""
+        if self._task is not None:
+            # Wait for a running flush instead of cancelling it mid-insert
+            async with self._flush_lock:
+                self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._wakeup = None
+        await self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return recorder counters and current buffer size."""
+        return {
+            "enabled": self.enabled,
+            "buffered": len(self._buffer),
+            "batch_size": self.batch_size,
+            "flush_interval_seconds": self.flush_interval_seconds,
+            **self._stats,
+        }
+
+
+# Global recorder instance
+_ai_usage_recorder: Optional[AIUsageRecorder] = None
+
+
+def get_ai_usage_recorder() -> AIUsageRecorder:
+    """
+    Get global AI usage recorder.
+
+    Returns:
+        AIUsageRecorder singleton
+    """
+    global _ai_usage_recorder
+    if _ai_usage_recorder is None:
+        _ai_usage_recorder = AIUsageRecorder(
+            batch_size=settings.ai_usage_log_batch_size,
+            flush_interval_seconds=settings.ai_usage_log_flush_seconds,
+            max_buffer=settings.ai_usage_log_max_buffer,
+            max_attempts=settings.ai_usage_log_max_attempts,
+            enabled=settings.ai_usage_log_enabled,
+        )
+    return _ai_usage_recorder
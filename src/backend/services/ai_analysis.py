@@ -4,11 +4,14 @@ AI Analysis service - High-level service for CV and candidate analysis.
 Uses AI providers to analyze CVs against job postings.
 """
 
+import asyncio
 import json
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from uuid import UUID
 
-from services.ai import get_ai_manager, AIRequest, PromptType
+from config import settings
+from services.ai import get_ai_manager, AIRequest, PromptSection, PromptType
+from services.ai.prompt_budget import estimate_tokens, trim_to_tokens
 from services.ai.prompts import get_prompt
 from services.database.enrichment_service import (
     CompanyEnrichmentService,
@@ -19,6 +22,28 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Prompt budget for CV-vs-job prompts: the job posting is kept first, then the
+# CV (start and end preserved), and enrichment context is trimmed first
+ANALYSIS_BUDGET_SECTIONS = [
+    PromptSection(name="job_posting", priority=0, keep_tail=True),
+    PromptSection(name="cv_text", priority=1, keep_tail=True),
+    PromptSection(name="enrichment_context", priority=2),
+]
+
+# Interviewer analysis: sections of the shared (cached) prompt prefix are fitted
+# before the CV, so their trimming doesn't depend on the CV and the prefix stays
+# identical for every candidate of a session.
+INTERVIEWER_BUDGET_SECTIONS = [
+    PromptSection(name="job_posting", priority=0, keep_tail=True),
+    PromptSection(name="company_context", priority=1),
+    PromptSection(name="cv_text", priority=2, keep_tail=True),
+    PromptSection(name="candidate_context", priority=3),
+    PromptSection(name="enrichment_context", priority=3),
+]
+
+# Output tokens reserved per CV in a batched summary request
+SUMMARY_OUTPUT_TOKENS_PER_CV = 600
+
 
 class AIAnalysisService:
     """
@@ -77,7 +102,13 @@ class AIAnalysisService:
                 variables=variables,
                 language=language,
                 temperature=0.4,
-                max_tokens=1024
+                max_tokens=1024,
+                hedge=True,  # Interactive: hedge slow providers
+                budget_sections=[
+                    PromptSection(name="job_posting", priority=0, keep_tail=True),
+                    PromptSection(name="structured_job_posting", priority=1),
+                    PromptSection(name="enrichment_context", priority=2),
+                ]
             )
             
             response = await self.ai_manager.execute(ai_request)
@@ -104,6 +135,7 @@ class AIAnalysisService:
         company_name: Optional[str] = None,
         candidate_id: Optional[UUID] = None,
         candidate_name: Optional[str] = None,
+        timeout: Optional[float] = None,
     ) -> Optional[Dict[str, Any]]:
         """
         Analyze a candidate for interviewer mode.
@@ -115,22 +147,32 @@ class AIAnalysisService:
             weights: Category weights
             hard_blockers: Hard blocker rules
             language: Response language
+            timeout: Seconds allowed per provider call (time queued for rate
+                limits is not counted)
             
         Returns:
-            Analysis dict with categories, scores, strengths, etc.
+            Analysis dict with categories, scores, strengths, etc. If every
+            provider was rate limited: {"data": None, "error", "retry_after"}
+            (seconds until a provider accepts requests again). None on other
+            failures.
         """
         try:
             # Get prompt template (in the correct language)
             template = await get_prompt("interviewer_analysis", language)
             
-            # Build enrichment context
-            enrichment_context = await self._build_enrichment_context(
-                company_name=company_name,
+            # Build enrichment context: company context is the same for every CV
+            # (shared prompt prefix), candidate context goes with the CV
+            company_context = await self._build_enrichment_context(company_name=company_name)
+            candidate_context = await self._build_enrichment_context(
                 candidate_id=candidate_id,
                 candidate_name=candidate_name,
             )
+            enrichment_context = "\n\n".join(
+                context for context in (company_context, candidate_context) if context
+            )
 
-            # Prepare variables (no truncation - models support large contexts)
+            # Prepare variables (fitted to the model's context window by the AI manager).
+            # enrichment_context keeps templates stored before the prefix/suffix split working.
             variables = {
                 "job_posting": job_posting_text,
                 "cv_text": cv_text,
@@ -139,6 +181,8 @@ class AIAnalysisService:
                 "hard_blockers": str(hard_blockers),
                 "nice_to_have": str(nice_to_have),
                 "language": language,
+                "company_context": company_context,
+                "candidate_context": candidate_context,
                 "enrichment_context": enrichment_context,
             }
             
@@ -151,7 +195,9 @@ class AIAnalysisService:
                 variables=variables,
                 language=language,
                 temperature=0.7,
-                max_tokens=None  # Will use model's maximum from model_limits
+                max_tokens=None,  # Will use model's maximum from model_limits
+                budget_sections=INTERVIEWER_BUDGET_SECTIONS,
+                timeout=timeout
             )
             
             # Execute with AI manager (auto-selects provider and handles fallback)
@@ -159,6 +205,8 @@ class AIAnalysisService:
             
             if not response.success:
                 logger.error(f"AI analysis failed: {response.error}")
+                if response.rate_limited:
+                    return {"data": None, "error": response.error, "retry_after": response.retry_after}
                 return None
             
             return {
@@ -167,7 +215,10 @@ class AIAnalysisService:
                 "data": response.data or {},
                 "raw_text": response.raw_text,
                 "input_tokens": response.input_tokens,
-                "output_tokens": response.output_tokens
+                "output_tokens": response.output_tokens,
+                "cache_hit": response.cache_hit,
+                "cached_input_tokens": response.cached_input_tokens,
+                "prompt_cache_hit_rate": response.prompt_cache_hit_rate
             }
             
         except Exception as e:
@@ -222,7 +273,8 @@ class AIAnalysisService:
                 variables=variables,
                 language=language,
                 temperature=0.7,
-                max_tokens=2048
+                max_tokens=2048,
+                budget_sections=ANALYSIS_BUDGET_SECTIONS
             )
             
             # Execute
@@ -238,7 +290,8 @@ class AIAnalysisService:
                 "data": response.data or {},
                 "raw_text": response.raw_text,
                 "input_tokens": response.input_tokens,
-                "output_tokens": response.output_tokens
+                "output_tokens": response.output_tokens,
+                "cache_hit": response.cache_hit
             }
             
         except Exception as e:
@@ -269,7 +322,8 @@ class AIAnalysisService:
                 variables={"cv_text": cv_text},
                 language=language,
                 temperature=0.3,  # Lower for extraction
-                max_tokens=2048
+                max_tokens=2048,
+                budget_sections=[PromptSection(name="cv_text", keep_tail=True)]
             )
             
             response = await self.ai_manager.execute(ai_request)
@@ -302,7 +356,11 @@ class AIAnalysisService:
                 },
                 language=language,
                 temperature=0.4,
-                max_tokens=1024
+                max_tokens=1024,
+                hedge=True,  # Interactive: hedge slow providers
+                budget_sections=[
+                    PromptSection(name="cv_text", max_tokens=settings.ai_summary_max_cv_tokens, keep_tail=True)
+                ]
             )
 
             response = await self.ai_manager.execute(ai_request)
@@ -317,6 +375,137 @@ class AIAnalysisService:
             logger.error(f"Error summarizing CV: {exc}")
             return None
     
+    async def summarize_cvs(
+        self,
+        cvs: List[Tuple[str, str]],
+        language: str = "en"
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Generate structured summaries for several CVs with batched AI calls.
+        
+        CVs are packed into as few cv_summary_batch requests as fit the batch
+        size and prompt token budget (each CV fitted to AI_SUMMARY_MAX_CV_TOKENS).
+        Batches run concurrently. CVs whose summary is missing from a batch
+        response (or whose batch failed to parse) are summarized one by one
+        with summarize_cv.
+        
+        Args:
+            cvs: (cv_text, file_name) pairs
+            language: Response language
+            
+        Returns:
+            Summaries in the same order as cvs (None where summarization failed)
+        """
+        summaries: List[Optional[Dict[str, Any]]] = [None] * len(cvs)
+        texts = {
+            idx: trim_to_tokens(cv_text, settings.ai_summary_max_cv_tokens, keep_tail=True)
+            for idx, (cv_text, _) in enumerate(cvs)
+            if cv_text
+        }
+        
+        async def _run_batch(batch: List[int]):
+            results = await self._summarize_cv_batch(
+                [(texts[idx], cvs[idx][1]) for idx in batch],
+                language
+            ) if len(batch) > 1 else {}
+            missing = [idx for position, idx in enumerate(batch) if position not in results]
+            if results and missing:
+                logger.warning(f"Batched CV summary missing {len(missing)} of {len(batch)} CV(s); summarizing them individually")
+            for position, idx in enumerate(batch):
+                if position in results:
+                    summaries[idx] = results[position]
+            fallback = await asyncio.gather(*(
+                self.summarize_cv(texts[idx], cvs[idx][1], language) for idx in missing
+            ))
+            for idx, summary in zip(missing, fallback):
+                summaries[idx] = summary
+        
+        await asyncio.gather(*(_run_batch(batch) for batch in self._pack_summary_batches(texts)))
+        return summaries
+    
+    @staticmethod
+    def _pack_summary_batches(texts: Dict[int, str]) -> List[List[int]]:
+        """Group CV indices into batches within the batch size and prompt token budget."""
+        batches: List[List[int]] = []
+        current: List[int] = []
+        current_tokens = 0
+        for idx, text in texts.items():
+            tokens = estimate_tokens(text)
+            if current and (
+                len(current) >= settings.ai_summary_batch_size
+                or current_tokens + tokens > settings.ai_summary_batch_max_input_tokens
+            ):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(idx)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
+    
+    async def _summarize_cv_batch(
+        self,
+        cvs: List[Tuple[str, str]],
+        language: str
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Summarize several CVs in one AI request.
+        
+        Args:
+            cvs: (cv_text, file_name) pairs, already fitted to the budget
+            language: Response language
+            
+        Returns:
+            Summaries keyed by position in cvs (missing entries were not returned
+            or could not be parsed; empty if the whole request failed)
+        """
+        try:
+            template = await get_prompt("cv_summary_batch", language)
+            blocks = [
+                f"=== CV {position} | File: {file_name} ===\n{cv_text}"
+                for position, (cv_text, file_name) in enumerate(cvs, 1)
+            ]
+            
+            ai_request = AIRequest(
+                prompt_type=PromptType.CV_SUMMARY,
+                template=template,
+                variables={
+                    "cv_count": len(cvs),
+                    "cvs": "\n\n".join(blocks),
+                    "language": language
+                },
+                language=language,
+                temperature=0.4,
+                max_tokens=SUMMARY_OUTPUT_TOKENS_PER_CV * len(cvs)
+            )
+            
+            response = await self.ai_manager.execute(ai_request)
+            
+            if not response.success:
+                logger.error(f"Batched CV summary failed: {response.error}")
+                return {}
+            
+            entries = (response.data or {}).get("summaries")
+            if not isinstance(entries, list):
+                logger.warning("Batched CV summary response has no summaries list")
+                return {}
+            
+            results: Dict[int, Dict[str, Any]] = {}
+            for entry in entries:
+                if not isinstance(entry, dict):
+                    continue
+                try:
+                    position = int(entry.pop("index")) - 1
+                except (KeyError, TypeError, ValueError):
+                    continue
+                if 0 <= position < len(cvs) and position not in results:
+                    results[position] = entry
+            return results
+        
+        except Exception as exc:
+            logger.error(f"Error in batched CV summary: {exc}")
+            return {}
+    
     async def normalize_job_posting(
         self,
         job_posting_text: str,
@@ -370,7 +559,11 @@ class AIAnalysisService:
                 },
                 language=language,
                 temperature=0.3,
-                max_tokens=1024
+                max_tokens=1024,
+                budget_sections=[
+                    PromptSection(name="job_posting_text", priority=0, keep_tail=True),
+                    PromptSection(name="enrichment_context", priority=1),
+                ]
             )
             
             response = await self.ai_manager.execute(ai_request)
@@ -459,7 +652,11 @@ class AIAnalysisService:
                 variables=variables,
                 language=language,
                 temperature=0.6,
-                max_tokens=1536
+                max_tokens=1536,
+                budget_sections=[
+                    PromptSection(name="job_posting_summary", priority=0, keep_tail=True),
+                    PromptSection(name="enrichment_context", priority=1),
+                ]
             )
             
             response = await self.ai_manager.execute(ai_request)
@@ -14,18 +14,20 @@ This service handles:
 - Employability scoring
 """
 
+import asyncio
 import json
-from typing import Dict, Any, List, Optional
+from typing import AsyncIterator, Dict, Any, List, Optional
 from uuid import UUID
 import logging
 
+from database import run_db
 from services.database.chatbot_service import get_chatbot_database_service
 from services.database.candidate_service import get_candidate_service
 from services.database.cv_service import get_cv_service
 from services.database.job_posting_service import get_job_posting_service
 from services.database.company_profile_service import get_company_profile_service
 from services.database.candidate_profile_service import get_candidate_profile_service
-from services.ai import get_ai_manager, AIRequest, PromptType
+from services.ai import get_ai_manager, AIRequest, PromptSection, PromptType
 from services.ai.prompts import get_prompt
 from services.ai_analysis import get_ai_analysis_service
 from services.search.brave_search import get_brave_search_service
@@ -34,6 +36,10 @@ import re
 
 logger = logging.getLogger(__name__)
 
+# Token caps replacing the former character slicing of CV text in prompts
+CV_SUMMARY_MAX_TOKENS = 500
+ORIGINAL_CV_MAX_TOKENS = 4000
+
 
 class ChatbotService:
     """
@@ -95,7 +101,7 @@ class ChatbotService:
                 logger.warning("All consents must be given to start session")
                 return None
             
-            session = self.db_service.create_session(
+            session = await run_db(self.db_service.create_session,
                 language=language,
                 consent_given=True,
                 profile_data={}
@@ -109,7 +115,7 @@ class ChatbotService:
             
             # Add welcome message
             welcome_msg = await self._generate_welcome_message(language)
-            self.db_service.add_message(
+            await run_db(self.db_service.add_message,
                 session_id=session_id,
                 role="bot",
                 content=welcome_msg,
@@ -164,31 +170,12 @@ class ChatbotService:
         """
         try:
             # Get session
-            session = self.db_service.get_session(session_id)
+            session = await run_db(self.db_service.get_session, session_id)
             if not session:
                 logger.error(f"Session {session_id} not found")
                 return None
             
-            # Add user message
-            self.db_service.add_message(
-                session_id=session_id,
-                role="user",
-                content=user_message,
-                message_type=message_type
-            )
-            
-            # Check if user provided personal or company links/information
-            # Process personal links if detected in message
-            await self._process_personal_links(session_id, session, user_message)
-            
-            # Process company links ONLY if company-specific links are detected
-            # (linkedin.com/company or explicit company websites)
-            # Don't process companies automatically just because they're in the CV
-            if re.search(r'linkedin\.com/company|(?:website|site|empresa|company)[\s:]*http', user_message, re.IGNORECASE):
-                await self._process_company_links(session_id, session, user_message)
-            
-            # Get conversation history
-            messages = self.db_service.get_messages(session_id, limit=20)
+            messages = await self._record_user_message(session_id, session, user_message, message_type)
             language = session.get("language", "en")
             
             # Generate conversational response using AI
@@ -206,44 +193,159 @@ class ChatbotService:
             # Detect if user provided specific information (CV, job, profile)
             detected_info = await self._detect_user_input(session, user_message, language)
             
-            # Update session with detected information
-            if detected_info:
-                update_data = {}
-                if detected_info.get("profile_data"):
-                    current_profile = session.get("profile_data", {})
-                    current_profile.update(detected_info["profile_data"])
-                    update_data["profile_data"] = current_profile
-                
-                if detected_info.get("cv_data"):
-                    update_data["cv_data"] = detected_info["cv_data"]
-                
-                if detected_info.get("job_opportunity_data"):
-                    update_data["job_opportunity_data"] = detected_info["job_opportunity_data"]
-                
-                if update_data:
-                    self.db_service.update_session(session_id, update_data)
+            await self._save_bot_response(session_id, session, bot_response_content, detected_info)
             
-            # Add bot response to messages
             bot_response = {
                 "content": bot_response_content,
                 "message_type": "text",
                 "metadata": detected_info or {}
             }
             
-            self.db_service.add_message(
-                session_id=session_id,
-                role="bot",
-                content=bot_response_content,
-                message_type="text",
-                metadata=detected_info or {}
-            )
-            
             return bot_response
             
         except Exception as e:
             logger.error(f"Error handling message in session {session_id}: {e}", exc_info=True)
             return None
     
+    async def stream_message(
+        self,
+        session_id: UUID,
+        user_message: str,
+        message_type: str = "text"
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Handle user message, streaming the bot response as it is generated.
+        
+        Same flow as handle_message, but the reply text is yielded as the AI
+        provider produces it, and input detection runs alongside the reply
+        instead of after it. The bot message is persisted once the stream
+        completes; a reply that breaks off mid-stream is not stored.
+        
+        Args:
+            session_id: Session ID
+            user_message: User's message
+            message_type: Type of message
+            
+        Yields:
+            {"event": "token", "text": ...} for each piece of the reply, then
+            {"event": "done", "message": <stored bot message>} or
+            {"event": "error", "error": ...}
+        """
+        session = await run_db(self.db_service.get_session, session_id)
+        if not session:
+            logger.error(f"Session {session_id} not found")
+            yield {"event": "error", "error": "Session not found"}
+            return
+        
+        messages = await self._record_user_message(session_id, session, user_message, message_type)
+        language = session.get("language", "en")
+        
+        # Input detection is a separate AI call: run it while the reply streams
+        detection = asyncio.create_task(self._detect_user_input(session, user_message, language))
+        try:
+            parts: List[str] = []
+            try:
+                ai_request = self._build_conversational_request(session, user_message, messages, language)
+                async for chunk in self.ai_manager.stream(ai_request):
+                    text = chunk.text if parts else chunk.text.lstrip()
+                    if text:
+                        parts.append(text)
+                        yield {"event": "token", "text": text}
+            except Exception as e:
+                logger.error(f"[Chatbot] AI stream failed: {e}")
+                if parts:
+                    yield {"event": "error", "error": "Response interrupted, please try again"}
+                    return
+            
+            bot_response_content = "".join(parts).strip()
+            if not bot_response_content:
+                # Fallback to error message
+                bot_response_content = await self._generate_error_message(language)
+                yield {"event": "token", "text": bot_response_content}
+            
+            detected_info = await detection
+            stored = await self._save_bot_response(session_id, session, bot_response_content, detected_info)
+            if not stored:
+                yield {"event": "error", "error": "Failed to save bot response"}
+                return
+            yield {"event": "done", "message": stored}
+        finally:
+            if not detection.done():
+                detection.cancel()
+    
+    async def _record_user_message(
+        self,
+        session_id: UUID,
+        session: Dict[str, Any],
+        user_message: str,
+        message_type: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Store the user message, process any links in it and return the history.
+        
+        Returns:
+            Recent conversation messages (including the new one)
+        """
+        # Add user message
+        await run_db(self.db_service.add_message,
+            session_id=session_id,
+            role="user",
+            content=user_message,
+            message_type=message_type
+        )
+        
+        # Check if user provided personal or company links/information
+        # Process personal links if detected in message
+        await self._process_personal_links(session_id, session, user_message)
+        
+        # Process company links ONLY if company-specific links are detected
+        # (linkedin.com/company or explicit company websites)
+        # Don't process companies automatically just because they're in the CV
+        if re.search(r'linkedin\.com/company|(?:website|site|empresa|company)[\s:]*http', user_message, re.IGNORECASE):
+            await self._process_company_links(session_id, session, user_message)
+        
+        # Get conversation history
+        return await run_db(self.db_service.get_messages, session_id, limit=20)
+    
+    async def _save_bot_response(
+        self,
+        session_id: UUID,
+        session: Dict[str, Any],
+        content: str,
+        detected_info: Optional[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Apply detected user information to the session and store the bot message.
+        
+        Returns:
+            Stored bot message or None if it could not be saved
+        """
+        # Update session with detected information
+        if detected_info:
+            update_data = {}
+            if detected_info.get("profile_data"):
+                current_profile = session.get("profile_data", {})
+                current_profile.update(detected_info["profile_data"])
+                update_data["profile_data"] = current_profile
+            
+            if detected_info.get("cv_data"):
+                update_data["cv_data"] = detected_info["cv_data"]
+            
+            if detected_info.get("job_opportunity_data"):
+                update_data["job_opportunity_data"] = detected_info["job_opportunity_data"]
+            
+            if update_data:
+                await run_db(self.db_service.update_session, session_id, update_data)
+        
+        # Add bot response to messages
+        return await run_db(self.db_service.add_message,
+            session_id=session_id,
+            role="bot",
+            content=content,
+            message_type="text",
+            metadata=detected_info or {}
+        )
+    
     async def _handle_welcome_step(self, session: Dict[str, Any], user_message: str) -> Dict[str, Any]:
         """Handle welcome step - transition to profile collection."""
         language = session.get("language", "en")
@@ -295,7 +397,7 @@ class ChatbotService:
                     if candidate:
                         candidate_id = UUID(candidate["id"])
                 
-                self.db_service.update_session(session_id, {
+                await run_db(self.db_service.update_session, session_id, {
                     "profile_data": current_profile,
                     "candidate_id": str(candidate_id) if candidate_id else None
                 })
@@ -397,7 +499,7 @@ Message: {text}"""
                 # Store job opportunity data
                 company_name = job_data.get("company") or job_data.get("company_name")
                 
-                self.db_service.create_job_opportunity(
+                await run_db(self.db_service.create_job_opportunity,
                     session_id=session_id,
                     raw_text=user_message,
                     structured_data=job_data,
@@ -414,7 +516,7 @@ Message: {text}"""
                 )
                 
                 # Update session
-                self.db_service.update_session(session_id, {
+                await run_db(self.db_service.update_session, session_id, {
                     "job_opportunity_data": job_data
                 })
                 
@@ -474,7 +576,7 @@ Message: {text}"""
                             }
                             
                             # Update session with company enrichment
-                            self.db_service.update_session(session_id, {
+                            await run_db(self.db_service.update_session, session_id, {
                                 "companies_enrichment": companies_enrichment
                             })
                             
@@ -556,7 +658,7 @@ Message: {text}"""
             
             if analysis:
                 # Store analysis
-                self.db_service.create_digital_footprint(
+                await run_db(self.db_service.create_digital_footprint,
                     session_id=session_id,
                     linkedin_url=links.get("linkedin"),
                     github_url=links.get("github"),
@@ -605,7 +707,7 @@ Message: {text}"""
                     additional_questions["questions"] = questions.get("questions", [])
                     additional_questions["questions_asked"] = 0
                     
-                    self.db_service.update_session(session_id, {
+                    await run_db(self.db_service.update_session, session_id, {
                         "additional_questions_data": additional_questions
                     })
                     
@@ -674,7 +776,7 @@ Message: {text}"""
             
             # Store CV versions
             if ats_cv:
-                self.db_service.create_cv_version(
+                await run_db(self.db_service.create_cv_version,
                     session_id=session_id,
                     version_type="ats_friendly",
                     cv_content=ats_cv.get("cv_content", ""),
@@ -685,7 +787,7 @@ Message: {text}"""
                 )
             
             if human_cv:
-                self.db_service.create_cv_version(
+                await run_db(self.db_service.create_cv_version,
                     session_id=session_id,
                     version_type="human_friendly",
                     cv_content=human_cv.get("cv_content", ""),
@@ -738,7 +840,7 @@ Message: {text}"""
             
             if interview_prep:
                 # Store interview prep
-                self.db_service.create_interview_prep(
+                await run_db(self.db_service.create_interview_prep,
                     session_id=session_id,
                     likely_questions=interview_prep.get("likely_questions", []),
                     suggested_answers=interview_prep.get("suggested_answers", []),
@@ -779,7 +881,7 @@ Message: {text}"""
             
             if not cv_data or not job_data:
                 # Complete without score
-                self.db_service.complete_session(session_id)
+                await run_db(self.db_service.complete_session, session_id)
                 return {
                     "content": await self._generate_completion_message(language),
                     "current_step": "completed"
@@ -801,7 +903,7 @@ Message: {text}"""
             
             if score_data:
                 # Store score
-                self.db_service.create_employability_score(
+                await run_db(self.db_service.create_employability_score,
                     session_id=session_id,
                     overall_score=score_data.get("overall_score", 0),
                     technical_skills_score=score_data.get("technical_skills_score"),
@@ -813,7 +915,7 @@ Message: {text}"""
                 )
             
             # Complete the session
-            self.db_service.complete_session(session_id)
+            await run_db(self.db_service.complete_session, session_id)
             
             # Generate completion message with score
             completion_msg = await self._generate_completion_message_with_score(language, score_data)
@@ -827,7 +929,7 @@ Message: {text}"""
         except Exception as e:
             logger.error(f"Error calculating score: {e}")
             # Complete anyway
-            self.db_service.complete_session(session_id)
+            await run_db(self.db_service.complete_session, session_id)
             return {
                 "content": await self._generate_completion_message(language),
                 "current_step": "completed"
@@ -972,12 +1074,13 @@ Message: {text}"""
                 prompt_type=PromptType.CHATBOT_DIGITAL_FOOTPRINT_ANALYSIS,
                 template=template,
                 variables={
-                    "cv_summary": cv_summary[:2000],  # Limit length
+                    "cv_summary": cv_summary,
                     "linkedin_data": links.get("linkedin", "") or "",
                     "github_data": links.get("github", "") or "",
                     "portfolio_data": links.get("portfolio", "") or ""
                 },
-                language=language
+                language=language,
+                budget_sections=[PromptSection(name="cv_summary", max_tokens=CV_SUMMARY_MAX_TOKENS)]
             )
             
             response = await self.ai_manager.execute(ai_request)
@@ -1080,12 +1183,13 @@ Message: {text}"""
                 prompt_type=PromptType.CHATBOT_CV_GENERATION,
                 template=template,
                 variables={
-                    "original_cv": original_cv[:4000],  # Limit length
+                    "original_cv": original_cv,
                     "job_requirements": json.dumps(job_requirements)
                 },
                 language=language,
                 temperature=0.4,
-                max_tokens=3000
+                max_tokens=3000,
+                budget_sections=[PromptSection(name="original_cv", max_tokens=ORIGINAL_CV_MAX_TOKENS, keep_tail=True)]
             )
             
             response = await self.ai_manager.execute(ai_request)
@@ -1113,12 +1217,13 @@ Message: {text}"""
                 prompt_type=PromptType.CHATBOT_CV_GENERATION,
                 template=template,
                 variables={
-                    "original_cv": original_cv[:4000],
+                    "original_cv": original_cv,
                     "job_requirements": json.dumps(job_requirements)
                 },
                 language=language,
                 temperature=0.6,
-                max_tokens=3000
+                max_tokens=3000,
+                budget_sections=[PromptSection(name="original_cv", max_tokens=ORIGINAL_CV_MAX_TOKENS, keep_tail=True)]
             )
             
             response = await self.ai_manager.execute(ai_request)
@@ -1157,13 +1262,14 @@ Message: {text}"""
                 prompt_type=PromptType.CHATBOT_INTERVIEW_PREP,
                 template=template,
                 variables={
-                    "cv_summary": cv_summary[:2000],
+                    "cv_summary": cv_summary,
                     "job_opportunity": json.dumps(job_opportunity),
                     "experience_highlights": json.dumps(experience_highlights)
                 },
                 language=language,
                 temperature=0.5,
-                max_tokens=2500
+                max_tokens=2500,
+                budget_sections=[PromptSection(name="cv_summary", max_tokens=CV_SUMMARY_MAX_TOKENS)]
             )
             
             response = await self.ai_manager.execute(ai_request)
@@ -1201,13 +1307,14 @@ Message: {text}"""
                 prompt_type=PromptType.CHATBOT_EMPLOYABILITY_SCORE,
                 template=template,
                 variables={
-                    "cv_summary": cv_summary[:2000],
+                    "cv_summary": cv_summary,
                     "job_requirements": json.dumps(job_requirements),
                     "structured_analysis": ""
                 },
                 language=language,
                 temperature=0.4,
-                max_tokens=2000
+                max_tokens=2000,
+                budget_sections=[PromptSection(name="cv_summary", max_tokens=CV_SUMMARY_MAX_TOKENS)]
             )
             
             response = await self.ai_manager.execute(ai_request)
@@ -1262,54 +1369,7 @@ Message: {text}"""
         configured in the database (app_settings table).
         """
         try:
-            # Build system prompt based on session context
-            system_prompt = self._build_system_prompt(session, language)
-            
-            # Build conversation context from history (last 10 messages for context)
-            recent_history = conversation_history[-10:] if len(conversation_history) > 10 else conversation_history
-            
-            # Get labels based on language
-            labels = {
-                "en": {"history": "Conversation history:", "user": "User", "assistant": "Assistant"},
-                "pt": {"history": "Histórico da conversa:", "user": "Utilizador", "assistant": "Assistente"},
-                "fr": {"history": "Historique de la conversation:", "user": "Utilisateur", "assistant": "Assistant"},
-                "es": {"history": "Historial de la conversación:", "user": "Usuario", "assistant": "Asistente"}
-            }
-            lang_labels = labels.get(language, labels["en"])
-            
-            # Build conversational prompt with full context
-            conversation_parts = []
-            
-            # Add system instructions
-            conversation_parts.append(f"{system_prompt}\n\n")
-            
-            # Add conversation history
-            if recent_history:
-                conversation_parts.append(f"{lang_labels['history']}\n")
-                for msg in recent_history:
-                    role_label = lang_labels["assistant"] if msg.get("role") == "bot" else lang_labels["user"]
-                    content = msg.get("content", "").strip()
-                    if content:
-                        conversation_parts.append(f"{role_label}: {content}\n")
-                conversation_parts.append("\n")
-            
-            # Add current user message
-            conversation_parts.append(f"{lang_labels['user']}: {user_message}\n\n")
-            conversation_parts.append(f"{lang_labels['assistant']}:")
-            
-            # Build final prompt
-            conversational_prompt = "".join(conversation_parts)
-            
-            # Use AIManager.execute() - this automatically respects fallback chain from database
-            # Don't specify provider_name so it uses the configured fallback chain
-            ai_request = AIRequest(
-                prompt_type=PromptType.CHATBOT_PROFILE_EXTRACTION,  # Use chatbot prompt type
-                template=conversational_prompt,
-                variables={},  # No variables needed for conversational prompt
-                language=language,
-                temperature=0.7,  # More conversational temperature
-                max_tokens=1000
-            )
+            ai_request = self._build_conversational_request(session, user_message, conversation_history, language)
             
             # Execute using AI manager - it will automatically use fallback chain from database
             logger.info(f"[Chatbot] Generating conversational response using AI providers with fallback chain")
@@ -1342,6 +1402,64 @@ Message: {text}"""
             logger.error(f"Error generating conversational response: {e}", exc_info=True)
             return None
     
+    def _build_conversational_request(
+        self,
+        session: Dict[str, Any],
+        user_message: str,
+        conversation_history: List[Dict[str, Any]],
+        language: str
+    ) -> AIRequest:
+        """Build the conversational AI request (system prompt, recent history and user message)."""
+        # Build system prompt based on session context
+        system_prompt = self._build_system_prompt(session, language)
+        
+        # Build conversation context from history (last 10 messages for context)
+        recent_history = conversation_history[-10:] if len(conversation_history) > 10 else conversation_history
+        
+        # Get labels based on language
+        labels = {
+            "en": {"history": "Conversation history:", "user": "User", "assistant": "Assistant"},
+            "pt": {"history": "Histórico da conversa:", "user": "Utilizador", "assistant": "Assistente"},
+            "fr": {"history": "Historique de la conversation:", "user": "Utilisateur", "assistant": "Assistant"},
+            "es": {"history": "Historial de la conversación:", "user": "Usuario", "assistant": "Asistente"}
+        }
+        lang_labels = labels.get(language, labels["en"])
+        
+        # Build conversational prompt with full context
+        conversation_parts = []
+        
+        # Add system instructions
+        conversation_parts.append(f"{system_prompt}\n\n")
+        
+        # Add conversation history
+        if recent_history:
+            conversation_parts.append(f"{lang_labels['history']}\n")
+            for msg in recent_history:
+                role_label = lang_labels["assistant"] if msg.get("role") == "bot" else lang_labels["user"]
+                content = msg.get("content", "").strip()
+                if content:
+                    conversation_parts.append(f"{role_label}: {content}\n")
+            conversation_parts.append("\n")
+        
+        # Add current user message
+        conversation_parts.append(f"{lang_labels['user']}: {user_message}\n\n")
+        conversation_parts.append(f"{lang_labels['assistant']}:")
+        
+        # Build final prompt
+        conversational_prompt = "".join(conversation_parts)
+        
+        # Sent without provider_name, so AIManager uses the fallback chain from database
+        return AIRequest(
+            prompt_type=PromptType.CHATBOT_PROFILE_EXTRACTION,  # Use chatbot prompt type
+            template=conversational_prompt,
+            variables={},  # No variables needed for conversational prompt
+            language=language,
+            temperature=0.7,  # More conversational temperature
+            max_tokens=1000,
+            hedge=True,  # Interactive reply: hedge slow providers
+            json_output=False  # Free-text reply, not the profile extraction JSON
+        )
+    
     async def _process_personal_links(
         self,
         session_id: UUID,
@@ -1426,7 +1544,7 @@ Message: {text}"""
                     profile_data["links"] = links
                     
                     # Update session
-                    self.db_service.update_session(session_id, {
+                    await run_db(self.db_service.update_session, session_id, {
                         "profile_data": profile_data,
                         "candidate_enrichment": candidate_enrichment
                     })
@@ -1484,7 +1602,7 @@ Message: {text}"""
                             candidate_id = session.get("candidate_id")
                             if candidate_id:
                                 sc = structured_candidate or {}
-                                self.candidate_profile_service.upsert_candidate_profile(
+                                await run_db(self.candidate_profile_service.upsert_candidate_profile,
                                     candidate_id=UUID(candidate_id),
                                     full_name=(profile_data.get("name") or sc.get("normalized_name") or name),
                                     normalized_name=(sc.get("normalized_name") if isinstance(sc, dict) else None),
@@ -1515,7 +1633,7 @@ Message: {text}"""
                         logger.warning(f"[Chatbot] Failed to structure/persist candidate profile: {e}")
             else:
                 # Just update links if no enrichment
-                self.db_service.update_session(session_id, {
+                await run_db(self.db_service.update_session, session_id, {
                     "profile_data": profile_data
                 })
                 
@@ -1708,7 +1826,7 @@ Message: {text}"""
                                     # Persist profile
                                     if structured_company or risk_structured:
                                         sc = structured_company or {}
-                                        self.company_profile_service.upsert_company_profile(
+                                        await run_db(self.company_profile_service.upsert_company_profile,
                                             company_name=company_name,
                                             normalized_name=(sc.get("normalized_name") if isinstance(sc, dict) else None),
                                             basic_info=(sc.get("basic_info") if isinstance(sc, dict) else None),
@@ -1785,7 +1903,7 @@ Message: {text}"""
             
             # Update session with companies enrichment data
             if companies_enrichment:
-                self.db_service.update_session(session_id, {
+                await run_db(self.db_service.update_session, session_id, {
                     "companies_enrichment": companies_enrichment
                 })
                 logger.info(f"[Chatbot] Updated session with enrichment for {len(companies_enrichment)} companies")
@@ -4,6 +4,7 @@ Database services package.
 Provides CRUD operations for all database entities.
 """
 
+from .bulk import BulkRowResult
 from .candidate_service import CandidateService, get_candidate_service
 from .company_service import CompanyService, get_company_service
 from .interviewer_service import InterviewerService, get_interviewer_service
@@ -17,6 +18,7 @@ from .company_profile_service import CompanyProfileService, get_company_profile_
 from .candidate_profile_service import CandidateProfileService, get_candidate_profile_service
 
 __all__ = [
+    "BulkRowResult",
     "CandidateService",
     "get_candidate_service",
     "CompanyService",
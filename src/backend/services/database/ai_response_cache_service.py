@@ -0,0 +1,155 @@
+"""
+AI response cache database service.
+
+Persistent tier of the AI response cache (table ai_response_cache).
+"""
+
+import logging
+from typing import Optional, Dict, Any
+from datetime import datetime, timedelta, timezone
+
+from database.async_client import get_async_supabase_client
+
+logger = logging.getLogger(__name__)
+
+
+class AIResponseCacheService:
+    """
+    Service for reading and writing cached AI responses in the database.
+
+    Entries expire after their TTL and the table is pruned to a maximum
+    number of rows (oldest first).
+    """
+
+    def __init__(self):
+        """Initialize the service with database client."""
+        self.client = get_async_supabase_client()
+        self.table = "ai_response_cache"
+
+    async def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a non-expired cached response.
+
+        Args:
+            cache_key: Content hash of the request
+
+        Returns:
+            Serialized AIResponse dict or None if missing/expired
+        """
+        try:
+            now = datetime.now(timezone.utc).isoformat()
+            result = (
+                await self.client.table(self.table)
+                .select("response")
+                .eq("cache_key", cache_key)
+                .gt("expires_at", now)
+                .limit(1)
+                .execute()
+            )
+            if result.data:
+                return result.data[0]["response"]
+            return None
+        except Exception as e:
+            logger.warning(f"Error reading AI response cache: {e}")
+            return None
+
+    async def set(
+        self,
+        cache_key: str,
+        prompt_type: str,
+        provider: str,
+        model: Optional[str],
+        response: Dict[str, Any],
+        ttl_seconds: int,
+    ) -> bool:
+        """
+        Insert or replace a cached response.
+
+        Args:
+            cache_key: Content hash of the request
+            prompt_type: Prompt type of the request
+            provider: Provider that produced the response
+            model: Model that produced the response
+            response: Serialized AIResponse
+            ttl_seconds: Time to live
+
+        Returns:
+            True if stored
+        """
+        try:
+            now = datetime.now(timezone.utc)
+            await self.client.table(self.table).upsert({
+                "cache_key": cache_key,
+                "prompt_type": prompt_type,
+                "provider": provider,
+                "model": model,
+                "response": response,
+                "created_at": now.isoformat(),
+                "expires_at": (now + timedelta(seconds=ttl_seconds)).isoformat(),
+            }).execute()
+            return True
+        except Exception as e:
+            logger.warning(f"Error writing AI response cache: {e}")
+            return False
+
+    async def prune(self, max_entries: int) -> int:
+        """
+        Delete expired entries and the oldest entries beyond max_entries.
+
+        Args:
+            max_entries: Maximum rows to keep
+
+        Returns:
+            Number of rows deleted (best effort)
+        """
+        deleted = 0
+        try:
+            now = datetime.now(timezone.utc).isoformat()
+            result = await self.client.table(self.table).delete().lt("expires_at", now).execute()
+            deleted += len(result.data or [])
+
+            overflow = (
+                await self.client.table(self.table)
+                .select("cache_key")
+                .order("created_at", desc=True)
+                .range(max_entries, max_entries + 999)
+                .execute()
+            )
+            keys = [row["cache_key"] for row in (overflow.data or [])]
+            if keys:
+                result = await self.client.table(self.table).delete().in_("cache_key", keys).execute()
+                deleted += len(result.data or [])
+        except Exception as e:
+            logger.warning(f"Error pruning AI response cache: {e}")
+        return deleted
+
+    async def purge(self) -> int:
+        """
+        Delete all cached responses.
+
+        Returns:
+            Number of rows deleted
+        """
+        try:
+            result = await self.client.table(self.table).delete().neq("cache_key", "").execute()
+            return len(result.data or [])
+        except Exception as e:
+            logger.error(f"Error purging AI response cache: {e}")
+            return 0
+
+
+# Global service instance
+_ai_response_cache_service: Optional[AIResponseCacheService] = None
+
+
+def get_ai_response_cache_service() -> AIResponseCacheService:
+    """
+    Get global AI response cache service instance.
+
+    Returns:
+        AIResponseCacheService singleton
+    """
+    global _ai_response_cache_service
+    if _ai_response_cache_service is None:
+        _ai_response_cache_service = AIResponseCacheService()
+    return _ai_response_cache_service
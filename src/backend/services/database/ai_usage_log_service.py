@@ -0,0 +1,58 @@
+"""
+AI usage log database service.
+
+Bulk inserts into the ai_usage_logs table (written by the AI usage recorder).
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from database.async_client import get_async_supabase_client
+
+logger = logging.getLogger(__name__)
+
+
+class AIUsageLogService:
+    """
+    Service for writing AI usage records.
+    """
+
+    def __init__(self):
+        """Initialize the service with database client."""
+        self.client = get_async_supabase_client()
+        self.table = "ai_usage_logs"
+
+    async def insert_many(self, records: List[Dict[str, Any]]) -> int:
+        """
+        Insert usage records in a single request.
+
+        Args:
+            records: Rows for ai_usage_logs
+
+        Returns:
+            Number of rows inserted
+
+        Raises:
+            Exception: If the insert fails (the caller keeps the records for retry)
+        """
+        if not records:
+            return 0
+        await self.client.table(self.table).insert(records).execute()
+        return len(records)
+
+
+# Global service instance
+_ai_usage_log_service: Optional[AIUsageLogService] = None
+
+
+def get_ai_usage_log_service() -> AIUsageLogService:
+    """
+    Get global AI usage log service.
+
+    Returns:
+        AIUsageLogService singleton
+    """
+    global _ai_usage_log_service
+    if _ai_usage_log_service is None:
+        _ai_usage_log_service = AIUsageLogService()
+    return _ai_usage_log_service
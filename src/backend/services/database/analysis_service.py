@@ -6,7 +6,9 @@ Handles CRUD operations for analyses table.
 
 from typing import Optional, Dict, Any, List
 from uuid import UUID
-from database import get_supabase_client
+from database import get_async_supabase_client
+from config import settings
+from .bulk import BulkRowResult, bulk_insert
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,7 +18,7 @@ class AnalysisService:
     """Service for managing analyses in the database."""
     
     def __init__(self):
-        self.client = get_supabase_client()
+        self.client = get_async_supabase_client()
         self.table = "analyses"
     
     async def create(
@@ -74,32 +76,32 @@ class AnalysisService:
             Created analysis dict or None if failed
         """
         try:
-            analysis_data = {
-                "mode": mode,
-                "job_posting_id": str(job_posting_id),
-                "cv_id": str(cv_id),
-                "candidate_id": str(candidate_id),
-                "prompt_id": str(prompt_id) if prompt_id else None,
-                "provider": provider,
-                "model": model,
-                "categories": categories,
-                "global_score": global_score,
-                "strengths": {"items": strengths} if strengths else None,
-                "risks": {"items": risks} if risks else None,
-                "questions": questions if isinstance(questions, dict) else ({"items": questions} if questions else None),
-                "intro_pitch": intro_pitch,
-                "hard_blocker_flags": {"flags": hard_blocker_flags} if hard_blocker_flags else None,
-                "language": language,
-                "report_id": str(report_id) if report_id else None,
-                "detailed_analysis": detailed_analysis,
-                "input_tokens": input_tokens,
-                "output_tokens": output_tokens,
-                "input_cost": input_cost,
-                "output_cost": output_cost,
-                "total_cost": total_cost
-            }
+            analysis_data = self._build_row(
+                mode=mode,
+                job_posting_id=job_posting_id,
+                cv_id=cv_id,
+                candidate_id=candidate_id,
+                provider=provider,
+                categories=categories,
+                language=language,
+                model=model,
+                prompt_id=prompt_id,
+                global_score=global_score,
+                strengths=strengths,
+                risks=risks,
+                questions=questions,
+                intro_pitch=intro_pitch,
+                hard_blocker_flags=hard_blocker_flags,
+                report_id=report_id,
+                detailed_analysis=detailed_analysis,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                input_cost=input_cost,
+                output_cost=output_cost,
+                total_cost=total_cost
+            )
             
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .insert(analysis_data)\
                 .execute()
             
@@ -113,10 +115,88 @@ class AnalysisService:
             logger.error(f"Error creating analysis: {e}")
             return None
     
+    @staticmethod
+    def _build_row(
+        mode: str,
+        job_posting_id: UUID,
+        cv_id: UUID,
+        candidate_id: UUID,
+        provider: str,
+        categories: Dict[str, Any],
+        language: str,
+        model: Optional[str] = None,
+        prompt_id: Optional[UUID] = None,
+        global_score: Optional[float] = None,
+        strengths: Optional[List[str]] = None,
+        risks: Optional[List[str]] = None,
+        questions: Optional[List[str]] = None,
+        intro_pitch: Optional[str] = None,
+        hard_blocker_flags: Optional[List[str]] = None,
+        report_id: Optional[UUID] = None,
+        detailed_analysis: Optional[Dict[str, Any]] = None,
+        input_tokens: Optional[int] = None,
+        output_tokens: Optional[int] = None,
+        input_cost: Optional[float] = None,
+        output_cost: Optional[float] = None,
+        total_cost: Optional[float] = None
+    ) -> Dict[str, Any]:
+        return {
+            "mode": mode,
+            "job_posting_id": str(job_posting_id),
+            "cv_id": str(cv_id),
+            "candidate_id": str(candidate_id),
+            "prompt_id": str(prompt_id) if prompt_id else None,
+            "provider": provider,
+            "model": model,
+            "categories": categories,
+            "global_score": global_score,
+            "strengths": {"items": strengths} if strengths else None,
+            "risks": {"items": risks} if risks else None,
+            "questions": questions if isinstance(questions, dict) else ({"items": questions} if questions else None),
+            "intro_pitch": intro_pitch,
+            "hard_blocker_flags": {"flags": hard_blocker_flags} if hard_blocker_flags else None,
+            "language": language,
+            "report_id": str(report_id) if report_id else None,
+            "detailed_analysis": detailed_analysis,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "input_cost": input_cost,
+            "output_cost": output_cost,
+            "total_cost": total_cost
+        }
+    
+    async def create_many(self, analyses: List[Dict[str, Any]]) -> List[BulkRowResult]:
+        """
+        Create several analysis records with multi-row inserts.
+        
+        Args:
+            analyses: Keyword arguments of create() for each analysis
+            
+        Returns:
+            One BulkRowResult per analysis, in order (data is the created
+            analysis, error says why that analysis was not created)
+        """
+        try:
+            rows = [self._build_row(**analysis) for analysis in analyses]
+        except Exception as e:
+            logger.error(f"Error preparing analyses: {e}")
+            return [BulkRowResult(error=str(e)) for _ in analyses]
+        
+        results = await bulk_insert(
+            lambda: self.client.table(self.table),
+            rows,
+            batch_size=settings.db_bulk_insert_batch_size
+        )
+        failed = [result.error for result in results if not result.ok]
+        logger.info(f"Created {len(results) - len(failed)}/{len(results)} analyses")
+        if failed:
+            logger.error(f"Failed to create {len(failed)} analyses: {failed}")
+        return results
+    
     async def get_by_id(self, analysis_id: UUID) -> Optional[Dict[str, Any]]:
         """Get analysis by ID."""
         try:
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .select("*")\
                 .eq("id", str(analysis_id))\
                 .limit(1)\
@@ -145,7 +225,7 @@ class AnalysisService:
             List of analysis dicts sorted by global_score DESC
         """
         try:
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .select("*")\
                 .eq("job_posting_id", str(job_posting_id))\
                 .order("global_score", desc=True)\
@@ -188,7 +268,7 @@ class AnalysisService:
             query = query.order("created_at", desc=True)\
                 .range(offset, offset + limit - 1)
             
-            result = query.execute()
+            result = await query.execute()
             
             return result.data or []
             
@@ -207,7 +287,7 @@ class AnalysisService:
             List of analysis dicts for the candidate
         """
         try:
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .select("*")\
                 .eq("candidate_id", str(candidate_id))\
                 .order("created_at", desc=True)\
@@ -222,7 +302,7 @@ class AnalysisService:
     async def count_all(self) -> int:
         """Count total number of analyses."""
         try:
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .select("id", count="exact")\
                 .execute()
             return result.count or 0
@@ -235,7 +315,7 @@ class AnalysisService:
         try:
             from datetime import datetime, timedelta
             cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat()
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .select("id", count="exact")\
                 .gte("created_at", cutoff)\
                 .execute()
@@ -244,18 +324,49 @@ class AnalysisService:
             logger.error(f"Error counting recent analyses: {e}")
             return 0
     
+    async def get_provider_stats(self) -> List[Dict[str, Any]]:
+        """
+        Aggregate analyses by provider and model (for the admin dashboard).
+
+        Uses the analysis_provider_stats() function (migration 016), which
+        groups in the database; without it the rows are read and grouped here.
+        Raises on error.
+
+        Returns:
+            One dict per (provider, model) with calls, persisted_cost (sum of
+            stored costs), token_calls (analyses without a stored cost but with
+            token counts) and the input_tokens/output_tokens sums of those
+        """
+        try:
+            result = await self.client.rpc("analysis_provider_stats").execute()
+            return [
+                {
+                    "provider": row.get("provider"),
+                    "model": row.get("model"),
+                    "calls": int(row.get("calls") or 0),
+                    "persisted_cost": float(row.get("persisted_cost") or 0),
+                    "token_calls": int(row.get("token_calls") or 0),
+                    "input_tokens": int(row.get("input_tokens") or 0),
+                    "output_tokens": int(row.get("output_tokens") or 0),
+                }
+                for row in (result.data or [])
+            ]
+        except Exception as e:
+            logger.debug(f"analysis_provider_stats unavailable, aggregating rows: {e}")
+
+        # Migration 016 not applied: read every row
+        result = await self.client.table(self.table)\
+            .select("provider, model, total_cost, input_cost, output_cost, input_tokens, output_tokens")\
+            .execute()
+        return _aggregate_provider_rows(result.data or [])
+
     async def count_by_provider(self) -> Dict[str, int]:
         """Count analyses by AI provider."""
         try:
-            result = self.client.table(self.table)\
-                .select("provider")\
-                .execute()
-            
-            counts = {}
-            for row in (result.data or []):
-                provider = row.get("provider", "unknown")
-                counts[provider] = counts.get(provider, 0) + 1
-            
+            counts: Dict[str, int] = {}
+            for row in await self.get_provider_stats():
+                provider = row["provider"]
+                counts[provider] = counts.get(provider, 0) + row["calls"]
             return counts
         except Exception as e:
             logger.error(f"Error counting by provider: {e}")
@@ -264,7 +375,14 @@ class AnalysisService:
     async def count_by_language(self) -> Dict[str, int]:
         """Count analyses by language."""
         try:
-            result = self.client.table(self.table)\
+            result = await self.client.rpc("analysis_language_counts").execute()
+            return {row.get("language"): int(row.get("calls") or 0) for row in (result.data or [])}
+        except Exception as e:
+            logger.debug(f"analysis_language_counts unavailable, counting rows: {e}")
+
+        # Migration 016 not applied: read every row
+        try:
+            result = await self.client.table(self.table)\
                 .select("language")\
                 .execute()
             
@@ -279,6 +397,45 @@ class AnalysisService:
             return {}
 
 
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except (ValueError, TypeError):
+        return None
+
+
+def _aggregate_provider_rows(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Group analysis rows like analysis_provider_stats() does."""
+    groups: Dict[tuple, Dict[str, Any]] = {}
+    for row in rows:
+        provider = row.get("provider", "unknown")
+        model = row.get("model")
+        group = groups.get((provider, model))
+        if group is None:
+            group = groups[(provider, model)] = {
+                "provider": provider, "model": model, "calls": 0, "persisted_cost": 0.0,
+                "token_calls": 0, "input_tokens": 0, "output_tokens": 0,
+            }
+        group["calls"] += 1
+
+        # Stored total_cost, else input_cost + output_cost
+        cost = _to_float(row.get("total_cost")) or 0.0
+        if cost == 0.0:
+            input_cost = _to_float(row.get("input_cost"))
+            output_cost = _to_float(row.get("output_cost"))
+            if input_cost is not None and output_cost is not None:
+                cost = input_cost + output_cost
+        group["persisted_cost"] += cost
+
+        input_tokens = row.get("input_tokens")
+        output_tokens = row.get("output_tokens")
+        if cost == 0.0 and input_tokens is not None and output_tokens is not None:
+            group["token_calls"] += 1
+            group["input_tokens"] += input_tokens
+            group["output_tokens"] += output_tokens
+    return list(groups.values())
+
+
 # Global service instance
 _analysis_service: Optional[AnalysisService] = None
 
@@ -0,0 +1,95 @@
+"""
+App settings database service.
+
+Reads and writes application-wide settings (table app_settings). Reads go
+through services/settings_cache.py; errors are raised so the cache can tell
+a missing setting from an unreachable database.
+"""
+
+import logging
+from typing import Any, Dict, Optional
+
+from database.async_client import get_async_supabase_client
+
+logger = logging.getLogger(__name__)
+
+
+class AppSettingsService:
+    """Service for app_settings rows (setting_key -> setting_value)."""
+
+    def __init__(self):
+        """Initialize the service with database client."""
+        self.client = get_async_supabase_client()
+        self.table = "app_settings"
+
+    async def get(self, setting_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a setting row.
+
+        Args:
+            setting_key: Setting key (e.g. "default_ai_provider")
+
+        Returns:
+            Row dict or None if the setting does not exist
+
+        Raises:
+            Exception: If the database query fails
+        """
+        result = await self.client.table(self.table).select("*").eq("setting_key", setting_key).limit(1).execute()
+        return result.data[0] if result.data else None
+
+    async def set(self, setting_key: str, setting_value: str, description: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Create or update a setting.
+
+        Args:
+            setting_key: Setting key
+            setting_value: Value (JSON-encoded for structured settings)
+            description: Optional description
+
+        Returns:
+            Stored row
+
+        Raises:
+            Exception: If the database write fails
+        """
+        data: Dict[str, Any] = {"setting_value": setting_value}
+        if description is not None:
+            data["description"] = description
+
+        existing = await self.client.table(self.table).select("id").eq("setting_key", setting_key).execute()
+        if existing.data:
+            result = await self.client.table(self.table).update(data).eq("setting_key", setting_key).execute()
+        else:
+            result = await self.client.table(self.table).insert({"setting_key": setting_key, **data}).execute()
+        return result.data[0] if result.data else {"setting_key": setting_key, **data}
+
+    async def get_version(self) -> Optional[str]:
+        """
+        Latest updated_at across all settings (changes whenever any setting is written).
+
+        Returns:
+            ISO timestamp or None if the table is empty
+
+        Raises:
+            Exception: If the database query fails
+        """
+        result = await self.client.table(self.table).select("updated_at").order("updated_at", desc=True).limit(1).execute()
+        return result.data[0].get("updated_at") if result.data else None
+
+
+# Global service instance
+_app_settings_service: Optional[AppSettingsService] = None
+
+
+def get_app_settings_service() -> AppSettingsService:
+    """
+    Get global app settings service instance.
+
+    Returns:
+        AppSettingsService singleton
+    """
+    global _app_settings_service
+    if _app_settings_service is None:
+        _app_settings_service = AppSettingsService()
+    return _app_settings_service
@@ -0,0 +1,82 @@
+"""
+Multi-row inserts with per-row results.
+
+Used by the create_many methods of the database services: rows are sent as one
+PostgREST insert per chunk of rows and the created rows (with their ids) are
+returned in input order. Postgres applies a multi-row insert atomically, so if
+a chunk is rejected its rows are retried one by one to find the bad ones; the
+other rows are still created and each row reports its own error.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BulkRowResult:
+    """Outcome of one row of a bulk insert: the created row, or why it failed."""
+
+    data: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.data is not None
+
+
+async def _insert_one(table: Callable[[], Any], row: Dict[str, Any]) -> BulkRowResult:
+    try:
+        result = await table().insert(row).execute()
+    except Exception as e:
+        return BulkRowResult(error=str(e))
+    if not result.data:
+        return BulkRowResult(error="Insert succeeded but no data returned")
+    return BulkRowResult(data=result.data[0])
+
+
+async def bulk_insert(
+    table: Callable[[], Any],
+    rows: List[Dict[str, Any]],
+    batch_size: int = 100,
+) -> List[BulkRowResult]:
+    """
+    Insert rows with one request per batch_size rows.
+
+    Args:
+        table: Returns a fresh query builder for the table, e.g.
+            lambda: self.client.table(self.table) (called from the service
+            module so query metrics keep the service's label)
+        rows: Rows to insert
+        batch_size: Maximum rows per request
+
+    Returns:
+        One BulkRowResult per row, in the order of rows
+    """
+    results: List[BulkRowResult] = []
+    batch_size = max(1, batch_size)
+    for start in range(0, len(rows), batch_size):
+        chunk = rows[start:start + batch_size]
+        if len(chunk) == 1:
+            results.append(await _insert_one(table, chunk[0]))
+            continue
+
+        try:
+            response = await table().insert(chunk).execute()
+        except Exception as e:
+            logger.warning(f"Bulk insert of {len(chunk)} row(s) failed, retrying rows one by one: {e}")
+            results.extend(await asyncio.gather(*(_insert_one(table, row) for row in chunk)))
+            continue
+
+        created = response.data or []
+        if len(created) == len(chunk):
+            results.extend(BulkRowResult(data=row) for row in created)
+        else:
+            # The rows may have been written; retrying could duplicate them
+            error = f"Bulk insert returned {len(created)} row(s) for {len(chunk)}"
+            logger.error(error)
+            results.extend(BulkRowResult(error=error) for _ in chunk)
+    return results
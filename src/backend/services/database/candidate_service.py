@@ -7,7 +7,10 @@ Handles all CRUD operations for candidates table with deduplication logic.
 from typing import Optional, List, Dict, Any
 from uuid import UUID
 from datetime import datetime
-from database import get_supabase_client
+from database import get_async_supabase_client, get_entity_loader, forget_entity
+from database.loader import MAX_IDS_PER_QUERY
+from config import settings
+from .bulk import BulkRowResult, bulk_insert
 import logging
 
 logger = logging.getLogger(__name__)
@@ -25,7 +28,7 @@ class CandidateService:
     """
     
     def __init__(self):
-        self.client = get_supabase_client()
+        self.client = get_async_supabase_client()
         self.table = "candidates"
     
     async def find_by_email(self, email: str) -> Optional[Dict[str, Any]]:
@@ -41,7 +44,7 @@ class CandidateService:
             Candidate dict if found, None otherwise
         """
         try:
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .select("*")\
                 .eq("email", email.lower())\
                 .limit(1)\
@@ -79,18 +82,11 @@ class CandidateService:
             Created candidate dict or None if failed
         """
         try:
-            candidate_data = {
-                "email": email.lower(),
-                "name": name,
-                "phone": phone,
-                "country": country,
-                "consent_given": consent_given,
-                "consent_timestamp": datetime.utcnow().isoformat() if consent_given else None
-            }
+            candidate_data = self._build_row(email, name, phone, country, consent_given)
             
             logger.info(f"Attempting to create candidate: email={email}, name={name}")
             
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .insert(candidate_data)\
                 .execute()
             
@@ -132,6 +128,46 @@ class CandidateService:
             # Re-raise exception so router can handle it properly
             raise
     
+    @staticmethod
+    def _build_row(
+        email: str,
+        name: str,
+        phone: Optional[str] = None,
+        country: Optional[str] = None,
+        consent_given: bool = False
+    ) -> Dict[str, Any]:
+        return {
+            "email": email.lower(),
+            "name": name,
+            "phone": phone,
+            "country": country,
+            "consent_given": consent_given,
+            "consent_timestamp": datetime.utcnow().isoformat() if consent_given else None
+        }
+    
+    async def create_many(self, candidates: List[Dict[str, Any]]) -> List[BulkRowResult]:
+        """
+        Create several candidates with multi-row inserts.
+        
+        Args:
+            candidates: Keyword arguments of create() for each candidate
+                (email, name and optionally phone, country, consent_given)
+            
+        Returns:
+            One BulkRowResult per candidate, in order (data is the created
+            candidate, error says why that candidate was not created)
+        """
+        results = await bulk_insert(
+            lambda: self.client.table(self.table),
+            [self._build_row(**candidate) for candidate in candidates],
+            batch_size=settings.db_bulk_insert_batch_size
+        )
+        failed = [result.error for result in results if not result.ok]
+        logger.info(f"Created {len(results) - len(failed)}/{len(results)} candidate(s)")
+        if failed:
+            logger.error(f"Failed to create {len(failed)} candidate(s): {failed}")
+        return results
+    
     async def find_or_create(
         self,
         email: str,
@@ -196,10 +232,11 @@ class CandidateService:
                 "consent_timestamp": datetime.utcnow().isoformat() if consent_given else None
             }
             
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .update(update_data)\
                 .eq("id", str(candidate_id))\
                 .execute()
+            forget_entity(self.table, candidate_id)
             
             logger.info(f"Updated consent for candidate: {candidate_id}")
             return True
@@ -219,7 +256,12 @@ class CandidateService:
             Candidate dict or None
         """
         try:
-            result = self.client.table(self.table)\
+            loader = get_entity_loader()
+            if loader is not None:
+                # Batched with the other lookups of this request/job
+                return await loader.load(self.table, candidate_id, lambda: self.client.table(self.table))
+            
+            result = await self.client.table(self.table)\
                 .select("*")\
                 .eq("id", str(candidate_id))\
                 .limit(1)\
@@ -234,6 +276,35 @@ class CandidateService:
             logger.error(f"Error getting candidate by ID: {e}")
             return None
     
+    async def get_by_ids(self, candidate_ids: List[UUID]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get several candidates, in one query per MAX_IDS_PER_QUERY ids.
+        
+        Args:
+            candidate_ids: Candidate UUIDs (duplicates are fine)
+            
+        Returns:
+            Dict of candidate ID (str) -> candidate dict (missing IDs are left out)
+        """
+        ids = list(dict.fromkeys(str(candidate_id) for candidate_id in candidate_ids))
+        if not ids:
+            return {}
+        try:
+            found: Dict[str, Dict[str, Any]] = {}
+            for start in range(0, len(ids), MAX_IDS_PER_QUERY):
+                result = await self.client.table(self.table)\
+                    .select("*")\
+                    .in_("id", ids[start:start + MAX_IDS_PER_QUERY])\
+                    .execute()
+                for row in result.data or []:
+                    found[str(row["id"])] = row
+            
+            return found
+            
+        except Exception as e:
+            logger.error(f"Error getting candidates by ID: {e}")
+            return {}
+    
     async def list_all(
         self,
         limit: int = 100,
@@ -250,7 +321,7 @@ class CandidateService:
             List of candidate dicts
         """
         try:
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .select("*")\
                 .order("created_at", desc=True)\
                 .range(offset, offset + limit - 1)\
@@ -273,7 +344,7 @@ class CandidateService:
             List of CV dicts for the candidate
         """
         try:
-            result = self.client.table("cvs")\
+            result = await self.client.table("cvs")\
                 .select("*")\
                 .eq("candidate_id", str(candidate_id))\
                 .order("created_at", desc=True)\
@@ -296,7 +367,7 @@ class CandidateService:
             List of analysis dicts for the candidate
         """
         try:
-            result = self.client.table("analyses")\
+            result = await self.client.table("analyses")\
                 .select("*")\
                 .eq("candidate_id", str(candidate_id))\
                 .order("created_at", desc=True)\
@@ -316,7 +387,7 @@ class CandidateService:
             Total count of candidates
         """
         try:
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .select("id", count="exact")\
                 .execute()
             
@@ -340,7 +411,7 @@ class CandidateService:
             from datetime import datetime, timedelta
             cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat()
             
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .select("id", count="exact")\
                 .gte("created_at", cutoff)\
                 .execute()
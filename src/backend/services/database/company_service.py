@@ -6,7 +6,7 @@ Handles CRUD operations for companies table.
 
 from typing import Optional, Dict, Any, List
 from uuid import UUID
-from database import get_supabase_client
+from database import get_async_supabase_client
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,7 +16,7 @@ class CompanyService:
     """Service for managing companies in the database."""
     
     def __init__(self):
-        self.client = get_supabase_client()
+        self.client = get_async_supabase_client()
         self.table = "companies"
     
     async def find_by_name(self, name: str) -> Optional[Dict[str, Any]]:
@@ -30,7 +30,7 @@ class CompanyService:
             Company dict if found, None otherwise
         """
         try:
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .select("*")\
                 .ilike("name", name)\
                 .limit(1)\
@@ -59,7 +59,7 @@ class CompanyService:
         try:
             company_data = {"name": name.strip()}
             
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .insert(company_data)\
                 .execute()
             
@@ -105,7 +105,7 @@ class CompanyService:
             Company dict or None
         """
         try:
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .select("*")\
                 .eq("id", str(company_id))\
                 .limit(1)\
@@ -136,7 +136,7 @@ class CompanyService:
             List of company dicts
         """
         try:
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .select("*")\
                 .order("created_at", desc=True)\
                 .range(offset, offset + limit - 1)\
@@ -151,7 +151,7 @@ class CompanyService:
     async def count_all(self) -> int:
         """Count total number of companies."""
         try:
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .select("id", count="exact")\
                 .execute()
             return result.count or 0
@@ -164,7 +164,7 @@ class CompanyService:
         try:
             from datetime import datetime, timedelta
             cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat()
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .select("id", count="exact")\
                 .gte("created_at", cutoff)\
                 .execute()
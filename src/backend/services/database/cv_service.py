@@ -6,7 +6,10 @@ Handles CRUD operations for CVs table with versioning support.
 
 from typing import Optional, Dict, Any, List
 from uuid import UUID
-from database import get_supabase_client
+from database import get_async_supabase_client, get_entity_loader, forget_entity
+from database.loader import MAX_IDS_PER_QUERY
+from config import settings
+from .bulk import BulkRowResult, bulk_insert
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,7 +19,7 @@ class CVService:
     """Service for managing CVs in the database."""
     
     def __init__(self):
-        self.client = get_supabase_client()
+        self.client = get_async_supabase_client()
         self.table = "cvs"
     
     async def get_next_version(self, candidate_id: UUID) -> int:
@@ -30,7 +33,7 @@ class CVService:
             Next version number (1 if no CVs exist)
         """
         try:
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .select("version")\
                 .eq("candidate_id", str(candidate_id))\
                 .order("version", desc=True)\
@@ -83,7 +86,7 @@ class CVService:
                 "uploaded_by_flow": uploaded_by_flow
             }
             
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .insert(cv_data)\
                 .execute()
             
@@ -97,10 +100,91 @@ class CVService:
             logger.error(f"Error creating CV: {e}")
             return None
     
+    async def get_next_versions(self, candidate_ids: List[UUID]) -> Dict[str, int]:
+        """
+        Get next version numbers for several candidates, in one query per
+        MAX_IDS_PER_QUERY candidates.
+        
+        Args:
+            candidate_ids: Candidate UUIDs
+            
+        Returns:
+            Dict of candidate ID (str) -> next version number (1 if no CVs exist)
+            
+        Raises:
+            Exception: If the lookup fails (guessing would write duplicate versions)
+        """
+        next_versions = {str(candidate_id): 1 for candidate_id in candidate_ids}
+        ids = list(next_versions)
+        for start in range(0, len(ids), MAX_IDS_PER_QUERY):
+            result = await self.client.table(self.table)\
+                .select("candidate_id, version")\
+                .in_("candidate_id", ids[start:start + MAX_IDS_PER_QUERY])\
+                .execute()
+            
+            for row in result.data or []:
+                candidate_id = str(row["candidate_id"])
+                next_versions[candidate_id] = max(next_versions[candidate_id], row["version"] + 1)
+        
+        return next_versions
+    
+    async def create_many(self, cvs: List[Dict[str, Any]]) -> List[BulkRowResult]:
+        """
+        Create several CV records with multi-row inserts.
+        
+        Versions are looked up once for all candidates; CVs of the same
+        candidate get consecutive versions in list order. If the lookup
+        fails no CV is created.
+        
+        Args:
+            cvs: Keyword arguments of create() for each CV (candidate_id,
+                file_url, uploaded_by_flow and optionally extracted_text,
+                structured_data, language)
+            
+        Returns:
+            One BulkRowResult per CV, in order (data is the created CV,
+            error says why that CV was not created)
+        """
+        try:
+            next_versions = await self.get_next_versions([cv["candidate_id"] for cv in cvs])
+        except Exception as e:
+            logger.error(f"Error getting next CV versions, not creating {len(cvs)} CV(s): {e}")
+            return [BulkRowResult(error=f"Could not determine CV version: {e}") for _ in cvs]
+        
+        rows = []
+        for cv in cvs:
+            candidate_id = str(cv["candidate_id"])
+            rows.append({
+                "candidate_id": candidate_id,
+                "file_url": cv["file_url"],
+                "extracted_text": cv.get("extracted_text"),
+                "structured_data": cv.get("structured_data"),
+                "language": cv.get("language"),
+                "version": next_versions[candidate_id],
+                "uploaded_by_flow": cv["uploaded_by_flow"]
+            })
+            next_versions[candidate_id] += 1
+        
+        results = await bulk_insert(
+            lambda: self.client.table(self.table),
+            rows,
+            batch_size=settings.db_bulk_insert_batch_size
+        )
+        failed = [result.error for result in results if not result.ok]
+        logger.info(f"Created {len(results) - len(failed)}/{len(results)} CV(s)")
+        if failed:
+            logger.error(f"Failed to create {len(failed)} CV(s): {failed}")
+        return results
+    
     async def get_by_id(self, cv_id: UUID) -> Optional[Dict[str, Any]]:
         """Get CV by ID."""
         try:
-            result = self.client.table(self.table)\
+            loader = get_entity_loader()
+            if loader is not None:
+                # Batched with the other lookups of this request/job
+                return await loader.load(self.table, cv_id, lambda: self.client.table(self.table))
+            
+            result = await self.client.table(self.table)\
                 .select("*")\
                 .eq("id", str(cv_id))\
                 .limit(1)\
@@ -139,7 +223,7 @@ class CVService:
             if latest_only:
                 query = query.limit(1)
             
-            result = query.execute()
+            result = await query.execute()
             return result.data or []
             
         except Exception as e:
@@ -172,10 +256,11 @@ class CVService:
                 "language": language
             }
             
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .update(update_data)\
                 .eq("id", str(cv_id))\
                 .execute()
+            forget_entity(self.table, cv_id)
             
             logger.info(f"Updated extracted data for CV: {cv_id}")
             return True
@@ -187,7 +272,7 @@ class CVService:
     async def count_all(self) -> int:
         """Count total number of CVs."""
         try:
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .select("id", count="exact")\
                 .execute()
             return result.count or 0
@@ -9,7 +9,8 @@ from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
 from uuid import UUID
 
-from database.connection import get_supabase_client
+from database.async_client import get_async_supabase_client
+from database.loader import MAX_IDS_PER_QUERY
 
 logger = logging.getLogger(__name__)
 
@@ -23,7 +24,7 @@ class CompanyEnrichmentService:
     
     def __init__(self):
         """Initialize the service with database client."""
-        self.client = get_supabase_client()
+        self.client = get_async_supabase_client()
         self.table = "company_enrichments"
     
     async def get_latest(
@@ -45,7 +46,7 @@ class CompanyEnrichmentService:
             cutoff_date = datetime.now() - timedelta(days=max_age_days)
             
             response = (
-                self.client.table(self.table)
+                await self.client.table(self.table)
                 .select("*")
                 .ilike("company_name", company_name)
                 .eq("is_valid", True)
@@ -110,7 +111,7 @@ class CompanyEnrichmentService:
             }
             
             response = (
-                self.client.table(self.table)
+                await self.client.table(self.table)
                 .insert(record)
                 .execute()
             )
@@ -138,7 +139,7 @@ class CompanyEnrichmentService:
         """
         try:
             response = (
-                self.client.table(self.table)
+                await self.client.table(self.table)
                 .update({"is_valid": False})
                 .ilike("company_name", company_name)
                 .execute()
@@ -170,7 +171,7 @@ class CompanyEnrichmentService:
             cutoff_date = datetime.now() - timedelta(days=max_age_days)
             
             response = (
-                self.client.table(self.table)
+                await self.client.table(self.table)
                 .select("*")
                 .eq("company_id", str(company_id))
                 .eq("is_valid", True)
@@ -199,7 +200,7 @@ class CandidateEnrichmentService:
     
     def __init__(self):
         """Initialize the service with database client."""
-        self.client = get_supabase_client()
+        self.client = get_async_supabase_client()
         self.table = "candidate_enrichments"
     
     async def get_latest(
@@ -221,7 +222,7 @@ class CandidateEnrichmentService:
             cutoff_date = datetime.now() - timedelta(days=max_age_days)
             
             response = (
-                self.client.table(self.table)
+                await self.client.table(self.table)
                 .select("*")
                 .eq("candidate_id", str(candidate_id))
                 .eq("is_valid", True)
@@ -242,6 +243,51 @@ class CandidateEnrichmentService:
             logger.error(f"Error fetching candidate enrichment: {str(e)}")
             return None
     
+    async def get_latest_many(
+        self,
+        candidate_ids: List[UUID],
+        max_age_days: int = 90,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the latest valid enrichment of several candidates, in one query
+        per MAX_IDS_PER_QUERY candidates.
+        
+        Args:
+            candidate_ids: UUIDs of the candidates
+            max_age_days: Maximum age of cached data in days (default: 90)
+        
+        Returns:
+            Dict of candidate ID (str) -> latest enrichment (candidates without
+            recent enrichment are left out)
+        """
+        ids = list(dict.fromkeys(str(candidate_id) for candidate_id in candidate_ids))
+        if not ids:
+            return {}
+        try:
+            cutoff_date = datetime.now() - timedelta(days=max_age_days)
+            
+            latest: Dict[str, Dict[str, Any]] = {}
+            for start in range(0, len(ids), MAX_IDS_PER_QUERY):
+                response = (
+                    await self.client.table(self.table)
+                    .select("*")
+                    .in_("candidate_id", ids[start:start + MAX_IDS_PER_QUERY])
+                    .eq("is_valid", True)
+                    .gte("enriched_at", cutoff_date.isoformat())
+                    .order("enriched_at", desc=True)
+                    .execute()
+                )
+                for row in response.data or []:
+                    # Newest first, so the first row of each candidate wins
+                    latest.setdefault(str(row["candidate_id"]), row)
+            
+            logger.info(f"Found cached enrichment for {len(latest)}/{len(ids)} candidate(s)")
+            return latest
+            
+        except Exception as e:
+            logger.error(f"Error fetching candidate enrichments: {str(e)}")
+            return {}
+    
     async def save(
         self,
         candidate_id: UUID,
@@ -288,7 +334,7 @@ class CandidateEnrichmentService:
             }
             
             response = (
-                self.client.table(self.table)
+                await self.client.table(self.table)
                 .insert(record)
                 .execute()
             )
@@ -317,7 +363,7 @@ class CandidateEnrichmentService:
         """
         try:
             response = (
-                self.client.table(self.table)
+                await self.client.table(self.table)
                 .update({"is_valid": False})
                 .eq("candidate_id", str(candidate_id))
                 .execute()
@@ -349,7 +395,7 @@ class CandidateEnrichmentService:
             cutoff_date = datetime.now() - timedelta(days=max_age_days)
             
             response = (
-                self.client.table(self.table)
+                await self.client.table(self.table)
                 .select("*")
                 .ilike("candidate_name", candidate_name)
                 .eq("is_valid", True)
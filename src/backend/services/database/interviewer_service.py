@@ -7,7 +7,7 @@ Handles CRUD operations for interviewers table.
 from typing import Optional, Dict, Any, List
 from uuid import UUID
 from datetime import datetime
-from database import get_supabase_client
+from database import get_async_supabase_client
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,7 +17,7 @@ class InterviewerService:
     """Service for managing interviewers in the database."""
     
     def __init__(self):
-        self.client = get_supabase_client()
+        self.client = get_async_supabase_client()
         self.table = "interviewers"
     
     async def find_by_email(self, email: str) -> Optional[Dict[str, Any]]:
@@ -31,7 +31,7 @@ class InterviewerService:
             Interviewer dict if found, None otherwise
         """
         try:
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .select("*")\
                 .eq("email", email.lower())\
                 .limit(1)\
@@ -81,7 +81,7 @@ class InterviewerService:
                 "consent_timestamp": datetime.utcnow().isoformat() if consent_given else None
             }
             
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .insert(interviewer_data)\
                 .execute()
             
@@ -159,7 +159,7 @@ class InterviewerService:
                 "consent_timestamp": datetime.utcnow().isoformat() if consent_given else None
             }
             
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .update(update_data)\
                 .eq("id", str(interviewer_id))\
                 .execute()
@@ -182,7 +182,7 @@ class InterviewerService:
             Interviewer dict or None
         """
         try:
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .select("*")\
                 .eq("id", str(interviewer_id))\
                 .limit(1)\
@@ -213,7 +213,7 @@ class InterviewerService:
             List of interviewer dicts
         """
         try:
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .select("*")\
                 .order("created_at", desc=True)\
                 .range(offset, offset + limit - 1)\
@@ -228,7 +228,7 @@ class InterviewerService:
     async def count_all(self) -> int:
         """Count total number of interviewers."""
         try:
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .select("id", count="exact")\
                 .execute()
             return result.count or 0
@@ -6,7 +6,7 @@ Handles CRUD operations for job_postings table.
 
 from typing import Optional, Dict, Any, List
 from uuid import UUID
-from database import get_supabase_client
+from database import get_async_supabase_client, get_entity_loader, forget_entity
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,7 +16,7 @@ class JobPostingService:
     """Service for managing job postings in the database."""
     
     def __init__(self):
-        self.client = get_supabase_client()
+        self.client = get_async_supabase_client()
         self.table = "job_postings"
     
     async def create(
@@ -90,7 +90,7 @@ class JobPostingService:
                 f"language={job_data['language']}"
             )
             
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .insert(job_data)\
                 .execute()
             
@@ -138,7 +138,12 @@ class JobPostingService:
     async def get_by_id(self, job_posting_id: UUID) -> Optional[Dict[str, Any]]:
         """Get job posting by ID."""
         try:
-            result = self.client.table(self.table)\
+            loader = get_entity_loader()
+            if loader is not None:
+                # Batched with the other lookups of this request/job
+                return await loader.load(self.table, job_posting_id, lambda: self.client.table(self.table))
+            
+            result = await self.client.table(self.table)\
                 .select("*")\
                 .eq("id", str(job_posting_id))\
                 .limit(1)\
@@ -169,10 +174,11 @@ class JobPostingService:
             True if updated successfully
         """
         try:
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .update({"structured_data": structured_data})\
                 .eq("id", str(job_posting_id))\
                 .execute()
+            forget_entity(self.table, job_posting_id)
             
             logger.info(f"Updated structured data for job posting: {job_posting_id}")
             return True
@@ -188,10 +194,11 @@ class JobPostingService:
     ) -> bool:
         """Update job posting key points."""
         try:
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .update({"key_points": key_points})\
                 .eq("id", str(job_posting_id))\
                 .execute()
+            forget_entity(self.table, job_posting_id)
             
             return True
             
@@ -207,13 +214,14 @@ class JobPostingService:
     ) -> bool:
         """Update job posting weights and hard blockers."""
         try:
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .update({
                     "weights": weights,
                     "hard_blockers": hard_blockers
                 })\
                 .eq("id", str(job_posting_id))\
                 .execute()
+            forget_entity(self.table, job_posting_id)
             
             return True
             
@@ -237,7 +245,7 @@ class JobPostingService:
             List of job posting dicts
         """
         try:
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .select("*")\
                 .order("created_at", desc=True)\
                 .range(offset, offset + limit - 1)\
@@ -252,7 +260,7 @@ class JobPostingService:
     async def count_all(self) -> int:
         """Count total number of job postings."""
         try:
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .select("id", count="exact")\
                 .execute()
             return result.count or 0
@@ -265,7 +273,7 @@ class JobPostingService:
         try:
             from datetime import datetime, timedelta
             cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat()
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .select("id", count="exact")\
                 .gte("created_at", cutoff)\
                 .execute()
@@ -6,7 +6,7 @@ Pricing can be fetched from provider APIs or manually configured.
 """
 
 from typing import Optional, Dict, Any, List
-from database import get_supabase_client
+from database import get_async_supabase_client
 import logging
 from datetime import datetime
 
@@ -17,7 +17,7 @@ class PricingService:
     """Service for managing AI model pricing information."""
     
     def __init__(self):
-        self.client = get_supabase_client()
+        self.client = get_async_supabase_client()
         self.table = "ai_model_pricing"
     
     async def get_pricing(
@@ -45,7 +45,7 @@ class PricingService:
                 query = query.eq("model_name", model_name)
             
             query = query.order("last_updated_at", desc=True)
-            result = query.execute()
+            result = await query.execute()
             
             if result.data and len(result.data) > 0:
                 # Return most recent pricing
@@ -76,7 +76,7 @@ class PricingService:
             if provider:
                 query = query.eq("provider", provider)
             
-            result = query.execute()
+            result = await query.execute()
             return result.data or []
             
         except Exception as e:
@@ -138,13 +138,13 @@ class PricingService:
             
             if existing:
                 # Update existing
-                result = self.client.table(self.table)\
+                result = await self.client.table(self.table)\
                     .update(data)\
                     .eq("id", existing["id"])\
                     .execute()
             else:
                 # Insert new
-                result = self.client.table(self.table)\
+                result = await self.client.table(self.table)\
                     .insert(data)\
                     .execute()
             
@@ -161,7 +161,7 @@ class PricingService:
     async def deactivate_pricing(self, provider: str, model_name: str) -> bool:
         """Deactivate pricing for a model."""
         try:
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .update({"is_active": False})\
                 .eq("provider", provider)\
                 .eq("model_name", model_name)\
@@ -10,7 +10,7 @@ This service handles all database operations for AI prompts, including:
 
 from typing import List, Optional, Dict, Any
 from datetime import datetime
-from database import get_supabase_client
+from database import get_async_supabase_client
 import logging
 import json
 
@@ -22,7 +22,7 @@ class PromptService:
     
     def __init__(self):
         """Initialize the prompt service."""
-        self.client = get_supabase_client()
+        self.client = get_async_supabase_client()
     
     async def get_all_prompts(
         self,
@@ -54,7 +54,7 @@ class PromptService:
             # Order by category and name
             query = query.order("category").order("name")
             
-            result = query.execute()
+            result = await query.execute()
             return result.data if result.data else []
             
         except Exception as e:
@@ -72,7 +72,7 @@ class PromptService:
             Prompt dictionary or None if not found
         """
         try:
-            result = self.client.table("ai_prompts")\
+            result = await self.client.table("ai_prompts")\
                 .select("*")\
                 .eq("id", prompt_id)\
                 .single()\
@@ -93,7 +93,8 @@ class PromptService:
         """
         Get a prompt by its key.
         
-        This is the main method used by the AI service to fetch prompts.
+        Used by the admin API; AI calls read prompts through the in-process
+        prompt registry (services/ai/prompt_registry.py).
         
         Args:
             prompt_key: Unique key identifier (e.g., "cv_extraction")
@@ -116,7 +117,7 @@ class PromptService:
                 # Get the default version for this key
                 query = query.eq("is_default", True)
             
-            result = query.execute()
+            result = await query.execute()
             
             if result.data and len(result.data) > 0:
                 # Update usage stats
@@ -181,7 +182,7 @@ class PromptService:
                 "version": 1
             }
             
-            result = self.client.table("ai_prompts")\
+            result = await self.client.table("ai_prompts")\
                 .insert(prompt_data)\
                 .execute()
             
@@ -288,7 +289,7 @@ class PromptService:
                 update_data["content"] = content
             
             # Update the prompt
-            result = self.client.table("ai_prompts")\
+            result = await self.client.table("ai_prompts")\
                 .update(update_data)\
                 .eq("id", prompt_id)\
                 .execute()
@@ -315,7 +316,7 @@ class PromptService:
         """
         try:
             # Soft delete: just set to inactive
-            result = self.client.table("ai_prompts")\
+            result = await self.client.table("ai_prompts")\
                 .update({"is_active": False})\
                 .eq("id", prompt_id)\
                 .execute()
@@ -341,7 +342,7 @@ class PromptService:
             List of version dictionaries, ordered by version descending
         """
         try:
-            result = self.client.table("prompt_versions")\
+            result = await self.client.table("prompt_versions")\
                 .select("*")\
                 .eq("prompt_id", prompt_id)\
                 .order("version", desc=True)\
@@ -372,7 +373,7 @@ class PromptService:
         """
         try:
             # Get the version
-            version_result = self.client.table("prompt_versions")\
+            version_result = await self.client.table("prompt_versions")\
                 .select("*")\
                 .eq("prompt_id", prompt_id)\
                 .eq("version", version)\
@@ -431,7 +432,77 @@ class PromptService:
         except Exception as e:
             logger.error(f"Error getting prompt stats: {e}")
             return {"total": 0, "active": 0, "inactive": 0, "by_category": {}}
-    
+
+    async def get_active_default_prompts(self) -> List[Dict[str, Any]]:
+        """
+        Get the active default prompt of every key and language.
+
+        Used by the prompt registry (services/ai/prompt_registry.py), which
+        handles errors, so they are raised.
+
+        Returns:
+            List of prompt dictionaries
+        """
+        result = await self.client.table("ai_prompts")\
+            .select("*")\
+            .eq("is_active", True)\
+            .eq("is_default", True)\
+            .execute()
+        return result.data if result.data else []
+
+    async def get_prompts_version(self) -> Optional[str]:
+        """
+        Latest updated_at across all prompts (changes whenever a prompt is
+        created, edited, rolled back or deactivated). Raises on error.
+
+        Returns:
+            ISO timestamp or None if there are no prompts
+        """
+        result = await self.client.table("ai_prompts")\
+            .select("updated_at")\
+            .order("updated_at", desc=True)\
+            .limit(1)\
+            .execute()
+        return result.data[0].get("updated_at") if result.data else None
+
+    async def increment_usage_batch(self, usage: Dict[str, int]) -> None:
+        """
+        Add usage counts for many prompts. Raises if nothing could be written.
+
+        Args:
+            usage: Number of uses by prompt ID
+        """
+        if not usage:
+            return
+        try:
+            await self.client.rpc("increment_prompt_usage_batch", {"usage": usage}).execute()
+            return
+        except Exception as e:
+            logger.debug(f"increment_prompt_usage_batch unavailable, updating prompts one by one: {e}")
+
+        # Migration 015 not applied: read-modify-write per prompt
+        now = datetime.utcnow().isoformat()
+        failed = 0
+        for prompt_id, count in usage.items():
+            try:
+                current = await self.client.table("ai_prompts")\
+                    .select("usage_count")\
+                    .eq("id", prompt_id)\
+                    .single()\
+                    .execute()
+                await self.client.table("ai_prompts")\
+                    .update({
+                        "usage_count": (current.data.get("usage_count") or 0) + count,
+                        "last_used_at": now
+                    })\
+                    .eq("id", prompt_id)\
+                    .execute()
+            except Exception as e:
+                failed += 1
+                if failed == len(usage):
+                    raise
+                logger.debug(f"Failed to update usage for prompt {prompt_id}: {e}")
+
     async def _increment_usage(self, prompt_id: str) -> None:
         """
         Increment usage counter for a prompt.
@@ -440,16 +511,16 @@ class PromptService:
             prompt_id: UUID of the prompt
         """
         try:
-            self.client.rpc(
+            await self.client.rpc(
                 "increment_prompt_usage",
                 {"prompt_id": prompt_id}
             ).execute()
         except Exception:
             # Non-critical - just update the fields directly
             try:
-                self.client.table("ai_prompts")\
+                await self.client.table("ai_prompts")\
                     .update({
-                        "usage_count": self.client.table("ai_prompts").select("usage_count").eq("id", prompt_id).single().execute().data["usage_count"] + 1,
+                        "usage_count": (await self.client.table("ai_prompts").select("usage_count").eq("id", prompt_id).single().execute()).data["usage_count"] + 1,
                         "last_used_at": datetime.utcnow().isoformat()
                     })\
                     .eq("id", prompt_id)\
@@ -480,7 +551,7 @@ class PromptService:
             created_by: Admin who made the change
         """
         try:
-            self.client.table("prompt_versions")\
+            await self.client.table("prompt_versions")\
                 .insert({
                     "prompt_id": prompt_id,
                     "version": version,
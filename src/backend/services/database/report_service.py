@@ -8,7 +8,7 @@ Reports group multiple candidate analyses and store evaluation criteria.
 from typing import Optional, Dict, Any, List
 from uuid import UUID
 from datetime import datetime
-from database import get_supabase_client
+from database import get_async_supabase_client
 import logging
 import random
 import string
@@ -20,7 +20,7 @@ class ReportService:
     """Service for managing persistent analysis reports in the database."""
     
     def __init__(self):
-        self.client = get_supabase_client()
+        self.client = get_async_supabase_client()
         self.table = "analysis_reports"
     
     def _generate_report_code(self) -> str:
@@ -73,7 +73,7 @@ class ReportService:
             for _ in range(max_attempts):
                 candidate_code = self._generate_report_code()
                 # Check if code exists
-                existing = self.client.table(self.table)\
+                existing = await self.client.table(self.table)\
                     .select("id")\
                     .eq("report_code", candidate_code)\
                     .execute()
@@ -102,7 +102,7 @@ class ReportService:
                 "total_candidates": 0
             }
             
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .insert(report_data)\
                 .execute()
             
@@ -119,7 +119,7 @@ class ReportService:
     async def get_by_id(self, report_id: UUID) -> Optional[Dict[str, Any]]:
         """Get report by ID."""
         try:
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .select("*")\
                 .eq("id", str(report_id))\
                 .limit(1)\
@@ -145,7 +145,7 @@ class ReportService:
             Report dict or None if not found
         """
         try:
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .select("*")\
                 .eq("report_code", report_code.upper())\
                 .limit(1)\
@@ -176,7 +176,7 @@ class ReportService:
             True if updated successfully
         """
         try:
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .update({
                     "executive_recommendation": executive_recommendation,
                     "analyzed_at": datetime.utcnow().isoformat()
@@ -209,7 +209,7 @@ class ReportService:
             
             new_count = report.get('total_candidates', 0) + count
             
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .update({"total_candidates": new_count})\
                 .eq("id", str(report_id))\
                 .execute()
@@ -231,7 +231,7 @@ class ReportService:
             List of analysis dicts sorted by global_score DESC
         """
         try:
-            result = self.client.table("analyses")\
+            result = await self.client.table("analyses")\
                 .select("*")\
                 .eq("report_id", str(report_id))\
                 .order("global_score", desc=True)\
@@ -259,7 +259,7 @@ class ReportService:
             List of recent reports
         """
         try:
-            result = self.client.table(self.table)\
+            result = await self.client.table(self.table)\
                 .select("*")\
                 .eq("interviewer_id", str(interviewer_id))\
                 .eq("status", "active")\
@@ -139,6 +139,20 @@ class SessionService:
         
         return False
     
+    def count_active(self) -> Dict[str, int]:
+        """
+        Count unexpired sessions per flow type.
+        
+        Returns:
+            Dict mapping flow type to number of active sessions
+        """
+        now = datetime.utcnow().isoformat()
+        counts: Dict[str, int] = {}
+        for session in list(self._sessions.values()):
+            if session["expires_at"] > now:
+                counts[session["flow_type"]] = counts.get(session["flow_type"], 0) + 1
+        return counts
+    
     def cleanup_expired_sessions(self) -> int:
         """
         Remove all expired sessions.
@@ -0,0 +1,7 @@
+"""
+HTTP client services package.
+"""
+
+from .registry import HTTPClientRegistry, get_http_client_registry
+
+__all__ = ["HTTPClientRegistry", "get_http_client_registry"]
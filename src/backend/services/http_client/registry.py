@@ -0,0 +1,164 @@
+"""
+Shared HTTP client registry for outbound API calls.
+
+Owns one pooled keep-alive httpx.AsyncClient per upstream host (Kimi,
+MiniMax, Brave Search, PDF.co, ...) so repeated requests and polling loops
+reuse TCP/TLS connections and DNS lookups instead of opening a fresh client
+every time. Clients are opened and closed in the FastAPI lifespan.
+"""
+
+import asyncio
+import importlib.util
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Any
+from urllib.parse import urlparse
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 needs the optional "h2" package (httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Pool settings used for hosts without an explicit entry below
+DEFAULT_HOST_CONFIG: Dict[str, Any] = {
+    "max_connections": 10,
+    "max_keepalive_connections": 5,
+    "keepalive_expiry": 30.0,
+    "timeout": 30.0,
+    "http2": True,
+}
+
+# Per-host pool settings (limits and default timeout)
+HOST_CONFIG: Dict[str, Dict[str, Any]] = {
+    # LLM providers: long completions, many parallel analyses
+    "kimi-k2.ai": {"max_connections": 20, "max_keepalive_connections": 10, "timeout": 300.0},
+    "api.minimax.chat": {"max_connections": 20, "max_keepalive_connections": 10, "timeout": 300.0},
+    # Search / enrichment
+    "api.search.brave.com": {"max_connections": 10, "max_keepalive_connections": 5, "timeout": 30.0},
+    # PDF.co: uploads plus frequent job polling
+    "api.pdf.co": {"max_connections": 10, "max_keepalive_connections": 5, "timeout": 90.0},
+}
+
+
+def get_host_config(host: str) -> Dict[str, Any]:
+    """
+    Get pool settings for a host, merged over the defaults.
+
+    Args:
+        host: Upstream hostname (e.g., "api.pdf.co")
+
+    Returns:
+        Dict with max_connections, max_keepalive_connections, keepalive_expiry, timeout, http2
+    """
+    config = dict(DEFAULT_HOST_CONFIG)
+    config.update(HOST_CONFIG.get(host, {}))
+    return config
+
+
+class HTTPClientRegistry:
+    """
+    Application-scoped registry of pooled httpx clients, one per upstream host.
+
+    Pooled clients are bound to the event loop the registry was opened on
+    (the uvicorn loop). Calls made from any other loop, or before the registry
+    is opened, get a short-lived client with the same settings, which keeps
+    sync wrappers that use asyncio.run working.
+    """
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def is_open(self) -> bool:
+        """Whether pooled clients are being served."""
+        return self._loop is not None
+
+    def open(self):
+        """Bind the registry to the running event loop and start pooling."""
+        self._loop = asyncio.get_running_loop()
+        logger.info(f"HTTP client registry opened (HTTP/2 available: {HTTP2_AVAILABLE})")
+
+    async def close(self):
+        """Close all pooled clients and stop pooling."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        self._loop = None
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing HTTP client: {e}")
+        logger.info(f"HTTP client registry closed ({len(clients)} client(s))")
+
+    def _build_client(self, host: str) -> httpx.AsyncClient:
+        """Create a client configured for the given host."""
+        config = get_host_config(host)
+        limits = httpx.Limits(
+            max_connections=config["max_connections"],
+            max_keepalive_connections=config["max_keepalive_connections"],
+            keepalive_expiry=config["keepalive_expiry"],
+        )
+        return httpx.AsyncClient(
+            timeout=config["timeout"],
+            limits=limits,
+            http2=bool(config["http2"]) and HTTP2_AVAILABLE,
+        )
+
+    def _get_pooled_client(self, host: str) -> httpx.AsyncClient:
+        """Get (or create) the pooled client for a host."""
+        client = self._clients.get(host)
+        if client is None or client.is_closed:
+            client = self._build_client(host)
+            self._clients[host] = client
+            logger.info(f"Created pooled HTTP client for {host}")
+        return client
+
+    def _is_pooling_loop(self) -> bool:
+        """Whether the current event loop is the one pooled clients belong to."""
+        try:
+            return self._loop is not None and asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    @asynccontextmanager
+    async def client(self, url: str) -> AsyncIterator[httpx.AsyncClient]:
+        """
+        Get an HTTP client for the host of the given URL.
+
+        Usage:
+            async with registry.client(url) as client:
+                response = await client.post(url, json=payload, timeout=60.0)
+
+        The pooled client is not closed on exit; a short-lived fallback client is.
+
+        Args:
+            url: Request URL or API base URL (only the host is used)
+        """
+        host = urlparse(url).netloc or url
+
+        if self._is_pooling_loop():
+            yield self._get_pooled_client(host)
+            return
+
+        async with self._build_client(host) as client:
+            yield client
+
+
+# Global registry instance
+_http_client_registry: Optional[HTTPClientRegistry] = None
+
+
+def get_http_client_registry() -> HTTPClientRegistry:
+    """
+    Get global HTTP client registry.
+
+    Returns:
+        HTTPClientRegistry singleton
+    """
+    global _http_client_registry
+    if _http_client_registry is None:
+        _http_client_registry = HTTPClientRegistry()
+    return _http_client_registry
@@ -0,0 +1,17 @@
+"""
+Metrics services package.
+"""
+
+from .registry import Counter, Gauge, Histogram, MetricsRegistry, get_metrics_registry
+from .collectors import record_ai_response, record_db_query, track_background_job
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    "get_metrics_registry",
+    "record_ai_response",
+    "record_db_query",
+    "track_background_job",
+]
@@ -0,0 +1,164 @@
+"""
+Application metrics.
+
+Defines the metrics served at /api/metrics and small helpers the
+instrumented code calls:
+- AIManager: request latency, outcome, token and cost counters per
+  provider/model/prompt type (record_ai_response) and requests waiting for
+  a provider concurrency slot or RPM/TPM budget (AI_QUEUE_DEPTH)
+- Supabase client: query latency per service/table/operation
+  (record_db_query, see database/instrumentation.py)
+- Background jobs: duration and jobs in progress per step
+  (track_background_job)
+- Rate limiting: public endpoint 429s and provider 429s/throttling
+  (RATE_LIMIT_EVENTS)
+- Active sessions, computed at scrape time from the session service
+"""
+
+import functools
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from .registry import get_metrics_registry
+
+_registry = get_metrics_registry()
+
+AI_REQUEST_DURATION = _registry.histogram(
+    "ai_request_duration_seconds",
+    "Latency of AI provider calls (cache hits excluded)",
+    ("provider", "model", "prompt_type"),
+    buckets=(0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0),
+)
+AI_REQUESTS = _registry.counter(
+    "ai_requests_total",
+    "AI provider calls by outcome (success, error, rate_limited, cache_hit)",
+    ("provider", "model", "prompt_type", "status"),
+)
+AI_TOKENS = _registry.counter(
+    "ai_tokens_total",
+    "AI tokens by kind (input, output, cached_input)",
+    ("provider", "model", "prompt_type", "kind"),
+)
+AI_COST = _registry.counter(
+    "ai_cost_usd_total",
+    "Estimated AI cost in USD",
+    ("provider", "model", "prompt_type"),
+)
+AI_QUEUE_DEPTH = _registry.gauge(
+    "ai_queue_depth",
+    "AI requests waiting for a provider concurrency slot or rate limit budget",
+    ("provider", "model", "queue"),
+)
+DB_QUERY_DURATION = _registry.histogram(
+    "db_query_duration_seconds",
+    "Latency of Supabase queries",
+    ("service", "table", "operation"),
+)
+DB_QUERY_ERRORS = _registry.counter(
+    "db_query_errors_total",
+    "Supabase queries that raised",
+    ("service", "table", "operation"),
+)
+BACKGROUND_JOB_DURATION = _registry.histogram(
+    "background_job_duration_seconds",
+    "Duration of background jobs per step",
+    ("step", "status"),
+    buckets=(1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1200.0, 1800.0, 3600.0),
+)
+BACKGROUND_JOBS_IN_PROGRESS = _registry.gauge(
+    "background_jobs_in_progress",
+    "Background jobs currently running per step",
+    ("step",),
+)
+RATE_LIMIT_EVENTS = _registry.counter(
+    "rate_limit_events_total",
+    "Rate limiting: public API rejections (scope=http) and AI provider 429s/throttled requests",
+    ("scope", "target", "event"),
+)
+
+
+def _active_sessions() -> Dict[Tuple[str, ...], float]:
+    from services.database.session_service import get_session_service
+    return {(flow_type,): count for flow_type, count in get_session_service().count_active().items()}
+
+
+ACTIVE_SESSIONS = _registry.gauge(
+    "active_sessions",
+    "Unexpired interviewer/candidate flow sessions",
+    ("flow_type",),
+    callback=_active_sessions,
+)
+
+
+def record_ai_response(prompt_type: Optional[str], response: Any):
+    """
+    Record one AI call (AIManager._log_usage).
+
+    Args:
+        prompt_type: Prompt type value (None if unknown)
+        response: AIResponse of the call
+    """
+    labels = (response.provider or "unknown", response.model or "", prompt_type or "unknown")
+    if response.cache_hit:
+        AI_REQUESTS.inc(*labels, "cache_hit")
+        return
+    if response.success:
+        status = "success"
+    elif response.rate_limited:
+        status = "rate_limited"
+    else:
+        status = "error"
+    AI_REQUESTS.inc(*labels, status)
+    if response.latency_ms is not None:
+        AI_REQUEST_DURATION.observe(response.latency_ms / 1000.0, *labels)
+    if response.input_tokens:
+        AI_TOKENS.inc(*labels, "input", amount=response.input_tokens)
+    if response.output_tokens:
+        AI_TOKENS.inc(*labels, "output", amount=response.output_tokens)
+    if response.cached_input_tokens:
+        AI_TOKENS.inc(*labels, "cached_input", amount=response.cached_input_tokens)
+    if response.cost_usd:
+        AI_COST.inc(*labels, amount=response.cost_usd)
+
+
+def record_db_query(service: str, table: str, operation: str, seconds: float, success: bool = True):
+    """
+    Record one Supabase query.
+
+    Args:
+        service: Calling module (e.g. "cv_service")
+        table: Table or RPC function name
+        operation: select, insert, update, upsert, delete or rpc
+        seconds: Query latency
+        success: False if the query raised
+    """
+    DB_QUERY_DURATION.observe(seconds, service, table, operation)
+    if not success:
+        DB_QUERY_ERRORS.inc(service, table, operation)
+
+
+def track_background_job(step: str):
+    """
+    Decorator recording the duration of an async background job.
+
+    Args:
+        step: Job name (e.g. "analysis")
+
+    Returns:
+        Decorator for an async function
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            BACKGROUND_JOBS_IN_PROGRESS.inc(step)
+            started = time.monotonic()
+            status = "error"
+            try:
+                result = await func(*args, **kwargs)
+                status = "completed"
+                return result
+            finally:
+                BACKGROUND_JOBS_IN_PROGRESS.dec(step)
+                BACKGROUND_JOB_DURATION.observe(time.monotonic() - started, step, status)
+        return wrapper
+    return decorator
@@ -16,6 +16,7 @@ import httpx
 import json
 from typing import Tuple, Optional, Dict, Any
 from config import settings
+from services.http_client import get_http_client_registry
 
 logger = logging.getLogger(__name__)
 
@@ -156,9 +157,10 @@ class PDFCoService:
                 "x-api-key": self.api_key
             }
             
-            async with httpx.AsyncClient(timeout=90.0) as client:
+            async with get_http_client_registry().client(url) as client:
                 response = await client.post(
                     url,
+                    timeout=90.0,
                     headers=headers,
                     files=files
                 )
@@ -210,9 +212,10 @@ class PDFCoService:
                 "inline": True
             }
             
-            async with httpx.AsyncClient(timeout=90.0) as client:
+            async with get_http_client_registry().client(url) as client:
                 response = await client.post(
                     url,
+                    timeout=90.0,
                     headers=self.headers,
                     json=payload
                 )
@@ -273,9 +276,10 @@ class PDFCoService:
                 "inline": True
             }
             
-            async with httpx.AsyncClient(timeout=90.0) as client:
+            async with get_http_client_registry().client(url) as client:
                 response = await client.post(
                     url,
+                    timeout=90.0,
                     headers=self.headers,
                     json=payload
                 )
@@ -340,9 +344,10 @@ class PDFCoService:
                 "inline": True  # Return text inline (not as file URL)
             }
             
-            async with httpx.AsyncClient(timeout=60.0) as client:
+            async with get_http_client_registry().client(url) as client:
                 response = await client.post(
                     url,
+                    timeout=60.0,
                     headers=self.headers,
                     json=payload
                 )
@@ -480,9 +485,10 @@ class PDFCoService:
                 "inline": True
             }
             
-            async with httpx.AsyncClient(timeout=90.0) as client:
+            async with get_http_client_registry().client(url) as client:
                 response = await client.post(
                     url,
+                    timeout=90.0,
                     headers=self.headers,
                     json=payload
                 )
@@ -530,9 +536,10 @@ class PDFCoService:
         
         for attempt in range(max_attempts):
             try:
-                async with httpx.AsyncClient(timeout=10.0) as client:
+                async with get_http_client_registry().client(url) as client:
                     response = await client.post(
                         url,
+                        timeout=10.0,
                         headers=self.headers,
                         json={"jobId": job_id}
                     )
@@ -577,9 +584,10 @@ class PDFCoService:
         
         for attempt in range(max_attempts):
             try:
-                async with httpx.AsyncClient(timeout=10.0) as client:
+                async with get_http_client_registry().client(url) as client:
                     response = await client.post(
                         url,
+                        timeout=10.0,
                         headers=self.headers,
                         json={"jobId": job_id}
                     )
@@ -633,9 +641,10 @@ class PDFCoService:
         
         for attempt in range(max_attempts):
             try:
-                async with httpx.AsyncClient(timeout=10.0) as client:
+                async with get_http_client_registry().client(url) as client:
                     response = await client.post(
                         url,
+                        timeout=10.0,
                         headers=self.headers,
                         json={"jobId": job_id}
                     )
@@ -660,8 +669,8 @@ class PDFCoService:
                     
                     if pdf_url:
                         # Download PDF from URL
-                        async with httpx.AsyncClient(timeout=30.0) as client:
-                            pdf_response = await client.get(pdf_url)
+                        async with get_http_client_registry().client(pdf_url) as client:
+                            pdf_response = await client.get(pdf_url, timeout=30.0)
                             pdf_response.raise_for_status()
                             return pdf_response.content
                 
@@ -702,9 +711,10 @@ class PDFCoService:
         
         for attempt in range(max_attempts):
             try:
-                async with httpx.AsyncClient(timeout=10.0) as client:
+                async with get_http_client_registry().client(url) as client:
                     response = await client.post(
                         url,
+                        timeout=10.0,
                         headers=self.headers,
                         json={"jobId": job_id}
                     )
@@ -767,9 +777,10 @@ class PDFCoService:
                 "inline": True
             }
             
-            async with httpx.AsyncClient(timeout=60.0) as client:
+            async with get_http_client_registry().client(url) as client:
                 response = await client.post(
                     url,
+                    timeout=60.0,
                     headers=self.headers,
                     json=payload
                 )
@@ -10,6 +10,7 @@ import httpx
 from pydantic import BaseModel
 
 from config import settings
+from services.http_client import get_http_client_registry
 from services.ai.prompts import get_prompt
 
 logger = logging.getLogger(__name__)
@@ -139,8 +140,8 @@ class BraveSearchService:
         }
         
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(url, params=params, headers=headers)
+            async with get_http_client_registry().client(url) as client:
+                response = await client.get(url, params=params, headers=headers, timeout=10.0)
                 response.raise_for_status()
                 
                 data = response.json()
@@ -232,8 +233,8 @@ class BraveSearchService:
         }
         
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(url, params=params, headers=headers)
+            async with get_http_client_registry().client(url) as client:
+                response = await client.get(url, params=params, headers=headers, timeout=10.0)
                 response.raise_for_status()
                 
                 data = response.json()
@@ -304,8 +305,8 @@ class BraveSearchService:
                 "stream": False
             }
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(url, json=payload, headers=headers)
+            async with get_http_client_registry().client(url) as client:
+                response = await client.post(url, json=payload, headers=headers, timeout=30.0)
                 response.raise_for_status()
                 
                 data = response.json()
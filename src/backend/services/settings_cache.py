@@ -0,0 +1,254 @@
+"""
+Cache for hot settings stored in app_settings.
+
+Settings such as the AI fallback chain are read on every request, so each
+worker keeps them in memory:
+- A value is fresh for SETTINGS_CACHE_TTL_SECONDS. After that it is still
+  served for up to SETTINGS_CACHE_STALE_SECONDS while one background task
+  reloads it (stale-while-revalidate); only a value older than that makes
+  the caller wait for the database.
+- A missing setting, or a failed read with nothing cached, is remembered
+  for SETTINGS_CACHE_NEGATIVE_TTL_SECONDS and then retried, so a database
+  hiccup at startup no longer sticks until restart. A failed reload keeps
+  serving the previous value.
+- invalidate() drops entries in this worker (the admin endpoints call it
+  after writing). Other workers notice the write by polling the newest
+  app_settings.updated_at every SETTINGS_CACHE_VERSION_CHECK_SECONDS in the
+  background and drop all entries when it changes.
+
+Concurrent misses for a key share one read.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Setting keys
+DEFAULT_AI_PROVIDER_KEY = "default_ai_provider"
+AI_CACHE_ENABLED_KEY = "ai_cache_enabled"
+
+_TRUE_VALUES = frozenset({"true", "1", "yes", "on"})
+
+
+@dataclass
+class _Entry:
+    value: Any  # setting_value, or None if the setting is missing / could not be read
+    expires_at: float  # Fresh until
+    stale_until: float  # Served (while reloading) until
+
+
+class AppSettingsCache:
+    """
+    Per-worker TTL cache of app_settings values with background refresh.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 60.0,
+        stale_seconds: float = 300.0,
+        negative_ttl_seconds: float = 10.0,
+        version_check_seconds: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.version_check_seconds = version_check_seconds
+        self._clock = clock
+
+        self._entries: Dict[str, _Entry] = {}
+        self._loads: Dict[str, asyncio.Task] = {}
+        # Bumped by invalidate() so reads started before it don't repopulate the cache
+        self._generation = 0
+        self._version: Optional[str] = None
+        self._version_checked_at: Optional[float] = None
+        self._version_task: Optional[asyncio.Task] = None
+        self._service = None
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "reloads": 0, "errors": 0, "invalidations": 0}
+
+    def _get_service(self):
+        if self._service is None:
+            from services.database.app_settings_service import get_app_settings_service
+            self._service = get_app_settings_service()
+        return self._service
+
+    async def get(self, key: str) -> Any:
+        """
+        Get a setting value.
+
+        Args:
+            key: Setting key
+
+        Returns:
+            setting_value, or None if the setting is missing or unreadable
+        """
+        self._maybe_check_version()
+        now = self._clock()
+        entry = self._entries.get(key)
+        if entry is not None and now < entry.expires_at:
+            self._stats["hits"] += 1
+            return entry.value
+        if entry is not None and now < entry.stale_until:
+            self._stats["stale_hits"] += 1
+            self._start_load(key)
+            return entry.value
+        self._stats["misses"] += 1
+        return await asyncio.shield(self._start_load(key))
+
+    async def get_json(self, key: str, default: Any = None) -> Any:
+        """
+        Get a setting stored as JSON text (values that are not valid JSON are returned as is).
+
+        Args:
+            key: Setting key
+            default: Returned if the setting is missing
+
+        Returns:
+            Decoded value
+        """
+        value = await self.get(key)
+        if value is None:
+            return default
+        if isinstance(value, str):
+            try:
+                return json.loads(value)
+            except (json.JSONDecodeError, ValueError):
+                return value
+        return value
+
+    async def get_bool(self, key: str, default: bool) -> bool:
+        """
+        Get a boolean setting ("true"/"1"/"yes"/"on" are true).
+
+        Args:
+            key: Setting key
+            default: Returned if the setting is missing
+
+        Returns:
+            Setting value
+        """
+        value = await self.get(key)
+        if value is None:
+            return default
+        if isinstance(value, bool):
+            return value
+        return str(value).strip().lower() in _TRUE_VALUES
+
+    def invalidate(self, key: Optional[str] = None):
+        """
+        Drop a cached setting (or all of them) in this worker.
+
+        Args:
+            key: Setting key, or None for all settings
+        """
+        self._generation += 1
+        self._stats["invalidations"] += 1
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def _start_load(self, key: str) -> asyncio.Task:
+        """Start reading a setting unless a read is already running (single flight)."""
+        loop = asyncio.get_running_loop()
+        task = self._loads.get(key)
+        if task is None or task.done() or task.get_loop() is not loop:
+            task = loop.create_task(self._load(key))
+            self._loads[key] = task
+            task.add_done_callback(lambda _: self._loads.pop(key, None) if self._loads.get(key) is task else None)
+        return task
+
+    async def _load(self, key: str) -> Any:
+        generation = self._generation
+        previous = self._entries.get(key)
+        self._stats["reloads"] += 1
+        try:
+            row = await self._get_service().get(key)
+        except Exception as e:
+            self._stats["errors"] += 1
+            value = previous.value if previous is not None else None
+            logger.warning(f"Could not read setting {key} ({'keeping cached value' if previous else 'no cached value'}): {e}")
+            now = self._clock()
+            # Retry soon; meanwhile keep serving what we had (stale-if-error)
+            self._store(key, generation, _Entry(
+                value,
+                now + self.negative_ttl_seconds,
+                now + self.negative_ttl_seconds + (self.stale_seconds if value is not None else 0.0),
+            ))
+            return value
+
+        now = self._clock()
+        if row is None:
+            self._store(key, generation, _Entry(None, now + self.negative_ttl_seconds, now + self.negative_ttl_seconds))
+            return None
+        value = row.get("setting_value")
+        self._store(key, generation, _Entry(value, now + self.ttl_seconds, now + self.ttl_seconds + self.stale_seconds))
+        return value
+
+    def _store(self, key: str, generation: int, entry: _Entry):
+        if generation == self._generation:
+            self._entries[key] = entry
+
+    def _maybe_check_version(self):
+        """Start a background app_settings version check if one is due."""
+        if self.version_check_seconds <= 0:
+            return
+        now = self._clock()
+        if self._version_checked_at is not None and now - self._version_checked_at < self.version_check_seconds:
+            return
+        loop = asyncio.get_running_loop()
+        task = self._version_task
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+        self._version_checked_at = now
+        self._version_task = loop.create_task(self._check_version())
+
+    async def _check_version(self):
+        try:
+            version = await self._get_service().get_version()
+        except Exception as e:
+            logger.debug(f"Settings version check failed: {e}")
+            return
+        if self._version is not None and version != self._version:
+            logger.info(f"app_settings changed (updated_at {self._version} -> {version}); reloading cached settings")
+            self.invalidate()
+        self._version = version
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache counters and the cached keys."""
+        return {
+            "keys": sorted(self._entries),
+            "version": self._version,
+            "ttl_seconds": self.ttl_seconds,
+            "stale_seconds": self.stale_seconds,
+            **self._stats,
+        }
+
+
+# Global cache instance
+_app_settings_cache: Optional[AppSettingsCache] = None
+
+
+def get_app_settings_cache() -> AppSettingsCache:
+    """
+    Get global app settings cache.
+
+    Returns:
+        AppSettingsCache singleton
+    """
+    global _app_settings_cache
+    if _app_settings_cache is None:
+        _app_settings_cache = AppSettingsCache(
+            ttl_seconds=settings.settings_cache_ttl_seconds,
+            stale_seconds=settings.settings_cache_stale_seconds,
+            negative_ttl_seconds=settings.settings_cache_negative_ttl_seconds,
+            version_check_seconds=settings.settings_cache_version_check_seconds,
+        )
+    return _app_settings_cache
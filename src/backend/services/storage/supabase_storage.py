@@ -2,13 +2,15 @@
 Supabase Storage service for file uploads.
 
 Handles uploading and managing files (CVs, job postings, etc.) in Supabase storage buckets.
+The storage client is synchronous, so uploads and deletes run on the database
+executor (run_db) to keep the event loop free while files are transferred.
 """
 
 import os
 from typing import Optional, Tuple
 from uuid import uuid4
 from datetime import datetime
-from database import get_supabase_client
+from database import get_supabase_client, run_db
 import logging
 
 logger = logging.getLogger(__name__)
@@ -52,7 +54,8 @@ class SupabaseStorageService:
             unique_filename = f"{candidate_id}/{uuid4()}{file_extension}"
             
             # Upload to Supabase storage
-            result = self.client.storage.from_(self.cv_bucket).upload(
+            await run_db(
+                self.client.storage.from_(self.cv_bucket).upload,
                 path=unique_filename,
                 file=file_content,
                 file_options={"content-type": self._get_content_type(file_extension)}
@@ -89,7 +92,8 @@ class SupabaseStorageService:
             file_extension = os.path.splitext(filename)[1]
             unique_filename = f"{job_posting_id}/{uuid4()}{file_extension}"
             
-            result = self.client.storage.from_(self.job_posting_bucket).upload(
+            await run_db(
+                self.client.storage.from_(self.job_posting_bucket).upload,
                 path=unique_filename,
                 file=file_content,
                 file_options={"content-type": self._get_content_type(file_extension)}
@@ -174,7 +178,7 @@ class SupabaseStorageService:
             True if deleted successfully
         """
         try:
-            self.client.storage.from_(bucket).remove([filepath])
+            await run_db(self.client.storage.from_(bucket).remove, [filepath])
             logger.info(f"File deleted: {bucket}/{filepath}")
             return True
         except Exception as e:
@@ -16,7 +16,8 @@ async def calculate_cost_from_tokens(
     provider: str, 
     model: Optional[str], 
     input_tokens: Optional[int], 
-    output_tokens: Optional[int]
+    output_tokens: Optional[int],
+    calls: int = 1
 ) -> Dict[str, float]:
     """
     Calculate cost based on actual token usage.
@@ -29,6 +30,8 @@ async def calculate_cost_from_tokens(
         model: Optional model name (for OpenAI and Claude to determine pricing tier)
         input_tokens: Number of input tokens used
         output_tokens: Number of output tokens generated
+        calls: Number of calls the token counts are summed over (flat
+            per-call prices are charged once per call)
     
     Returns:
         Dict with 'input_cost', 'output_cost', and 'total_cost' in USD
@@ -49,7 +52,7 @@ async def calculate_cost_from_tokens(
             if pricing_type == "credit_based" or pricing_type == "per_request":
                 # For credit-based or per-request pricing
                 if per_request_price:
-                    total_cost = float(per_request_price)
+                    total_cost = float(per_request_price) * calls
                     # Distribute proportionally if we have tokens
                     if input_tokens and output_tokens:
                         total_tokens = input_tokens + output_tokens
@@ -87,7 +90,7 @@ async def calculate_cost_from_tokens(
             "kimi": 0.005,
             "minimax": 0.0001
         }
-        total = fallback_costs.get(provider, 0.0001)
+        total = fallback_costs.get(provider, 0.0001) * calls
         return {
             "input_cost": total * 0.5,  # Estimate 50/50 split
             "output_cost": total * 0.5,
@@ -157,7 +160,7 @@ async def calculate_cost_from_tokens(
     elif provider == "kimi":
         # Kimi uses credit-based pricing (não cobra por tokens, mas por request)
         # Distribuímos o custo estimado proporcionalmente
-        total_estimated = 0.005
+        total_estimated = 0.005 * calls
         total_tokens = (input_tokens or 0) + (output_tokens or 0)
         if total_tokens > 0:
             input_cost = (input_tokens / total_tokens) * total_estimated
@@ -173,7 +176,7 @@ async def calculate_cost_from_tokens(
     
     else:
         # Unknown provider, use fallback
-        total = 0.0001
+        total = 0.0001 * calls
         input_cost = total * 0.5
         output_cost = total * 0.5
     
@@ -0,0 +1,243 @@
+"""
+Shared fixtures for the backend tests.
+
+- fake_provider: an AIProvider stand-in for AIManager tests.
+- memory_client: an in-memory Supabase client (tables, RPCs and storage)
+  installed as the process-wide client.
+- analysis_session: the session service used by the interviewer background jobs.
+"""
+
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent.parent / "src" / "backend"
+sys.path.insert(0, str(backend_path))
+
+
+class _FakeProvider:
+    """Minimal stand-in for an AIProvider used by AIManager tests."""
+    
+    instances = 0
+    calls = 0
+    
+    def __init__(self, api_key, config=None):
+        type(self).instances += 1
+        self.config = config or {}
+        self.model_name = self.config.get("model")
+    
+    @property
+    def provider_name(self):
+        return "openai"
+    
+    def build_prompt(self, template, variables):
+        from services.ai import AIProvider
+        return AIProvider.build_prompt(self, template, variables)
+    
+    async def complete(self, request):
+        from services.ai import AIResponse
+        type(self).calls += 1
+        return AIResponse(
+            success=True,
+            raw_text="ok",
+            provider="openai",
+            model=self.model_name,
+            input_tokens=100,
+            output_tokens=20,
+            cost_usd=0.01
+        )
+
+
+class _FakeAnalysisSession:
+    """In-memory session service used by the step 6 background job tests."""
+    
+    def __init__(self, data):
+        self.session = {"data": data, "current_step": 5}
+        self.snapshots = []
+    
+    def get_session(self, session_id):
+        return self.session
+    
+    def update_session(self, session_id, data, step=None):
+        self.session["data"].update(data)
+        if "analysis_results" in data:
+            self.snapshots.append([r["candidate_id"] for r in data["analysis_results"]])
+        return True
+
+
+class _MemoryQuery:
+    """PostgREST builder stand-in over an in-memory table (inserts are all-or-nothing)."""
+    
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.rows = None
+        self.values = None
+        self.filters = []
+        self.ordering = None
+    
+    def insert(self, rows):
+        self.rows = rows if isinstance(rows, list) else [rows]
+        return self
+    
+    def select(self, *columns, **kwargs):
+        return self
+    
+    def update(self, values):
+        self.values = values
+        return self
+    
+    def in_(self, column, values):
+        self.client.in_sizes.append(len(values))
+        self.filters.append((column, lambda value, values=set(values): value in values))
+        return self
+    
+    def eq(self, column, value):
+        self.filters.append((column, lambda v, value=value: v == value))
+        return self
+    
+    def gte(self, column, value):
+        self.filters.append((column, lambda v, value=value: v is not None and v >= value))
+        return self
+    
+    def order(self, column, desc=False):
+        self.ordering = (column, desc)
+        return self
+    
+    def limit(self, count):
+        return self
+    
+    def execute(self):
+        with self.client.blocking_call():
+            if self.table in self.client.failing_tables:
+                raise RuntimeError("query failed")
+            return self._execute()
+    
+    def _execute(self):
+        table = self.client.tables.setdefault(self.table, [])
+        if self.values is not None:
+            data = [row for row in table if all(match(row.get(c)) for c, match in self.filters)]
+            for row in data:
+                row.update(self.values)
+            return SimpleNamespace(data=data, count=None)
+        if self.rows is None:
+            self.client.selects.append(self.table)
+            data = [row for row in table if all(match(row.get(c)) for c, match in self.filters)]
+            if self.ordering:
+                data.sort(key=lambda row: row[self.ordering[0]], reverse=self.ordering[1])
+            return SimpleNamespace(data=data, count=None)
+        self.client.requests.append(len(self.rows))
+        if any("bad" in str(row.get("email") or row.get("file_url")) for row in self.rows):
+            raise RuntimeError("violates check constraint")
+        created = [{"id": f"{self.table}-{len(table) + i + 1}", **row} for i, row in enumerate(self.rows)]
+        table.extend(created)
+        return SimpleNamespace(data=created, count=None)
+
+
+class _MemoryRpc:
+    def __init__(self, client, fn):
+        self.client = client
+        self.fn = fn
+    
+    def execute(self):
+        with self.client.blocking_call():
+            if self.fn not in self.client.functions:
+                raise RuntimeError(f"Could not find the function public.{self.fn}")
+            self.client.rpcs.append(self.fn)
+            return SimpleNamespace(data=self.client.functions[self.fn](self.client), count=None)
+
+
+class _MemoryBucket:
+    """Storage bucket stand-in keeping uploaded files in memory."""
+    
+    def __init__(self, client, name):
+        self.client = client
+        self.name = name
+    
+    def upload(self, path, file, file_options=None):
+        with self.client.blocking_call():
+            self.client.files[(self.name, path)] = file
+            return {"path": path}
+    
+    def remove(self, paths):
+        with self.client.blocking_call():
+            for path in paths:
+                self.client.files.pop((self.name, path), None)
+            return [{"name": path} for path in paths]
+    
+    def get_public_url(self, path):
+        return f"https://storage.example.com/{self.name}/{path}"
+
+
+class _MemoryClient:
+    """
+    In-memory stand-in for the supabase-py client.
+    
+    Queries, RPCs and uploads sleep `delay` seconds and block the calling
+    thread like the real client; `max_active` is the highest number of them
+    seen running at the same time.
+    """
+    
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.tables = {}
+        self.files = {}
+        self.requests = []
+        self.selects = []
+        self.rpcs = []
+        # Number of values of each in_() filter
+        self.in_sizes = []
+        # RPC name -> callable(client) returning rows (no entry: function not deployed)
+        self.functions = {}
+        # Tables whose queries fail
+        self.failing_tables = set()
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        self.storage = SimpleNamespace(from_=lambda bucket: _MemoryBucket(self, bucket))
+    
+    @contextmanager
+    def blocking_call(self):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            if self.delay:
+                time.sleep(self.delay)
+            yield
+        finally:
+            with self._lock:
+                self.active -= 1
+    
+    def table(self, name):
+        return _MemoryQuery(self, name)
+    
+    def rpc(self, fn, params=None):
+        return _MemoryRpc(self, fn)
+
+
+@pytest.fixture
+def fake_provider():
+    """_FakeProvider subclass with its instance and call counters starting at 0."""
+    return type("FakeProvider", (_FakeProvider,), {"instances": 0, "calls": 0})
+
+
+@pytest.fixture
+def memory_client(monkeypatch):
+    """A fresh _MemoryClient installed as the Supabase client of the services."""
+    from database import connection
+    client = _MemoryClient()
+    monkeypatch.setattr(connection, "_supabase_client", client)
+    return client
+
+
+@pytest.fixture
+def analysis_session():
+    """Factory for in-memory interviewer session services: analysis_session(data)."""
+    return _FakeAnalysisSession
@@ -0,0 +1,96 @@
+"""
+Tests for the AI response cache.
+"""
+
+import pytest
+
+
+class TestAIResponseCache:
+    """Test the content-addressed AI response cache."""
+    
+    def _request(self, cv_text="CV text", temperature=0.7):
+        from services.ai import AIRequest, PromptType
+        return AIRequest(
+            prompt_type=PromptType.INTERVIEWER_ANALYSIS,
+            template="Analyse {cv_text}",
+            variables={"cv_text": cv_text},
+            temperature=temperature
+        )
+    
+    def _make_manager(self, monkeypatch, fake_provider, cache):
+        from services.ai import manager as manager_module
+        
+        monkeypatch.setattr(manager_module, "get_ai_response_cache", lambda: cache)
+        manager = manager_module.AIManager()
+        manager.providers = {"openai": fake_provider("test-key", {"model": "gpt-4o-mini"})}
+        manager._db_fallback_chain = [{"provider": "openai", "model": None, "order": 1}]
+        return manager
+    
+    def test_key_depends_on_prompt_model_and_params(self):
+        """Test the cache key changes with prompt, model and temperature."""
+        from services.ai.response_cache import AIResponseCache
+        
+        request = self._request()
+        key = AIResponseCache.make_key(request, "prompt", "openai", "gpt-4o-mini")
+        
+        assert key == AIResponseCache.make_key(self._request(), "prompt", "openai", "gpt-4o-mini")
+        assert key != AIResponseCache.make_key(request, "other prompt", "openai", "gpt-4o-mini")
+        assert key != AIResponseCache.make_key(request, "prompt", "openai", "gpt-4o")
+        assert key != AIResponseCache.make_key(self._request(temperature=0.2), "prompt", "openai", "gpt-4o-mini")
+    
+    @pytest.mark.asyncio
+    async def test_repeated_request_served_from_cache(self, monkeypatch, fake_provider):
+        """Test identical requests hit the cache and report zero cost."""
+        from services.ai.response_cache import AIResponseCache
+        
+        cache = AIResponseCache(persistent=False)
+        manager = self._make_manager(monkeypatch, fake_provider, cache)
+        
+        first = await manager.execute(self._request())
+        second = await manager.execute(self._request())
+        different = await manager.execute(self._request(cv_text="Another CV"))
+        
+        assert fake_provider.calls == 2
+        assert not first.cache_hit and first.cost_usd == 0.01
+        assert second.cache_hit
+        assert second.raw_text == "ok"
+        assert second.cost_usd == 0.0 and second.input_tokens == 0
+        assert not different.cache_hit
+    
+    @pytest.mark.asyncio
+    async def test_bypass_and_purge(self, monkeypatch, fake_provider):
+        """Test disabled cache always calls the provider and purge empties it."""
+        from services.ai.response_cache import AIResponseCache
+        
+        cache = AIResponseCache(persistent=False)
+        manager = self._make_manager(monkeypatch, fake_provider, cache)
+        await manager.execute(self._request())
+        
+        cache.enabled = False
+        response = await manager.execute(self._request())
+        assert not response.cache_hit
+        assert fake_provider.calls == 2
+        
+        cache.enabled = True
+        removed = await cache.purge()
+        assert removed["memory"] == 1
+        response = await manager.execute(self._request())
+        assert not response.cache_hit
+    
+    @pytest.mark.asyncio
+    async def test_memory_tier_is_lru_bounded(self):
+        """Test the memory tier evicts least recently used entries."""
+        from services.ai import AIResponse
+        from services.ai.response_cache import AIResponseCache
+        
+        cache = AIResponseCache(max_memory_entries=2, persistent=False)
+        request = self._request()
+        response = AIResponse(success=True, raw_text="ok", provider="openai")
+        for key in ("a", "b"):
+            await cache.set(key, request, response)
+        assert await cache.get("a") is not None  # "a" becomes most recent
+        await cache.set("c", request, response)
+        
+        assert await cache.get("b") is None
+        assert await cache.get("a") is not None
+        assert await cache.get("c") is not None
@@ -0,0 +1,143 @@
+"""
+Tests for the admin dashboard statistics aggregates.
+"""
+
+import pytest
+
+
+def _migration_function(migration, name, table, columns):
+    """Run the SQL body of a migration's function over an in-memory table with SQLite."""
+    import re
+    import sqlite3
+    from pathlib import Path
+    path = Path(__file__).resolve().parents[2] / "src" / "backend" / "database" / "migrations" / migration
+    body = re.search(
+        rf"CREATE OR REPLACE FUNCTION {name}\(\).*?AS \$\$(.*?)\$\$", path.read_text(), re.DOTALL
+    ).group(1)
+    
+    def run(client):
+        db = sqlite3.connect(":memory:")
+        db.row_factory = sqlite3.Row
+        db.execute(f"CREATE TABLE {table} ({', '.join(columns)})")
+        db.executemany(
+            f"INSERT INTO {table} VALUES ({', '.join('?' for _ in columns)})",
+            [[row.get(column) for column in columns] for row in client.tables.get(table, [])],
+        )
+        return [dict(row) for row in db.execute(body)]
+    return run
+
+
+class TestAnalysisStatsAggregates:
+    """Test admin statistics grouped in the database (migration 016) instead of row scans."""
+    
+    _COLUMNS = ["provider", "model", "language", "total_cost", "input_cost", "output_cost", "input_tokens", "output_tokens"]
+    
+    def _fill(self, client):
+        rows = [
+            ("gemini", "gemini-2.0-flash", "en", 0.002, None, None, 1000, 500),
+            ("gemini", "gemini-2.0-flash", "en", 0, 0.001, 0.0005, None, None),
+            ("gemini", "gemini-2.0-flash", "pt", None, None, None, 2000, 1000),
+            ("gemini", "gemini-2.0-flash", "pt", None, None, None, 4000, 3000),
+            ("openai", "gpt-4o-mini", "en", None, None, None, 10000, 2000),
+            ("openai", None, "fr", None, None, None, None, None),
+            ("kimi", "kimi-k2", "en", None, None, None, 300, 100),
+            ("kimi", "kimi-k2", "en", None, None, None, 0, 0),
+            ("error", None, "en", None, None, None, 10, 10),
+        ]
+        client.tables["analyses"] = [dict(zip(self._COLUMNS, row)) for row in rows]
+    
+    def _deploy(self, client):
+        client.functions = {
+            name: _migration_function("016_analysis_stats_aggregates.sql", name, "analyses", self._COLUMNS)
+            for name in ("analysis_provider_stats", "analysis_language_counts")
+        }
+    
+    @staticmethod
+    def _by_group(stats):
+        return {(row["provider"], row["model"]): row for row in stats}
+    
+    @pytest.mark.asyncio
+    async def test_rpc_aggregates_match_row_scan(self, memory_client):
+        """Test the SQL functions return the same groups as the fallback that reads every row."""
+        from services.database.analysis_service import AnalysisService
+        
+        self._fill(memory_client)
+        service = AnalysisService()
+        scanned = self._by_group(await service.get_provider_stats())
+        scanned_languages = await service.count_by_language()
+        
+        self._deploy(memory_client)
+        memory_client.selects.clear()
+        service = AnalysisService()
+        grouped = self._by_group(await service.get_provider_stats())
+        assert await service.count_by_language() == scanned_languages == {"en": 6, "pt": 2, "fr": 1}
+        assert await service.count_by_provider() == {"gemini": 4, "openai": 2, "kimi": 2, "error": 1}
+        assert memory_client.selects == []
+        
+        assert grouped.keys() == scanned.keys()
+        for key, row in grouped.items():
+            assert row["persisted_cost"] == pytest.approx(scanned[key]["persisted_cost"])
+            for field in ("calls", "token_calls", "input_tokens", "output_tokens"):
+                assert row[field] == scanned[key][field]
+        assert grouped[("gemini", "gemini-2.0-flash")]["persisted_cost"] == pytest.approx(0.0035)
+        assert grouped[("gemini", "gemini-2.0-flash")]["token_calls"] == 2
+        assert grouped[("gemini", "gemini-2.0-flash")]["input_tokens"] == 6000
+    
+    @pytest.mark.asyncio
+    async def test_dashboard_costs_match_per_row_calculation(self, monkeypatch, memory_client):
+        """Test detailed-stats prices token-only analyses per group with the same totals as per row."""
+        import json
+        from routers.admin import get_detailed_stats
+        from services.database import (
+            analysis_service, candidate_service, company_service, cv_service,
+            interviewer_service, job_posting_service,
+        )
+        from utils import cost_calculator
+        from utils.cost_calculator import calculate_cost_from_tokens
+        client = memory_client
+        self._fill(client)
+        self._deploy(client)
+        client.tables["ai_model_pricing"] = [{
+            "provider": "kimi", "model_name": "kimi-k2", "is_active": True, "last_updated_at": "2026-10-01",
+            "pricing_type": "per_request", "per_request_price": 0.004,
+            "input_price_per_1m": 0, "output_price_per_1m": 0,
+        }]
+        for module, name in [
+            (analysis_service, "_analysis_service"), (candidate_service, "_candidate_service"),
+            (company_service, "_company_service"), (cv_service, "_cv_service"),
+            (interviewer_service, "_interviewer_service"), (job_posting_service, "_job_posting_service"),
+        ]:
+            monkeypatch.setattr(module, name, None)
+        
+        expected = {}
+        for row in client.tables["analyses"]:
+            cost = row["total_cost"] or ((row["input_cost"] or 0) + (row["output_cost"] or 0))
+            if not cost and row["input_tokens"] is not None:
+                cost = (await calculate_cost_from_tokens(
+                    row["provider"], row["model"], row["input_tokens"], row["output_tokens"]
+                ))["total_cost"]
+            expected[row["provider"]] = expected.get(row["provider"], 0.0) + cost
+        
+        priced = []
+        
+        async def recording_calculator(provider, model, input_tokens, output_tokens, calls=1):
+            priced.append((provider, input_tokens, output_tokens, calls))
+            return await calculate_cost_from_tokens(provider, model, input_tokens, output_tokens, calls)
+        
+        monkeypatch.setattr(cost_calculator, "calculate_cost_from_tokens", recording_calculator)
+        client.selects.clear()
+        response = json.loads((await get_detailed_stats(admin=None)).body)
+        
+        # Groups are priced from their integer token sums, not averages
+        assert all(isinstance(value, int) for _, *tokens, _ in priced for value in tokens)
+        assert ("gemini", 6000) in [(provider, input_tokens) for provider, input_tokens, _, _ in priced]
+        
+        # Rows are only counted (count_all, count_recent); pricing is read once per group with token-only analyses
+        assert client.selects.count("analyses") == 2
+        assert client.selects.count("ai_model_pricing") == 3
+        assert sorted(client.rpcs) == ["analysis_language_counts", "analysis_provider_stats"]
+        assert response["providers"]["gemini"] == {"calls": 4, "cost": round(expected["gemini"], 6)}
+        assert response["providers"]["openai"] == {"calls": 2, "cost": round(expected["openai"], 6)}
+        assert response["providers"]["kimi"] == {"calls": 2, "cost": 0.008}
+        assert response["providers"]["claude"] == {"calls": 0, "cost": 0.0}
+        assert response["languages"] == {"en": 6, "pt": 2, "fr": 1}
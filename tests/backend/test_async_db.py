@@ -0,0 +1,98 @@
+"""
+Tests for running Supabase calls off the event loop.
+"""
+
+import pytest
+
+
+class TestAsyncDatabaseClient:
+    """Test that database queries run off the event loop and overlap."""
+    
+    @pytest.mark.asyncio
+    async def test_parallel_queries_overlap(self, memory_client):
+        """Test concurrent queries take about one query's latency and the loop keeps running."""
+        import asyncio
+        import time
+        from database.async_client import AsyncSupabaseClient
+        memory_client.delay = 0.1
+        memory_client.tables["cvs"] = [{"id": i} for i in range(8)]
+        memory_client.failing_tables.add("broken")
+        client = AsyncSupabaseClient(memory_client)
+        ticks = 0
+        
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+        
+        ticker_task = asyncio.create_task(ticker())
+        started = time.perf_counter()
+        results = await asyncio.gather(*(
+            client.table("cvs").select("*").eq("id", i).execute() for i in range(8)
+        ))
+        elapsed = time.perf_counter() - started
+        ticker_task.cancel()
+        
+        assert [result.data[0]["id"] for result in results] == list(range(8))
+        assert elapsed < 0.4  # 0.8s if the queries were serialized
+        assert memory_client.max_active > 1
+        assert ticks >= 5
+        
+        with pytest.raises(RuntimeError):
+            await client.table("broken").select("*").execute()
+    
+    @pytest.mark.asyncio
+    async def test_services_use_async_client(self, monkeypatch, memory_client):
+        """Test parallel service calls overlap and queries keep their service/table metrics labels."""
+        import asyncio
+        import time
+        from database import connection
+        from database.instrumentation import InstrumentedClient
+        from services.database.candidate_service import CandidateService
+        from services.metrics.collectors import DB_QUERY_DURATION
+        memory_client.delay = 0.1
+        memory_client.tables["candidates"] = [{"id": i, "email": f"user{i}@example.com"} for i in range(6)]
+        monkeypatch.setattr(connection, "_supabase_client", InstrumentedClient(memory_client))
+        service = CandidateService()
+        before = DB_QUERY_DURATION.snapshot("candidate_service", "candidates", "select")[0]
+        
+        started = time.perf_counter()
+        found = await asyncio.gather(*(service.find_by_email(f"user{i}@example.com") for i in range(6)))
+        elapsed = time.perf_counter() - started
+        
+        assert [row["email"] for row in found] == [f"user{i}@example.com" for i in range(6)]
+        assert elapsed < 0.35  # 0.6s if the queries were serialized
+        assert DB_QUERY_DURATION.snapshot("candidate_service", "candidates", "select")[0] == before + 6
+
+
+class TestAdminAuthCalls:
+    """Test that Supabase Auth admin calls run off the event loop."""
+    
+    @pytest.mark.asyncio
+    async def test_list_users_does_not_block_event_loop(self, memory_client):
+        """Test two admin user listings run at the same time."""
+        import asyncio
+        import json
+        import time
+        from types import SimpleNamespace
+        from routers import admin
+        
+        def list_users():
+            time.sleep(0.2)
+            return [SimpleNamespace(
+                id="u1", email="a@example.com", user_metadata={"role": "admin"},
+                banned_until=None, created_at=None, last_sign_in_at=None,
+            )]
+        
+        memory_client.auth = SimpleNamespace(admin=SimpleNamespace(list_users=list_users))
+        
+        started = time.perf_counter()
+        responses = await asyncio.gather(
+            admin.list_admin_users(admin={"id": "u0"}),
+            admin.list_admin_users(admin={"id": "u0"}),
+        )
+        elapsed = time.perf_counter() - started
+        
+        assert [json.loads(response.body)["total"] for response in responses] == [1, 1]
+        assert elapsed < 0.35  # 0.4s if the calls blocked the loop
@@ -0,0 +1,81 @@
+"""
+Tests for batched candidate and enrichment lookups.
+"""
+
+import pytest
+
+
+class TestBatchedResultLookups:
+    """Test step 7 loads candidates and enrichments with one query each."""
+    
+    @pytest.mark.asyncio
+    async def test_latest_enrichment_per_candidate(self, memory_client):
+        """Test get_latest_many keeps the newest valid enrichment of each candidate."""
+        from datetime import datetime, timedelta
+        from services.database.enrichment_service import CandidateEnrichmentService
+        recent = (datetime.now() - timedelta(days=1)).isoformat()
+        older = (datetime.now() - timedelta(days=2)).isoformat()
+        client = memory_client
+        client.tables["candidate_enrichments"] = [
+            {"candidate_id": "c1", "is_valid": True, "enriched_at": older, "ai_summary": "old"},
+            {"candidate_id": "c1", "is_valid": True, "enriched_at": recent, "ai_summary": "new"},
+            {"candidate_id": "c2", "is_valid": False, "enriched_at": recent, "ai_summary": "invalid"},
+        ]
+        
+        latest = await CandidateEnrichmentService().get_latest_many(["c1", "c2", "c3", "c1"])
+        
+        assert {key: row["ai_summary"] for key, row in latest.items()} == {"c1": "new"}
+        assert client.selects == ["candidate_enrichments"]
+    
+    @pytest.mark.asyncio
+    async def test_large_id_lists_are_chunked(self, memory_client):
+        """Test get_by_ids and get_latest_many split more than MAX_IDS_PER_QUERY ids over several queries."""
+        from datetime import datetime
+        from database.loader import MAX_IDS_PER_QUERY
+        from services.database.candidate_service import CandidateService
+        from services.database.enrichment_service import CandidateEnrichmentService
+        ids = [f"c{i}" for i in range(MAX_IDS_PER_QUERY * 2 + 5)]
+        now = datetime.now().isoformat()
+        client = memory_client
+        client.tables["candidates"] = [{"id": candidate_id} for candidate_id in ids]
+        client.tables["candidate_enrichments"] = [
+            {"candidate_id": candidate_id, "is_valid": True, "enriched_at": now} for candidate_id in ids
+        ]
+        
+        candidates = await CandidateService().get_by_ids(ids)
+        enrichments = await CandidateEnrichmentService().get_latest_many(ids)
+        
+        assert set(candidates) == set(enrichments) == set(ids)
+        assert client.in_sizes == [MAX_IDS_PER_QUERY, MAX_IDS_PER_QUERY, 5] * 2
+        assert client.selects == ["candidates"] * 3 + ["candidate_enrichments"] * 3
+    
+    @pytest.mark.asyncio
+    async def test_step7_fetches_enrichments_in_one_query(self, monkeypatch, memory_client, analysis_session):
+        """Test step 7 attaches stored enrichments with a single query and keeps step 6 enrichment."""
+        import json
+        import uuid
+        from datetime import datetime
+        import services.database as database_services
+        from routers import interviewer
+        
+        candidate_ids = [str(uuid.uuid4()) for _ in range(3)]
+        client = memory_client
+        client.tables["candidate_enrichments"] = [
+            {"candidate_id": candidate_id, "is_valid": True, "enriched_at": datetime.now().isoformat(),
+             "candidate_name": f"Stored {i}"}
+            for i, candidate_id in enumerate(candidate_ids)
+        ]
+        results = [
+            {"candidate_id": candidate_ids[0], "global_score": 60},
+            {"candidate_id": candidate_ids[1], "global_score": 90},
+            {"candidate_id": candidate_ids[2], "global_score": 75, "enrichment": {"candidate": {"name": "From step 6"}}},
+        ]
+        session_service = analysis_session({"analysis_complete": True, "analysis_results": results})
+        monkeypatch.setattr(database_services, "get_session_service", lambda: session_service)
+        
+        response = await interviewer.step7_results(uuid.uuid4(), report_code=None)
+        body = json.loads(response.body)
+        
+        assert [r["global_score"] for r in body["results"]] == [90, 75, 60]
+        assert [r["enrichment"]["candidate"]["name"] for r in body["results"]] == ["Stored 1", "From step 6", "Stored 0"]
+        assert client.selects == ["candidate_enrichments"]
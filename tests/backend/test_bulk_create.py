@@ -0,0 +1,80 @@
+"""
+Tests for bulk create_many inserts.
+"""
+
+import pytest
+
+
+class TestBulkCreate:
+    """Test multi-row create_many inserts with per-row results."""
+    
+    @pytest.mark.asyncio
+    async def test_candidates_created_with_one_insert(self, monkeypatch, memory_client):
+        """Test create_many sends one request per batch and returns rows in order."""
+        from config import settings
+        from services.database.candidate_service import CandidateService
+        client = memory_client
+        monkeypatch.setattr(settings, "db_bulk_insert_batch_size", 3)
+        
+        results = await CandidateService().create_many([
+            {"email": f"User{i}@Example.com", "name": f"User {i}"} for i in range(5)
+        ])
+        
+        assert client.requests == [3, 2]
+        assert all(result.ok for result in results)
+        assert [result.data["email"] for result in results] == [f"user{i}@example.com" for i in range(5)]
+        assert len({result.data["id"] for result in results}) == 5
+    
+    @pytest.mark.asyncio
+    async def test_rejected_batch_reports_errors_per_row(self, memory_client):
+        """Test a rejected batch is retried row by row so only the bad rows fail."""
+        from services.database.candidate_service import CandidateService
+        client = memory_client
+        
+        results = await CandidateService().create_many([
+            {"email": "a@example.com", "name": "A"},
+            {"email": "bad@example.com", "name": "B"},
+            {"email": "c@example.com", "name": "C"},
+        ])
+        
+        assert [result.ok for result in results] == [True, False, True]
+        assert "check constraint" in results[1].error
+        assert [row["email"] for row in client.tables["candidates"]] == ["a@example.com", "c@example.com"]
+    
+    @pytest.mark.asyncio
+    async def test_cv_versions_assigned_in_one_query(self, memory_client):
+        """Test CV create_many continues each candidate's versions, including several CVs per candidate."""
+        from services.database.cv_service import CVService
+        client = memory_client
+        client.tables["cvs"] = [{"id": "old", "candidate_id": "c1", "version": 2}]
+        
+        results = await CVService().create_many([
+            {"candidate_id": "c1", "file_url": "a.pdf", "uploaded_by_flow": "interviewer"},
+            {"candidate_id": "c2", "file_url": "b.pdf", "uploaded_by_flow": "interviewer"},
+            {"candidate_id": "c1", "file_url": "c.pdf", "uploaded_by_flow": "interviewer"},
+        ])
+        
+        assert client.requests == [3]
+        assert [(r.data["candidate_id"], r.data["version"]) for r in results] == [("c1", 3), ("c2", 1), ("c1", 4)]
+    
+    @pytest.mark.asyncio
+    async def test_cv_version_lookup_chunked_and_failure_creates_nothing(self, memory_client):
+        """Test version lookups are split by MAX_IDS_PER_QUERY and a failed lookup fails every row."""
+        from database.loader import MAX_IDS_PER_QUERY
+        from services.database.cv_service import CVService
+        client = memory_client
+        cvs = [
+            {"candidate_id": f"c{i}", "file_url": f"{i}.pdf", "uploaded_by_flow": "interviewer"}
+            for i in range(MAX_IDS_PER_QUERY + 1)
+        ]
+        
+        results = await CVService().create_many(cvs)
+        assert all(result.ok for result in results)
+        assert client.in_sizes == [MAX_IDS_PER_QUERY, 1]
+        
+        client.tables["cvs"] = []
+        client.failing_tables.add("cvs")
+        results = await CVService().create_many(cvs[:2])
+        assert [result.ok for result in results] == [False, False]
+        assert "Could not determine CV version" in results[0].error
+        assert client.tables["cvs"] == []
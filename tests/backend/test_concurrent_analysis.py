@@ -0,0 +1,247 @@
+"""
+Tests for concurrent step 5 ingestion and step 6 analysis.
+"""
+
+import pytest
+
+
+class _FakeRecordService:
+    """Async get_by_id/create stand-in returning canned records."""
+    
+    def __init__(self, records=None):
+        self.records = records or {}
+        self.created = []
+    
+    async def get_by_id(self, record_id):
+        return self.records.get(str(record_id))
+    
+    async def create(self, **kwargs):
+        record = {"id": f"analysis-{len(self.created) + 1}", **kwargs}
+        self.created.append(record)
+        return record
+    
+    async def create_many(self, rows):
+        from services.database import BulkRowResult
+        self.bulk_calls = getattr(self, "bulk_calls", 0) + 1
+        return [BulkRowResult(data=await self.create(**row)) for row in rows]
+
+
+class _FakeInterviewerAI:
+    """Analysis service whose per-CV latency is controlled by the CV text."""
+    
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.recommendation_inputs = None
+    
+    async def analyze_candidate_for_interviewer(self, job_md, cv_md, *args, **kwargs):
+        import asyncio
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(float(cv_md.strip().split()[-1]))
+        finally:
+            self.in_flight -= 1
+        return {
+            "data": {"categories": {"technical": 4}, "strengths": ["x"]},
+            "provider": "openai",
+            "model": "gpt-4o-mini",
+            "input_tokens": 10,
+            "output_tokens": 5,
+        }
+    
+    async def generate_executive_recommendation(self, candidates_data, **kwargs):
+        self.recommendation_inputs = [c["candidate_id"] for c in candidates_data]
+        return {"top_recommendation": candidates_data[0]["candidate_id"]}
+
+
+class _FakePromptRegistry:
+    """Prompt registry stand-in counting lookups."""
+    
+    def __init__(self, prompt_id):
+        self.prompt_id = prompt_id
+        self.lookups = []
+    
+    async def get(self, prompt_key, language="en"):
+        self.lookups.append((prompt_key, language))
+        return {"id": self.prompt_id, "prompt_key": prompt_key, "language": language}
+
+
+class TestConcurrentAnalysis:
+    """Test bounded concurrency for step 6 analysis and per-provider limits."""
+    
+    def test_parse_concurrency_limits(self):
+        """Test the per-provider concurrency setting format."""
+        from services.ai.manager import parse_concurrency_limits
+        
+        assert parse_concurrency_limits("gemini=4, openai=8,default=2") == {
+            "gemini": 4, "openai": 8, "default": 2
+        }
+        assert parse_concurrency_limits("") == {}
+        assert parse_concurrency_limits("gemini=x,claude=0") == {}
+    
+    @pytest.mark.asyncio
+    async def test_provider_limit_caps_in_flight_requests(self, monkeypatch, fake_provider):
+        """Test AIManager never exceeds the configured per-provider concurrency."""
+        import asyncio
+        from services.ai import manager as manager_module
+        from services.ai import AIRequest, AIResponse, PromptType
+        from services.ai.response_cache import AIResponseCache
+        
+        monkeypatch.setattr(manager_module, "get_ai_response_cache", lambda: AIResponseCache(enabled=False))
+        monkeypatch.setattr(manager_module.settings, "ai_provider_max_concurrency", "openai=2")
+        
+        state = {"in_flight": 0, "max": 0}
+        
+        class _SlowProvider(fake_provider):
+            async def complete(self, request):
+                state["in_flight"] += 1
+                state["max"] = max(state["max"], state["in_flight"])
+                await asyncio.sleep(0.02)
+                state["in_flight"] -= 1
+                return AIResponse(success=True, raw_text="ok", provider="openai")
+        
+        manager = manager_module.AIManager()
+        manager.providers = {"openai": _SlowProvider("test-key")}
+        request = AIRequest(prompt_type=PromptType.TRANSLATION, template="hi", variables={})
+        
+        responses = await asyncio.gather(*(
+            manager.execute(request, provider_name="openai") for _ in range(6)
+        ))
+        
+        assert all(r.success for r in responses)
+        assert state["max"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_background_analysis_runs_concurrently_and_keeps_order(self, monkeypatch, analysis_session):
+        """Test CVs are analysed in parallel, published as they finish, and returned in cv_ids order."""
+        import uuid
+        from routers import interviewer
+        from services.ai import prompt_registry
+        
+        monkeypatch.setattr(interviewer.settings, "analysis_max_concurrency", 3)
+        registry = _FakePromptRegistry(str(uuid.uuid4()))
+        monkeypatch.setattr(prompt_registry, "get_prompt_registry", lambda: registry)
+        
+        job_id = str(uuid.uuid4())
+        # Earlier CVs are slower, so they finish last
+        delays = [0.08, 0.06, 0.04, 0.02, 0.01]
+        cv_ids = [str(uuid.uuid4()) for _ in delays]
+        candidate_ids = [str(uuid.uuid4()) for _ in delays]
+        cvs = {
+            cv_id: {"id": cv_id, "candidate_id": cand_id, "extracted_text": f"Experience {delay}"}
+            for cv_id, cand_id, delay in zip(cv_ids, candidate_ids, delays)
+        }
+        
+        session_service = analysis_session({
+            "job_posting_id": job_id,
+            "cv_ids": cv_ids,
+            "candidates_info": [],
+            "weights": {"technical": 1},
+        })
+        analysis_service = _FakeRecordService()
+        ai_service = _FakeInterviewerAI()
+        
+        await interviewer._run_analysis_background(
+            uuid.uuid4(),
+            session_service,
+            _FakeRecordService({job_id: {"id": job_id, "raw_text": "Senior engineer"}}),
+            _FakeRecordService(cvs),
+            analysis_service,
+            ai_service,
+            _FakeRecordService(),
+            _FakeRecordService(),
+        )
+        
+        data = session_service.session["data"]
+        assert data["analysis_complete"] is True
+        assert [r["candidate_id"] for r in data["analysis_results"]] == candidate_ids
+        assert ai_service.recommendation_inputs == candidate_ids
+        assert data["analysis_progress"]["current"] == len(cv_ids)
+        assert 1 < ai_service.max_in_flight <= 3
+        assert len(analysis_service.created) == len(cv_ids)
+        # Analysis records were written with one bulk insert, and their ids filled in
+        assert analysis_service.bulk_calls == 1
+        assert all(r["analysis_id"] for r in data["analysis_results"])
+        # The prompt id was resolved once for the whole job
+        assert registry.lookups == [("interviewer_analysis", "en")]
+        assert {str(r["prompt_id"]) for r in analysis_service.created} == {registry.prompt_id}
+        # Partial results were published as each CV finished, fastest first
+        assert session_service.snapshots[0] == [candidate_ids[2]]
+    
+    @pytest.mark.asyncio
+    async def test_cv_upload_pipeline_overlaps_files_and_keeps_order(self, monkeypatch, analysis_session):
+        """Test step 5 ingestion processes files concurrently with per-file errors and ordered results."""
+        import asyncio
+        import uuid
+        from routers import interviewer
+        
+        monkeypatch.setattr(interviewer.settings, "upload_max_concurrency", 3)
+        monkeypatch.setattr(interviewer.settings, "ai_summary_batch_size", 2)
+        
+        state = {"in_flight": 0, "max": 0, "batches": [], "candidate_batches": [], "cv_batches": []}
+        
+        class _Candidates:
+            async def create(self, email, name, consent_given):
+                return {"id": str(uuid.uuid4()), "name": name}
+            
+            async def create_many(self, candidates):
+                from services.database import BulkRowResult
+                state["candidate_batches"].append(len(candidates))
+                return [BulkRowResult(data=await self.create(**c)) for c in candidates]
+        
+        class _Storage:
+            async def upload_cv(self, content, filename, candidate_id):
+                if filename.startswith("broken"):
+                    return False, None, "Storage unavailable"
+                return True, f"cvs/{candidate_id}/{filename}", None
+        
+        class _CVs:
+            async def create(self, candidate_id, file_url, uploaded_by_flow, extracted_text):
+                return {"id": str(uuid.uuid4()), "candidate_id": str(candidate_id)}
+            
+            async def create_many(self, cvs):
+                from services.database import BulkRowResult
+                state["cv_batches"].append(len(cvs))
+                return [BulkRowResult(data=await self.create(**cv)) for cv in cvs]
+        
+        class _Summaries:
+            async def summarize_cvs(self, cvs, language):
+                state["in_flight"] += 1
+                state["max"] = max(state["max"], state["in_flight"])
+                state["batches"].append([filename for _, filename in cvs])
+                # Earlier files are slower
+                await asyncio.sleep(max(float(text.split()[-1]) for text, _ in cvs))
+                state["in_flight"] -= 1
+                return [{"full_name": filename} for _, filename in cvs]
+        
+        delays = [0.06, 0.04, 0.02, 0.01]
+        files_data = [
+            {"filename": f"cv{i}.txt", "content": f"Experience {delay}".encode()}
+            for i, delay in enumerate(delays)
+        ]
+        files_data.insert(1, {"filename": "virus.exe", "content": b"MZ"})
+        files_data.append({"filename": "broken.txt", "content": b"Experience 0.01"})
+        
+        session_service = analysis_session({"language": "en"})
+        await interviewer._run_cv_upload_background(
+            uuid.uuid4(), files_data, session_service, _CVs(), _Candidates(), _Storage(), _Summaries()
+        )
+        
+        data = session_service.session["data"]
+        assert data["upload_status"] == "complete"
+        assert [c["filename"] for c in data["candidates_info"]] == ["cv0.txt", "cv1.txt", "cv2.txt", "cv3.txt"]
+        assert data["cv_count"] == 4
+        assert len(data["upload_errors"]) == 2
+        assert data["upload_errors"][0].startswith("virus.exe:")
+        assert data["upload_errors"][1] == "broken.txt: Storage unavailable"
+        assert data["upload_progress"]["current"] == len(files_data)
+        assert data["upload_summary"]["failed"] == 2
+        # Stored CVs were summarized two per request, with batches overlapping
+        assert sorted(len(batch) for batch in state["batches"]) == [2, 2]
+        assert [c["summary"] for c in data["candidates_info"]] == [{"full_name": f"cv{i}.txt"} for i in range(4)]
+        assert state["max"] > 1
+        # Candidates of the valid files and the stored CVs were each created with one bulk insert
+        assert state["candidate_batches"] == [5]
+        assert state["cv_batches"] == [4]
+        assert all(c["cv_id"] for c in data["candidates_info"])
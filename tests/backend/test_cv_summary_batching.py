@@ -0,0 +1,74 @@
+"""
+Tests for batched CV summaries.
+"""
+
+import pytest
+
+
+class TestBatchedCVSummaries:
+    """Test packing several CVs into one summary request."""
+    
+    def _service(self, monkeypatch, respond):
+        from services import ai_analysis
+        from services.ai import prompts
+        
+        async def _get_prompt(prompt_type, language="en"):
+            return prompts.get_prompt_sync(prompt_type)
+        
+        monkeypatch.setattr(ai_analysis, "get_prompt", _get_prompt)
+        monkeypatch.setattr(ai_analysis.settings, "ai_summary_batch_size", 3)
+        
+        requests = []
+        
+        class _Manager:
+            async def execute(self, request):
+                requests.append(request)
+                return respond(request)
+        
+        service = ai_analysis.AIAnalysisService.__new__(ai_analysis.AIAnalysisService)
+        service.ai_manager = _Manager()
+        return service, requests
+    
+    @pytest.mark.asyncio
+    async def test_summaries_mapped_by_index_with_per_cv_fallback(self, monkeypatch):
+        """Test batch results map back by index and missing entries are summarized individually."""
+        from services.ai import AIResponse, PromptType
+        
+        def _respond(request):
+            if "cvs" not in request.variables:
+                # Per-CV fallback call
+                return AIResponse(success=True, provider="openai", data={"full_name": request.variables["file_name"]})
+            # Batch answers out of order, skips its second CV and adds a bogus index
+            count = request.variables["cv_count"]
+            entries = [{"index": i, "full_name": f"batch-{i}"} for i in range(count, 0, -1) if i != 2]
+            return AIResponse(success=True, provider="openai", data={"summaries": entries + [{"index": 99}]})
+        
+        service, requests = self._service(monkeypatch, _respond)
+        cvs = [(f"CV text {i}", f"cv{i}.pdf") for i in range(5)] + [("", "empty.pdf")]
+        
+        summaries = await service.summarize_cvs(cvs)
+        
+        batch_requests = [r for r in requests if "cvs" in r.variables]
+        assert [r.variables["cv_count"] for r in batch_requests] == [3, 2]
+        assert all(r.prompt_type == PromptType.CV_SUMMARY for r in requests)
+        assert summaries == [
+            {"full_name": "batch-1"}, {"full_name": "cv1.pdf"}, {"full_name": "batch-3"},
+            {"full_name": "batch-1"}, {"full_name": "cv4.pdf"}, None,
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_unparseable_batch_falls_back_to_single_calls(self, monkeypatch):
+        """Test a batch response without a summaries list re-summarizes every CV."""
+        from services.ai import AIResponse
+        
+        def _respond(request):
+            if "cvs" in request.variables:
+                return AIResponse(success=True, provider="openai", raw_text="not json")
+            return AIResponse(success=True, provider="openai", data={"full_name": request.variables["file_name"]})
+        
+        service, requests = self._service(monkeypatch, _respond)
+        
+        summaries = await service.summarize_cvs([("a", "a.pdf"), ("b", "b.pdf")])
+        
+        assert summaries == [{"full_name": "a.pdf"}, {"full_name": "b.pdf"}]
+        assert len(requests) == 3
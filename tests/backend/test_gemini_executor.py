@@ -0,0 +1,51 @@
+"""
+Tests for running Gemini calls off the event loop.
+"""
+
+import pytest
+
+
+class _SlowGeminiModel:
+    """Fake Gemini model whose blocking generate_content takes a while."""
+    
+    def __init__(self, delay_seconds):
+        self.delay_seconds = delay_seconds
+    
+    def generate_content(self, prompt, **kwargs):
+        import time
+        from types import SimpleNamespace
+        time.sleep(self.delay_seconds)
+        return SimpleNamespace(text="done", candidates=[])
+
+
+class TestGeminiNonBlocking:
+    """Test Gemini completions do not block the event loop."""
+    
+    @pytest.mark.asyncio
+    async def test_event_loop_served_during_slow_call(self):
+        """Test other coroutines keep running while a slow Gemini call is in flight."""
+        import asyncio
+        import time
+        from services.ai import GeminiProvider, AIRequest, PromptType
+        
+        provider = GeminiProvider("test-key", {"model": "models/gemini-2.5-flash-lite"})
+        provider.model = _SlowGeminiModel(delay_seconds=0.5)
+        request = AIRequest(prompt_type=PromptType.TRANSLATION, template="hello", variables={})
+        
+        served_at = []
+        
+        async def other_request():
+            # Simulates a progress-polling request arriving during the analysis
+            for _ in range(5):
+                await asyncio.sleep(0.02)
+                served_at.append(time.monotonic())
+        
+        start = time.monotonic()
+        response, _ = await asyncio.gather(provider.complete(request), other_request())
+        gemini_done = start + response.latency_ms / 1000
+        
+        assert response.success
+        assert response.raw_text == "done"
+        assert len(served_at) == 5
+        # All polling requests were served well before the Gemini call finished
+        assert max(served_at) < gemini_done
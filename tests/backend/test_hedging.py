@@ -0,0 +1,107 @@
+"""
+Tests for hedged AI requests.
+"""
+
+import pytest
+
+
+class TestHedgedRequests:
+    """Test opt-in hedging across fallback chain entries."""
+    
+    def _make_manager(self, monkeypatch, fake_provider, primary_delay, secondary_delay):
+        import asyncio
+        from services.ai import manager as manager_module
+        from services.ai import AIResponse
+        from services.ai.health import ProviderHealthTracker
+        from services.ai.response_cache import AIResponseCache
+        
+        tracker = ProviderHealthTracker()
+        monkeypatch.setattr(manager_module, "get_ai_response_cache", lambda: AIResponseCache(enabled=False))
+        monkeypatch.setattr(manager_module, "get_provider_health_tracker", lambda: tracker)
+        monkeypatch.setattr(manager_module.settings, "ai_hedging_enabled", True)
+        monkeypatch.setattr(manager_module.settings, "ai_hedge_default_delay_ms", 50)
+        monkeypatch.setattr(manager_module.settings, "ai_hedge_min_delay_ms", 10)
+        
+        calls = {"claude": 0, "openai": 0}
+        
+        def _provider(name, delay):
+            class _Timed(fake_provider):
+                @property
+                def provider_name(self):
+                    return name
+                
+                async def complete(self, request):
+                    calls[name] += 1
+                    await asyncio.sleep(delay)
+                    return AIResponse(
+                        success=True, raw_text=name, provider=name,
+                        input_tokens=100, output_tokens=10, cost_usd=0.01
+                    )
+            return _Timed("k")
+        
+        manager = manager_module.AIManager()
+        manager.providers = {"claude": _provider("claude", primary_delay), "openai": _provider("openai", secondary_delay)}
+        manager._db_fallback_chain = [
+            {"provider": "claude", "model": None, "order": 1},
+            {"provider": "openai", "model": None, "order": 2},
+        ]
+        
+        logged = []
+        
+        async def _log_usage(request, response):
+            logged.append(response)
+        
+        monkeypatch.setattr(manager, "_log_usage", _log_usage)
+        return manager, calls, logged, tracker
+    
+    def _request(self, prompt_type=None, **kwargs):
+        from services.ai import AIRequest, PromptType
+        return AIRequest(
+            prompt_type=prompt_type or PromptType.CV_SUMMARY,
+            template="summarize",
+            variables={},
+            **kwargs
+        )
+    
+    @pytest.mark.asyncio
+    async def test_slow_primary_is_hedged_and_cancelled(self, monkeypatch, fake_provider):
+        """Test the hedge wins when the primary is slow, and both calls are logged."""
+        manager, calls, logged, tracker = self._make_manager(monkeypatch, fake_provider, primary_delay=1.0, secondary_delay=0.01)
+        
+        response = await manager.execute(self._request(hedge=True))
+        
+        assert response.success
+        assert response.provider == "openai"
+        assert response.hedged
+        assert calls == {"claude": 1, "openai": 1}
+        assert sorted((r.provider, r.success) for r in logged) == [("claude", False), ("openai", True)]
+        cancelled = next(r for r in logged if r.provider == "claude")
+        assert cancelled.input_tokens > 0 and cancelled.hedged
+        # Losing a hedge race is not a provider failure
+        assert tracker.stats()["entries"].get("claude/", {}).get("consecutive_failures", 0) == 0
+    
+    @pytest.mark.asyncio
+    async def test_fast_primary_is_not_hedged(self, monkeypatch, fake_provider):
+        """Test no hedge is fired when the primary answers within the delay."""
+        manager, calls, logged, _ = self._make_manager(monkeypatch, fake_provider, primary_delay=0.0, secondary_delay=0.0)
+        
+        response = await manager.execute(self._request(hedge=True))
+        
+        assert response.provider == "claude"
+        assert not response.hedged
+        assert calls == {"claude": 1, "openai": 0}
+    
+    @pytest.mark.asyncio
+    async def test_hedging_disabled_for_expensive_types_and_zero_budget(self, monkeypatch, fake_provider):
+        """Test expensive prompt types and max_hedges=0 never trigger a hedge."""
+        from services.ai import PromptType
+        manager, calls, _, _ = self._make_manager(monkeypatch, fake_provider, primary_delay=0.1, secondary_delay=0.0)
+        
+        response = await manager.execute(self._request(PromptType.INTERVIEWER_ANALYSIS, hedge=True))
+        assert response.provider == "claude"
+        response = await manager.execute(self._request(hedge=True, max_hedges=0))
+        assert response.provider == "claude"
+        response = await manager.execute(self._request())
+        assert response.provider == "claude"
+        
+        assert calls["openai"] == 0
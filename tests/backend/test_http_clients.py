@@ -0,0 +1,44 @@
+"""
+Tests for the shared HTTP client registry.
+"""
+
+import pytest
+
+
+class TestHTTPClientRegistry:
+    """Test the shared HTTP client registry."""
+    
+    @pytest.mark.asyncio
+    async def test_pooled_client_reused_per_host(self):
+        """Test one client is shared per host while the registry is open."""
+        from services.http_client import HTTPClientRegistry
+        
+        registry = HTTPClientRegistry()
+        registry.open()
+        try:
+            async with registry.client("https://api.pdf.co/v1/job/check") as first:
+                pass
+            async with registry.client("https://api.pdf.co/v1/file/upload") as second:
+                pass
+            async with registry.client("https://api.search.brave.com/res/v1") as other:
+                pass
+            
+            assert first is second
+            assert not first.is_closed
+            assert other is not first
+        finally:
+            await registry.close()
+        
+        assert first.is_closed
+        assert other.is_closed
+    
+    @pytest.mark.asyncio
+    async def test_short_lived_client_when_not_open(self):
+        """Test a temporary client is used (and closed) when the registry is not open."""
+        from services.http_client import HTTPClientRegistry
+        
+        registry = HTTPClientRegistry()
+        async with registry.client("https://api.pdf.co/v1") as client:
+            assert not client.is_closed
+        
+        assert client.is_closed
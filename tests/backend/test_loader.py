@@ -0,0 +1,56 @@
+"""
+Tests for the request/job-scoped entity loader.
+"""
+
+import pytest
+
+
+class TestEntityLoader:
+    """Test request/job-scoped batching and memoization of get_by_id lookups."""
+    
+    @pytest.mark.asyncio
+    async def test_lookups_in_one_tick_share_a_query(self, memory_client):
+        """Test concurrent get_by_id calls become one `in` query per table and repeats are memoized."""
+        import asyncio
+        from database import entity_loader_scope
+        from services.database.cv_service import CVService
+        from services.database.job_posting_service import JobPostingService
+        client = memory_client
+        client.tables["cvs"] = [{"id": f"cv{i}", "version": 1} for i in range(3)]
+        client.tables["job_postings"] = [{"id": "job1"}]
+        cv_service, job_service = CVService(), JobPostingService()
+        
+        with entity_loader_scope() as loader:
+            rows = await asyncio.gather(
+                *(cv_service.get_by_id(cv_id) for cv_id in ["cv0", "cv1", "cv0", "missing", "cv2"]),
+                job_service.get_by_id("job1"),
+            )
+            assert [row["id"] if row else None for row in rows] == ["cv0", "cv1", "cv0", None, "cv2", "job1"]
+            assert sorted(client.selects) == ["cvs", "job_postings"]
+            
+            # Memoized for the scope, including missing rows; callers get their own copies
+            rows[0]["version"] = 99
+            assert (await cv_service.get_by_id("cv0"))["version"] == 1
+            assert await cv_service.get_by_id("missing") is None
+            assert len(client.selects) == 2
+            assert loader.stats()["queries"] == 2
+        
+        # Outside a scope every call queries
+        await cv_service.get_by_id("cv0")
+        assert len(client.selects) == 3
+    
+    @pytest.mark.asyncio
+    async def test_updates_forget_memoized_rows(self, memory_client):
+        """Test an update through the service makes the next lookup read the row again."""
+        from database import entity_loader_scope
+        from services.database.job_posting_service import JobPostingService
+        client = memory_client
+        client.tables["job_postings"] = [{"id": "job1", "key_points": "old"}]
+        service = JobPostingService()
+        
+        with entity_loader_scope():
+            assert (await service.get_by_id("job1"))["key_points"] == "old"
+            assert (await service.get_by_id("job1"))["key_points"] == "old"
+            assert await service.update_key_points("job1", "new")
+            assert (await service.get_by_id("job1"))["key_points"] == "new"
+            assert client.selects == ["job_postings", "job_postings"]
@@ -0,0 +1,126 @@
+"""
+Tests for the metrics registry and /api/metrics.
+"""
+
+import pytest
+
+
+class TestMetrics:
+    """Test the metrics registry, its instrumentation and /api/metrics."""
+    
+    @pytest.mark.asyncio
+    async def test_render_prometheus_text_and_token(self, monkeypatch):
+        """Test exposition format for counters, histograms and callback gauges, and the required token."""
+        from fastapi import HTTPException
+        from services.metrics.registry import MetricsRegistry
+        from routers import metrics as metrics_router
+        
+        registry = MetricsRegistry()
+        requests = registry.counter("demo_requests_total", "Requests", ("route",))
+        latency = registry.histogram("demo_latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+        registry.gauge("demo_queue", "Queue", ("queue",), callback=lambda: {("jobs",): 3})
+        requests.inc('a"b', amount=2)
+        latency.observe(0.05, "x")
+        latency.observe(0.5, "x")
+        
+        text = registry.render()
+        assert '# TYPE demo_requests_total counter\ndemo_requests_total{route="a\\"b"} 2' in text
+        assert 'demo_latency_seconds_bucket{route="x",le="0.1"} 1' in text
+        assert 'demo_latency_seconds_bucket{route="x",le="+Inf"} 2' in text
+        assert 'demo_latency_seconds_sum{route="x"} 0.55' in text
+        assert 'demo_queue{queue="jobs"} 3' in text
+        
+        # Not served without a scrape token
+        monkeypatch.setattr(metrics_router.settings, "metrics_token", None)
+        with pytest.raises(HTTPException) as exc:
+            await metrics_router.metrics(authorization=None)
+        assert exc.value.status_code == 404
+        
+        monkeypatch.setattr(metrics_router.settings, "metrics_token", "secret")
+        for authorization in (None, "Bearer wrong"):
+            with pytest.raises(HTTPException) as exc:
+                await metrics_router.metrics(authorization=authorization)
+            assert exc.value.status_code == 401
+        response = await metrics_router.metrics(authorization="Bearer secret")
+        assert response.media_type.startswith("text/plain; version=0.0.4")
+        assert b"# TYPE ai_requests_total counter" in response.body
+    
+    @pytest.mark.asyncio
+    async def test_ai_manager_records_latency_tokens_and_cost(self, monkeypatch, fake_provider):
+        """Test every AIManager call feeds the per provider/model/prompt type metrics."""
+        from services.ai import AIRequest, PromptType
+        from services.ai import manager as manager_module
+        from services.ai.response_cache import AIResponseCache
+        from services.metrics.collectors import AI_COST, AI_REQUEST_DURATION, AI_REQUESTS, AI_TOKENS
+        
+        monkeypatch.setattr(manager_module, "get_ai_response_cache", lambda: AIResponseCache(enabled=False))
+        monkeypatch.setattr(manager_module.settings, "openai_api_key", "test-key")
+        manager = manager_module.AIManager()
+        
+        class _Timed(fake_provider):
+            async def complete(self, request):
+                response = await super().complete(request)
+                return response.model_copy(update={"latency_ms": 250})
+        
+        monkeypatch.setattr(manager_module, "OpenAIProvider", _Timed)
+        manager.providers = {"openai": _Timed("k")}
+        manager._db_fallback_chain = [{"provider": "openai", "model": "gpt-metrics", "order": 1}]
+        labels = ("openai", "gpt-metrics", "translation")
+        before = AI_REQUESTS.get(*labels, "success"), AI_TOKENS.get(*labels, "input"), AI_COST.get(*labels)
+        
+        await manager.execute(AIRequest(prompt_type=PromptType.TRANSLATION, template="hi", variables={}))
+        
+        assert AI_REQUESTS.get(*labels, "success") == before[0] + 1
+        assert AI_TOKENS.get(*labels, "input") == before[1] + 100
+        assert AI_COST.get(*labels) == pytest.approx(before[2] + 0.01)
+        assert AI_REQUEST_DURATION.snapshot(*labels) == (1, 0.25)
+    
+    @pytest.mark.asyncio
+    async def test_db_queries_and_background_jobs_are_timed(self):
+        """Test Supabase queries are timed per calling module/table/operation and jobs per step."""
+        from database.instrumentation import InstrumentedClient
+        from services.metrics import track_background_job
+        from services.metrics.collectors import (
+            BACKGROUND_JOB_DURATION, BACKGROUND_JOBS_IN_PROGRESS, DB_QUERY_DURATION, DB_QUERY_ERRORS,
+        )
+        
+        class _Builder:
+            def __init__(self, fail=False):
+                self.fail = fail
+            
+            def select(self, *columns):
+                return self
+            
+            def eq(self, column, value):
+                return self
+            
+            @property
+            def not_(self):
+                return self
+            
+            def execute(self):
+                if self.fail:
+                    raise RuntimeError("boom")
+                return type("Result", (), {"data": [{"id": 1}]})()
+        
+        class _Client:
+            def table(self, name):
+                return _Builder(fail=name == "broken")
+        
+        client = InstrumentedClient(_Client())
+        before = DB_QUERY_DURATION.snapshot("test_metrics", "cvs", "select")[0]
+        
+        assert client.table("cvs").select("id").not_.eq("id", 2).execute().data == [{"id": 1}]
+        with pytest.raises(RuntimeError):
+            client.table("broken").select("*").execute()
+        
+        assert DB_QUERY_DURATION.snapshot("test_metrics", "cvs", "select")[0] == before + 1
+        assert DB_QUERY_ERRORS.get("test_metrics", "broken", "select") >= 1
+        
+        @track_background_job("metrics_test")
+        async def job():
+            assert BACKGROUND_JOBS_IN_PROGRESS.get("metrics_test") == 1
+        
+        await job()
+        assert BACKGROUND_JOBS_IN_PROGRESS.get("metrics_test") == 0
+        assert BACKGROUND_JOB_DURATION.snapshot("metrics_test", "completed")[0] == 1
@@ -0,0 +1,59 @@
+"""
+Tests for fitting prompts into the model's context window.
+"""
+
+
+class TestPromptBudget:
+    """Test fitting prompt sections into the model's context window."""
+    
+    def _request(self, variables, max_tokens=4096):
+        from services.ai import AIRequest, PromptSection, PromptType
+        return AIRequest(
+            prompt_type=PromptType.INTERVIEWER_ANALYSIS,
+            template="Job:\n{job_posting}\nCV:\n{cv_text}\nContext:\n{enrichment_context}",
+            variables=variables,
+            max_tokens=max_tokens,
+            budget_sections=[
+                PromptSection(name="job_posting", priority=0, keep_tail=True),
+                PromptSection(name="cv_text", priority=1, keep_tail=True),
+                PromptSection(name="enrichment_context", priority=2),
+            ]
+        )
+    
+    def test_fits_by_priority_within_model_budget(self):
+        """Test enrichment is trimmed before the CV and the job posting is kept whole."""
+        from services.ai.prompt_budget import estimate_tokens, fit_request, get_input_budget
+        job = "Senior Python engineer\n" * 100
+        cv = "\n".join(f"Experience line {i}" for i in range(1500)) + "\nEducation: MSc Computer Science"
+        enrichment = "Company news\n" * 2000
+        request = self._request({"job_posting": job, "cv_text": cv, "enrichment_context": enrichment})
+        
+        fitted = fit_request(request, "gpt-4")  # 8192 context window
+        prompt = "".join(str(v) for v in fitted.variables.values())
+        
+        assert estimate_tokens(prompt) <= get_input_budget("gpt-4", 4096)
+        assert fitted.variables["job_posting"] == job
+        assert fitted.variables["cv_text"].startswith("Experience line 0")
+        assert fitted.variables["cv_text"].endswith("Education: MSc Computer Science")
+        assert fitted.variables["enrichment_context"] == ""
+        
+        # The same request fits untouched on a large-context model
+        assert fit_request(request, "models/gemini-2.5-pro") is request
+    
+    def test_section_cap_and_trim_boundaries(self):
+        """Test a section's own max_tokens applies and trimming cuts at line boundaries."""
+        from services.ai import AIRequest, PromptSection, PromptType
+        from services.ai.prompt_budget import TRIM_MARKER, estimate_tokens, fit_request
+        cv = "\n".join(f"Line {i:04d} of the CV" for i in range(400))
+        request = AIRequest(
+            prompt_type=PromptType.CV_SUMMARY,
+            template="{cv_text}",
+            variables={"cv_text": cv},
+            budget_sections=[PromptSection(name="cv_text", max_tokens=200)]
+        )
+        
+        fitted = fit_request(request, "gpt-4o").variables["cv_text"]
+        
+        assert estimate_tokens(fitted) <= 200
+        assert fitted.endswith(TRIM_MARKER)
+        assert all(line.startswith("Line ") and line.endswith("of the CV") for line in fitted[:-len(TRIM_MARKER)].split("\n"))
@@ -0,0 +1,84 @@
+"""
+Tests for the cached prompt prefix.
+"""
+
+
+class TestPromptCachePrefix:
+    """Test the shared (cached) prompt prefix of the interviewer analysis."""
+    
+    def _variables(self, cv_text, candidate_context=""):
+        return {
+            "job_posting": "Senior Python engineer",
+            "key_points": "FastAPI, PostgreSQL",
+            "weights": "{'technical_skills': 40}",
+            "hard_blockers": "[]",
+            "nice_to_have": "['Kubernetes']",
+            "language": "en",
+            "company_context": "Company: Acme",
+            "candidate_context": candidate_context,
+            "cv_text": cv_text,
+        }
+    
+    def test_prefix_is_shared_across_cvs(self):
+        """Test only the suffix changes per CV and Claude marks the prefix as cacheable."""
+        from services.ai.prompt_template import CACHE_BREAKPOINT
+        from services.ai.claude_provider import ClaudeProvider
+        from services.ai.prompts import get_prompt_sync
+        from services.ai import AIRequest, PromptType
+        template = get_prompt_sync("interviewer_analysis")
+        assert CACHE_BREAKPOINT in template
+        provider = ClaudeProvider("test-key", {"model": "claude-3-5-sonnet-20241022"})
+        
+        messages = [
+            provider._build_messages(AIRequest(
+                prompt_type=PromptType.INTERVIEWER_ANALYSIS,
+                template=template,
+                variables=self._variables(cv, candidate),
+            ))
+            for cv, candidate in (("CV of Ana", "Ana's GitHub"), ("CV of Bruno", ""))
+        ]
+        
+        first, second = (message[0]["content"] for message in messages)
+        assert first[0] == second[0]
+        assert first[0]["cache_control"] == {"type": "ephemeral"}
+        assert "Senior Python engineer" in first[0]["text"] and "Company: Acme" in first[0]["text"]
+        assert "CV of Ana" in first[1]["text"] and "Ana's GitHub" in first[1]["text"]
+        assert "CV of" not in first[0]["text"]
+        
+        # The flat prompt (other providers, cache keys) has no marker and keeps the same order
+        prompt = provider.build_prompt(template, self._variables("CV of Ana"))
+        assert CACHE_BREAKPOINT not in prompt
+        assert prompt == "".join(provider.build_prompt_parts(template, self._variables("CV of Ana")))
+        
+        # Templates without a breakpoint are sent as a single plain message
+        plain = provider._build_messages(AIRequest(
+            prompt_type=PromptType.CV_SUMMARY,
+            template="Summarize {cv_text}",
+            variables={"cv_text": "CV"},
+        ))
+        assert plain == [{"role": "user", "content": "Summarize CV"}]
+    
+    def test_cache_hits_reported_in_response(self):
+        """Test cache reads are reported as a hit rate and billed at the cached price."""
+        from types import SimpleNamespace
+        from services.ai import AIResponse
+        from services.ai.claude_provider import ClaudeProvider
+        from services.ai.openai_provider import OpenAIProvider
+        provider = ClaudeProvider("test-key", {"model": "claude-3-5-sonnet-20241022"})
+        
+        usage = SimpleNamespace(input_tokens=100, cache_read_input_tokens=900, cache_creation_input_tokens=0)
+        input_tokens, cached_tokens, cache_write_tokens = provider._input_usage(usage)
+        response = AIResponse(
+            success=True, provider="claude", input_tokens=input_tokens, cached_input_tokens=cached_tokens
+        )
+        
+        assert (input_tokens, cached_tokens, cache_write_tokens) == (1000, 900, 0)
+        assert response.prompt_cache_hit_rate == 0.9
+        assert response.model_dump()["prompt_cache_hit_rate"] == 0.9
+        assert provider._calculate_cost(1000, 0, 900) < provider._calculate_cost(1000, 0)
+        assert provider._input_usage(SimpleNamespace(input_tokens=50)) == (50, None, None)
+        assert AIResponse(success=True, provider="gemini", input_tokens=50).prompt_cache_hit_rate is None
+        
+        details = SimpleNamespace(prompt_tokens_details={"cached_tokens": 512})
+        assert OpenAIProvider._cached_tokens(details) == 512
+        assert OpenAIProvider._cached_tokens(SimpleNamespace()) is None
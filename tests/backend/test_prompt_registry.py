@@ -0,0 +1,139 @@
+"""
+Tests for the in-process prompt registry.
+"""
+
+import pytest
+
+
+class _FakePromptService:
+    """In-memory stand-in for the PromptService methods used by the prompt registry."""
+    
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.version = "2026-01-01T00:00:00"
+        self.fail = False
+        self.loads = 0
+        self.delay = 0.0
+        self.usage_batches = []
+    
+    async def get_prompts_version(self):
+        if self.fail:
+            raise ConnectionError("database unavailable")
+        return self.version
+    
+    async def get_active_default_prompts(self):
+        self.loads += 1
+        return [dict(row) for row in self.rows]
+    
+    async def increment_usage_batch(self, usage):
+        import asyncio
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("database unavailable")
+        self.usage_batches.append(usage)
+
+
+class TestPromptRegistry:
+    """Test the in-process prompt registry."""
+    
+    def _make_registry(self, service):
+        from services.ai.prompt_registry import PromptRegistry
+        
+        clock = [0.0]
+        registry = PromptRegistry(
+            refresh_seconds=300,
+            version_check_seconds=5,
+            retry_seconds=10,
+            clock=lambda: clock[0],
+        )
+        registry._service = service
+        return registry, clock
+    
+    def _row(self, prompt_id, key, language, version, content):
+        return {"id": prompt_id, "prompt_key": key, "language": language, "version": version, "content": content}
+    
+    @pytest.mark.asyncio
+    async def test_prompts_served_from_memory_and_invalidated(self):
+        """Test all languages load once, and invalidation or a new version reloads them."""
+        service = _FakePromptService([
+            self._row("p1", "cv_summary", "en", 1, "Summary {cv_text}"),
+            self._row("p2", "cv_summary", "pt", 2, "Resumo {cv_text}"),
+        ])
+        registry, clock = self._make_registry(service)
+        
+        assert (await registry.get("cv_summary", "pt"))["content"] == "Resumo {cv_text}"
+        assert (await registry.get("cv_summary", "en"))["version"] == 1
+        assert await registry.get("cv_summary", "fr") is None
+        assert service.loads == 1
+        
+        # Edit in this worker
+        service.rows[0] = self._row("p1", "cv_summary", "en", 2, "Summary v2 {cv_text}")
+        registry.invalidate()
+        assert (await registry.get("cv_summary", "en"))["version"] == 2
+        assert service.loads == 2
+        
+        # Edit in another worker: picked up by the background version check
+        service.rows[1] = self._row("p2", "cv_summary", "pt", 3, "Resumo v3 {cv_text}")
+        clock[0] = 3
+        await registry.get("cv_summary", "pt")
+        assert registry._refresh_task.done()
+        service.version = "2026-01-02T00:00:00"
+        clock[0] = 6
+        assert (await registry.get("cv_summary", "pt"))["version"] == 2
+        await registry._refresh_task
+        assert (await registry.get("cv_summary", "pt"))["version"] == 3
+        assert service.loads == 3
+    
+    @pytest.mark.asyncio
+    async def test_failed_load_retried_and_get_prompt_falls_back(self, monkeypatch):
+        """Test a failed load serves defaults, is retried after the delay and then serves the database prompt."""
+        from services.ai import prompt_registry as registry_module
+        from services.ai.prompts import get_prompt, TRANSLATION_PROMPT
+        
+        service = _FakePromptService([self._row("p1", "translation", "en", 4, "Translate {content}")])
+        registry, clock = self._make_registry(service)
+        monkeypatch.setattr(registry_module, "_prompt_registry", registry)
+        
+        service.fail = True
+        assert await get_prompt("translation") == TRANSLATION_PROMPT
+        service.fail = False
+        assert await get_prompt("translation") == TRANSLATION_PROMPT
+        assert registry.stats()["failed_loads"] == 1
+        
+        clock[0] = 11
+        assert await get_prompt("translation") == "Translate {content}"
+    
+    @pytest.mark.asyncio
+    async def test_usage_counted_and_flushed_in_batches(self):
+        """Test uses are aggregated per prompt and kept when a flush fails."""
+        service = _FakePromptService([])
+        registry, _ = self._make_registry(service)
+        
+        for prompt_id in ("p1", "p2", "p1", None):
+            registry.record_usage(prompt_id)
+        
+        service.fail = True
+        assert await registry.flush_usage() == 0
+        registry.record_usage("p1")
+        service.fail = False
+        assert await registry.flush_usage() == 4
+        assert await registry.flush_usage() == 0
+        assert service.usage_batches == [{"p1": 3, "p2": 1}]
+    
+    @pytest.mark.asyncio
+    async def test_close_waits_for_running_usage_flush(self):
+        """Test shutdown during a slow usage write neither loses nor repeats counts."""
+        import asyncio
+        service = _FakePromptService([])
+        service.delay = 0.1
+        registry, _ = self._make_registry(service)
+        registry.record_usage("p1")
+        registry.record_usage("p2")
+        
+        registry._task = asyncio.get_running_loop().create_task(registry.flush_usage())
+        await asyncio.sleep(0.01)
+        registry.record_usage("p1")
+        await registry.close()
+        
+        assert service.usage_batches == [{"p1": 1, "p2": 1}, {"p1": 1}]
+        assert registry.stats()["pending_usage"] == 0
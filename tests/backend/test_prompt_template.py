@@ -0,0 +1,74 @@
+"""
+Tests for compiled prompt templates.
+"""
+
+
+class TestCompiledTemplates:
+    """Test compiled prompt templates."""
+    
+    def test_render_matches_replace_semantics(self):
+        """Test JSON braces and unfilled placeholders stay literal and values are not re-scanned."""
+        from services.ai.prompt_template import compile_template
+        template = 'Answer in {language}.\nCV:\n{cv_text}\n{{"score": {{"value": 1}}, "lang": "{{language}}"}}\n{unknown}'
+        variables = {"cv_text": "Uses {language} templates", "language": "pt"}
+        
+        rendered = compile_template(template).render(variables)
+        
+        assert rendered == 'Answer in pt.\nCV:\nUses {language} templates\n{{"score": {{"value": 1}}, "lang": "{pt}"}}\n{unknown}'
+        assert compile_template(template).count("language") == 2
+    
+    def test_compile_reports_placeholder_mismatches(self, caplog, monkeypatch):
+        """Test undeclared placeholders and unused declared variables are logged once per registry prompt version."""
+        import logging
+        from services.ai import prompt_template
+        from services.ai.prompt_registry import PromptRegistry
+        monkeypatch.setattr(prompt_template, "_registered_templates", {})
+        monkeypatch.setattr(prompt_template, "_registered_by_text", {})
+        row = {
+            "id": "p1", "prompt_key": "test", "language": "en", "version": 1,
+            "content": "Job: {job_posting}\nCV: {cv_txt}\n{cache_breakpoint}Lang: {language}",
+            "variables": ["job_posting", "cv_text", "language"],
+        }
+        registry = PromptRegistry()
+        
+        with caplog.at_level(logging.WARNING, logger="services.ai.prompt_template"):
+            registry._install([row])
+            registry._install([row])
+        
+        warnings = [record.getMessage() for record in caplog.records]
+        assert warnings == [
+            "Prompt test/en v1: undeclared placeholders ['cv_txt']",
+            "Prompt test/en v1: declared variables not in template ['cv_text']",
+        ]
+        compiled = prompt_template.compile_template(row["content"])
+        assert compiled.render_parts({"job_posting": "J", "language": "en"}) == ("Job: J\nCV: {cv_txt}\n", "Lang: en")
+    
+    def test_only_registry_prompts_are_cached(self, monkeypatch):
+        """Test registry prompts are cached by key, language and version, and ad-hoc templates are not cached."""
+        from services.ai import prompt_template
+        from services.ai.prompt_registry import PromptRegistry
+        from services.ai.prompt_template import compile_template, get_registered_template
+        monkeypatch.setattr(prompt_template, "_registered_templates", {})
+        monkeypatch.setattr(prompt_template, "_registered_by_text", {})
+        registry = PromptRegistry()
+        
+        registry._install([{"id": "p1", "prompt_key": "cv_summary", "language": "en", "version": 1, "content": "Summary {cv_text}"}])
+        v1 = get_registered_template(("cv_summary", "en", 1))
+        assert compile_template("Summary {cv_text}") is v1
+        
+        # Per-call templates (chatbot f-strings) are parsed but never kept
+        for message in ("hi", "hello"):
+            ad_hoc = f"User said: {message}\nReply in {{language}}"
+            assert compile_template(ad_hoc) is not compile_template(ad_hoc)
+            assert compile_template(ad_hoc).render({"language": "en"}) == f"User said: {message}\nReply in en"
+        assert list(prompt_template._registered_templates) == [("cv_summary", "en", 1)]
+        
+        # A reload keeps unchanged versions and drops replaced ones
+        registry._install([
+            {"id": "p1", "prompt_key": "cv_summary", "language": "en", "version": 1, "content": "Summary {cv_text}"},
+            {"id": "p2", "prompt_key": "cv_summary", "language": "pt", "version": 1, "content": "Resumo {cv_text}"},
+        ])
+        assert get_registered_template(("cv_summary", "en", 1)) is v1
+        registry._install([{"id": "p1", "prompt_key": "cv_summary", "language": "en", "version": 2, "content": "Summary v2 {cv_text}"}])
+        assert list(prompt_template._registered_templates) == [("cv_summary", "en", 2)]
+        assert compile_template("Summary {cv_text}") is not v1
@@ -0,0 +1,141 @@
+"""
+Tests for provider health tracking and circuit breaking.
+"""
+
+import pytest
+
+
+class TestProviderHealth:
+    """Test health-scored routing and circuit breaking of the fallback chain."""
+    
+    def _tracker(self, open_seconds=30.0):
+        from services.ai.health import ProviderHealthTracker
+        return ProviderHealthTracker(window_size=20, failure_threshold=3, open_seconds=open_seconds)
+    
+    def _chain(self):
+        return [
+            {"provider": "gemini", "model": "gemini-2.5-pro", "order": 1},
+            {"provider": "openai", "model": "gpt-4o-mini", "order": 2},
+            {"provider": "claude", "model": "claude-3-haiku-20240307", "order": 3},
+        ]
+    
+    def test_breaker_opens_after_consecutive_failures(self):
+        """Test an entry is skipped once it trips the breaker."""
+        tracker = self._tracker()
+        for _ in range(3):
+            tracker.record("gemini", "models/gemini-2.5-pro", success=False, latency_ms=30000, error_kind="server_error")
+        
+        ordered = tracker.order_chain(self._chain())
+        assert [item["provider"] for item in ordered] == ["openai", "claude"]
+        
+        stats = tracker.stats()["entries"]["gemini/models/gemini-2.5-pro"]
+        assert stats["state"] == "open"
+        assert stats["recent_5xx"] == 3
+    
+    def test_half_open_probe_closes_or_reopens(self):
+        """Test a single probe is let through after the cool-down."""
+        import time
+        tracker = self._tracker(open_seconds=0.05)
+        for _ in range(3):
+            tracker.record("openai", "gpt-4o-mini", success=False, error_kind="rate_limited")
+        assert not tracker.allow_request("openai", "gpt-4o-mini")
+        
+        time.sleep(0.06)
+        assert tracker.allow_request("openai", "gpt-4o-mini")  # the probe
+        assert not tracker.allow_request("openai", "gpt-4o-mini")  # only one at a time
+        tracker.record("openai", "gpt-4o-mini", success=False, error_kind="rate_limited")
+        assert tracker.stats()["entries"]["openai/gpt-4o-mini"]["state"] == "open"
+        
+        time.sleep(0.06)
+        assert tracker.allow_request("openai", "gpt-4o-mini")
+        tracker.record("openai", "gpt-4o-mini", success=True, latency_ms=800)
+        stats = tracker.stats()["entries"]["openai/gpt-4o-mini"]
+        assert stats["state"] == "closed"
+        assert stats["success_rate"] == 1.0
+    
+    def test_degraded_entries_tried_last_and_percentiles(self):
+        """Test low success-rate entries move behind healthy ones; latency percentiles are reported."""
+        tracker = self._tracker()
+        for i in range(10):
+            # 60% success, never three failures in a row
+            tracker.record("gemini", "models/gemini-2.5-pro", success=i % 5 not in (1, 3), latency_ms=1000 + i)
+        for latency in range(100, 1100, 100):
+            tracker.record("openai", "gpt-4o-mini", success=True, latency_ms=latency)
+        
+        ordered = tracker.order_chain(self._chain())
+        assert [item["provider"] for item in ordered] == ["openai", "claude", "gemini"]
+        
+        stats = tracker.stats()["entries"]["openai/gpt-4o-mini"]
+        assert stats["p50_latency_ms"] in (500, 600)
+        assert stats["p95_latency_ms"] == 1000
+    
+    @pytest.mark.asyncio
+    async def test_manager_skips_failing_provider(self, monkeypatch, fake_provider):
+        """Test AIManager stops calling a provider whose circuit is open."""
+        from services.ai import manager as manager_module
+        from services.ai import AIRequest, AIResponse, PromptType
+        from services.ai.response_cache import AIResponseCache
+        
+        tracker = self._tracker()
+        monkeypatch.setattr(manager_module, "get_ai_response_cache", lambda: AIResponseCache(enabled=False))
+        monkeypatch.setattr(manager_module, "get_provider_health_tracker", lambda: tracker)
+        
+        calls = {"claude": 0, "openai": 0}
+        
+        class _DownProvider(fake_provider):
+            @property
+            def provider_name(self):
+                return "claude"
+            
+            async def complete(self, request):
+                calls["claude"] += 1
+                return AIResponse(success=False, provider="claude", error="503 Service Unavailable")
+        
+        class _UpProvider(fake_provider):
+            async def complete(self, request):
+                calls["openai"] += 1
+                return AIResponse(success=True, raw_text="ok", provider="openai")
+        
+        manager = manager_module.AIManager()
+        manager.providers = {"claude": _DownProvider("k"), "openai": _UpProvider("k")}
+        manager._db_fallback_chain = [
+            {"provider": "claude", "model": None, "order": 1},
+            {"provider": "openai", "model": None, "order": 2},
+        ]
+        request = AIRequest(prompt_type=PromptType.TRANSLATION, template="hi", variables={})
+        
+        for _ in range(6):
+            response = await manager.execute(request)
+            assert response.success
+        
+        assert calls["claude"] == 3
+        assert calls["openai"] == 6
+    
+    @pytest.mark.asyncio
+    async def test_caller_cancellation_is_not_a_provider_failure(self, monkeypatch, fake_provider):
+        """Test a call cancelled by the caller's timeout leaves the provider's health alone."""
+        import asyncio
+        from services.ai import manager as manager_module
+        from services.ai import AIRequest, AIResponse, PromptType
+        from services.ai.response_cache import AIResponseCache
+        
+        tracker = self._tracker()
+        monkeypatch.setattr(manager_module, "get_ai_response_cache", lambda: AIResponseCache(enabled=False))
+        monkeypatch.setattr(manager_module, "get_provider_health_tracker", lambda: tracker)
+        
+        class _SlowProvider(fake_provider):
+            async def complete(self, request):
+                await asyncio.sleep(1)
+                return AIResponse(success=True, raw_text="ok", provider="openai")
+        
+        manager = manager_module.AIManager()
+        manager.providers = {"openai": _SlowProvider("k", {"model": "gpt-4o-mini"})}
+        manager._db_fallback_chain = [{"provider": "openai", "model": None, "order": 1}]
+        request = AIRequest(prompt_type=PromptType.TRANSLATION, template="hi", variables={})
+        
+        for _ in range(4):
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(manager.execute(request), timeout=0.02)
+        
+        assert tracker.allow_request("openai", "gpt-4o-mini")
+        assert "openai/gpt-4o-mini" not in tracker.stats()["entries"]
@@ -0,0 +1,52 @@
+"""
+Tests for pooled AI provider instances.
+"""
+
+import pytest
+
+
+class TestAIProviderPool:
+    """Test pooled provider instances in AIManager."""
+    
+    def _make_manager(self, monkeypatch, fake_provider):
+        from services.ai import manager as manager_module
+        from services.ai.response_cache import AIResponseCache
+        
+        monkeypatch.setattr(manager_module, "get_ai_response_cache", lambda: AIResponseCache(enabled=False))
+        monkeypatch.setattr(manager_module, "OpenAIProvider", fake_provider)
+        monkeypatch.setattr(manager_module.settings, "openai_api_key", "test-key")
+        
+        manager = manager_module.AIManager()
+        manager.providers = {"openai": fake_provider("test-key")}
+        manager._db_fallback_chain = [{"provider": "openai", "model": "gpt-4o-mini", "order": 1}]
+        fake_provider.instances = 0
+        return manager
+    
+    def _request(self):
+        from services.ai import AIRequest, PromptType
+        return AIRequest(prompt_type=PromptType.TRANSLATION, template="hi", variables={})
+    
+    @pytest.mark.asyncio
+    async def test_provider_reused_across_calls(self, monkeypatch, fake_provider):
+        """Test the same (provider, model) instance is built once and reused."""
+        manager = self._make_manager(monkeypatch, fake_provider)
+        
+        for _ in range(3):
+            response = await manager.execute(self._request())
+            assert response.success
+            assert response.model == "gpt-4o-mini"
+        
+        assert fake_provider.instances == 1
+    
+    @pytest.mark.asyncio
+    async def test_invalidate_clears_pool(self, monkeypatch, fake_provider):
+        """Test invalidation drops pooled providers and the cached chain."""
+        manager = self._make_manager(monkeypatch, fake_provider)
+        await manager.execute(self._request(), provider_name="openai", model_name="gpt-4o")
+        
+        manager.invalidate_fallback_chain()
+        assert manager._db_fallback_chain is None
+        assert manager._provider_pool == {}
+        
+        await manager.execute(self._request(), provider_name="openai", model_name="gpt-4o")
+        assert fake_provider.instances == 2
@@ -0,0 +1,200 @@
+"""
+Tests for provider rate limiting.
+"""
+
+import pytest
+
+
+class _RateLimitedError(Exception):
+    """Exception shaped like an SDK/httpx error carrying an HTTP response."""
+    
+    def __init__(self, message, status_code=429, headers=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.response = type("Response", (), {"status_code": status_code, "headers": headers or {}})()
+
+
+class TestRateLimitScheduler:
+    """Test RPM/TPM token-bucket throttling of provider calls."""
+    
+    def _scheduler(self, rpm=600, tpm=100000):
+        from services.ai.rate_limiter import RateLimitScheduler
+        return RateLimitScheduler(overrides={"openai": (rpm, tpm)}, max_wait_seconds=5)
+    
+    def test_parse_overrides_and_model_budgets(self):
+        """Test AI_RATE_LIMITS parsing and model_limits fallbacks."""
+        from services.ai.rate_limiter import parse_rate_limit_overrides
+        from services.ai.model_limits import get_rate_limits
+        
+        assert parse_rate_limit_overrides("gemini=10/2000, gpt-4o=5/100,bad=x") == {
+            "gemini": (10, 2000), "gpt-4o": (5, 100)
+        }
+        assert get_rate_limits("gemini", "gemini-2.5-flash") == get_rate_limits("gemini", "models/gemini-2.5-flash")
+        assert get_rate_limits("openai", "unknown-model") == get_rate_limits("openai")
+        assert get_rate_limits("unknown-provider") is None
+    
+    def test_retry_after_extraction(self):
+        """Test Retry-After is read from headers and from Gemini-style messages."""
+        from services.ai.rate_limiter import get_retry_after, is_rate_limit_error
+        
+        assert get_retry_after(_RateLimitedError("slow down", headers={"retry-after": "7"})) == 7.0
+        assert get_retry_after(_RateLimitedError("slow down", headers={"retry-after-ms": "1500"})) == 1.5
+        assert get_retry_after(Exception("429 Resource exhausted. Please retry in 12.5s.")) == 12.5
+        assert get_retry_after(Exception("boom")) is None
+        assert is_rate_limit_error(_RateLimitedError("slow down"))
+        assert is_rate_limit_error(Exception("429 Quota exceeded"))
+        assert not is_rate_limit_error(_RateLimitedError("bad request", status_code=400))
+    
+    @pytest.mark.asyncio
+    async def test_requests_queue_when_rpm_exhausted(self):
+        """Test a request waits for the request bucket to refill."""
+        scheduler = self._scheduler(rpm=600)
+        budget = scheduler._get_budget("openai", "gpt-4o-mini")
+        budget.available_requests = 0
+        
+        waited = await scheduler.acquire("openai", "gpt-4o-mini", 10)
+        
+        assert 0.05 < waited < 1.0
+        assert budget.throttled == 1
+    
+    @pytest.mark.asyncio
+    async def test_tokens_reconciled_with_actual_usage(self):
+        """Test unused reserved tokens are returned to the TPM bucket."""
+        from services.ai import AIResponse
+        
+        scheduler = self._scheduler(tpm=10000)
+        await scheduler.acquire("openai", "gpt-4o-mini", 4000)
+        budget = scheduler._get_budget("openai", "gpt-4o-mini")
+        assert budget.available_tokens <= 6001
+        
+        scheduler.record_response(
+            "openai", "gpt-4o-mini", 4000,
+            AIResponse(success=True, provider="openai", input_tokens=300, output_tokens=200)
+        )
+        assert budget.available_tokens >= 9499
+    
+    @pytest.mark.asyncio
+    async def test_retry_after_pauses_model(self):
+        """Test a 429 response refunds its tokens and blocks the model for the Retry-After interval."""
+        from services.ai import AIResponse
+        
+        scheduler = self._scheduler(tpm=10000)
+        await scheduler.acquire("openai", "gpt-4o-mini", 4000)
+        scheduler.record_response(
+            "openai", "gpt-4o-mini", 4000,
+            AIResponse(success=False, provider="openai", rate_limited=True, retry_after=0.2)
+        )
+        assert scheduler._get_budget("openai", "gpt-4o-mini").available_tokens >= 9999
+        
+        waited = await scheduler.acquire("openai", "gpt-4o-mini", 100)
+        assert waited >= 0.15
+        assert scheduler.stats()["models"]["openai/gpt-4o-mini"]["rate_limited"] == 1
+    
+    def _manager(self, monkeypatch, fake_provider, scheduler, complete):
+        from services.ai import manager as manager_module
+        from services.ai.health import ProviderHealthTracker
+        from services.ai.response_cache import AIResponseCache
+        
+        tracker = ProviderHealthTracker()
+        monkeypatch.setattr(manager_module, "get_ai_response_cache", lambda: AIResponseCache(enabled=False))
+        monkeypatch.setattr(manager_module, "get_provider_health_tracker", lambda: tracker)
+        monkeypatch.setattr(manager_module, "get_rate_limit_scheduler", lambda: scheduler)
+        
+        class _Provider(fake_provider):
+            async def complete(self, request):
+                return await complete(self, request)
+        
+        manager = manager_module.AIManager()
+        manager.providers = {"openai": _Provider("k", {"model": "gpt-4o-mini"})}
+        manager._db_fallback_chain = [{"provider": "openai", "model": None, "order": 1}]
+        return manager, tracker
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_or_failed_call_refunds_reservation(self, monkeypatch, fake_provider):
+        """Test tokens reserved for a call that raises or is cancelled go back to the TPM bucket."""
+        import asyncio
+        from services.ai import AIRequest, PromptType
+        
+        async def complete(provider, request):
+            if request.template == "boom":
+                raise RuntimeError("connection reset")
+            await asyncio.sleep(10)
+        
+        scheduler = self._scheduler(tpm=10000)
+        manager, _ = self._manager(monkeypatch, fake_provider, scheduler, complete)
+        provider = manager.providers["openai"]
+        budget = scheduler._get_budget("openai", "gpt-4o-mini")
+        
+        with pytest.raises(RuntimeError):
+            await manager._call_provider_throttled(
+                provider, AIRequest(prompt_type=PromptType.TRANSLATION, template="boom", variables={}, max_tokens=3000)
+            )
+        assert budget.available_tokens >= 9999
+        
+        call = asyncio.get_running_loop().create_task(manager._call_provider_throttled(
+            provider, AIRequest(prompt_type=PromptType.TRANSLATION, template="hi", variables={}, max_tokens=3000)
+        ))
+        await asyncio.sleep(0.05)
+        assert budget.available_tokens < 7100
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+        assert budget.available_tokens >= 9999
+    
+    @pytest.mark.asyncio
+    async def test_timeout_covers_provider_call_not_queue(self, monkeypatch, fake_provider):
+        """Test request.timeout starts once the rate limiter admits the request."""
+        import asyncio
+        from services.ai import AIRequest, AIResponse, PromptType
+        
+        delays = [0.05, 0.5]
+        
+        async def complete(provider, request):
+            await asyncio.sleep(delays.pop(0))
+            return AIResponse(success=True, raw_text="ok", provider="openai", model=provider.model_name)
+        
+        scheduler = self._scheduler()
+        manager, tracker = self._manager(monkeypatch, fake_provider, scheduler, complete)
+        request = AIRequest(prompt_type=PromptType.TRANSLATION, template="hi", variables={}, timeout=0.2)
+        
+        # Queued for 0.3s (longer than the timeout), then answers in 0.05s
+        scheduler.penalize("openai", "gpt-4o-mini", retry_after=0.3)
+        assert (await manager.execute(request)).success
+        
+        response = await manager.execute(request)
+        assert not response.success
+        assert "timed out after 0.2s" in response.error
+        assert tracker.stats()["entries"]["openai/gpt-4o-mini"]["recent_5xx"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_rate_limited_chain_reports_scheduler_retry_after(self, monkeypatch, fake_provider):
+        """Test a fallback chain that only got 429s tells the caller when to retry."""
+        from services.ai import AIRequest, AIResponse, PromptType
+        
+        async def complete(provider, request):
+            return AIResponse(
+                success=False, error="429 Too Many Requests", provider="openai",
+                model=provider.model_name, rate_limited=True, retry_after=30
+            )
+        
+        manager, _ = self._manager(monkeypatch, fake_provider, self._scheduler(), complete)
+        response = await manager.execute(
+            AIRequest(prompt_type=PromptType.TRANSLATION, template="hi", variables={})
+        )
+        
+        assert not response.success
+        assert response.rate_limited
+        assert 29 < response.retry_after <= 30
+    
+    def test_analysis_retry_delay_uses_retry_after_with_jitter(self, monkeypatch):
+        """Test step 6 retries back off exponentially with jitter and wait out rate limits."""
+        from config import settings
+        from routers.interviewer import _analysis_retry_delay
+        monkeypatch.setattr(settings, "ai_rate_limit_max_wait_seconds", 60.0)
+        
+        first = [_analysis_retry_delay(1) for _ in range(50)]
+        assert all(1.0 <= delay <= 1.5 for delay in first)
+        assert len(set(first)) > 1
+        assert all(2.0 <= _analysis_retry_delay(2) <= 3.0 for _ in range(20))
+        assert all(20.0 <= _analysis_retry_delay(1, retry_after=20) <= 30.0 for _ in range(20))
+        assert all(60.0 <= _analysis_retry_delay(1, retry_after=3600) <= 90.0 for _ in range(20))
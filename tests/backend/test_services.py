@@ -89,4 +89,3 @@ class TestAISystem:
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
-
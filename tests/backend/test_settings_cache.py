@@ -0,0 +1,128 @@
+"""
+Tests for the app_settings cache.
+"""
+
+import pytest
+
+
+class _FakeSettingsService:
+    """In-memory stand-in for AppSettingsService."""
+    
+    def __init__(self, values):
+        self.values = dict(values)
+        self.version = "2026-01-01T00:00:00"
+        self.fail = False
+        self.reads = 0
+    
+    async def get(self, setting_key):
+        self.reads += 1
+        if self.fail:
+            raise ConnectionError("database unavailable")
+        if setting_key not in self.values:
+            return None
+        return {"setting_key": setting_key, "setting_value": self.values[setting_key]}
+    
+    async def get_version(self):
+        return self.version
+
+
+class TestAppSettingsCache:
+    """Test the app_settings cache (TTL, stale-while-revalidate, invalidation)."""
+    
+    def _make_cache(self, service, version_check_seconds=0.0):
+        from services.settings_cache import AppSettingsCache
+        
+        clock = [0.0]
+        cache = AppSettingsCache(
+            ttl_seconds=10,
+            stale_seconds=30,
+            negative_ttl_seconds=2,
+            version_check_seconds=version_check_seconds,
+            clock=lambda: clock[0],
+        )
+        cache._service = service
+        return cache, clock
+    
+    async def _settle(self, cache):
+        import asyncio
+        pending = [*cache._loads.values(), *([cache._version_task] if cache._version_task else [])]
+        await asyncio.gather(*pending)
+    
+    @pytest.mark.asyncio
+    async def test_ttl_and_stale_while_revalidate(self):
+        """Test fresh hits skip the database and stale values are served while reloading."""
+        service = _FakeSettingsService({"ai_cache_enabled": "false"})
+        cache, clock = self._make_cache(service)
+        
+        assert await cache.get_bool("ai_cache_enabled", True) is False
+        assert await cache.get("ai_cache_enabled") == "false"
+        assert service.reads == 1
+        
+        service.values["ai_cache_enabled"] = "true"
+        clock[0] = 15
+        assert await cache.get("ai_cache_enabled") == "false"
+        await self._settle(cache)
+        assert await cache.get("ai_cache_enabled") == "true"
+        assert service.reads == 2
+        
+        service.values["ai_cache_enabled"] = "false"
+        clock[0] = 100
+        assert await cache.get("ai_cache_enabled") == "false"
+        assert cache.stats()["stale_hits"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_negative_results_expire(self):
+        """Test failed and missing reads are retried after the negative TTL."""
+        service = _FakeSettingsService({"default_ai_provider": "openai"})
+        cache, clock = self._make_cache(service)
+        
+        service.fail = True
+        assert await cache.get("default_ai_provider") is None
+        service.fail = False
+        assert await cache.get("default_ai_provider") is None
+        assert service.reads == 1
+        
+        clock[0] = 3
+        assert await cache.get("default_ai_provider") == "openai"
+        assert await cache.get("missing") is None
+        
+        # A failed reload keeps serving the previous value
+        service.fail = True
+        clock[0] = 100
+        assert await cache.get("default_ai_provider") == "openai"
+        assert cache.stats()["errors"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_version_change_reloads_fallback_chain(self, monkeypatch, fake_provider):
+        """Test a write seen through updated_at makes the manager re-parse the chain."""
+        import json
+        from services.ai import manager as manager_module
+        from services.ai.response_cache import AIResponseCache
+        
+        service = _FakeSettingsService({
+            "default_ai_provider": json.dumps([{"provider": "openai", "model": "gpt-4o-mini", "order": 1}]),
+        })
+        cache, clock = self._make_cache(service, version_check_seconds=5)
+        monkeypatch.setattr(manager_module, "get_app_settings_cache", lambda: cache)
+        monkeypatch.setattr(manager_module, "get_ai_response_cache", lambda: AIResponseCache(enabled=False))
+        monkeypatch.setattr(manager_module, "OpenAIProvider", fake_provider)
+        monkeypatch.setattr(manager_module.settings, "openai_api_key", "test-key")
+        
+        manager = manager_module.AIManager()
+        manager.providers = {"openai": fake_provider("test-key")}
+        chain = await manager._load_fallback_chain_from_db()
+        assert chain[0]["model"] == "gpt-4o-mini"
+        await self._settle(cache)
+        manager._get_pooled_provider("openai", "gpt-4o-mini")
+        assert manager._provider_pool
+        
+        # Another worker changes the setting
+        service.values["default_ai_provider"] = json.dumps([{"provider": "openai", "model": "gpt-4o", "order": 1}])
+        service.version = "2026-01-02T00:00:00"
+        clock[0] = 6
+        assert (await manager._load_fallback_chain_from_db())[0]["model"] == "gpt-4o-mini"
+        await self._settle(cache)
+        
+        chain = await manager._load_fallback_chain_from_db()
+        assert chain[0]["model"] == "gpt-4o"
+        assert manager._provider_pool == {}
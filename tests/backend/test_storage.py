@@ -0,0 +1,31 @@
+"""
+Tests for the Supabase storage service.
+"""
+
+import pytest
+
+
+class TestStorageUploads:
+    """Test that storage uploads run off the event loop."""
+    
+    @pytest.mark.asyncio
+    async def test_parallel_uploads_overlap(self, memory_client):
+        """Test concurrent CV uploads run at the same time instead of one after another."""
+        import asyncio
+        import time
+        from services.storage.supabase_storage import SupabaseStorageService
+        memory_client.delay = 0.2
+        storage = SupabaseStorageService()
+        
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            storage.upload_cv(b"%PDF-1", "a.pdf", "cand-1"),
+            storage.upload_cv(b"%PDF-2", "b.pdf", "cand-2"),
+        )
+        elapsed = time.perf_counter() - started
+        
+        assert all(success for success, _, _ in results)
+        assert results[0][1].startswith("https://storage.example.com/cvs/cand-1/")
+        assert len(memory_client.files) == 2
+        assert memory_client.max_active == 2
+        assert elapsed < 0.35  # 0.4s if the uploads were serialized
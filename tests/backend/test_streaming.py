@@ -0,0 +1,151 @@
+"""
+Tests for streamed AI completions.
+"""
+
+import pytest
+
+
+class TestStreaming:
+    """Test streaming completions through AIManager."""
+    
+    def _make_manager(self, monkeypatch, providers):
+        from services.ai import manager as manager_module
+        from services.ai.health import ProviderHealthTracker
+        from services.ai.response_cache import AIResponseCache
+        
+        tracker = ProviderHealthTracker()
+        monkeypatch.setattr(manager_module, "get_ai_response_cache", lambda: AIResponseCache(enabled=False))
+        monkeypatch.setattr(manager_module, "get_provider_health_tracker", lambda: tracker)
+        
+        manager = manager_module.AIManager()
+        manager.providers = dict(providers)
+        manager._db_fallback_chain = [
+            {"provider": name, "model": None, "order": idx + 1}
+            for idx, name in enumerate(providers)
+        ]
+        
+        logged = []
+        
+        async def _log_usage(request, response):
+            logged.append(response)
+        
+        monkeypatch.setattr(manager, "_log_usage", _log_usage)
+        return manager, logged, tracker
+    
+    @pytest.fixture
+    def streaming_provider(self, fake_provider):
+        """Factory of fake providers streaming `pieces`, raising after `fail_after` pieces if set."""
+        from services.ai import AIResponse, AIStreamChunk, AIStreamError
+        
+        def _provider(name, pieces, fail_after=None):
+            class _Streaming(fake_provider):
+                @property
+                def provider_name(self):
+                    return name
+                
+                async def stream(self, request):
+                    for idx, piece in enumerate(pieces):
+                        if fail_after is not None and idx == fail_after:
+                            raise AIStreamError(AIResponse(success=False, error=f"{name} failed", provider=name))
+                        yield AIStreamChunk(text=piece)
+                    if fail_after is not None and fail_after >= len(pieces):
+                        raise AIStreamError(AIResponse(success=False, error=f"{name} failed", provider=name))
+                    yield AIStreamChunk(done=True, response=AIResponse(
+                        success=True, raw_text="".join(pieces), provider=name,
+                        input_tokens=10, output_tokens=len(pieces), latency_ms=5
+                    ))
+            
+            return _Streaming("k")
+        
+        return _provider
+    
+    def _request(self):
+        from services.ai import AIRequest, PromptType
+        return AIRequest(prompt_type=PromptType.CHATBOT_PROFILE_EXTRACTION, template="hi", variables={})
+    
+    @pytest.mark.asyncio
+    async def test_falls_back_before_first_token(self, monkeypatch, streaming_provider):
+        """Test a provider failing before any text falls through to the next entry."""
+        manager, logged, tracker = self._make_manager(monkeypatch, {
+            "claude": streaming_provider("claude", ["never"], fail_after=0),
+            "openai": streaming_provider("openai", ["Hel", "lo"]),
+        })
+        
+        chunks = [chunk async for chunk in manager.stream(self._request())]
+        
+        assert [chunk.text for chunk in chunks if not chunk.done] == ["Hel", "lo"]
+        assert chunks[-1].done and chunks[-1].response.raw_text == "Hello"
+        assert [(r.provider, r.success) for r in logged] == [("claude", False), ("openai", True)]
+        assert tracker.stats()["entries"]["claude/"]["success_rate"] == 0.0
+    
+    @pytest.mark.asyncio
+    async def test_failure_after_first_token_is_raised(self, monkeypatch, streaming_provider):
+        """Test no fallback happens once text has been streamed."""
+        from services.ai import AIStreamError
+        manager, _, _ = self._make_manager(monkeypatch, {
+            "claude": streaming_provider("claude", ["Hel", "lo"], fail_after=1),
+            "openai": streaming_provider("openai", ["other"]),
+        })
+        
+        received = []
+        with pytest.raises(AIStreamError):
+            async for chunk in manager.stream(self._request()):
+                received.append(chunk.text)
+        
+        assert received == ["Hel"]
+    
+    @pytest.mark.asyncio
+    async def test_admin_cache_bypass_applies_to_streams(self, monkeypatch, streaming_provider):
+        """Test the ai_cache_enabled setting turns the response cache off for streamed requests too."""
+        from services.ai import manager as manager_module
+        from services.ai.response_cache import AIResponseCache
+        
+        class _Settings:
+            enabled = False
+            
+            async def get(self, key):
+                return None
+            
+            async def get_bool(self, key, default):
+                return self.enabled
+        
+        calls = []
+        manager, _, _ = self._make_manager(monkeypatch, {"openai": streaming_provider("openai", ["Hi"])})
+        provider = manager.providers["openai"]
+        original_stream = provider.stream
+        
+        def _counting_stream(request):
+            calls.append(request)
+            return original_stream(request)
+        
+        monkeypatch.setattr(provider, "stream", _counting_stream)
+        settings_cache = _Settings()
+        cache = AIResponseCache(persistent=False)
+        monkeypatch.setattr(manager_module, "get_ai_response_cache", lambda: cache)
+        monkeypatch.setattr(manager_module, "get_app_settings_cache", lambda: settings_cache)
+        
+        for _ in range(2):
+            chunks = [chunk async for chunk in manager.stream(self._request())]
+            assert chunks[-1].response.raw_text == "Hi"
+        assert len(calls) == 2
+        
+        settings_cache.enabled = True
+        for _ in range(2):
+            chunks = [chunk async for chunk in manager.stream(self._request())]
+        assert chunks[-1].response.cache_hit
+        assert len(calls) == 3
+    
+    @pytest.mark.asyncio
+    async def test_default_stream_wraps_complete(self, fake_provider):
+        """Test providers without native streaming yield the completion as one chunk."""
+        from services.ai import AIProvider
+        
+        class _Plain(fake_provider):
+            async def stream(self, request):
+                async for chunk in AIProvider.stream(self, request):
+                    yield chunk
+        
+        chunks = [chunk async for chunk in _Plain("k").stream(self._request())]
+        
+        assert [chunk.text for chunk in chunks] == ["ok", ""]
+        assert chunks[-1].done and chunks[-1].response.output_tokens == 20
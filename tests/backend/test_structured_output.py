@@ -0,0 +1,126 @@
+"""
+Tests for structured AI output parsing.
+"""
+
+import pytest
+
+
+class TestStructuredOutput:
+    """Test the shared structured-output parser, validation and JSON mode."""
+    
+    def test_parser_repairs_common_defects(self):
+        """Test fences, prose, trailing commas, doubled braces and truncated output are recovered."""
+        from services.ai.structured_output import parse_json_response
+        
+        assert parse_json_response('Sure! Here it is:\n```json\n{"a": [1, 2,], "b": "x}"}\n```\nThanks') == {"a": [1, 2], "b": "x}"}
+        assert parse_json_response('{{"a": {{"b": 1}}}}') == {"a": {"b": 1}}
+        assert parse_json_response('{"a": {"b": {}}, "c": "}}"}') == {"a": {"b": {}}, "c": "}}"}
+        assert parse_json_response('{"summary": "Senior dev", "skills": ["Python", "Go') == {
+            "summary": "Senior dev", "skills": ["Python", "Go"]
+        }
+        assert parse_json_response('{"summary": "Senior dev", "score": {"value": 8, "reason":') == {
+            "summary": "Senior dev", "score": {"value": 8}
+        }
+        assert parse_json_response("No JSON here") is None
+    
+    def test_validation_and_json_opt_out(self):
+        """Test per-prompt-type schemas and that free-text requests are not parsed."""
+        from services.ai import AIRequest, PromptType
+        from services.ai.structured_output import expects_json, parse_structured_output
+        
+        request = AIRequest(prompt_type=PromptType.INTERVIEWER_ANALYSIS, template="t", variables={})
+        data, error = parse_structured_output(request, '{"strengths": ["x"], "score_breakdown": {}}')
+        assert data is None
+        assert error == "Invalid structured output for interviewer_analysis: missing 'categories'"
+        
+        # score_breakdown is optional (the global score falls back to the categories)
+        data, error = parse_structured_output(request, '{"categories": {"technical": 80}}')
+        assert data == {"categories": {"technical": 80}} and error is None
+        
+        assert expects_json(AIRequest(prompt_type=PromptType.CV_SUMMARY, template="t", variables={}))
+        assert not expects_json(request.model_copy(update={"json_output": False}))
+        assert not expects_json(AIRequest(prompt_type=PromptType.TRANSLATION, template="t", variables={}))
+        
+        # Chatbot prompts are parsed on a best effort basis: free text is not an error
+        chatbot = AIRequest(prompt_type=PromptType.CHATBOT_PROFILE_EXTRACTION, template="t", variables={})
+        assert not expects_json(chatbot)
+        assert parse_structured_output(chatbot, 'Sure! ```json\n{"name": "Ana"}\n```') == ({"name": "Ana"}, None)
+        assert parse_structured_output(chatbot, "Tell me about your last role.") == (None, None)
+        assert parse_structured_output(chatbot.model_copy(update={"json_output": False}), '{"a": 1}') == (None, None)
+    
+    @pytest.mark.asyncio
+    async def test_provider_requests_json_mode_and_fails_invalid_output(self):
+        """Test OpenAI gets response_format and an invalid document fails the response for fallback."""
+        from types import SimpleNamespace
+        from services.ai import AIRequest, PromptType
+        from services.ai.openai_provider import OpenAIProvider
+        
+        replies = ['{"strengths": ["x"]}', '{"weights": {"technical_skills": 60},}']
+        sent = []
+        
+        async def create(**kwargs):
+            sent.append(kwargs)
+            return SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content=replies.pop(0)))],
+                usage=SimpleNamespace(prompt_tokens=100, completion_tokens=20, prompt_tokens_details=None),
+            )
+        
+        provider = OpenAIProvider.__new__(OpenAIProvider)
+        provider.config = {}
+        provider.model_name = "gpt-4o-mini"
+        provider.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        
+        invalid = await provider.complete(
+            AIRequest(prompt_type=PromptType.INTERVIEWER_ANALYSIS, template="Return JSON", variables={})
+        )
+        valid = await provider.complete(
+            AIRequest(prompt_type=PromptType.WEIGHTING_RECOMMENDATION, template="Return JSON", variables={})
+        )
+        
+        assert sent[0]["response_format"] == {"type": "json_object"}
+        assert not invalid.success and "categories" in invalid.error
+        assert invalid.input_tokens == 100
+        assert valid.success and valid.data == {"weights": {"technical_skills": 60}}
+    
+    @pytest.mark.asyncio
+    async def test_non_json_chatbot_reply_succeeds_without_fallback(self, monkeypatch):
+        """Test a free-text chatbot reply is a successful response and doesn't walk the fallback chain."""
+        from services.ai import manager as manager_module
+        from services.ai import AIRequest, PromptType
+        from services.ai.response_cache import AIResponseCache
+        from services.ai.openai_provider import OpenAIProvider
+        from types import SimpleNamespace
+        
+        sent = []
+        
+        async def create(**kwargs):
+            sent.append(kwargs)
+            return SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content="Great! Which city are you based in?"))],
+                usage=SimpleNamespace(prompt_tokens=50, completion_tokens=10, prompt_tokens_details=None),
+            )
+        
+        providers = {}
+        for name in ("openai", "claude"):
+            provider = OpenAIProvider.__new__(OpenAIProvider)
+            provider.config = {}
+            provider.model_name = "gpt-4o-mini"
+            provider.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+            providers[name] = provider
+        monkeypatch.setattr(manager_module, "get_ai_response_cache", lambda: AIResponseCache(enabled=False))
+        manager = manager_module.AIManager()
+        manager.providers = providers
+        manager._db_fallback_chain = [
+            {"provider": "openai", "model": None, "order": 1},
+            {"provider": "claude", "model": None, "order": 2},
+        ]
+        
+        response = await manager.execute(
+            AIRequest(prompt_type=PromptType.CHATBOT_QUESTION_GENERATION, template="Ask a question", variables={})
+        )
+        
+        assert response.success
+        assert response.data is None
+        assert response.raw_text == "Great! Which city are you based in?"
+        assert len(sent) == 1
+        assert "response_format" not in sent[0]
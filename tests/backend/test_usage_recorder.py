@@ -0,0 +1,149 @@
+"""
+Tests for the AI usage log recorder.
+"""
+
+import pytest
+
+
+class _FakeUsageLogService:
+    """Stands in for the ai_usage_logs table (slow inserts)."""
+    
+    def __init__(self, failures=0, delay=0.0):
+        self.batches = []
+        self.failures = failures
+        self.delay = delay
+    
+    async def insert_many(self, records):
+        import asyncio
+        await asyncio.sleep(self.delay)
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("database unavailable")
+        self.batches.append(list(records))
+        return len(records)
+
+
+class TestUsageRecorder:
+    """Test write-behind persistence of AI usage logs."""
+    
+    @pytest.mark.asyncio
+    async def test_buffers_and_flushes_in_batches(self):
+        """Test records are bulk-inserted on the size threshold and on close, without blocking record()."""
+        import asyncio
+        import time
+        from services.ai.usage_recorder import AIUsageRecorder
+        recorder = AIUsageRecorder(batch_size=2, flush_interval_seconds=60)
+        recorder._service = service = _FakeUsageLogService(delay=0.05)
+        recorder.start()
+        
+        started = time.perf_counter()
+        for i in range(3):
+            recorder.record({"prompt_type": "translation", "input_tokens": i})
+        assert time.perf_counter() - started < 0.01
+        
+        await asyncio.sleep(0.2)
+        assert [len(batch) for batch in service.batches] == [2, 1]
+        
+        recorder.record({"prompt_type": "chatbot_interview_prep", "input_tokens": 3})
+        await recorder.close()
+        
+        written = [record["input_tokens"] for batch in service.batches for record in batch]
+        assert written == [0, 1, 2, 3]
+        assert all(len(batch) <= 2 for batch in service.batches)
+        assert recorder.stats()["buffered"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_records(self):
+        """Test records survive a failed insert and the buffer stays bounded."""
+        from services.ai.usage_recorder import AIUsageRecorder
+        recorder = AIUsageRecorder(batch_size=2, max_buffer=3)
+        recorder._service = service = _FakeUsageLogService(failures=1)
+        
+        for i in range(4):
+            recorder.record({"input_tokens": i})
+        assert await recorder.flush() == 0
+        assert recorder.stats()["buffered"] == 3
+        assert recorder.stats()["dropped"] == 1
+        
+        assert await recorder.flush() == 3
+        assert [record["input_tokens"] for batch in service.batches for record in batch] == [1, 2, 3]
+    
+    @pytest.mark.asyncio
+    async def test_close_waits_for_running_flush(self):
+        """Test shutdown during a slow insert writes every record instead of losing the in-flight batch."""
+        import asyncio
+        from services.ai.usage_recorder import AIUsageRecorder
+        recorder = AIUsageRecorder(batch_size=5, flush_interval_seconds=60)
+        recorder._service = service = _FakeUsageLogService(delay=0.2)
+        recorder.start()
+        
+        for i in range(5):
+            recorder.record({"input_tokens": i})
+        await asyncio.sleep(0.05)
+        recorder.record({"input_tokens": 5})
+        await recorder.close()
+        
+        assert [record["input_tokens"] for batch in service.batches for record in batch] == list(range(6))
+        stats = recorder.stats()
+        assert stats["written"] == 6 and stats["buffered"] == 0 and stats["dropped"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_flush_requeues_records(self):
+        """Test records of a cancelled flush go back to the buffer."""
+        import asyncio
+        from services.ai.usage_recorder import AIUsageRecorder
+        recorder = AIUsageRecorder(batch_size=2)
+        recorder._service = _FakeUsageLogService(delay=0.2)
+        for i in range(3):
+            recorder.record({"input_tokens": i})
+        
+        flush = asyncio.get_running_loop().create_task(recorder.flush())
+        await asyncio.sleep(0.05)
+        flush.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await flush
+        
+        assert [record["input_tokens"] for record in recorder._buffer] == [0, 1, 2]
+    
+    @pytest.mark.asyncio
+    async def test_failing_batch_dropped_after_max_attempts(self):
+        """Test a batch that keeps failing is dropped so later records get written."""
+        from services.ai.usage_recorder import AIUsageRecorder
+        recorder = AIUsageRecorder(batch_size=2, max_attempts=3)
+        recorder._service = service = _FakeUsageLogService(failures=3)
+        for i in range(4):
+            recorder.record({"input_tokens": i})
+        
+        for _ in range(3):
+            assert await recorder.flush() == 0
+        assert recorder.stats()["dropped"] == 2
+        assert recorder.stats()["buffered"] == 2
+        
+        assert await recorder.flush() == 2
+        assert [record["input_tokens"] for batch in service.batches for record in batch] == [2, 3]
+    
+    @pytest.mark.asyncio
+    async def test_manager_records_every_call(self, monkeypatch, fake_provider):
+        """Test AIManager hands a usage row to the recorder for each call."""
+        from services.ai import AIRequest, PromptType
+        from services.ai import manager as manager_module
+        from services.ai.response_cache import AIResponseCache
+        from services.ai.usage_recorder import AIUsageRecorder
+        recorder = AIUsageRecorder()
+        monkeypatch.setattr(manager_module, "get_ai_usage_recorder", lambda: recorder)
+        monkeypatch.setattr(manager_module, "get_ai_response_cache", lambda: AIResponseCache(enabled=False))
+        manager = manager_module.AIManager()
+        manager.providers = {"openai": fake_provider("test-key")}
+        manager._db_fallback_chain = [{"provider": "openai", "model": "gpt-4o-mini", "order": 1}]
+        monkeypatch.setattr(manager_module, "OpenAIProvider", fake_provider)
+        monkeypatch.setattr(manager_module.settings, "openai_api_key", "test-key")
+        
+        await manager.execute(AIRequest(
+            prompt_type=PromptType.CHATBOT_INTERVIEW_PREP, template="hi", variables={}
+        ))
+        
+        [row] = list(recorder._buffer)
+        assert row["prompt_type"] == "chatbot_interview_prep"
+        assert row["provider"] == "openai" and row["model_name"] == "gpt-4o-mini"
+        assert row["input_tokens"] == 100 and row["status"] == "success"
+        assert row["created_at"]
@@ -0,0 +1,481 @@
+"""
+Offline stand-ins for the benchmark harness.
+
+- InMemorySupabase: the subset of the supabase-py client used by
+  services/database and services/storage (table()/from_() query builders,
+  rpc() and storage buckets), backed by dicts. An optional per-query
+  latency is slept synchronously, like the real blocking client.
+- FakeAIProvider: deterministic AIProvider with a seeded latency
+  distribution (log-normal around a median), error and 429 rates, returning
+  plausible JSON for every prompt type the interviewer and candidate flows
+  use. Output goes through the shared structured-output parser like the
+  real providers.
+"""
+
+import asyncio
+import copy
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from postgrest.exceptions import APIError
+
+from services.ai.base import AIProvider, AIRequest, AIResponse, PromptType
+from services.ai.structured_output import expects_json, parse_structured_output
+
+
+def _normalize(value: Any) -> Any:
+    """JSON round trip, as values would go over the wire (UUIDs become strings)."""
+    return json.loads(json.dumps(value, default=str))
+
+
+class InMemoryResult:
+    """Mimics postgrest's APIResponse (data and count)."""
+
+    def __init__(self, data: Any, count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+
+class InMemoryQuery:
+    """Query builder for one table, executed against InMemorySupabase."""
+
+    def __init__(self, db: "InMemorySupabase", table: str):
+        self._db = db
+        self._table = table
+        self._operation = "select"
+        self._columns: Optional[List[str]] = None
+        self._count = False
+        self._payload: Any = None
+        self._on_conflict: Optional[str] = None
+        self._filters: List[Callable[[Dict[str, Any]], bool]] = []
+        self._order: List[Tuple[str, bool]] = []
+        self._limit: Optional[int] = None
+        self._offset = 0
+        self._single = False
+
+    # Operations
+
+    def select(self, columns: str = "*", count: Optional[str] = None) -> "InMemoryQuery":
+        self._operation = "select"
+        if columns.strip() != "*":
+            self._columns = [column.strip() for column in columns.split(",")]
+        self._count = count is not None
+        return self
+
+    def insert(self, rows: Any, **_: Any) -> "InMemoryQuery":
+        self._operation = "insert"
+        self._payload = rows
+        return self
+
+    def upsert(self, rows: Any, on_conflict: Optional[str] = None, **_: Any) -> "InMemoryQuery":
+        self._operation = "upsert"
+        self._payload = rows
+        self._on_conflict = on_conflict
+        return self
+
+    def update(self, values: Dict[str, Any], **_: Any) -> "InMemoryQuery":
+        self._operation = "update"
+        self._payload = values
+        return self
+
+    def delete(self, **_: Any) -> "InMemoryQuery":
+        self._operation = "delete"
+        return self
+
+    # Filters and modifiers
+
+    def _filter(self, column: str, predicate: Callable[[Any], bool]) -> "InMemoryQuery":
+        self._filters.append(lambda row: predicate(row.get(column)))
+        return self
+
+    def eq(self, column: str, value: Any) -> "InMemoryQuery":
+        value = _normalize(value)
+        return self._filter(column, lambda stored: stored == value)
+
+    def neq(self, column: str, value: Any) -> "InMemoryQuery":
+        value = _normalize(value)
+        return self._filter(column, lambda stored: stored != value)
+
+    def gt(self, column: str, value: Any) -> "InMemoryQuery":
+        value = _normalize(value)
+        return self._filter(column, lambda stored: stored is not None and stored > value)
+
+    def gte(self, column: str, value: Any) -> "InMemoryQuery":
+        value = _normalize(value)
+        return self._filter(column, lambda stored: stored is not None and stored >= value)
+
+    def lt(self, column: str, value: Any) -> "InMemoryQuery":
+        value = _normalize(value)
+        return self._filter(column, lambda stored: stored is not None and stored < value)
+
+    def lte(self, column: str, value: Any) -> "InMemoryQuery":
+        value = _normalize(value)
+        return self._filter(column, lambda stored: stored is not None and stored <= value)
+
+    def ilike(self, column: str, pattern: str) -> "InMemoryQuery":
+        regex = re.compile(
+            "^" + ".*".join(re.escape(part) for part in pattern.split("%")) + "$",
+            re.IGNORECASE | re.DOTALL,
+        )
+        return self._filter(column, lambda stored: stored is not None and bool(regex.match(str(stored))))
+
+    def in_(self, column: str, values: List[Any]) -> "InMemoryQuery":
+        values = _normalize(list(values))
+        return self._filter(column, lambda stored: stored in values)
+
+    def order(self, column: str, desc: bool = False, **_: Any) -> "InMemoryQuery":
+        for name in column.split(","):
+            self._order.append((name.strip(), desc))
+        return self
+
+    def limit(self, size: int, **_: Any) -> "InMemoryQuery":
+        self._limit = size
+        return self
+
+    def range(self, start: int, end: int, **_: Any) -> "InMemoryQuery":
+        self._offset = start
+        self._limit = end - start + 1
+        return self
+
+    def single(self) -> "InMemoryQuery":
+        self._single = True
+        return self
+
+    # Execution
+
+    def _matches(self, row: Dict[str, Any]) -> bool:
+        return all(predicate(row) for predicate in self._filters)
+
+    def _project(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        if self._columns is None:
+            return copy.deepcopy(row)
+        return {column: copy.deepcopy(row.get(column)) for column in self._columns}
+
+    def execute(self) -> InMemoryResult:
+        self._db.simulate_latency()
+        with self._db.lock:
+            self._db.query_count += 1
+            rows = self._db.rows(self._table)
+            if self._operation == "insert":
+                return InMemoryResult([self._db.store(self._table, row) for row in self._as_list(self._payload)])
+            if self._operation == "upsert":
+                return InMemoryResult([self._upsert(rows, row) for row in self._as_list(self._payload)])
+            if self._operation == "update":
+                values = _normalize(self._payload)
+                matched = [row for row in rows if self._matches(row)]
+                for row in matched:
+                    row.update(copy.deepcopy(values))
+                return InMemoryResult([copy.deepcopy(row) for row in matched])
+            if self._operation == "delete":
+                matched = [row for row in rows if self._matches(row)]
+                rows[:] = [row for row in rows if not self._matches(row)]
+                return InMemoryResult(matched)
+            return self._select(rows)
+
+    @staticmethod
+    def _as_list(payload: Any) -> List[Dict[str, Any]]:
+        return list(payload) if isinstance(payload, list) else [payload]
+
+    def _upsert(self, rows: List[Dict[str, Any]], row: Dict[str, Any]) -> Dict[str, Any]:
+        key = self._on_conflict or self._db.conflict_keys.get(self._table, "id")
+        value = _normalize(row.get(key))
+        for existing in rows:
+            if value is not None and existing.get(key) == value:
+                existing.update(_normalize(row))
+                return copy.deepcopy(existing)
+        return self._db.store(self._table, row)
+
+    def _select(self, rows: List[Dict[str, Any]]) -> InMemoryResult:
+        matched = [row for row in rows if self._matches(row)]
+        for column, desc in reversed(self._order):
+            matched.sort(key=lambda row: (row.get(column) is None, row.get(column)), reverse=desc)
+        count = len(matched) if self._count else None
+        end = None if self._limit is None else self._offset + self._limit
+        data = [self._project(row) for row in matched[self._offset:end]]
+        if self._single:
+            if len(data) != 1:
+                raise APIError({
+                    "code": "PGRST116",
+                    "message": "JSON object requested, multiple (or no) rows returned",
+                    "details": f"The result contains {len(data)} rows",
+                })
+            return InMemoryResult(data[0], count)
+        return InMemoryResult(data, count)
+
+
+class InMemoryRpc:
+    """Deferred RPC call (executed like a query)."""
+
+    def __init__(self, db: "InMemorySupabase", fn: str, params: Dict[str, Any]):
+        self._db = db
+        self._fn = fn
+        self._params = params
+
+    def execute(self) -> InMemoryResult:
+        self._db.simulate_latency()
+        handler = self._db.rpc_functions.get(self._fn)
+        if handler is None:
+            raise APIError({"code": "PGRST202", "message": f"Could not find the function public.{self._fn}"})
+        with self._db.lock:
+            self._db.query_count += 1
+            return InMemoryResult(handler(self._db, **(self._params or {})))
+
+
+class InMemoryBucket:
+    """Storage bucket keeping uploaded files in memory."""
+
+    def __init__(self, db: "InMemorySupabase", name: str):
+        self._db = db
+        self._name = name
+        self.files: Dict[str, bytes] = {}
+
+    def upload(self, path: str, file: bytes, file_options: Optional[Dict[str, Any]] = None) -> Dict[str, str]:
+        self._db.simulate_latency()
+        self.files[path] = file
+        return {"Key": f"{self._name}/{path}"}
+
+    def get_public_url(self, path: str, *args: Any) -> str:
+        return f"memory://{self._name}/{path}"
+
+    def create_signed_url(self, path: str, expires_in: int, *args: Any) -> Dict[str, str]:
+        return {"signedURL": f"memory://{self._name}/{path}?expires_in={expires_in}"}
+
+    def remove(self, paths: List[str]) -> List[Dict[str, str]]:
+        for path in paths:
+            self.files.pop(path, None)
+        return [{"name": path} for path in paths]
+
+
+class InMemoryStorage:
+    """client.storage replacement: buckets created on first use."""
+
+    def __init__(self, db: "InMemorySupabase"):
+        self._db = db
+        self.buckets: Dict[str, InMemoryBucket] = {}
+
+    def from_(self, bucket: str) -> InMemoryBucket:
+        if bucket not in self.buckets:
+            self.buckets[bucket] = InMemoryBucket(self._db, bucket)
+        return self.buckets[bucket]
+
+
+class InMemorySupabase:
+    """
+    In-memory stand-in for the supabase-py Client.
+
+    Rows get an "id" (UUID string) and "created_at" when inserted without
+    them. Upserts match on conflict_keys[table] (default "id").
+    """
+
+    def __init__(
+        self,
+        query_latency_ms: float = 0.0,
+        conflict_keys: Optional[Dict[str, str]] = None,
+        rpc_functions: Optional[Dict[str, Callable[..., Any]]] = None,
+    ):
+        """
+        Args:
+            query_latency_ms: Time each query blocks the calling thread (network round trip)
+            conflict_keys: Upsert conflict column per table
+            rpc_functions: RPC handlers called as handler(db, **params)
+        """
+        self.query_latency_ms = query_latency_ms
+        self.conflict_keys = {"ai_response_cache": "cache_key", "app_settings": "setting_key", **(conflict_keys or {})}
+        self.rpc_functions = dict(rpc_functions or {})
+        self.tables: Dict[str, List[Dict[str, Any]]] = {}
+        self.storage = InMemoryStorage(self)
+        self.lock = threading.RLock()
+        self.query_count = 0
+
+    def simulate_latency(self):
+        if self.query_latency_ms > 0:
+            time.sleep(self.query_latency_ms / 1000.0)
+
+    def rows(self, table: str) -> List[Dict[str, Any]]:
+        """Live row list of a table (created empty on first use)."""
+        return self.tables.setdefault(table, [])
+
+    def store(self, table: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert a row, filling id/created_at, and return a copy."""
+        stored = _normalize(row)
+        stored.setdefault("id", str(uuid.uuid4()))
+        stored.setdefault("created_at", datetime.now(timezone.utc).isoformat())
+        with self.lock:
+            self.rows(table).append(stored)
+        return copy.deepcopy(stored)
+
+    def table(self, table_name: str) -> InMemoryQuery:
+        return InMemoryQuery(self, table_name)
+
+    def from_(self, table_name: str) -> InMemoryQuery:
+        return InMemoryQuery(self, table_name)
+
+    def rpc(self, fn: str, params: Optional[Dict[str, Any]] = None) -> InMemoryRpc:
+        return InMemoryRpc(self, fn, params or {})
+
+
+# Canned output per prompt type (CV summaries and analyses get per-call scores)
+_JOB_POSTING = {
+    "title": "Senior Backend Engineer",
+    "company": "Acme Corp",
+    "required_skills": ["Python", "FastAPI", "PostgreSQL", "Docker", "AWS"],
+    "preferred_skills": ["Kubernetes", "Terraform"],
+    "experience_level": "Senior (5+ years)",
+    "languages": ["English"],
+    "qualifications": ["BSc in Computer Science or equivalent"],
+    "responsibilities": ["Design and operate backend services"],
+}
+_WEIGHTING = {
+    "weights": {"technical_skills": 40, "experience": 30, "soft_skills": 20, "languages": 10},
+    "hard_blockers": ["No work permit"],
+    "nice_to_have": ["Kubernetes"],
+    "summary": "Technical depth matters most for this role.",
+}
+_EXECUTIVE = {
+    "executive_summary": "Two strong candidates stand out for the role.",
+    "top_recommendation": {"candidate_index": 1, "reasoning": "Best technical match"},
+    "comparison_table": [],
+    "hiring_strategy": "Interview the top two candidates first.",
+}
+
+
+class FakeAIProvider(AIProvider):
+    """
+    Deterministic AIProvider for offline load tests.
+
+    Each call draws, from a seeded RNG, a latency (log-normal around
+    latency_ms), then a 429 (rate_limit_rate) or a server error (error_rate).
+    """
+
+    def __init__(
+        self,
+        name: str = "fake",
+        model: str = "fake-model",
+        latency_ms: float = 0.0,
+        latency_sigma: float = 0.5,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: float = 0.05,
+        seed: int = 0,
+    ):
+        """
+        Args:
+            name: Provider name (as used in the fallback chain)
+            model: Model name reported in responses
+            latency_ms: Median latency per call
+            latency_sigma: Log-normal shape (0 for a fixed latency)
+            error_rate: Probability of a 500 error
+            rate_limit_rate: Probability of a 429
+            retry_after: Retry-After seconds returned with 429s
+            seed: RNG seed
+        """
+        super().__init__("fake-key", {"model": model})
+        self._name = name
+        self.model_name = model
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self._rng = random.Random(seed)
+        self.calls: Dict[str, int] = {}
+
+    @property
+    def provider_name(self) -> str:
+        return self._name
+
+    def _draw(self) -> Tuple[float, float]:
+        latency = 0.0
+        if self.latency_ms > 0:
+            latency = self.latency_ms / 1000.0
+            if self.latency_sigma > 0:
+                latency = self._rng.lognormvariate(math.log(latency), self.latency_sigma)
+        return latency, self._rng.random()
+
+    def _score(self) -> int:
+        return self._rng.randint(40, 95)
+
+    def _payload(self, request: AIRequest) -> Any:
+        prompt_type = request.prompt_type
+        if prompt_type == PromptType.JOB_POSTING_NORMALIZATION:
+            return _JOB_POSTING
+        if prompt_type == PromptType.WEIGHTING_RECOMMENDATION:
+            return _WEIGHTING
+        if prompt_type == PromptType.CV_SUMMARY:
+            summary = {"headline": "Backend engineer", "years_experience": 7, "key_skills": ["Python", "SQL"]}
+            if "cv_count" in request.variables:
+                count = int(request.variables["cv_count"])
+                return {"summaries": [{"index": index, **summary} for index in range(1, count + 1)]}
+            return summary
+        if prompt_type in (PromptType.INTERVIEWER_ANALYSIS, PromptType.CANDIDATE_ANALYSIS):
+            categories = {name: self._score() for name in _WEIGHTING["weights"]}
+            return {
+                "categories": categories,
+                "score_breakdown": {name: {"score": score, "weight": _WEIGHTING["weights"][name]}
+                                    for name, score in categories.items()},
+                "global_score": round(sum(categories.values()) / len(categories)),
+                "strengths": ["Solid Python experience", "Led a team of four"],
+                "risks": ["Limited cloud exposure"],
+                "gaps": ["Limited cloud exposure"],
+                "custom_questions": ["Describe a service you scaled.", "How do you review code?"],
+                "answers": ["I sharded the database.", "Small PRs, clear checklists."],
+                "gap_strategies": ["Mention AWS certification in progress"],
+                "preparation_tips": ["Prepare a system design example"],
+                "recommendation": "Interview",
+                "intro_pitch": "Backend engineer with seven years of Python.",
+                "profile_summary": "Experienced backend engineer.",
+            }
+        if prompt_type == PromptType.EXECUTIVE_RECOMMENDATION:
+            return _EXECUTIVE
+        return {"result": "ok"}
+
+    async def complete(self, request: AIRequest) -> AIResponse:
+        self.calls[request.prompt_type.value] = self.calls.get(request.prompt_type.value, 0) + 1
+        prompt = self.build_prompt(request.template, request.variables)
+        latency, outcome = self._draw()
+        if latency:
+            await asyncio.sleep(latency)
+        latency_ms = int(latency * 1000)
+        base = {"provider": self._name, "model": self.model_name, "latency_ms": latency_ms}
+
+        if outcome < self.rate_limit_rate:
+            return AIResponse(
+                success=False,
+                error="429 Too Many Requests (fake rate limit)",
+                rate_limited=True,
+                retry_after=self.retry_after,
+                **base,
+            )
+        if outcome < self.rate_limit_rate + self.error_rate:
+            return AIResponse(success=False, error="500 Internal Server Error (fake)", **base)
+
+        json_mode = expects_json(request)
+        raw_text = json.dumps(self._payload(request)) if json_mode else f"[{request.language}] {prompt[:200]}"
+        data, parse_error = parse_structured_output(request, raw_text) if json_mode else (None, None)
+        input_tokens = len(prompt) // 4
+        output_tokens = len(raw_text) // 4
+        return AIResponse(
+            success=parse_error is None,
+            data=data,
+            raw_text=raw_text,
+            error=parse_error,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cost_usd=(input_tokens + 4 * output_tokens) / 1_000_000,
+            **base,
+        )
+
+    async def extract_structured_data(self, text: str, schema: Dict[str, Any], language: str = "en") -> AIResponse:
+        return await self.complete(AIRequest(
+            prompt_type=PromptType.CV_EXTRACTION,
+            template="{text}",
+            variables={"text": text},
+            language=language,
+        ))
@@ -0,0 +1,457 @@
+"""
+Offline load benchmark for the interviewer and candidate pipelines.
+
+Drives N concurrent interviewer sessions through steps 1-7 and N candidate
+sessions through steps 1-5 against the real FastAPI app (in-process, via
+httpx's ASGI transport), with Supabase replaced by InMemorySupabase and the
+AI fallback chain by FakeAIProvider instances (see fake_backends.py).
+Nothing leaves the process, so runs are repeatable and free.
+
+Background steps (job posting processing, weighting suggestions, CV upload,
+analysis) are timed from the request that starts them until their progress
+endpoint reports completion. The report lists throughput, p50/p95/p99
+latency per step, AI calls per prompt type, DB queries and peak traced
+memory.
+
+Run with: python tests/benchmarks/pipeline_benchmark.py [--interviewers N]
+          [--candidates N] [--cvs N] [--latency-ms MS] [--error-rate P]
+          [--rate-limit-rate P] [--db-latency-ms MS]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import importlib
+import math
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Add backend and this directory to path
+backend_path = Path(__file__).parent.parent.parent / "src" / "backend"
+sys.path.insert(0, str(backend_path))
+sys.path.insert(0, str(Path(__file__).parent))
+
+import httpx
+
+from config import settings
+from fake_backends import FakeAIProvider, InMemorySupabase
+
+# Module-level singletons that capture the Supabase client or AI providers;
+# reset while the fakes are installed so they are rebuilt against them
+_SINGLETONS: Tuple[Tuple[str, str], ...] = (
+    ("database.connection", "_supabase_client"),
+    ("services.database.company_service", "_company_service"),
+    ("services.database.session_service", "_session_service"),
+    ("services.database.job_posting_service", "_job_posting_service"),
+    ("services.database.cv_service", "_cv_service"),
+    ("services.database.analysis_service", "_analysis_service"),
+    ("services.database.report_service", "_report_service"),
+    ("services.database.interviewer_service", "_interviewer_service"),
+    ("services.database.candidate_service", "_candidate_service"),
+    ("services.database.prompt_service", "_prompt_service"),
+    ("services.database.enrichment_service", "_company_enrichment_service_instance"),
+    ("services.database.enrichment_service", "_candidate_enrichment_service_instance"),
+    ("services.database.ai_usage_log_service", "_ai_usage_log_service"),
+    ("services.database.ai_response_cache_service", "_ai_response_cache_service"),
+    ("services.database.app_settings_service", "_app_settings_service"),
+    ("services.storage.supabase_storage", "_storage_service"),
+    ("services.search.brave_search", "_brave_search_service"),
+    ("services.ai.manager", "_ai_manager"),
+    ("services.ai.response_cache", "_ai_response_cache"),
+    ("services.ai.usage_recorder", "_ai_usage_recorder"),
+    ("services.ai.prompt_registry", "_prompt_registry"),
+    ("services.ai.rate_limiter", "_rate_limit_scheduler"),
+    ("services.ai.health", "_provider_health_tracker"),
+    ("services.ai_analysis", "_ai_analysis_service"),
+    ("services.settings_cache", "_app_settings_cache"),
+)
+
+# Progress statuses that end a background step
+_DONE_STATUSES = frozenset({"complete", "completed"})
+_FAILED_STATUSES = frozenset({"error", "failed"})
+
+INTERVIEWER_STEPS = tuple(f"interviewer.step{n}" for n in range(1, 8))
+CANDIDATE_STEPS = tuple(f"candidate.step{n}" for n in range(1, 6))
+
+
+@dataclass
+class BenchmarkConfig:
+    """Load shape and fake backend behaviour for one run."""
+    interviewer_sessions: int = 10
+    candidate_sessions: int = 10
+    cvs_per_session: int = 5
+    ai_latency_ms: float = 200.0
+    ai_latency_sigma: float = 0.5
+    ai_error_rate: float = 0.0
+    ai_rate_limit_rate: float = 0.0
+    db_latency_ms: float = 0.0
+    poll_interval: float = 0.05
+    step_timeout: float = 600.0
+    trace_memory: bool = True
+    seed: int = 0
+
+
+@dataclass
+class BenchmarkResult:
+    """Timings and counters collected by run_benchmark."""
+    config: BenchmarkConfig
+    wall_seconds: float = 0.0
+    completed: Dict[str, int] = field(default_factory=dict)
+    failures: List[str] = field(default_factory=list)
+    step_seconds: Dict[str, List[float]] = field(default_factory=dict)
+    ai_calls: Dict[str, int] = field(default_factory=dict)
+    db_queries: int = 0
+    peak_memory_bytes: Optional[int] = None
+
+    def record(self, step: str, seconds: float):
+        self.step_seconds.setdefault(step, []).append(seconds)
+
+    @property
+    def sessions_per_second(self) -> float:
+        total = sum(self.completed.values())
+        return total / self.wall_seconds if self.wall_seconds else 0.0
+
+    def format_report(self) -> str:
+        """Human-readable summary of the run."""
+        config = self.config
+        lines = [
+            f"Sessions: {config.interviewer_sessions} interviewer ({config.cvs_per_session} CVs each), "
+            f"{config.candidate_sessions} candidate | AI latency {config.ai_latency_ms:.0f} ms "
+            f"(sigma {config.ai_latency_sigma}), errors {config.ai_error_rate:.0%}, "
+            f"429s {config.ai_rate_limit_rate:.0%} | DB latency {config.db_latency_ms:.0f} ms",
+            f"Wall time: {self.wall_seconds:.2f} s | completed: "
+            + ", ".join(f"{flow} {count}" for flow, count in sorted(self.completed.items()))
+            + f" | failed: {len(self.failures)} | throughput: {self.sessions_per_second:.2f} sessions/s",
+            "",
+            f"  {'step':<20} {'n':>5} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'max ms':>10}",
+        ]
+        for step in (*INTERVIEWER_STEPS, *CANDIDATE_STEPS):
+            values = self.step_seconds.get(step)
+            if not values:
+                continue
+            lines.append(
+                f"  {step:<20} {len(values):>5} "
+                + " ".join(f"{percentile(values, pct) * 1000:>10.1f}" for pct in (50, 95, 99))
+                + f" {max(values) * 1000:>10.1f}"
+            )
+        lines.append("")
+        lines.append("AI calls: " + ", ".join(f"{name} {count}" for name, count in sorted(self.ai_calls.items())))
+        lines.append(f"DB queries: {self.db_queries}")
+        if self.peak_memory_bytes is not None:
+            lines.append(f"Peak traced memory: {self.peak_memory_bytes / (1024 * 1024):.1f} MiB")
+        for failure in self.failures[:10]:
+            lines.append(f"  failed: {failure}")
+        return "\n".join(lines)
+
+
+class StepFailed(Exception):
+    """A step returned an error status or timed out."""
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile (0 for no values)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def job_posting_text(session: int) -> str:
+    """A ~3 KB job posting, unique per session (no AI response cache hits)."""
+    requirements = "\n".join(
+        f"- Requirement {i}: experience with distributed Python services, PostgreSQL and cloud tooling"
+        for i in range(30)
+    )
+    return f"Senior Backend Engineer (opening #{session})\nAcme Corp, Lisbon\n\nRequirements:\n{requirements}\n"
+
+
+def cv_text(session: int, index: int) -> str:
+    """A ~4 KB plain-text CV, unique per session and index."""
+    experience = "\n".join(
+        f"{2010 + i}-{2011 + i} | Engineer at Company {i} | Built APIs, data pipelines and team processes"
+        for i in range(40)
+    )
+    return f"Candidate {session}-{index}\ncandidate{session}.{index}@example.com\n\nExperience:\n{experience}\n"
+
+
+@contextlib.contextmanager
+def offline_backends(config: BenchmarkConfig) -> Iterator[Tuple[InMemorySupabase, List[FakeAIProvider]]]:
+    """
+    Install InMemorySupabase and a two-provider fake fallback chain.
+
+    Singletons are reset (and restored afterwards) so services are rebuilt
+    against the fakes; Brave Search enrichment is disabled for the run.
+
+    Args:
+        config: Benchmark configuration
+
+    Yields:
+        (in-memory database, fake providers in fallback order)
+    """
+    saved = [
+        (module, name, getattr(module, name))
+        for module, name in ((importlib.import_module(path), name) for path, name in _SINGLETONS)
+    ]
+    saved_brave_key = settings.brave_search_api_key
+    try:
+        for module, name, _ in saved:
+            setattr(module, name, None)
+        settings.brave_search_api_key = None
+
+        db = InMemorySupabase(query_latency_ms=config.db_latency_ms)
+        client: Any = db
+        if settings.metrics_enabled:
+            from database.instrumentation import InstrumentedClient
+            client = InstrumentedClient(db)
+        importlib.import_module("database.connection")._supabase_client = client
+
+        providers = [
+            FakeAIProvider(
+                name=name,
+                latency_ms=config.ai_latency_ms,
+                latency_sigma=config.ai_latency_sigma,
+                error_rate=config.ai_error_rate,
+                rate_limit_rate=config.ai_rate_limit_rate,
+                seed=config.seed + offset,
+            )
+            for offset, name in enumerate(("fake_primary", "fake_secondary"))
+        ]
+        db.store("app_settings", {
+            "setting_key": "default_ai_provider",
+            "setting_value": [
+                {"provider": provider.provider_name, "model": None, "order": order}
+                for order, provider in enumerate(providers, 1)
+            ],
+        })
+
+        from services.ai.manager import get_ai_manager
+        manager = get_ai_manager()
+        manager.providers = {provider.provider_name: provider for provider in providers}
+        manager.default_provider = providers[0].provider_name
+        manager.invalidate_fallback_chain()
+
+        yield db, providers
+    finally:
+        settings.brave_search_api_key = saved_brave_key
+        for module, name, value in saved:
+            setattr(module, name, value)
+
+
+async def _poll(
+    client: httpx.AsyncClient,
+    url: str,
+    config: BenchmarkConfig,
+    status_of: Callable[[Dict[str, Any]], str] = lambda body: body.get("status", ""),
+) -> Dict[str, Any]:
+    """Poll a progress endpoint until the step completes."""
+    deadline = time.monotonic() + config.step_timeout
+    while True:
+        response = await client.get(url)
+        response.raise_for_status()
+        body = response.json()
+        status = status_of(body)
+        if status in _DONE_STATUSES:
+            return body
+        if status in _FAILED_STATUSES:
+            raise StepFailed(f"{url}: {status} {body.get('progress')}")
+        if time.monotonic() > deadline:
+            raise StepFailed(f"{url}: timed out after {config.step_timeout:.0f}s (status {status})")
+        await asyncio.sleep(config.poll_interval)
+
+
+def _check(response: httpx.Response) -> Dict[str, Any]:
+    if response.status_code >= 400:
+        raise StepFailed(f"{response.request.method} {response.request.url.path}: "
+                         f"{response.status_code} {response.text[:200]}")
+    return response.json()
+
+
+@contextlib.asynccontextmanager
+async def _timed(result: BenchmarkResult, step: str):
+    started = time.perf_counter()
+    yield
+    result.record(step, time.perf_counter() - started)
+
+
+async def run_interviewer_session(client: httpx.AsyncClient, session: int, config: BenchmarkConfig,
+                                  result: BenchmarkResult):
+    """Drive one interviewer session through steps 1-7."""
+    base = "/api/interviewer"
+
+    async with _timed(result, "interviewer.step1"):
+        body = _check(await client.post(f"{base}/step1", json={
+            "name": f"Interviewer {session}",
+            "email": f"interviewer{session}@example.com",
+            "company_name": "Acme Corp",
+            "consent_terms": True,
+            "consent_privacy": True,
+            "consent_store_data": True,
+            "consent_future_contact": True,
+            "language": "en",
+        }))
+    session_id = body["session_id"]
+
+    async with _timed(result, "interviewer.step2"):
+        _check(await client.post(f"{base}/step2", data={
+            "session_id": session_id,
+            "raw_text": job_posting_text(session),
+        }))
+        await _poll(client, f"{base}/step2/progress/{session_id}", config)
+
+    async with _timed(result, "interviewer.step3"):
+        body = _check(await client.get(f"{base}/step3/suggestions/{session_id}"))
+        key_points = body.get("suggested_key_points") or "Python, PostgreSQL, team leadership"
+        _check(await client.post(f"{base}/step3", json={"session_id": session_id, "key_points": key_points}))
+
+    async with _timed(result, "interviewer.step4"):
+        body = _check(await client.get(f"{base}/step4/suggestions/{session_id}"))
+        if not body.get("has_suggestions"):
+            body = (await _poll(client, f"{base}/step4/suggestions/progress/{session_id}", config))["suggestions"]
+        weights = body.get("weights") or {"technical_skills": 50, "experience": 30, "languages": 20}
+        _check(await client.post(f"{base}/step4", json={
+            "session_id": session_id,
+            "weights": weights,
+            "hard_blockers": body.get("hard_blockers", []),
+            "nice_to_have": body.get("nice_to_have", []),
+        }))
+
+    async with _timed(result, "interviewer.step5"):
+        files = [
+            ("files", (f"cv_{session}_{index}.txt", cv_text(session, index).encode(), "text/plain"))
+            for index in range(1, config.cvs_per_session + 1)
+        ]
+        _check(await client.post(f"{base}/step5", data={"session_id": session_id}, files=files))
+        await _poll(client, f"{base}/step5/progress/{session_id}", config)
+
+    async with _timed(result, "interviewer.step6"):
+        _check(await client.post(f"{base}/step6", params={"session_id": session_id}))
+        await _poll(client, f"{base}/step6/progress/{session_id}", config)
+
+    async with _timed(result, "interviewer.step7"):
+        _check(await client.get(f"{base}/step7/{session_id}"))
+
+
+async def run_candidate_session(client: httpx.AsyncClient, session: int, config: BenchmarkConfig,
+                                result: BenchmarkResult):
+    """Drive one candidate session through steps 1-5."""
+    base = "/api/candidate"
+
+    async with _timed(result, "candidate.step1"):
+        body = _check(await client.post(f"{base}/step1", json={
+            "name": f"Candidate {session}",
+            "email": f"candidate{session}@example.com",
+            "consent_terms": True,
+            "consent_privacy": True,
+            "consent_store_data": True,
+            "consent_future_contact": True,
+            "language": "en",
+        }))
+    session_id = body["session_id"]
+
+    async with _timed(result, "candidate.step2"):
+        _check(await client.post(f"{base}/step2", data={
+            "session_id": session_id,
+            "raw_text": job_posting_text(10_000 + session),
+        }))
+        await _poll(client, f"{base}/step2/progress/{session_id}", config)
+
+    async with _timed(result, "candidate.step3"):
+        _check(await client.post(
+            f"{base}/step3",
+            data={"session_id": session_id},
+            files={"file": (f"cv_candidate_{session}.txt", cv_text(10_000 + session, 1).encode(), "text/plain")},
+        ))
+
+    async with _timed(result, "candidate.step4"):
+        _check(await client.post(f"{base}/step4", params={"session_id": session_id}))
+        await _poll(client, f"{base}/step4/progress/{session_id}", config)
+
+    async with _timed(result, "candidate.step5"):
+        _check(await client.get(f"{base}/step5/{session_id}"))
+
+
+async def run_benchmark(config: BenchmarkConfig) -> BenchmarkResult:
+    """
+    Run all sessions concurrently against the app with offline backends.
+
+    Args:
+        config: Benchmark configuration
+
+    Returns:
+        BenchmarkResult (failed sessions are listed, not raised)
+    """
+    from main import app
+
+    result = BenchmarkResult(config=config)
+
+    async def _session(flow: str, runner, session: int, client: httpx.AsyncClient):
+        try:
+            await runner(client, session, config, result)
+            result.completed[flow] = result.completed.get(flow, 0) + 1
+        except (StepFailed, httpx.HTTPError) as e:
+            result.failures.append(f"{flow} #{session}: {e}")
+
+    with offline_backends(config) as (db, providers):
+        if config.trace_memory:
+            tracemalloc.start()
+        try:
+            async with app.router.lifespan_context(app):
+                transport = httpx.ASGITransport(app=app)
+                async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+                    started = time.perf_counter()
+                    await asyncio.gather(
+                        *(_session("interviewer", run_interviewer_session, n, client)
+                          for n in range(1, config.interviewer_sessions + 1)),
+                        *(_session("candidate", run_candidate_session, n, client)
+                          for n in range(1, config.candidate_sessions + 1)),
+                    )
+                    result.wall_seconds = time.perf_counter() - started
+            if config.trace_memory:
+                result.peak_memory_bytes = tracemalloc.get_traced_memory()[1]
+        finally:
+            if config.trace_memory:
+                tracemalloc.stop()
+
+        for provider in providers:
+            for prompt_type, count in provider.calls.items():
+                result.ai_calls[prompt_type] = result.ai_calls.get(prompt_type, 0) + count
+        result.db_queries = db.query_count
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--interviewers", type=int, default=10, help="Concurrent interviewer sessions")
+    parser.add_argument("--candidates", type=int, default=10, help="Concurrent candidate sessions")
+    parser.add_argument("--cvs", type=int, default=5, help="CVs uploaded per interviewer session")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="Median fake AI latency")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="Log-normal shape of AI latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of an AI 500 error")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Probability of an AI 429")
+    parser.add_argument("--db-latency-ms", type=float, default=0.0, help="Blocking latency per DB query")
+    parser.add_argument("--no-trace-memory", action="store_true", help="Skip tracemalloc (faster)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    config = BenchmarkConfig(
+        interviewer_sessions=args.interviewers,
+        candidate_sessions=args.candidates,
+        cvs_per_session=args.cvs,
+        ai_latency_ms=args.latency_ms,
+        ai_latency_sigma=args.latency_sigma,
+        ai_error_rate=args.error_rate,
+        ai_rate_limit_rate=args.rate_limit_rate,
+        db_latency_ms=args.db_latency_ms,
+        trace_memory=not args.no_trace_memory,
+        seed=args.seed,
+    )
+    print(asyncio.run(run_benchmark(config)).format_report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Smoke tests for the offline pipeline benchmark harness.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent.parent / "src" / "backend"
+sys.path.insert(0, str(backend_path))
+
+from fake_backends import FakeAIProvider, InMemorySupabase
+from pipeline_benchmark import CANDIDATE_STEPS, INTERVIEWER_STEPS, BenchmarkConfig, run_benchmark
+
+
+class TestFakeBackends:
+    """Test the in-memory Supabase and fake AI provider."""
+
+    def test_in_memory_supabase_queries(self):
+        """Inserted rows can be filtered, ordered, counted and updated."""
+        db = InMemorySupabase()
+        for score in (70, 90, 80):
+            db.table("analyses").insert({"report_id": "r1", "global_score": score}).execute()
+        db.table("analyses").insert({"report_id": "r2", "global_score": 50}).execute()
+
+        result = db.table("analyses").select("id, global_score", count="exact")\
+            .eq("report_id", "r1").order("global_score", desc=True).limit(2).execute()
+        assert [row["global_score"] for row in result.data] == [90, 80]
+        assert result.count == 3
+        assert set(result.data[0]) == {"id", "global_score"}
+
+        db.table("analyses").update({"global_score": 55}).eq("report_id", "r2").execute()
+        row = db.table("analyses").select("*").eq("report_id", "r2").single().execute().data
+        assert row["global_score"] == 55
+
+    @pytest.mark.asyncio
+    async def test_fake_provider_errors_and_rate_limits(self):
+        """Error and 429 rates produce failed responses the manager can classify."""
+        from services.ai.base import AIRequest, PromptType
+
+        request = AIRequest(prompt_type=PromptType.WEIGHTING_RECOMMENDATION, template="{job}", variables={"job": "x"})
+
+        response = await FakeAIProvider(rate_limit_rate=1.0).complete(request)
+        assert not response.success and response.rate_limited and response.retry_after
+
+        response = await FakeAIProvider(error_rate=1.0).complete(request)
+        assert not response.success and not response.rate_limited
+
+        response = await FakeAIProvider().complete(request)
+        assert response.success and "weights" in response.data
+
+
+class TestPipelineBenchmark:
+    """Test the end-to-end benchmark run."""
+
+    @pytest.mark.asyncio
+    async def test_sessions_complete_offline(self):
+        """All interviewer and candidate sessions finish and every step is timed."""
+        config = BenchmarkConfig(
+            interviewer_sessions=2,
+            candidate_sessions=2,
+            cvs_per_session=2,
+            ai_latency_ms=0,
+            poll_interval=0.01,
+            trace_memory=False,
+        )
+        result = await run_benchmark(config)
+
+        assert result.failures == []
+        assert result.completed == {"interviewer": 2, "candidate": 2}
+        for step in (*INTERVIEWER_STEPS, *CANDIDATE_STEPS):
+            assert len(result.step_seconds[step]) == 2
+        assert result.ai_calls["interviewer_analysis"] == 4
+        assert result.ai_calls["candidate_analysis"] == 2
+        assert result.db_queries > 0
+        assert "interviewer.step6" in result.format_report()